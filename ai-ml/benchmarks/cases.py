@@ -0,0 +1,386 @@
+"""
+Benchmark Cases
+Hot paths of the use-case pipelines, each set up against the databases named
+in the use case's own config and timed by run_case
+
+Every case runs in a fresh interpreter (see run_benchmarks.py): the use cases
+have colliding top-level packages (services, models, ...) and a fresh process
+keeps warm caches and peak memory from leaking between cases.
+"""
+
+import sys
+import time
+import resource
+import contextlib
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+AI_ML_DIR = Path(__file__).parent.parent
+USE_CASES_DIR = AI_ML_DIR / "use-cases"
+sys.path.append(str(AI_ML_DIR / "shared" / "utils"))
+from db_connector import DBConnector
+
+# Sorted-neighbourhood window for dedup candidate pairs
+DEDUP_WINDOW = 4
+
+# Agreement priors used instead of trained m/u probabilities, so the pair
+# scoring cost does not depend on which model happens to be on disk
+DEDUP_M_PROB = 0.9
+DEDUP_U_PROB = 0.1
+
+NUDGE_ACTION_TYPES = ['renewal', 'missing_doc', 'consent', 'informational']
+NUDGE_URGENCIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+NUDGE_URGENCY_WEIGHTS = [0.05, 0.25, 0.45, 0.25]
+
+# Timed runs per case unless --repeat is given. Cases that write can only be
+# timed once per fresh database: a second run sees the rows of the first.
+DEFAULT_REPEAT = 3
+DEFAULT_REPEAT_WRITING = 1
+
+# A case's setup returns run(latencies) -> items processed, and a teardown
+Workload = Tuple[Callable[[List[float]], int], Optional[Callable[[], None]]]
+
+
+def _use_case_path(use_case: str, *parts: str):
+    path = str(USE_CASES_DIR.joinpath(use_case, *parts))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame rows as dicts with None for missing values"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _warehouse_query(options: Dict[str, Any], query: str, params: Dict[str, Any]) -> pd.DataFrame:
+    db = DBConnector(**options['warehouse'])
+    try:
+        db.connect()
+        return db.execute_query(query, params)
+    finally:
+        db.disconnect()
+
+
+def dedup_pair_scoring(options: Dict[str, Any]) -> Workload:
+    """AI-01: Fellegi-Sunter match scores over sorted-neighbourhood candidate pairs"""
+    _use_case_path('01_golden_record', 'src')
+    from deduplication import FellegiSunterDeduplication
+    
+    records = _warehouse_query(options, """
+        SELECT citizen_id, first_name || ' ' || last_name AS full_name, date_of_birth,
+               gender, caste_id, district_id, pincode, family_income
+        FROM citizens
+        ORDER BY citizen_id
+        LIMIT %(limit)s
+    """, {'limit': options['items'] // DEDUP_WINDOW + 1000})
+    
+    # Block on district, compare each record with its next neighbours by name
+    records = records.sort_values(['district_id', 'full_name']).reset_index(drop=True)
+    rows = [row for _, row in records.iterrows()]
+    districts = records['district_id'].to_numpy()
+    pairs = [
+        (rows[i], rows[j])
+        for i in range(len(rows))
+        for j in range(i + 1, min(i + 1 + DEDUP_WINDOW, len(rows)))
+        if districts[i] == districts[j]
+    ][:options['items']]
+    
+    model = FellegiSunterDeduplication()
+    if pairs:
+        for feature in model.feature_engineer.compute_match_features(*pairs[0]):
+            model.m_probs[feature] = DEDUP_M_PROB
+            model.u_probs[feature] = DEDUP_U_PROB
+    
+    def run(latencies):
+        for left, right in pairs:
+            started = time.perf_counter()
+            model.compute_match_score(left, right)
+            latencies.append(time.perf_counter() - started)
+        return len(pairs)
+    
+    return run, None
+
+
+def eligibility_batch(options: Dict[str, Any]) -> Workload:
+    """AI-03: batch eligibility evaluation of all active schemes for N families"""
+    _use_case_path('03_identification_beneficiary', 'src')
+    from evaluator_service import EligibilityEvaluationService
+    
+    service = EligibilityEvaluationService()
+    
+    def run(latencies):
+        result = service.evaluate_batch(max_families=options['items'])
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        return result['families_evaluated']
+    
+    return run, service.close
+
+
+def campaign_planning(options: Dict[str, Any]) -> Workload:
+    """AI-04: eligibility signal intake and campaign policies for every scheme with signals"""
+    _use_case_path('04_intimation_smart_consent_triggering', 'src')
+    from campaign_manager import CampaignManager
+    
+    manager = CampaignManager()
+    schemes = manager.eligibility_db.execute_query("""
+        SELECT DISTINCT scheme_code
+        FROM eligibility.eligibility_snapshots
+        WHERE evaluation_status IN ('RULE_ELIGIBLE', 'POSSIBLE_ELIGIBLE')
+        ORDER BY scheme_code
+    """)['scheme_code'].tolist()
+    
+    def run(latencies):
+        candidates = 0
+        for scheme_code in schemes:
+            started = time.perf_counter()
+            intake = manager.intake_eligibility_signals(scheme_code)
+            manager.apply_campaign_policies(intake, scheme_code)
+            latencies.append(time.perf_counter() - started)
+            candidates += len(intake)
+        return candidates
+    
+    return run, manager.disconnect
+
+
+def form_mapping(options: Dict[str, Any]) -> Workload:
+    """AI-05: map_many over the first N applications"""
+    _use_case_path('05_auto_app_submission_post_consent', 'src')
+    from form_mapper import FormMapper
+    
+    mapper = FormMapper()
+    mapper.connect()
+    applications = _records(mapper.db.execute_query("""
+        SELECT application_id, family_id::text AS family_id, member_id::text AS member_id, scheme_code
+        FROM application.applications
+        ORDER BY application_id
+        LIMIT %(limit)s
+    """, {'limit': options['items']}))
+    
+    def run(latencies):
+        return len(mapper.map_many(applications))
+    
+    return run, mapper.disconnect
+
+
+def decision_evaluation(options: Dict[str, Any]) -> Workload:
+    """AI-06: evaluate_application (rules, risk score, routing) per application"""
+    _use_case_path('06_auto_approval_straight_processing', 'src')
+    from decision_engine import DecisionEngine
+    
+    engine = DecisionEngine()
+    engine.connect()
+    applications = _records(engine.external_dbs['application'].execute_query("""
+        SELECT application_id, family_id::text AS family_id, scheme_code
+        FROM application.applications
+        ORDER BY application_id
+        LIMIT %(limit)s
+    """, {'limit': options['items']}))
+    
+    def run(latencies):
+        for application in applications:
+            started = time.perf_counter()
+            engine.evaluate_application(
+                application['application_id'], application['family_id'], application['scheme_code']
+            )
+            latencies.append(time.perf_counter() - started)
+        return len(applications)
+    
+    return run, engine.disconnect
+
+
+def detection_run(options: Dict[str, Any]) -> Workload:
+    """AI-07: PRIORITY_BATCH detection run over N active beneficiaries"""
+    _use_case_path('07_ineligible_mistargeted_beneficiary_detection', 'src')
+    from services.detection_orchestrator import DetectionOrchestrator
+    
+    orchestrator = DetectionOrchestrator()
+    orchestrator.connect()
+    beneficiary_ids = orchestrator.db.execute_query("""
+        SELECT DISTINCT beneficiary_id
+        FROM profile_360.benefit_history
+        WHERE status = 'ACTIVE'
+        ORDER BY beneficiary_id
+        LIMIT %(limit)s
+    """, {'limit': options['items']})['beneficiary_id'].astype(str).tolist()
+    
+    def run(latencies):
+        if not beneficiary_ids:
+            return 0
+        result = orchestrator.run_detection(
+            run_type='PRIORITY_BATCH', beneficiary_ids=beneficiary_ids, started_by='benchmark'
+        )
+        return result['total_processed']
+    
+    return run, orchestrator.disconnect
+
+
+def forecasting(options: Dict[str, Any]) -> Workload:
+    """AI-10: bulk baseline forecast refresh for N families"""
+    _use_case_path('10_entitlement_benefit_forecast', 'src', 'services')
+    from forecast_orchestrator import ForecastOrchestrator
+    
+    orchestrator = ForecastOrchestrator()
+    orchestrator.connect()
+    family_ids = orchestrator.db.execute_query("""
+        SELECT DISTINCT family_id::text AS family_id
+        FROM golden_records.beneficiaries
+        WHERE is_active = TRUE
+        ORDER BY family_id
+        LIMIT %(limit)s
+    """, {'limit': options['items']})['family_id'].tolist()
+    
+    def run(latencies):
+        if not family_ids:
+            return 0
+        return orchestrator.generate_baseline_forecasts_bulk(family_ids=family_ids)['families']
+    
+    return run, orchestrator.disconnect
+
+
+def nudge_scheduling(options: Dict[str, Any]) -> Workload:
+    """AI-11: schedule_nudges_bulk for one nudge per family"""
+    _use_case_path('11_personalized_communication_nudging', 'src', 'services')
+    _use_case_path('11_personalized_communication_nudging', 'src', 'models')
+    from nudge_orchestrator import NudgeOrchestrator
+    
+    family_ids = _warehouse_query(options, """
+        SELECT DISTINCT family_id
+        FROM golden_records
+        ORDER BY family_id
+        LIMIT %(limit)s
+    """, {'limit': options['items']})['family_id'].astype(str).to_numpy()
+    
+    rng = np.random.default_rng(options['seed'])
+    nudges = pd.DataFrame({
+        'family_id': family_ids,
+        'action_type': np.asarray(NUDGE_ACTION_TYPES, dtype=object)[rng.integers(0, len(NUDGE_ACTION_TYPES), size=len(family_ids))],
+        'urgency': np.asarray(NUDGE_URGENCIES, dtype=object)[rng.choice(len(NUDGE_URGENCIES), size=len(family_ids), p=NUDGE_URGENCY_WEIGHTS)]
+    })
+    
+    orchestrator = NudgeOrchestrator()
+    
+    def run(latencies):
+        return len(orchestrator.schedule_nudges_bulk(nudges, scheduled_by='SYSTEM'))
+    
+    return run, orchestrator.disconnect
+
+
+# Case -> setup function, workload size (items = min(citizens * per_citizen, max_items);
+# per_citizen None means the workload is whatever the source tables hold) and
+# whether a run writes rows (snapshots, mapped fields, decisions, forecasts, nudges)
+CASES: Dict[str, Dict[str, Any]] = {
+    'dedup_pair_scoring': {'setup': dedup_pair_scoring, 'unit': 'pairs', 'per_citizen': 1.0, 'max_items': 20000,
+                           'writes': False},
+    'eligibility_batch': {'setup': eligibility_batch, 'unit': 'families', 'per_citizen': 0.25, 'max_items': 5000,
+                          'writes': True},
+    'campaign_planning': {'setup': campaign_planning, 'unit': 'candidates', 'per_citizen': None, 'max_items': None,
+                          'writes': False},
+    'form_mapping': {'setup': form_mapping, 'unit': 'applications', 'per_citizen': 0.1, 'max_items': 20000,
+                     'writes': True},
+    'decision_evaluation': {'setup': decision_evaluation, 'unit': 'applications', 'per_citizen': 0.1, 'max_items': 2000,
+                            'writes': True},
+    'detection_run': {'setup': detection_run, 'unit': 'beneficiaries', 'per_citizen': 0.1, 'max_items': 5000,
+                      'writes': True},
+    'forecasting': {'setup': forecasting, 'unit': 'families', 'per_citizen': 0.25, 'max_items': 20000,
+                    'writes': True},
+    'nudge_scheduling': {'setup': nudge_scheduling, 'unit': 'nudges', 'per_citizen': 0.25, 'max_items': 50000,
+                         'writes': True},
+}
+
+
+def workload_items(name: str, citizens: int, max_items: Optional[int] = None) -> Optional[int]:
+    """Workload size of a case at the given scale (max_items overrides the case cap)"""
+    spec = CASES[name]
+    if spec['per_citizen'] is None:
+        return None
+    return max(1, min(int(citizens * spec['per_citizen']), max_items or spec['max_items']))
+
+
+def case_repeat(name: str, repeat: Optional[int] = None) -> int:
+    """Timed runs of a case (an explicit repeat overrides the per-case default)"""
+    if repeat is not None:
+        return repeat
+    return DEFAULT_REPEAT_WRITING if CASES[name]['writes'] else DEFAULT_REPEAT
+
+
+def _quiet(verbose: bool, sink):
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(sink)
+
+
+def _percentiles_ms(latencies: List[float]) -> Optional[Dict[str, float]]:
+    if not latencies:
+        return None
+    values = np.percentile(np.asarray(latencies) * 1000.0, [50, 95, 99])
+    return {
+        'p50': round(float(values[0]), 3),
+        'p95': round(float(values[1]), 3),
+        'p99': round(float(values[2]), 3),
+        'max': round(max(latencies) * 1000.0, 3),
+        'samples': len(latencies)
+    }
+
+
+def run_case(name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Set up one case, time case_repeat(name, options['repeat']) runs and summarise them
+    
+    Service output is swallowed unless options['verbose'] is set, so console
+    I/O of per-item progress prints does not dominate the timings.
+    
+    Returns:
+        Result dict (status, items, seconds, throughput, latency_ms, ...)
+    """
+    spec = CASES[name]
+    options = dict(options, items=workload_items(name, options['citizens'], options.get('max_items')))
+    verbose = options.get('verbose', False)
+    sink = open(os.devnull, 'w')
+    
+    started = time.perf_counter()
+    with _quiet(verbose, sink):
+        run, teardown = spec['setup'](options)
+    setup_seconds = time.perf_counter() - started
+    
+    runs = []
+    latencies: List[float] = []
+    try:
+        for _ in range(case_repeat(name, options.get('repeat'))):
+            run_latencies: List[float] = []
+            started = time.perf_counter()
+            with _quiet(verbose, sink):
+                items = run(run_latencies)
+            runs.append((time.perf_counter() - started, items))
+            latencies.extend(run_latencies)
+    finally:
+        if teardown:
+            with _quiet(verbose, sink):
+                teardown()
+        sink.close()
+    
+    seconds = sorted(elapsed for elapsed, _ in runs)
+    median_seconds = float(np.median(seconds))
+    items = int(np.median([count for _, count in runs]))
+    
+    return {
+        'status': 'ok' if items > 0 else 'no_data',
+        'description': spec['setup'].__doc__,
+        'unit': spec['unit'],
+        'workload': options['items'],
+        'items': items,
+        'repeat': len(runs),
+        'writes': spec['writes'],
+        'setup_seconds': round(setup_seconds, 3),
+        'seconds': {
+            'median': round(median_seconds, 4),
+            'min': round(seconds[0], 4),
+            'max': round(seconds[-1], 4)
+        },
+        'throughput': round(items / median_seconds, 2) if median_seconds > 0 else None,
+        'latency_ms': _percentiles_ms(latencies),
+        # ru_maxrss is in KB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    }
@@ -0,0 +1,299 @@
+"""
+Pipeline Benchmarks
+Seeds the warehouse with a synthetic population at a given scale, times the
+use-case hot paths (see cases.py) and compares the results with a stored
+baseline
+
+Usage:
+    python run_benchmarks.py --scale 10k --seed-data
+    python run_benchmarks.py --scale 1m --case form_mapping --case forecasting
+    python run_benchmarks.py --scale 1m --save-baseline
+"""
+
+import sys
+import json
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import yaml
+
+BENCHMARKS_DIR = Path(__file__).parent
+sys.path.append(str(BENCHMARKS_DIR.parent / "shared" / "utils"))
+from db_connector import DBConnector
+from cases import CASES, run_case, workload_items, case_repeat
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+SYNTHETIC_POPULATION_SCRIPT = BENCHMARKS_DIR.parent / "pipelines" / "warehouse" / "data" / "synthetic_population.py"
+
+# The synthetic population lands in smart_warehouse, which 04's config points at
+DEFAULT_CONFIG = BENCHMARKS_DIR.parent / "use-cases" / "04_intimation_smart_consent_triggering" / "config" / "db_config.yaml"
+
+
+def parse_scale(value: str) -> int:
+    """'10k', '1m', '10m' or a plain/suffixed citizen count ('250k', '2500000')"""
+    text = value.strip().lower()
+    if text in SCALES:
+        return SCALES[text]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    try:
+        return int(float(text.rstrip('km')) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid scale: {value}")
+
+
+def load_warehouse_config(config_path: str) -> Dict[str, Any]:
+    """DBConnector keyword arguments from a use case db_config.yaml"""
+    with open(config_path, 'r') as f:
+        db_config = yaml.safe_load(f)['database']
+    return {
+        'host': db_config['host'],
+        'port': db_config['port'],
+        'database': db_config['name'],
+        'user': db_config['user'],
+        'password': db_config['password']
+    }
+
+
+def seed_population(warehouse: Dict[str, Any], citizens: int, seed: int, workers: Optional[int] = None):
+    """
+    Top up the warehouse to `citizens` synthetic citizens
+    
+    Existing rows are kept; only the missing id range is generated, so a 1m
+    run after a 10k run reuses the first 10k citizens.
+    """
+    db = DBConnector(**warehouse)
+    try:
+        db.connect()
+        existing = db.execute_query("SELECT COUNT(*) AS count, COALESCE(MAX(citizen_id), 0) AS max_id FROM citizens")
+    finally:
+        db.disconnect()
+    
+    count, max_id = int(existing['count'].iloc[0]), int(existing['max_id'].iloc[0])
+    if count >= citizens:
+        print(f"✅ Warehouse already holds {count:,} citizens (>= {citizens:,}), skipping seeding")
+        return
+    
+    print(f"\n🔧 Seeding {citizens - count:,} citizens (warehouse has {count:,})...")
+    command = [
+        sys.executable, str(SYNTHETIC_POPULATION_SCRIPT),
+        '--citizens', str(citizens - count),
+        '--first-citizen-id', str(max_id + 1),
+        '--seed', str(seed),
+        '--host', str(warehouse['host']),
+        '--port', str(warehouse['port']),
+        '--database', warehouse['database'],
+        '--user', warehouse['user'],
+        '--password', warehouse['password']
+    ]
+    if workers:
+        command += ['--workers', str(workers)]
+    subprocess.run(command, check=True)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(case_names: List[str], options: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Run each case in its own spawned interpreter; failures are recorded, not raised"""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    
+    for name in case_names:
+        items = workload_items(name, options['citizens'], options.get('max_items'))
+        workload = f"{items:,} {CASES[name]['unit']}" if items else "all available"
+        repeat = case_repeat(name, options['repeat'])
+        print(f"\n⏱️  {name} ({workload}, {repeat} runs)...")
+        if CASES[name]['writes'] and repeat > 1:
+            print("   ⚠️  Case writes rows: runs after the first see the rows of earlier runs")
+        
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                result = executor.submit(run_case, name, options).result()
+            except Exception as e:
+                print(f"   ❌ {type(e).__name__}: {str(e).strip()}")
+                results[name] = {'status': 'error', 'error': f"{type(e).__name__}: {str(e).strip()}"}
+                continue
+        
+        results[name] = result
+        if result['status'] == 'ok':
+            latency = f", p95 {result['latency_ms']['p95']:.1f}ms" if result['latency_ms'] else ""
+            print(f"   ✅ {result['items']:,} {result['unit']} in {result['seconds']['median']:.2f}s "
+                  f"({result['throughput']:,.1f}/s{latency}, peak {result['peak_rss_mb']:.0f} MB)")
+        else:
+            print("   ⚠️  No data to process")
+    
+    return results
+
+
+# Run settings that change what a case measures; results are only compared when they match
+COMPARED_SETTINGS = ['citizens', 'max_items', 'repeat', 'seed']
+
+
+def settings_mismatch(meta: Dict[str, Any], baseline_meta: Dict[str, Any]) -> List[str]:
+    """Descriptions of the run settings that differ from the baseline's"""
+    return [
+        f"{key} {baseline_meta.get(key)} -> {meta.get(key)}"
+        for key in COMPARED_SETTINGS
+        if meta.get(key) != baseline_meta.get(key)
+    ]
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare throughput and p95 latency per case with a baseline run
+    
+    A case regresses when its throughput drops, or its p95 latency grows,
+    by more than `threshold` (a fraction, e.g. 0.1 = 10%). Cases whose
+    workload or number of runs differ from the baseline are not compared.
+    
+    Returns:
+        case -> {status: ok/regression/improvement/not_compared, changes or reason}
+    """
+    comparison = {}
+    
+    for name, result in current['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if result.get('status') != 'ok' or not base or base.get('status') != 'ok':
+            comparison[name] = {'status': 'not_compared'}
+            continue
+        
+        # Cases without a fixed workload process whatever the tables hold
+        keys = ['workload', 'repeat'] + (['items'] if result.get('workload') is None else [])
+        differences = [f"{key} {base.get(key)} -> {result.get(key)}" for key in keys if result.get(key) != base.get(key)]
+        if differences:
+            comparison[name] = {'status': 'not_compared', 'reason': ', '.join(differences)}
+            continue
+        
+        changes = {}
+        if result['throughput'] and base['throughput']:
+            changes['throughput'] = round(result['throughput'] / base['throughput'] - 1.0, 4)
+        if result['latency_ms'] and base['latency_ms'] and base['latency_ms']['p95'] > 0:
+            changes['p95_latency'] = round(result['latency_ms']['p95'] / base['latency_ms']['p95'] - 1.0, 4)
+        
+        regressed = (changes.get('throughput', 0.0) < -threshold or changes.get('p95_latency', 0.0) > threshold)
+        improved = (changes.get('throughput', 0.0) > threshold or changes.get('p95_latency', 0.0) < -threshold)
+        comparison[name] = {
+            'status': 'regression' if regressed else 'improvement' if improved else 'ok',
+            'baseline_throughput': base['throughput'],
+            'changes': changes
+        }
+    
+    return comparison
+
+
+def print_comparison(comparison: Dict[str, Dict[str, Any]]):
+    print("\n📊 Comparison with baseline:")
+    icons = {'ok': '✅', 'improvement': '🚀', 'regression': '❌', 'not_compared': '⚠️ '}
+    for name, entry in comparison.items():
+        changes = entry.get('changes', {})
+        detail = entry.get('reason') or ', '.join(f"{metric} {change:+.1%}" for metric, change in changes.items())
+        print(f"   {icons[entry['status']]} {name:<22} {entry['status']:<13} {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the use-case pipelines at a given data scale')
+    parser.add_argument('--scale', type=parse_scale, default=SCALES['10k'],
+                        help='Citizens in the warehouse: 10k, 1m, 10m or a count (default: 10k)')
+    parser.add_argument('--case', action='append', choices=list(CASES), help='Case to run (repeatable, default: all)')
+    parser.add_argument('--repeat', type=int,
+                        help='Timed runs per case, median is reported (default: 3, 1 for cases that write)')
+    parser.add_argument('--max-items', type=int, help='Cap the workload of every case (overrides the per-case caps)')
+    parser.add_argument('--config', default=str(DEFAULT_CONFIG), help='db_config.yaml of the warehouse database')
+    parser.add_argument('--seed-data', action='store_true', help='Top up the warehouse with synthetic citizens first')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic data / workload seed')
+    parser.add_argument('--workers', type=int, help='Worker processes for seeding')
+    parser.add_argument('--output', help='Result JSON (default: results/<scale>_<timestamp>.json)')
+    parser.add_argument('--baseline', help='Baseline JSON to compare with (default: baselines/<scale>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline for its scale')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Regression threshold as a fraction (default: 0.10)')
+    parser.add_argument('--verbose', action='store_true', help='Show service output during the timed runs')
+    args = parser.parse_args()
+    
+    warehouse = load_warehouse_config(args.config)
+    scale_name = next((name for name, count in SCALES.items() if count == args.scale), str(args.scale))
+    
+    print("=" * 80)
+    print(f"Pipeline Benchmarks: {args.scale:,} citizens ({scale_name})")
+    print("=" * 80)
+    
+    if args.seed_data:
+        seed_population(warehouse, args.scale, args.seed, args.workers)
+    
+    options = {
+        'citizens': args.scale,
+        'repeat': args.repeat,
+        'max_items': args.max_items,
+        'seed': args.seed,
+        'warehouse': warehouse,
+        'verbose': args.verbose
+    }
+    results = run_benchmarks(args.case or list(CASES), options)
+    
+    report = {
+        'meta': {
+            'scale': scale_name,
+            'citizens': args.scale,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': multiprocessing.cpu_count(),
+            'repeat': args.repeat,
+            'max_items': args.max_items,
+            'seed': args.seed
+        },
+        'cases': results
+    }
+    
+    baseline_path = Path(args.baseline) if args.baseline else BENCHMARKS_DIR / "baselines" / f"{scale_name}.json"
+    regressions = []
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+        mismatch = settings_mismatch(report['meta'], baseline['meta'])
+        if mismatch:
+            print(f"\n⚠️  Baseline {baseline_path} was run with different settings ({', '.join(mismatch)}), not comparing")
+        else:
+            report['baseline'] = {'path': str(baseline_path), 'git_commit': baseline['meta'].get('git_commit'),
+                                  'threshold': args.threshold}
+            report['comparison'] = compare_results(report, baseline, args.threshold)
+            print_comparison(report['comparison'])
+            regressions = [name for name, entry in report['comparison'].items() if entry['status'] == 'regression']
+    
+    output_path = Path(args.output) if args.output else (
+        BENCHMARKS_DIR / "results" / f"{scale_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output_paths = [output_path] + ([baseline_path] if args.save_baseline else [])
+    for path in output_paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    print(f"\n✅ Results written to {output_path}")
+    if args.save_baseline:
+        print(f"✅ Baseline stored at {baseline_path}")
+    if regressions:
+        print(f"❌ Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,133 +1,140 @@
 #!/usr/bin/env python3
 """
-Generate 50K citizen-scheme application pairs
+Generate citizen-scheme application pairs
+Applications are generated as NumPy-vectorized chunks for a given array of
+applicant citizen ids (one entry per application)
 """
 
-import random
-from datetime import datetime, timedelta
+import argparse
+from datetime import date
 from pathlib import Path
-import sys
-import os
 
-def generate_application_number(citizen_id, scheme_id, app_date):
-    """Generate unique application number"""
-    date_str = app_date.strftime('%Y%m%d')
-    return f"APP{date_str}{citizen_id:06d}{scheme_id:02d}"
+import numpy as np
+import pandas as pd
 
-def generate_application_data(num_apps, citizen_count, scheme_count):
-    """Generate application data"""
-    applications = []
+from generate_citizens import digits, sql_literal
+
+# Status distribution
+STATUS_WEIGHTS = {
+    'pending': 0.15,
+    'under_review': 0.20,
+    'approved': 0.40,
+    'rejected': 0.15,
+    'disbursed': 0.08,
+    'closed': 0.02
+}
+
+REJECTION_REASONS = [
+    'Income criteria not met',
+    'Age limit exceeded',
+    'Documents incomplete',
+    'Caste category not eligible',
+    'BPL card not available',
+    'Duplicate application',
+    'Invalid documents'
+]
+
+APPLICATION_COLUMNS = [
+    'application_number', 'citizen_id', 'scheme_id', 'application_date',
+    'application_status', 'eligibility_score', 'eligibility_status',
+    'approval_date', 'approved_amount', 'disbursed_amount', 'disbursement_date',
+    'documents_verified', 'documents_count', 'rejection_reason'
+]
+
+def generate_application_chunk(rng, citizen_ids, scheme_count, as_of=None):
+    """
+    Generate one application per entry of citizen_ids as a DataFrame
     
-    # Status distribution
-    status_weights = {
-        'pending': 0.15,
-        'under_review': 0.20,
-        'approved': 0.40,
-        'rejected': 0.15,
-        'disbursed': 0.08,
-        'closed': 0.02
-    }
+    Application numbers embed the citizen id (up to 9 digits) and the
+    citizen's ordinal within the chunk, so they are unique as long as a
+    citizen's applications are generated in the same chunk.
+    """
+    as_of = as_of or date.today()
+    citizen_ids = np.asarray(citizen_ids, dtype=np.int64)
+    n = len(citizen_ids)
     
-    # Date range (last 2 years)
-    start_date = datetime.now() - timedelta(days=730)
+    scheme_id = rng.integers(1, scheme_count + 1, size=n)
     
-    for i in range(1, num_apps + 1):
-        # Random citizen and scheme
-        citizen_id = random.randint(1, citizen_count)
-        scheme_id = random.randint(1, scheme_count)
-        
-        # Application date (weighted towards recent)
-        days_ago = int(random.expovariate(1/100))  # Exponential distribution
-        days_ago = min(days_ago, 730)
-        application_date = (datetime.now() - timedelta(days=days_ago)).date()
-        
-        # Status
-        status = random.choices(
-            list(status_weights.keys()),
-            weights=list(status_weights.values())
-        )[0]
-        
-        # Eligibility score (0-100)
-        # Higher scores for approved applications
-        if status in ['approved', 'disbursed']:
-            eligibility_score = random.uniform(70, 100)
-            eligibility_status = 'eligible'
-        elif status == 'rejected':
-            eligibility_score = random.uniform(0, 50)
-            eligibility_status = 'not_eligible'
-        else:
-            eligibility_score = random.uniform(40, 80)
-            eligibility_status = random.choice(['eligible', 'conditional'])
-        
-        # Application number
-        app_number = generate_application_number(citizen_id, scheme_id, application_date)
-        
-        # Approval and disbursement dates (if approved)
-        approval_date = None
-        disbursed_amount = None
-        disbursement_date = None
-        
-        if status in ['approved', 'disbursed']:
-            days_after = random.randint(5, 90)
-            approval_date = application_date + timedelta(days=days_after)
-            approved_amount = random.uniform(10000, 500000)
-            
-            if status == 'disbursed':
-                days_disburse = random.randint(10, 120)
-                disbursement_date = approval_date + timedelta(days=days_disburse)
-                disbursed_amount = approved_amount * random.uniform(0.8, 1.0)  # 80-100% of approved
-        else:
-            approved_amount = None
-        
-        # Documents
-        documents_verified = status in ['approved', 'disbursed']
-        documents_count = random.randint(2, 8) if documents_verified else random.randint(0, 5)
-        
-        # Rejection reason (if rejected)
-        rejection_reason = None
-        if status == 'rejected':
-            reasons = [
-                'Income criteria not met',
-                'Age limit exceeded',
-                'Documents incomplete',
-                'Caste category not eligible',
-                'BPL card not available',
-                'Duplicate application',
-                'Invalid documents'
-            ]
-            rejection_reason = random.choice(reasons)
-        
-        app = {
-            'application_number': app_number,
-            'citizen_id': citizen_id,
-            'scheme_id': scheme_id,
-            'application_date': application_date,
-            'application_status': status,
-            'eligibility_score': round(eligibility_score, 2),
-            'eligibility_status': eligibility_status,
-            'approval_date': approval_date,
-            'approved_amount': round(approved_amount, 2) if approved_amount else None,
-            'disbursed_amount': round(disbursed_amount, 2) if disbursed_amount else None,
-            'disbursement_date': disbursement_date,
-            'documents_verified': documents_verified,
-            'documents_count': documents_count,
-            'rejection_reason': rejection_reason
-        }
-        
-        applications.append(app)
+    # Application date (weighted towards recent, last 2 years)
+    days_ago = np.minimum(rng.exponential(100, size=n).astype(np.int64), 730)
+    application_date = pd.Timestamp(as_of) - pd.to_timedelta(days_ago, unit='D')
+    
+    # Status
+    statuses = np.array(list(STATUS_WEIGHTS.keys()), dtype=object)
+    status = statuses[rng.choice(len(statuses), size=n, p=list(STATUS_WEIGHTS.values()))]
+    approved = np.isin(status, ['approved', 'disbursed'])
+    rejected = status == 'rejected'
+    disbursed = status == 'disbursed'
+    
+    # Eligibility score (0-100), higher scores for approved applications
+    eligibility_score = np.round(np.select(
+        [approved, rejected],
+        [rng.uniform(70, 100, size=n), rng.uniform(0, 50, size=n)],
+        default=rng.uniform(40, 80, size=n)
+    ), 2)
+    eligibility_status = np.select(
+        [approved, rejected],
+        ['eligible', 'not_eligible'],
+        default=np.where(rng.random(n) < 0.5, 'eligible', 'conditional')
+    ).astype(object)
+    
+    # Approval and disbursement dates (if approved)
+    approval_date = application_date + pd.to_timedelta(rng.integers(5, 91, size=n), unit='D')
+    approved_amount = rng.uniform(10000, 500000, size=n)
+    disbursement_date = approval_date + pd.to_timedelta(rng.integers(10, 121, size=n), unit='D')
+    disbursed_amount = approved_amount * rng.uniform(0.8, 1.0, size=n)  # 80-100% of approved
     
-    return applications
+    # Documents
+    documents_count = np.where(approved, rng.integers(2, 9, size=n), rng.integers(0, 6, size=n))
+    
+    # Rejection reason (if rejected)
+    rejection_reason = np.where(
+        rejected,
+        np.array(REJECTION_REASONS, dtype=object)[rng.integers(0, len(REJECTION_REASONS), size=n)],
+        None
+    )
+    
+    # Application number: date + citizen + scheme + ordinal of the citizen's application
+    ordinal = pd.Series(citizen_ids).groupby(citizen_ids).cumcount().to_numpy()
+    yyyymmdd = application_date.year * 10000 + application_date.month * 100 + application_date.day
+    application_number = np.char.add('APP', digits(yyyymmdd, 8))
+    for part in (digits(citizen_ids, 9), digits(scheme_id, 2), digits(ordinal, 2)):
+        application_number = np.char.add(application_number, part)
+    
+    return pd.DataFrame({
+        'application_number': application_number.astype(object),
+        'citizen_id': citizen_ids,
+        'scheme_id': scheme_id,
+        'application_date': application_date,
+        'application_status': status,
+        'eligibility_score': eligibility_score,
+        'eligibility_status': eligibility_status,
+        'approval_date': approval_date.where(approved),
+        'approved_amount': np.where(approved, np.round(approved_amount, 2), np.nan),
+        'disbursed_amount': np.where(disbursed, np.round(disbursed_amount, 2), np.nan),
+        'disbursement_date': disbursement_date.where(disbursed),
+        'documents_verified': approved,
+        'documents_count': documents_count,
+        'rejection_reason': rejection_reason
+    })
+
+def generate_application_data(num_apps, citizen_count, scheme_count, seed=None):
+    """Generate application data for random citizens"""
+    rng = np.random.default_rng(seed)
+    citizen_ids = np.sort(rng.integers(1, citizen_count + 1, size=num_apps))
+    return generate_application_chunk(rng, citizen_ids, scheme_count)
 
 def write_insert_sql(applications, output_file):
     """Write INSERT statements to SQL file"""
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("-- 50K Citizen-Scheme Application Pairs\n")
+        f.write(f"-- {len(applications)} Citizen-Scheme Application Pairs\n")
         f.write("-- Generated synthetic application data\n\n")
         
         # Batch insert in chunks of 1000
         batch_size = 1000
-        for i in range(0, len(applications), batch_size):
-            batch = applications[i:i+batch_size]
+        frame = applications[APPLICATION_COLUMNS].astype(object).where(applications[APPLICATION_COLUMNS].notna(), None)
+        for i in range(0, len(frame), batch_size):
+            batch = frame.iloc[i:i+batch_size]
             f.write("INSERT INTO applications (\n")
             f.write("    application_number, citizen_id, scheme_id, application_date,\n")
             f.write("    application_status, eligibility_score, eligibility_status,\n")
@@ -135,27 +142,24 @@ def write_insert_sql(applications, output_file):
             f.write("    documents_verified, documents_count, rejection_reason\n")
             f.write(") VALUES\n")
             
-            values = []
-            for a in batch:
-                approval_date_val = f"'{a['approval_date']}'" if a['approval_date'] else 'NULL'
-                approved_amount_val = str(a['approved_amount']) if a['approved_amount'] else 'NULL'
-                disbursed_amount_val = str(a['disbursed_amount']) if a['disbursed_amount'] else 'NULL'
-                disbursement_date_val = f"'{a['disbursement_date']}'" if a['disbursement_date'] else 'NULL'
-                rejection_reason_val = f"'{a['rejection_reason'].replace("'", "''")}'" if a['rejection_reason'] else 'NULL'
-                
-                val = f"('{a['application_number']}', {a['citizen_id']}, {a['scheme_id']}, "
-                val += f"'{a['application_date']}', '{a['application_status']}', {a['eligibility_score']}, "
-                val += f"'{a['eligibility_status']}', {approval_date_val}, {approved_amount_val}, "
-                val += f"{disbursed_amount_val}, {disbursement_date_val}, {str(a['documents_verified']).upper()}, "
-                val += f"{a['documents_count']}, {rejection_reason_val})"
-                values.append(val)
+            values = [
+                '(' + ', '.join(sql_literal(v) for v in row) + ')'
+                for row in batch.itertuples(index=False, name=None)
+            ]
             
             f.write(',\n'.join(values))
             f.write(';\n\n')
 
 def main():
-    print("Generating 50K applications...")
-    applications = generate_application_data(50000, 100000, 12)
+    parser = argparse.ArgumentParser(description='Generate citizen-scheme application pairs')
+    parser.add_argument('--count', type=int, default=50000, help='Applications to generate')
+    parser.add_argument('--citizens', type=int, default=100000, help='Citizen id range (1..N)')
+    parser.add_argument('--schemes', type=int, default=12, help='Scheme id range (1..N)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed = same data)')
+    args = parser.parse_args()
+    
+    print(f"Generating {args.count:,} applications...")
+    applications = generate_application_data(args.count, args.citizens, args.schemes, seed=args.seed)
     
     output_dir = Path(__file__).parent
     sql_file = output_dir / '09_insert_applications.sql'
@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """
-Generate 100K synthetic Rajasthan citizens with realistic distributions
-Generates INSERT statements and CSV files
+Generate synthetic Rajasthan citizens with realistic distributions
+Citizens are generated in NumPy-vectorized chunks, grouped into families
+(head, spouse, children sharing location, caste and income)
+Generates INSERT statements and CSV files; see synthetic_population.py for
+sharded multi-process generation straight into PostgreSQL or Parquet
 """
 
-import random
+import argparse
 import csv
-from datetime import datetime, timedelta
+from datetime import date
 from pathlib import Path
 import sys
 import os
 
+import numpy as np
+import pandas as pd
+
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../../..'))
 
@@ -42,16 +48,9 @@ INCOME_DISTRIBUTION = {
 
 GENDER_DISTRIBUTION = {'Male': 0.52, 'Female': 0.48}
 
-# Age distribution (peak 18-60)
-def generate_age():
-    """Generate age with peak in 18-60 range"""
-    rand = random.random()
-    if rand < 0.05:  # 5% below 18
-        return random.randint(1, 17)
-    elif rand < 0.85:  # 80% between 18-60
-        return random.randint(18, 60)
-    else:  # 15% above 60
-        return random.randint(61, 85)
+# Family size (2-8, average 4)
+FAMILY_SIZES = np.array([2, 3, 4, 5, 6, 7, 8])
+FAMILY_SIZE_WEIGHTS = np.array([5, 10, 30, 25, 15, 10, 5]) / 100.0
 
 # First names (Rajasthani/Hindi)
 MALE_NAMES = [
@@ -72,175 +71,244 @@ LAST_NAMES = [
     'Shekhawat', 'Rathore', 'Chauhan', 'Tanwar', 'Saini', 'Bohra', 'Modi', 'Garg'
 ]
 
-def generate_jan_aadhaar():
-    """Generate 12-digit Jan Aadhaar number"""
-    return ''.join([str(random.randint(0, 9)) for _ in range(12)])
+# These would be loaded from database in real scenario
+# For now, using reasonable defaults
+DEFAULT_DISTRICT_MAP = {'JAI': 17, 'JOD': 19, 'UDAI': 30, 'AJM': 1, 'ALW': 2, 'SIK': 27, 'NAG': 22, 'BHI': 7}
+DEFAULT_CASTE_MAP = {
+    'GEN_RAJPUT': 1, 'GEN_BRAHMIN': 2, 'GEN_JAIN': 3, 'GEN_VAISHYA': 4,
+    'OBC_JAT': 9, 'OBC_GUJJAR': 10, 'OBC_MEENA': 11,
+    'SC_MEGHWAL': 17, 'SC_CHAMAR': 18, 'SC_KOLI': 19,
+    'ST_BHIL': 25, 'ST_MINAS': 26, 'ST_DAMOR': 27
+}
+
+# Map actual district names to codes
+DISTRICT_CODE_MAP = {
+    'Jaipur': 'JAI', 'Jodhpur': 'JOD', 'Udaipur': 'UDAI',
+    'Ajmer': 'AJM', 'Alwar': 'ALW', 'Sikar': 'SIK',
+    'Nagaur': 'NAG', 'Bhilwara': 'BHI'
+}
 
-def generate_date_of_birth(age):
-    """Generate date of birth from age"""
-    today = datetime.now()
-    birth_year = today.year - age
-    birth_date = datetime(birth_year, random.randint(1, 12), random.randint(1, 28))
-    return birth_date.date()
+CITIZEN_COLUMNS = [
+    'jan_aadhaar', 'aadhaar_number', 'first_name', 'middle_name', 'last_name',
+    'date_of_birth', 'gender', 'district_id', 'city_village', 'pincode', 'is_urban',
+    'caste_id', 'family_income', 'family_size', 'education_id', 'employment_id',
+    'bpl_card', 'house_type_id', 'farmer', 'disabled', 'mobile_number', 'status'
+]
 
-def generate_income():
-    """Generate family income based on distribution"""
-    rand = random.random()
-    if rand < 0.60:  # 60% below 2L
-        return random.randint(50000, 200000)
-    elif rand < 0.90:  # 30% between 2L-5L
-        return random.randint(200000, 500000)
-    else:  # 10% above 5L
-        return random.randint(500000, 2000000)
+# Identity numbers are a bijection of citizen_id modulo 10^12 (multipliers are
+# coprime to 10), so they look random but never collide across shards
+JAN_AADHAAR_MULTIPLIER, JAN_AADHAAR_OFFSET = 738226547591, 104729
+AADHAAR_MULTIPLIER, AADHAAR_OFFSET = 582964137083, 611953
 
-def get_district_id(district_name, district_map):
-    """Get district_id from district name"""
-    # Map actual district names to codes
-    district_code_map = {
-        'Jaipur': 'JAI', 'Jodhpur': 'JOD', 'Udaipur': 'UDAI',
-        'Ajmer': 'AJM', 'Alwar': 'ALW', 'Sikar': 'SIK',
-        'Nagaur': 'NAG', 'Bhilwara': 'BHI'
-    }
-    if district_name in district_code_map:
-        return district_map.get(district_code_map[district_name], 1)
-    return random.randint(1, 33)  # Other districts
+def digits(values, width):
+    """Zero-padded decimal strings for non-negative integers below 10^width (vectorized)"""
+    padded = (np.asarray(values, dtype=np.int64) + 10**width).astype(f'U{width + 1}')
+    return np.ascontiguousarray(padded.view('U1').reshape(-1, width + 1)[:, 1:]).view(f'U{width}').ravel()
 
-def get_caste_id(caste_category, caste_map):
-    """Get caste_id based on category"""
-    # Sample a caste from the category
-    category_castes = [c for c, cat in caste_map.items() if cat == caste_category]
-    if category_castes:
-        caste_code = random.choice(category_castes)
-        return caste_map.get(caste_code, 1)
-    return 1
+def _identity_numbers(citizen_ids, multiplier, offset):
+    """12-digit identity numbers derived from citizen ids"""
+    # (id * multiplier) mod 10^12 split in two halves to stay within int64
+    high, low = divmod(multiplier, 10**6)
+    ids = np.asarray(citizen_ids, dtype=np.int64) % 10**12
+    values = (((ids * high) % 10**6) * 10**6 + ids * low + offset) % 10**12
+    return digits(values, 12)
 
-def generate_citizen_data(num_citizens, district_map, caste_map):
-    """Generate citizen data"""
-    citizens = []
+def _choice(rng, values, size, p=None):
+    """rng.choice over a list of strings, returned as an object array"""
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
+
+def generate_family_sizes(rng, num_citizens):
+    """Split num_citizens into consecutive families (the last one may be smaller)"""
+    sizes = rng.choice(FAMILY_SIZES, size=num_citizens // FAMILY_SIZES.min() + 1, p=FAMILY_SIZE_WEIGHTS)
+    ends = np.cumsum(sizes)
+    count = int(np.searchsorted(ends, num_citizens)) + 1
+    sizes = sizes[:count].copy()
+    sizes[-1] -= ends[count - 1] - num_citizens
+    return sizes
+
+def generate_citizen_chunk(rng, first_citizen_id, num_citizens, district_map=None, caste_map=None, as_of=None):
+    """
+    Generate a chunk of citizens as a DataFrame (one row per citizen)
+    
+    Citizens get consecutive ids from first_citizen_id and are grouped into
+    families: member_rank 0 is the head, 1 the spouse, 2+ children. Besides
+    CITIZEN_COLUMNS the frame carries citizen_id, family_head_id, member_rank
+    and age for the derived tables.
+    """
+    district_map = district_map or DEFAULT_DISTRICT_MAP
+    caste_map = caste_map or DEFAULT_CASTE_MAP
+    as_of = as_of or date.today()
+    n = num_citizens
     
-    # District distribution (Jaipur 12%, Jodhpur 8%, etc.)
-    district_weights = list(DISTRICT_DISTRIBUTION.values())
+    citizen_id = np.arange(first_citizen_id, first_citizen_id + n, dtype=np.int64)
+    
+    # Families: consecutive citizens, head first
+    sizes = generate_family_sizes(rng, n)
+    num_families = len(sizes)
+    family_index = np.repeat(np.arange(num_families), sizes)
+    family_start = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    member_rank = np.arange(n) - family_start[family_index]
+    
+    # Family-level attributes: district (Jaipur 12%, Jodhpur 8%, rural 75%), caste (SC/ST 31%), income (60% <2L)
     district_names = list(DISTRICT_DISTRIBUTION.keys())
+    district_pick = rng.choice(len(district_names), size=num_families, p=list(DISTRICT_DISTRIBUTION.values()))
+    district_ids = np.array([
+        district_map.get(DISTRICT_CODE_MAP[name], 1) if name in DISTRICT_CODE_MAP else 0
+        for name in district_names
+    ])
+    family_district = district_ids[district_pick]
+    other = family_district == 0
+    family_district[other] = rng.integers(1, 34, size=int(other.sum()))  # Other districts
+    urban_district = np.isin(district_pick, [district_names.index('Jaipur'), district_names.index('Jodhpur')])
+    family_urban = urban_district & (rng.random(num_families) < 0.4)
     
-    for i in range(1, num_citizens + 1):
-        # Gender
-        gender = random.choices(
-            list(GENDER_DISTRIBUTION.keys()),
-            weights=list(GENDER_DISTRIBUTION.values())
-        )[0]
-        
-        # Name
-        if gender == 'Male':
-            first_name = random.choice(MALE_NAMES)
-        else:
-            first_name = random.choice(FEMALE_NAMES)
-        
-        middle_name = random.choice(MALE_NAMES) if random.random() < 0.3 else None
-        last_name = random.choice(LAST_NAMES)
-        
-        # Age and DOB
-        age = generate_age()
-        date_of_birth = generate_date_of_birth(age)
-        
-        # District (Jaipur 12%, Jodhpur 8%, rural 75%)
-        district_name = random.choices(district_names, weights=district_weights)[0]
-        district_id = get_district_id(district_name, district_map)
-        is_urban = district_name in ['Jaipur', 'Jodhpur'] and random.random() < 0.4
-        
-        # Caste (SC/ST 31%)
-        caste_category = random.choices(
-            list(CASTE_DISTRIBUTION.keys()),
-            weights=list(CASTE_DISTRIBUTION.values())
-        )[0]
-        caste_id = get_caste_id(caste_category, caste_map)
-        
-        # Income (60% <2L)
-        family_income = generate_income()
-        
-        # Education (correlated with age and income)
-        if age < 18:
-            education_id = random.randint(1, 3)  # Primary to Middle
-        elif family_income < 200000:
-            education_id = random.randint(1, 6)  # Illiterate to Diploma
-        else:
-            education_id = random.randint(4, 9)  # Secondary to Technical
-        
-        # Employment
-        if age < 18:
-            employment_id = 8  # Student
-        elif age > 60:
-            employment_id = 10  # Retired
-        elif gender == 'Female' and random.random() < 0.3:
-            employment_id = 9  # Housewife
-        else:
-            if family_income < 200000:
-                employment_id = random.choice([1, 2, 3, 4])  # Unemployed, Casual, Self, Agriculture
-            else:
-                employment_id = random.choice([2, 5, 6, 7])  # Casual, Regular, Govt, Private
-        
-        # Family size (2-8, average 4)
-        family_size = random.choices([2, 3, 4, 5, 6, 7, 8], weights=[5, 10, 30, 25, 15, 10, 5])[0]
-        
-        # BPL (correlated with income - 60% <2L are likely BPL)
-        bpl_card = family_income < 200000 and random.random() < 0.7
-        
-        # House type (correlated with income)
-        if family_income < 150000:
-            house_type_id = random.choice([1, 2])  # Kutcha or Semi-Pucca
-        elif family_income < 300000:
-            house_type_id = random.choice([2, 3])  # Semi-Pucca or Pucca
-        else:
-            house_type_id = 3  # Pucca
-        
-        # Farmer (rural areas more likely)
-        farmer = not is_urban and random.random() < 0.4
-        
-        # Contact
-        mobile_number = ''.join([str(random.randint(6, 9))] + [str(random.randint(0, 9)) for _ in range(9)])
-        
-        # Jan Aadhaar
-        jan_aadhaar = generate_jan_aadhaar()
-        aadhaar = generate_jan_aadhaar() if random.random() < 0.8 else None
-        
-        citizen = {
-            'jan_aadhaar': jan_aadhaar,
-            'aadhaar_number': aadhaar,
-            'first_name': first_name,
-            'middle_name': middle_name,
-            'last_name': last_name,
-            'date_of_birth': date_of_birth,
-            'gender': gender,
-            'district_id': district_id,
-            'city_village': f"{'City' if is_urban else 'Village'} {random.randint(1, 100)}",
-            'pincode': str(random.randint(300000, 349999)),
-            'is_urban': is_urban,
-            'caste_id': caste_id,
-            'family_income': family_income,
-            'family_size': family_size,
-            'education_id': education_id,
-            'employment_id': employment_id,
-            'bpl_card': bpl_card,
-            'house_type_id': house_type_id,
-            'farmer': farmer,
-            'disabled': random.random() < 0.03,  # 3% disabled
-            'mobile_number': mobile_number,
-            'status': 'active'
-        }
-        
-        citizens.append(citizen)
+    # Sample a caste from the category
+    categories = list(CASTE_DISTRIBUTION.keys())
+    category_pick = rng.choice(len(categories), size=num_families, p=list(CASTE_DISTRIBUTION.values()))
+    family_caste = np.ones(num_families, dtype=np.int64)
+    for index, category in enumerate(categories):
+        category_castes = np.array([cid for code, cid in caste_map.items() if code.split('_')[0] == category])
+        mask = category_pick == index
+        if len(category_castes) and mask.any():
+            family_caste[mask] = category_castes[rng.integers(0, len(category_castes), size=int(mask.sum()))]
+    
+    bands = list(INCOME_DISTRIBUTION.values())
+    band_pick = rng.choice(len(bands), size=num_families, p=[b[2] for b in bands])
+    low = np.array([b[0] for b in bands])[band_pick]
+    high = np.array([b[1] for b in bands])[band_pick]
+    family_income = rng.integers(low, high + 1)
+    
+    # BPL (correlated with income - 60% <2L are likely BPL)
+    family_bpl = (family_income < 200000) & (rng.random(num_families) < 0.7)
+    
+    # House type (correlated with income)
+    family_house = np.where(
+        family_income < 150000, rng.integers(1, 3, size=num_families),        # Kutcha or Semi-Pucca
+        np.where(family_income < 300000, rng.integers(2, 4, size=num_families), 3)  # Semi-Pucca/Pucca, Pucca
+    )
+    family_last_name = _choice(rng, LAST_NAMES, num_families)
+    
+    is_urban = family_urban[family_index]
+    income = family_income[family_index]
+    
+    # Gender: head mostly male, spouse opposite to head, children 52/48
+    head_male = rng.random(num_families) < 0.8
+    male = np.where(
+        member_rank == 0, head_male[family_index],
+        np.where(member_rank == 1, ~head_male[family_index], rng.random(n) < GENDER_DISTRIBUTION['Male'])
+    )
+    gender = np.where(male, 'Male', 'Female').astype(object)
+    
+    # Age: adult heads (80% 18-60, rest 61-85), spouses near the head's age, children 18-35 years younger
+    head_age = np.where(
+        rng.random(num_families) < 0.84,
+        rng.integers(18, 61, size=num_families),
+        rng.integers(61, 86, size=num_families)
+    )[family_index]
+    age = np.where(
+        member_rank == 0, head_age,
+        np.where(
+            member_rank == 1,
+            np.clip(head_age + rng.integers(-8, 5, size=n), 18, 90),
+            np.maximum(head_age - rng.integers(18, 36, size=n), 1)
+        )
+    )
+    date_of_birth = pd.to_datetime(pd.DataFrame({
+        'year': as_of.year - age,
+        'month': rng.integers(1, 13, size=n),
+        'day': rng.integers(1, 29, size=n)
+    }))
     
-    return citizens
+    # Name
+    first_name = np.where(male, _choice(rng, MALE_NAMES, n), _choice(rng, FEMALE_NAMES, n))
+    middle_name = np.where(rng.random(n) < 0.3, _choice(rng, MALE_NAMES, n), None)
+    
+    # Education (correlated with age and income)
+    education_id = np.where(
+        age < 18, rng.integers(1, 4, size=n),                                # Primary to Middle
+        np.where(income < 200000, rng.integers(1, 7, size=n), rng.integers(4, 10, size=n))
+    )
+    
+    # Employment: Student, Retired, Housewife, else by income
+    low_income_jobs = np.array([1, 2, 3, 4])   # Unemployed, Casual, Self, Agriculture
+    high_income_jobs = np.array([2, 5, 6, 7])  # Casual, Regular, Govt, Private
+    employment_id = np.select(
+        [age < 18, age > 60, ~male & (rng.random(n) < 0.3), income < 200000],
+        [8, 10, 9, low_income_jobs[rng.integers(0, 4, size=n)]],
+        default=high_income_jobs[rng.integers(0, 4, size=n)]
+    )
+    
+    # Contact
+    mobile_number = digits(rng.integers(6, 10, size=n) * 10**9 + rng.integers(0, 10**9, size=n), 10)
+    aadhaar = pd.Series(_identity_numbers(citizen_id, AADHAAR_MULTIPLIER, AADHAAR_OFFSET)).where(rng.random(n) < 0.8)
+    
+    city_village = (
+        pd.Series(np.where(is_urban, 'City ', 'Village '))
+        + pd.Series(rng.integers(1, 101, size=n)).astype(str)
+    ).to_numpy(dtype=object)
+    
+    return pd.DataFrame({
+        'citizen_id': citizen_id,
+        'family_head_id': citizen_id[family_start][family_index],
+        'member_rank': member_rank,
+        'age': age,
+        'jan_aadhaar': _identity_numbers(citizen_id, JAN_AADHAAR_MULTIPLIER, JAN_AADHAAR_OFFSET),
+        'aadhaar_number': aadhaar,
+        'first_name': first_name,
+        'middle_name': middle_name,
+        'last_name': family_last_name[family_index],
+        'date_of_birth': date_of_birth,
+        'gender': gender,
+        'district_id': family_district[family_index],
+        'city_village': city_village,
+        'pincode': digits(rng.integers(300000, 350000, size=n), 6),
+        'is_urban': is_urban,
+        'caste_id': family_caste[family_index],
+        'family_income': income,
+        'family_size': sizes[family_index],
+        'education_id': education_id,
+        'employment_id': employment_id,
+        'bpl_card': family_bpl[family_index],
+        'house_type_id': family_house[family_index],
+        # Farmer (rural areas more likely)
+        'farmer': ~is_urban & (rng.random(n) < 0.4),
+        'disabled': rng.random(n) < 0.03,  # 3% disabled
+        'mobile_number': mobile_number,
+        'status': 'active'
+    })
+
+def generate_citizen_data(num_citizens, district_map, caste_map, seed=None, chunk_size=100000):
+    """Generate citizen data (chunked, concatenated into one DataFrame)"""
+    rng = np.random.default_rng(seed)
+    chunks = [
+        generate_citizen_chunk(rng, start + 1, min(chunk_size, num_citizens - start), district_map, caste_map)
+        for start in range(0, num_citizens, chunk_size)
+    ]
+    return pd.concat(chunks, ignore_index=True)
+
+def sql_literal(value):
+    """SQL literal for one INSERT value"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return 'NULL'
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value)).upper()
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return str(value)
+    if isinstance(value, pd.Timestamp):
+        value = value.date()
+    return "'" + str(value).replace("'", "''") + "'"
 
 def write_insert_sql(citizens, output_file):
     """Write INSERT statements to SQL file"""
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("-- 100K Synthetic Rajasthan Citizens\n")
+        f.write(f"-- {len(citizens)} Synthetic Rajasthan Citizens\n")
         f.write("-- Generated with realistic distributions\n\n")
         
         # Batch insert in chunks of 1000
         batch_size = 1000
-        for i in range(0, len(citizens), batch_size):
-            batch = citizens[i:i+batch_size]
+        frame = citizens[CITIZEN_COLUMNS]
+        for i in range(0, len(frame), batch_size):
+            batch = frame.iloc[i:i+batch_size]
             f.write("INSERT INTO citizens (\n")
             f.write("    jan_aadhaar, aadhaar_number, first_name, middle_name, last_name,\n")
             f.write("    date_of_birth, gender, district_id, city_village, pincode, is_urban,\n")
@@ -248,50 +316,26 @@ def write_insert_sql(citizens, output_file):
             f.write("    bpl_card, house_type_id, farmer, disabled, mobile_number, status\n")
             f.write(") VALUES\n")
             
-            values = []
-            for c in batch:
-                middle_name_val = f"'{c['middle_name']}'" if c['middle_name'] else 'NULL'
-                aadhaar_val = f"'{c['aadhaar_number']}'" if c['aadhaar_number'] else 'NULL'
-                
-                val = f"('{c['jan_aadhaar']}', {aadhaar_val}, '{c['first_name']}', {middle_name_val}, '{c['last_name']}', "
-                val += f"'{c['date_of_birth']}', '{c['gender']}', {c['district_id']}, '{c['city_village']}', "
-                val += f"'{c['pincode']}', {str(c['is_urban']).upper()}, {c['caste_id']}, {c['family_income']}, "
-                val += f"{c['family_size']}, {c['education_id']}, {c['employment_id']}, {str(c['bpl_card']).upper()}, "
-                val += f"{c['house_type_id']}, {str(c['farmer']).upper()}, {str(c['disabled']).upper()}, "
-                val += f"'{c['mobile_number']}', '{c['status']}')"
-                values.append(val)
+            values = [
+                '(' + ', '.join(sql_literal(v) for v in row) + ')'
+                for row in batch.itertuples(index=False, name=None)
+            ]
             
             f.write(',\n'.join(values))
             f.write(';\n\n')
 
 def write_csv(citizens, output_file):
     """Write citizens to CSV file"""
-    fieldnames = [
-        'jan_aadhaar', 'aadhaar_number', 'first_name', 'middle_name', 'last_name',
-        'date_of_birth', 'gender', 'district_id', 'city_village', 'pincode', 'is_urban',
-        'caste_id', 'family_income', 'family_size', 'education_id', 'employment_id',
-        'bpl_card', 'house_type_id', 'farmer', 'disabled', 'mobile_number', 'status'
-    ]
-    
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for c in citizens:
-            writer.writerow(c)
+    citizens.to_csv(output_file, columns=CITIZEN_COLUMNS, index=False, date_format='%Y-%m-%d', quoting=csv.QUOTE_MINIMAL)
 
 def main():
-    # These would be loaded from database in real scenario
-    # For now, using reasonable defaults
-    district_map = {'JAI': 17, 'JOD': 19, 'UDAI': 30, 'AJM': 1, 'ALW': 2, 'SIK': 27, 'NAG': 22, 'BHI': 7}
-    caste_map = {
-        'GEN_RAJPUT': 1, 'GEN_BRAHMIN': 2, 'GEN_JAIN': 3, 'GEN_VAISHYA': 4,
-        'OBC_JAT': 9, 'OBC_GUJJAR': 10, 'OBC_MEENA': 11,
-        'SC_MEGHWAL': 17, 'SC_CHAMAR': 18, 'SC_KOLI': 19,
-        'ST_BHIL': 25, 'ST_MINAS': 26, 'ST_DAMOR': 27
-    }
+    parser = argparse.ArgumentParser(description='Generate synthetic Rajasthan citizens')
+    parser.add_argument('--count', type=int, default=100000, help='Citizens to generate')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed = same data)')
+    args = parser.parse_args()
     
-    print("Generating 100K synthetic Rajasthan citizens...")
-    citizens = generate_citizen_data(100000, district_map, caste_map)
+    print(f"Generating {args.count:,} synthetic Rajasthan citizens...")
+    citizens = generate_citizen_data(args.count, DEFAULT_DISTRICT_MAP, DEFAULT_CASTE_MAP, seed=args.seed)
     
     output_dir = Path(__file__).parent
     sql_file = output_dir / '08_insert_citizens.sql'
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic population for load testing
+Citizens (grouped into families), golden records, family relationships,
+benefit events and applications are generated in fixed-size shards on worker
+processes and streamed into PostgreSQL with COPY, or written as Parquet/CSV
+part files (one per shard and table)
+
+Every shard has its own seed derived from (seed, shard index), so the output
+does not depend on the number of workers and single shards can be regenerated.
+
+Usage:
+    python3 synthetic_population.py --citizens 10000000 --workers 8
+    python3 synthetic_population.py --citizens 1000000 --output parquet --out-dir /data/synthetic
+"""
+
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from generate_citizens import CITIZEN_COLUMNS, digits, generate_citizen_chunk
+from generate_applications import APPLICATION_COLUMNS, generate_application_chunk
+
+# Tables in load order (foreign keys point to earlier tables) -> COPY columns
+TABLE_COLUMNS = {
+    'citizens': ['citizen_id'] + CITIZEN_COLUMNS,
+    'applications': APPLICATION_COLUMNS,
+    'golden_records': [
+        'gr_id', 'family_id', 'citizen_id', 'jan_aadhaar', 'full_name', 'date_of_birth', 'age',
+        'gender', 'caste_id', 'district_id', 'city_village', 'pincode', 'is_urban', 'status'
+    ],
+    'gr_relationships': [
+        'from_gr_id', 'to_gr_id', 'relationship_type', 'is_verified', 'inference_confidence', 'source'
+    ],
+    'benefit_events': [
+        'gr_id', 'scheme_id', 'family_id', 'txn_date', 'amount', 'transaction_type',
+        'instalment_number', 'channel'
+    ]
+}
+
+# Golden record ids: fixed prefix + 12-digit citizen id (valid, deterministic UUIDs)
+GR_ID_PREFIX = '5a7e0000-0000-4000-8000-'
+
+TRANSACTION_TYPES = ['DISBURSEMENT', 'INSTALMENT']
+TRANSACTION_TYPE_WEIGHTS = [0.7, 0.3]
+CHANNELS = ['BANK_TRANSFER', 'CASH', 'VOUCHER', 'IN_KIND']
+CHANNEL_WEIGHTS = [0.75, 0.10, 0.10, 0.05]
+
+# Set in each worker process by _init_worker
+_worker_connection = None
+
+def plan_shards(num_citizens, shard_size, first_citizen_id=1):
+    """(shard_index, first_citizen_id, count) for each shard"""
+    return [
+        (index, first_citizen_id + start, min(shard_size, num_citizens - start))
+        for index, start in enumerate(range(0, num_citizens, shard_size))
+    ]
+
+def shard_rng(seed, shard_index):
+    """Independent random stream per shard"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index,)))
+
+def gr_ids(citizen_ids):
+    return np.char.add(GR_ID_PREFIX, digits(citizen_ids, 12))
+
+def generate_shard(shard, options):
+    """Generate all tables for one shard as DataFrames"""
+    shard_index, first_citizen_id, count = shard
+    rng = shard_rng(options['seed'], shard_index)
+    as_of = options['as_of']
+    tables = options['tables']
+    
+    citizens = generate_citizen_chunk(rng, first_citizen_id, count, as_of=as_of)
+    n = len(citizens)
+    citizen_ids = citizens['citizen_id'].to_numpy()
+    frames = {}
+    
+    if 'citizens' in tables:
+        frames['citizens'] = citizens
+    
+    # Applications: Poisson number per citizen, kept in this shard so numbers stay unique.
+    # Always generated so the random stream does not depend on --table
+    applicants = np.repeat(citizen_ids, rng.poisson(options['apps_per_citizen'], size=n))
+    applications = generate_application_chunk(rng, applicants, options['scheme_count'], as_of=as_of)
+    if 'applications' in tables:
+        frames['applications'] = applications
+    
+    gr_id = gr_ids(citizen_ids)
+    family_gr_id = gr_ids(citizens['family_head_id'].to_numpy())
+    
+    if 'golden_records' in tables:
+        middle = citizens['middle_name']
+        full_name = citizens['first_name'] + ' ' + (middle + ' ').fillna('') + citizens['last_name']
+        frames['golden_records'] = pd.DataFrame({
+            'gr_id': gr_id,
+            'family_id': family_gr_id,
+            'citizen_id': citizen_ids.astype(str),
+            'jan_aadhaar': citizens['jan_aadhaar'],
+            'full_name': full_name,
+            'date_of_birth': citizens['date_of_birth'],
+            'age': citizens['age'],
+            'gender': citizens['gender'],
+            'caste_id': citizens['caste_id'],
+            'district_id': citizens['district_id'],
+            'city_village': citizens['city_village'],
+            'pincode': citizens['pincode'],
+            'is_urban': citizens['is_urban'],
+            'status': 'active'
+        })
+    
+    if 'gr_relationships' in tables:
+        # Head -> spouse (rank 1) and head -> children (rank 2+)
+        rank = citizens['member_rank'].to_numpy()
+        members = rank > 0
+        frames['gr_relationships'] = pd.DataFrame({
+            'from_gr_id': family_gr_id[members],
+            'to_gr_id': gr_id[members],
+            'relationship_type': np.where(rank[members] == 1, 'SPOUSE', 'CHILD'),
+            'is_verified': True,
+            'inference_confidence': 1.0,
+            'source': 'SYNTHETIC'
+        })
+    
+    if 'benefit_events' in tables:
+        # BPL citizens receive more benefits
+        rates = np.where(citizens['bpl_card'].to_numpy(), options['benefits_per_bpl_citizen'], options['benefits_per_citizen'])
+        owner = np.repeat(np.arange(n), rng.poisson(rates))
+        m = len(owner)
+        transaction_type = np.asarray(TRANSACTION_TYPES, dtype=object)[
+            rng.choice(len(TRANSACTION_TYPES), size=m, p=TRANSACTION_TYPE_WEIGHTS)
+        ]
+        instalment = pd.array(rng.integers(1, 5, size=m), dtype='Int64')
+        instalment[transaction_type != 'INSTALMENT'] = pd.NA
+        frames['benefit_events'] = pd.DataFrame({
+            'gr_id': gr_id[owner],
+            'scheme_id': rng.integers(1, options['scheme_count'] + 1, size=m),
+            'family_id': family_gr_id[owner],
+            'txn_date': pd.Timestamp(as_of) - pd.to_timedelta(rng.integers(0, 730, size=m), unit='D'),
+            'amount': np.round(rng.lognormal(np.log(5000), 0.8, size=m), 2),
+            'transaction_type': transaction_type,
+            'instalment_number': instalment,
+            'channel': np.asarray(CHANNELS, dtype=object)[rng.choice(len(CHANNELS), size=m, p=CHANNEL_WEIGHTS)]
+        })
+    
+    return frames
+
+def _csv_buffer(frame, columns, header=False):
+    buffer = io.StringIO()
+    frame.to_csv(buffer, columns=columns, header=header, index=False, date_format='%Y-%m-%d')
+    buffer.seek(0)
+    return buffer
+
+def copy_frames(connection, frames):
+    """COPY one shard into PostgreSQL in a single transaction"""
+    cursor = connection.cursor()
+    try:
+        for table, columns in TABLE_COLUMNS.items():
+            if table not in frames:
+                continue
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                _csv_buffer(frames[table], columns)
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def write_part_files(out_dir, shard_index, frames, output):
+    """Write one part file per table (<out_dir>/<table>/part-NNNNN.<ext>)"""
+    for table, frame in frames.items():
+        table_dir = Path(out_dir) / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+        path = table_dir / f"part-{shard_index:05d}.{output}"
+        if output == 'parquet':
+            frame[TABLE_COLUMNS[table]].to_parquet(path, index=False)
+        else:
+            path.write_text(_csv_buffer(frame, TABLE_COLUMNS[table], header=True).getvalue(), encoding='utf-8')
+
+def _connect(db_config):
+    import psycopg2
+    return psycopg2.connect(connect_timeout=10, **db_config)
+
+def _init_worker(db_config):
+    """Open one connection per worker process (COPY output)"""
+    global _worker_connection
+    if db_config is not None:
+        _worker_connection = _connect(db_config)
+
+def _run_shard(shard, options):
+    """Generate and write one shard; returns row counts"""
+    started = time.perf_counter()
+    frames = generate_shard(shard, options)
+    generated = time.perf_counter()
+    
+    if options['output'] == 'copy':
+        copy_frames(_worker_connection, frames)
+    else:
+        write_part_files(options['out_dir'], shard[0], frames, options['output'])
+    
+    return {
+        'shard_index': shard[0],
+        'rows': {table: len(frame) for table, frame in frames.items()},
+        'generate_seconds': generated - started,
+        'write_seconds': time.perf_counter() - generated
+    }
+
+def generate_population(args):
+    """Plan shards, run them on a process pool and print throughput"""
+    options = {
+        'seed': args.seed,
+        'as_of': datetime.strptime(args.as_of, '%Y-%m-%d').date() if args.as_of else date.today(),
+        'tables': args.table or list(TABLE_COLUMNS),
+        'scheme_count': args.schemes,
+        'apps_per_citizen': args.apps_per_citizen,
+        'benefits_per_citizen': args.benefits_per_citizen,
+        'benefits_per_bpl_citizen': args.benefits_per_bpl_citizen,
+        'output': args.output,
+        'out_dir': args.out_dir
+    }
+    if args.output == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("❌ Parquet output needs pyarrow (pip install pyarrow)")
+            return
+    
+    db_config = None
+    if args.output == 'copy':
+        db_config = {
+            'host': args.host, 'port': args.port, 'dbname': args.database,
+            'user': args.user, 'password': args.password
+        }
+    
+    shards = plan_shards(args.citizens, args.shard_size, args.first_citizen_id)
+    if args.shard:
+        shards = [shard for shard in shards if shard[0] in set(args.shard)]
+    
+    print("=" * 80)
+    print(f"Generating {sum(s[2] for s in shards):,} citizens in {len(shards)} shards "
+          f"({args.workers} workers, output={args.output}, seed={args.seed}, as_of={options['as_of']})")
+    print("=" * 80)
+    
+    started = time.perf_counter()
+    totals = {table: 0 for table in options['tables']}
+    failed = []
+    
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(db_config,)) as executor:
+        futures = {executor.submit(_run_shard, shard, options): shard for shard in shards}
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ Shard {shard[0]} failed: {e}")
+                failed.append(shard[0])
+                continue
+            
+            for table, rows in result['rows'].items():
+                totals[table] += rows
+            elapsed = time.perf_counter() - started
+            print(f"   Shard {result['shard_index']}: {result['rows'].get('citizens', shard[2]):,} citizens "
+                  f"(generate {result['generate_seconds']:.1f}s, write {result['write_seconds']:.1f}s, "
+                  f"total {totals.get('citizens', 0) / max(elapsed, 1e-9):,.0f} citizens/s)")
+    
+    if args.output == 'copy' and 'citizens' in options['tables'] and not failed:
+        # citizen_id was supplied explicitly; move the BIGSERIAL sequence past it
+        connection = _connect(db_config)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT setval(pg_get_serial_sequence('citizens', 'citizen_id'), (SELECT MAX(citizen_id) FROM citizens));")
+            connection.commit()
+        finally:
+            connection.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Generated in {elapsed:.1f}s")
+    for table, rows in totals.items():
+        print(f"   - {table}: {rows:,}")
+    if failed:
+        print(f"\n⚠️  Failed shards (rerun with --shard): {sorted(failed)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic population for load testing')
+    parser.add_argument('--citizens', type=int, default=100000, help='Citizens to generate')
+    parser.add_argument('--shard-size', type=int, default=100000, help='Citizens per shard (part of the seed plan)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--seed', type=int, default=42, help='Base seed (same seed + shard size = same data)')
+    parser.add_argument('--as-of', help='Reference date for ages and event dates (YYYY-MM-DD, default today)')
+    parser.add_argument('--first-citizen-id', type=int, default=1, help='First citizen_id (append to existing data)')
+    parser.add_argument('--shard', type=int, action='append', help='Only generate these shard indexes (repeatable)')
+    parser.add_argument('--table', action='append', choices=list(TABLE_COLUMNS), help='Tables to write (repeatable, default: all)')
+    parser.add_argument('--output', choices=['copy', 'parquet', 'csv'], default='copy')
+    parser.add_argument('--out-dir', default=str(Path(__file__).parent / 'synthetic'), help='Directory for parquet/csv part files')
+    parser.add_argument('--schemes', type=int, default=12, help='Scheme id range (1..N)')
+    parser.add_argument('--apps-per-citizen', type=float, default=0.5)
+    parser.add_argument('--benefits-per-citizen', type=float, default=0.5)
+    parser.add_argument('--benefits-per-bpl-citizen', type=float, default=2.0)
+    parser.add_argument('--host', default=os.environ.get('DB_HOST', '172.17.16.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('DB_PORT', 5432)))
+    parser.add_argument('--database', default=os.environ.get('DB_NAME', 'smart_warehouse'))
+    parser.add_argument('--user', default=os.environ.get('DB_USER', 'sameer'))
+    parser.add_argument('--password', default=os.environ.get('DB_PASSWORD', 'anjali143'))
+    generate_population(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
+
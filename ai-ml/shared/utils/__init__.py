@@ -2,7 +2,22 @@
 Shared utilities for SMART AI/ML Platform
 """
 
-from .db_connector import DBConnector, query_db
+from .db_connector import DBConnector, query_db, copy_rows
+from .duplicate_index import DuplicateIndex, get_duplicate_index
+from .dashboard_data import DashboardDataSource, get_dashboard_source, conditional_json
+from .stat_rollups import (
+    install_rollups, backfill_rollups, rollup_totals, rollup_ready_metrics, rollup_stats_queries
+)
+from .instrumentation import (
+    enable_instrumentation, disable_instrumentation, span, traced,
+    render_prometheus, start_metrics_server, write_report
+)
 
-__all__ = ['DBConnector', 'query_db']
+__all__ = [
+    'DBConnector', 'query_db', 'copy_rows', 'DuplicateIndex', 'get_duplicate_index',
+    'DashboardDataSource', 'get_dashboard_source', 'conditional_json',
+    'install_rollups', 'backfill_rollups', 'rollup_totals', 'rollup_ready_metrics', 'rollup_stats_queries',
+    'enable_instrumentation', 'disable_instrumentation', 'span', 'traced',
+    'render_prometheus', 'start_metrics_server', 'write_report'
+]
 
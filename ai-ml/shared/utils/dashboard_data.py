@@ -0,0 +1,473 @@
+"""
+Dashboard Data Layer
+Pooled connections, keyset-paginated list queries and TTL-cached statistics
+shared by the Flask web viewers
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Union
+from uuid import UUID
+
+import pandas as pd
+import yaml
+from psycopg2 import pool as pg_pool
+
+try:
+    from .db_connector import DBConnector
+    from .instrumentation import cursor_factory
+except ImportError:
+    from db_connector import DBConnector
+    from instrumentation import cursor_factory
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder for values returned by psycopg2/pandas"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if hasattr(value, 'item'):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key values of the last row of a page as an opaque cursor"""
+    raw = json.dumps(values, default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Decode a cursor produced by encode_cursor (None for an empty cursor)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid page cursor: {e}")
+    if not isinstance(values, list):
+        raise ValueError("Invalid page cursor")
+    return values
+
+
+class StatsSnapshot:
+    """Result of a statistics query at one point in time"""
+    
+    def __init__(self, data: Dict[str, Any], generated_at: datetime, changed_at: datetime):
+        self.data = data
+        self.generated_at = generated_at
+        self.changed_at = changed_at
+        self.etag = hashlib.sha1(
+            json.dumps(data, sort_keys=True, default=_json_default).encode()
+        ).hexdigest()
+        self.refreshed_monotonic = time.monotonic()
+
+
+class PooledConnection(DBConnector):
+    """
+    DBConnector backed by a DashboardDataSource pool
+    
+    connect() checks a connection out of the pool and disconnect() returns
+    it, so existing route code written against DBConnector keeps working.
+    """
+    
+    def __init__(self, source: 'DashboardDataSource'):
+        super().__init__(
+            host=source.db_config['host'],
+            port=source.db_config['port'],
+            database=source.db_config['name'],
+            user=source.db_config['user'],
+            password=source.db_config['password']
+        )
+        self.source = source
+    
+    def connect(self):
+        """Check a connection out of the pool (no-op if already checked out)"""
+        if self.connection is None:
+            self.connection = self.source.getconn()
+        return self.connection
+    
+    def disconnect(self):
+        """Return the connection to the pool"""
+        if self.connection is not None:
+            self.source.putconn(self.connection)
+            self.connection = None
+
+
+class DashboardDataSource:
+    """
+    Read access to one dashboard database
+    
+    Holds a thread-safe connection pool, serves list queries one keyset page
+    at a time and keeps named statistics queries in a snapshot cache that is
+    refreshed in the background once it is older than stats_ttl_seconds.
+    """
+    
+    def __init__(
+        self,
+        db_config: Dict[str, Any],
+        min_connections: int = 1,
+        max_connections: int = 8,
+        stats_ttl_seconds: float = 30.0,
+        page_size: int = 20,
+        max_page_size: int = 200
+    ):
+        """
+        Initialize data source (connections are opened on first use)
+        
+        Args:
+            db_config: 'database' section of a db_config.yaml
+            min_connections: Connections kept open in the pool
+            max_connections: Upper bound on concurrent connections
+            stats_ttl_seconds: Age after which a stats snapshot is refreshed
+            page_size: Default rows per page
+            max_page_size: Largest page a client may request
+        """
+        self.db_config = db_config
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.stats_ttl_seconds = stats_ttl_seconds
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises when exhausted; requests wait for a slot instead
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.checkout_timeout_seconds = 30.0
+        
+        # name -> SQL, name -> fallback SQL, name -> StatsSnapshot
+        self._stats_queries: Dict[str, str] = {}
+        self._stats_fallbacks: Dict[str, str] = {}
+        self._stats_failed: set = set()
+        self._stats: Dict[str, StatsSnapshot] = {}
+        self._stats_refreshing: set = set()
+        self._stats_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop_refresher = threading.Event()
+    
+    @classmethod
+    def from_config_file(cls, config_path: Union[str, Path], **kwargs) -> 'DashboardDataSource':
+        """Create a data source from a db_config.yaml"""
+        with open(config_path, 'r') as f:
+            db_config = yaml.safe_load(f)['database']
+        return cls(db_config, **kwargs)
+    
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+    
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = pg_pool.ThreadedConnectionPool(
+                        self.min_connections,
+                        self.max_connections,
+                        host=self.db_config['host'],
+                        port=self.db_config['port'],
+                        database=self.db_config['name'],
+                        user=self.db_config['user'],
+                        password=self.db_config['password'],
+                        connect_timeout=10,
+                        cursor_factory=cursor_factory()
+                    )
+                    print(f"✅ Connection pool ready: {self.db_config['host']}:{self.db_config['port']}/"
+                          f"{self.db_config['name']} (max {self.max_connections})")
+        return self._pool
+    
+    def getconn(self):
+        """Check out a live connection (waits while all connections are in use)"""
+        if not self._slots.acquire(timeout=self.checkout_timeout_seconds):
+            raise TimeoutError(f"No pooled connection available after {self.checkout_timeout_seconds}s")
+        try:
+            db_pool = self._get_pool()
+            conn = db_pool.getconn()
+            if conn.closed:
+                db_pool.putconn(conn, close=True)
+                conn = db_pool.getconn()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def putconn(self, conn, broken: bool = False):
+        """Return a connection (open transactions are rolled back by the pool)"""
+        try:
+            if self._pool is None:
+                conn.close()
+            else:
+                self._pool.putconn(conn, close=broken or bool(conn.closed))
+        finally:
+            self._slots.release()
+    
+    @contextmanager
+    def connection(self):
+        """Pooled connection for the duration of a with-block"""
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = bool(conn.closed)
+            raise
+        finally:
+            self.putconn(conn, broken=broken)
+    
+    def checkout(self) -> PooledConnection:
+        """DBConnector-compatible handle on a pooled connection (already connected)"""
+        db = PooledConnection(self)
+        db.connect()
+        return db
+    
+    def query(self, sql: str, params: Optional[Union[Dict, Tuple, List]] = None) -> List[Dict[str, Any]]:
+        """Run a query and return rows as dicts"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+    
+    def query_df(self, sql: str, params: Optional[Union[Dict, Tuple, List]] = None) -> pd.DataFrame:
+        """Run a query and return a DataFrame (same coercion as pd.read_sql)"""
+        with self.connection() as conn:
+            return pd.read_sql(sql, conn, params=params)
+    
+    def close(self):
+        """Stop the stats refresher and close all pooled connections"""
+        self._stop_refresher.set()
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+    
+    # ------------------------------------------------------------------
+    # Keyset pagination
+    # ------------------------------------------------------------------
+    
+    def page(
+        self,
+        sql: str,
+        order_by: List[Tuple[str, str]],
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        params: Optional[List[Any]] = None,
+        as_frame: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of a list query
+        
+        The query is wrapped as a subquery, so order_by names its output
+        columns. The last order_by column must be unique and all of them
+        non-null (COALESCE nullable sort columns in the query).
+        
+        Args:
+            sql: SELECT without ORDER BY/LIMIT (positional %s params only)
+            order_by: [(column, 'ASC' | 'DESC'), ...]
+            cursor: next_cursor of the previous page
+            limit: Rows per page (capped at max_page_size)
+            params: Parameters of sql
+            as_frame: Return items as a DataFrame instead of a list of dicts
+        
+        Returns:
+            {'items', 'next_cursor', 'limit'}
+        """
+        limit = max(1, min(int(limit or self.page_size), self.max_page_size))
+        after = decode_cursor(cursor)
+        if after is not None and len(after) != len(order_by):
+            raise ValueError("Page cursor does not match the sort order")
+        
+        where, where_params = ('', [])
+        if after is not None:
+            where, where_params = self._keyset_condition(order_by, after)
+        
+        order = ', '.join(f"page.{column} {direction.upper()}" for column, direction in order_by)
+        paged_sql = f"SELECT * FROM ({sql}) AS page {where} ORDER BY {order} LIMIT %s"
+        paged_params = list(params or []) + where_params + [limit + 1]
+        
+        if as_frame:
+            items = self.query_df(paged_sql, paged_params)
+            has_more = len(items) > limit
+            items = items.iloc[:limit]
+            last = items.iloc[-1].to_dict() if has_more else None
+        else:
+            items = self.query(paged_sql, paged_params)
+            has_more = len(items) > limit
+            items = items[:limit]
+            last = items[-1] if has_more else None
+        
+        next_cursor = encode_cursor([last[column] for column, _ in order_by]) if last is not None else None
+        return {'items': items, 'next_cursor': next_cursor, 'limit': limit}
+    
+    @staticmethod
+    def _keyset_condition(order_by: List[Tuple[str, str]], after: List[Any]) -> Tuple[str, List[Any]]:
+        """WHERE clause selecting rows after the cursor position"""
+        directions = {direction.upper() for _, direction in order_by}
+        columns = [f"page.{column}" for column, _ in order_by]
+        
+        if len(directions) == 1:
+            # Row comparison lets PostgreSQL use a matching composite index
+            op = '<' if directions == {'DESC'} else '>'
+            placeholders = ', '.join(['%s'] * len(after))
+            return f"WHERE ({', '.join(columns)}) {op} ({placeholders})", list(after)
+        
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        clauses, values = [], []
+        for i, (_, direction) in enumerate(order_by):
+            op = '<' if direction.upper() == 'DESC' else '>'
+            parts = [f"{columns[j]} = %s" for j in range(i)] + [f"{columns[i]} {op} %s"]
+            clauses.append(f"({' AND '.join(parts)})")
+            values.extend(after[:i + 1])
+        return f"WHERE {' OR '.join(clauses)}", values
+    
+    # ------------------------------------------------------------------
+    # Cached statistics
+    # ------------------------------------------------------------------
+    
+    def get_stats(self, name: str, sql: Optional[str] = None, fallback_sql: Optional[str] = None) -> StatsSnapshot:
+        """
+        Get a statistics snapshot (single-row query)
+        
+        The first call runs the query; later calls return the cached snapshot
+        and, once it is older than stats_ttl_seconds, refresh it in a
+        background thread instead of making the request wait.
+        
+        Args:
+            name: Snapshot name
+            sql: Query registered under name on first use
+            fallback_sql: Query used while sql fails (e.g. rollup tables not installed yet)
+        """
+        with self._stats_lock:
+            if sql is not None:
+                self._stats_queries.setdefault(name, sql)
+            if fallback_sql is not None:
+                self._stats_fallbacks.setdefault(name, fallback_sql)
+            snapshot = self._stats.get(name)
+        
+        if snapshot is None:
+            return self.refresh_stats(name)
+        
+        if time.monotonic() - snapshot.refreshed_monotonic >= self.stats_ttl_seconds:
+            self._refresh_stats_async(name)
+        return snapshot
+    
+    def refresh_stats(self, name: str) -> StatsSnapshot:
+        """Run a registered statistics query and replace its snapshot"""
+        try:
+            rows = self.query(self._stats_queries[name])
+            self._stats_failed.discard(name)
+        except Exception as e:
+            fallback = self._stats_fallbacks.get(name)
+            if fallback is None:
+                raise
+            # Warn once per outage; the primary query is retried on every refresh
+            if name not in self._stats_failed:
+                print(f"⚠️  Stats query '{name}' failed, using fallback: {e}")
+                self._stats_failed.add(name)
+            rows = self.query(fallback)
+        data = {
+            key: (float(value) if isinstance(value, Decimal) else value)
+            for key, value in (rows[0] if rows else {}).items()
+        }
+        now = datetime.now()
+        
+        with self._stats_lock:
+            previous = self._stats.get(name)
+            snapshot = StatsSnapshot(data, now, now)
+            if previous is not None and previous.etag == snapshot.etag:
+                snapshot.changed_at = previous.changed_at
+            self._stats[name] = snapshot
+        return snapshot
+    
+    def _refresh_stats_async(self, name: str):
+        with self._stats_lock:
+            if name in self._stats_refreshing:
+                return
+            self._stats_refreshing.add(name)
+        
+        def run():
+            try:
+                self.refresh_stats(name)
+            except Exception as e:
+                print(f"⚠️  Error refreshing dashboard stats '{name}': {e}")
+            finally:
+                with self._stats_lock:
+                    self._stats_refreshing.discard(name)
+        
+        threading.Thread(target=run, name=f"stats-refresh-{name}", daemon=True).start()
+    
+    def start_stats_refresher(self):
+        """Refresh every registered snapshot each stats_ttl_seconds in a daemon thread"""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop_refresher.clear()
+        
+        def run():
+            while not self._stop_refresher.wait(self.stats_ttl_seconds):
+                with self._stats_lock:
+                    names = list(self._stats_queries)
+                for name in names:
+                    try:
+                        self.refresh_stats(name)
+                    except Exception as e:
+                        print(f"⚠️  Error refreshing dashboard stats '{name}': {e}")
+        
+        self._refresher = threading.Thread(target=run, name="stats-refresher", daemon=True)
+        self._refresher.start()
+
+
+_sources: Dict[Tuple, DashboardDataSource] = {}
+_sources_lock = threading.Lock()
+
+
+def get_dashboard_source(config_path: Union[str, Path], **kwargs) -> DashboardDataSource:
+    """
+    Get the process-wide data source for a db_config.yaml
+    
+    Config files pointing at the same database share one source (and pool);
+    kwargs only apply when the source is created.
+    """
+    with open(config_path, 'r') as f:
+        db_config = yaml.safe_load(f)['database']
+    key = (db_config['host'], db_config['port'], db_config['name'], db_config['user'])
+    
+    with _sources_lock:
+        source = _sources.get(key)
+        if source is None:
+            source = DashboardDataSource(db_config, **kwargs)
+            _sources[key] = source
+    return source
+
+
+def all_dashboard_sources() -> List[DashboardDataSource]:
+    """Data sources created so far"""
+    with _sources_lock:
+        return list(_sources.values())
+
+
+def conditional_json(data: Any, etag: str, last_modified: Optional[datetime] = None, max_age: int = 0):
+    """
+    Flask JSON response with ETag/Last-Modified that answers matching
+    If-None-Match / If-Modified-Since requests with 304 Not Modified
+    """
+    from flask import jsonify, request
+    
+    response = jsonify(data)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
@@ -3,11 +3,17 @@ Database Connector for SMART Platform
 Connects to PostgreSQL database using psycopg2 and pandas
 """
 
+import io
 import psycopg2
 import pandas as pd
 from typing import Optional, Dict, Any
 import os
 
+try:
+    from .instrumentation import cursor_factory
+except ImportError:
+    from instrumentation import cursor_factory
+
 
 class DBConnector:
     """PostgreSQL database connector with pandas integration"""
@@ -46,7 +52,8 @@ class DBConnector:
                 database=self.database,
                 user=self.user,
                 password=self.password,
-                connect_timeout=10
+                connect_timeout=10,
+                cursor_factory=cursor_factory()
             )
             print(f"✅ Connected to PostgreSQL: {self.host}:{self.port}/{self.database}")
             return self.connection
@@ -172,3 +179,23 @@ def query_db(query: str, host: str = "172.17.16.1", **kwargs) -> pd.DataFrame:
     with DBConnector(host=host, **kwargs) as db:
         return db.execute_query(query)
 
+
+def copy_rows(cursor, table: str, rows: pd.DataFrame):
+    """
+    Stream a DataFrame into a table with COPY
+    
+    Rows are sent as CSV in column order; empty unquoted values load as NULL.
+    
+    Args:
+        cursor: psycopg2 cursor of the writing transaction
+        table: Target table (schema-qualified)
+        rows: DataFrame whose columns match the target columns
+    """
+    buffer = io.StringIO()
+    rows.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(rows.columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
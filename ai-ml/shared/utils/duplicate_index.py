@@ -0,0 +1,692 @@
+"""
+Duplicate Index
+In-memory hash index from normalized bank account, mobile and Aadhaar numbers
+(and family/scheme pairs) to applications, for O(1) duplicate checks
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Callable
+
+import numpy as np
+
+
+class DuplicateIndex:
+    """
+    Hash index over application identifiers
+    
+    Identifiers are normalized and stored as keyed 64-bit BLAKE2b hashes, so
+    neither memory nor on-disk snapshots hold raw Aadhaar/account numbers.
+    The index is built from one bulk scan of application.applications and
+    application.application_fields and kept current by refresh(), which
+    re-indexes applications named in application.application_events (or
+    updated) since the last scan. ensure_current() refreshes at most once per
+    interval, so lookups lag the database by at most that interval.
+    
+    A snapshot saved with save() can be loaded memory-mapped: lookups then
+    binary-search the mapped arrays and only applications changed since the
+    snapshot are held in Python dicts.
+    """
+    
+    # Index kinds and the application field each is read from
+    IDENTIFIER_FIELDS = {
+        'bank_account': 'bank_account_number',
+        'mobile': 'mobile_number',
+        'aadhaar': 'aadhaar_number'
+    }
+    KINDS = ('bank_account', 'mobile', 'aadhaar', 'family_scheme')
+    
+    SNAPSHOT_ARRAYS = (
+        'keys', 'key_apps', 'key_kinds',
+        'app_ids', 'app_family', 'app_scheme', 'app_status', 'families'
+    )
+    
+    # Wait before retrying a failed background build
+    BUILD_RETRY_SECONDS = 60
+    
+    def __init__(self, hash_key: Optional[str] = None):
+        """
+        Initialize empty duplicate index
+        
+        Args:
+            hash_key: Optional secret for keyed hashing of identifiers
+        """
+        self.hash_key = (hash_key or '').encode()[:64]
+        
+        # key -> application IDs (delta over the snapshot, or everything when no snapshot)
+        self._by_key: Dict[int, set] = {}
+        self._key_kinds: Dict[int, int] = {}
+        # application_id -> (family_id, scheme_code, status, keys); None = removed
+        self._applications: Dict[int, Optional[Tuple[str, str, str, Tuple[int, ...]]]] = {}
+        self._base: Optional[Dict[str, Any]] = None
+        
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self._build_failed_at: Optional[float] = None
+        self.last_event_id = 0
+        self.last_updated_at = None
+        self.built_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+    
+    @staticmethod
+    def normalize(kind: str, value: Any) -> Optional[str]:
+        """Normalize an identifier value (None if it is empty or malformed)"""
+        if value is None:
+            return None
+        
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip()
+        
+        if kind == 'bank_account':
+            text = re.sub(r'[^0-9A-Za-z]', '', text).upper()
+            return text or None
+        
+        if kind == 'mobile':
+            digits = re.sub(r'\D', '', text)
+            if len(digits) > 10 and (digits.startswith('91') or digits.startswith('0')):
+                digits = digits[-10:]
+            return digits if len(digits) == 10 else None
+        
+        if kind == 'aadhaar':
+            digits = re.sub(r'\D', '', text)
+            return digits if len(digits) == 12 else None
+        
+        if kind == 'family_scheme':
+            return text or None
+        
+        raise ValueError(f"Unknown identifier kind: {kind}")
+    
+    def key(self, kind: str, value: Any) -> Optional[int]:
+        """Hash key for an identifier (None if the value does not normalize)"""
+        normalized = self.normalize(kind, value)
+        if normalized is None:
+            return None
+        digest = hashlib.blake2b(
+            f"{kind}:{normalized}".encode(),
+            digest_size=8,
+            key=self.hash_key
+        ).digest()
+        return int.from_bytes(digest, 'little')
+    
+    def family_scheme_key(self, family_id: Any, scheme_code: str) -> Optional[int]:
+        """Hash key for a (family, scheme) pair"""
+        return self.key('family_scheme', f"{family_id}|{scheme_code}")
+    
+    def add_application(
+        self,
+        application_id: int,
+        family_id: Any,
+        scheme_code: str,
+        status: str,
+        identifiers: Dict[str, Any]
+    ):
+        """
+        Index (or re-index) an application
+        
+        Args:
+            identifiers: Raw identifier values keyed by kind
+                ('bank_account', 'mobile', 'aadhaar')
+        """
+        family_id = str(family_id)
+        keyed = [(self.KINDS.index('family_scheme'), self.family_scheme_key(family_id, scheme_code))]
+        for kind in self.IDENTIFIER_FIELDS:
+            keyed.append((self.KINDS.index(kind), self.key(kind, identifiers.get(kind))))
+        keyed = [(kind_code, key) for kind_code, key in keyed if key is not None]
+        
+        with self._lock:
+            self._unlink(application_id)
+            for kind_code, key in keyed:
+                self._by_key.setdefault(key, set()).add(application_id)
+                self._key_kinds[key] = kind_code
+            self._applications[application_id] = (
+                family_id, scheme_code, status, tuple(key for _, key in keyed)
+            )
+    
+    def remove_application(self, application_id: int):
+        """Drop an application from the index"""
+        with self._lock:
+            self._unlink(application_id)
+            if self._base is not None:
+                self._applications[application_id] = None  # Shadow snapshot entry
+            else:
+                self._applications.pop(application_id, None)
+    
+    def _unlink(self, application_id: int):
+        """Remove an application's in-memory keys"""
+        record = self._applications.get(application_id)
+        if not record:
+            return
+        for key in record[3]:
+            application_ids = self._by_key.get(key)
+            if application_ids is not None:
+                application_ids.discard(application_id)
+                if not application_ids:
+                    del self._by_key[key]
+                    self._key_kinds.pop(key, None)
+    
+    def find(
+        self,
+        kind: str,
+        value: Any,
+        statuses: Optional[Iterable[str]] = None,
+        exclude_application_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find applications sharing an identifier
+        
+        Args:
+            kind: 'bank_account', 'mobile' or 'aadhaar'
+            value: Raw identifier value (normalized here)
+            statuses: Only return applications in these statuses
+            exclude_application_id: Application being checked
+        
+        Returns:
+            List of dicts with application_id, family_id, scheme_code and status
+        """
+        return self._find_key(self.key(kind, value), statuses, exclude_application_id)
+    
+    def find_family_scheme(
+        self,
+        family_id: Any,
+        scheme_code: str,
+        statuses: Optional[Iterable[str]] = None,
+        exclude_application_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find other applications of a family for the same scheme (see find())"""
+        return self._find_key(
+            self.family_scheme_key(family_id, scheme_code), statuses, exclude_application_id
+        )
+    
+    def _find_key(
+        self,
+        key: Optional[int],
+        statuses: Optional[Iterable[str]],
+        exclude_application_id: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Resolve a key to application records, applying filters"""
+        if key is None:
+            return []
+        
+        statuses = set(statuses) if statuses is not None else None
+        return self._match_key(key, statuses, exclude_application_id)
+    
+    def _match_key(
+        self,
+        key: int,
+        statuses: Optional[set],
+        exclude_application_id: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Application records holding a key, applying filters"""
+        matches = []
+        for application_id, (family_id, scheme_code, status) in self._resolve(key):
+            if application_id == exclude_application_id:
+                continue
+            if statuses is not None and status not in statuses:
+                continue
+            matches.append({
+                'application_id': application_id,
+                'family_id': family_id,
+                'scheme_code': scheme_code,
+                'status': status
+            })
+        return matches
+    
+    def _resolve(self, key: int) -> List[Tuple[int, Tuple[str, str, str]]]:
+        """Applications holding a key, merging snapshot and in-memory entries"""
+        resolved = []
+        
+        with self._lock:
+            for application_id in self._by_key.get(key, ()):
+                family_id, scheme_code, status, _ = self._applications[application_id]
+                resolved.append((application_id, (family_id, scheme_code, status)))
+            
+            base = self._base
+            if base is not None:
+                key_u64 = np.uint64(key)
+                lo = np.searchsorted(base['keys'], key_u64, side='left')
+                hi = np.searchsorted(base['keys'], key_u64, side='right')
+                for application_id in base['key_apps'][lo:hi].tolist():
+                    if application_id in self._applications:
+                        continue  # Changed (or removed) since the snapshot
+                    resolved.append((application_id, self._base_record(application_id)))
+        
+        return resolved
+    
+    def _base_record(self, application_id: int) -> Tuple[str, str, str]:
+        """Family, scheme and status of a snapshot application"""
+        base = self._base
+        i = int(np.searchsorted(base['app_ids'], application_id))
+        return (
+            str(base['families'][base['app_family'][i]]),
+            base['schemes'][base['app_scheme'][i]],
+            base['statuses'][base['app_status'][i]]
+        )
+    
+    def sweep(
+        self,
+        kinds: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None,
+        min_families: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Cross-application fraud sweep: identifiers shared across families
+        
+        Args:
+            kinds: Identifier kinds to sweep (default: bank_account, mobile, aadhaar)
+            statuses: Only count applications in these statuses
+            min_families: Minimum number of distinct families sharing an identifier
+        
+        Returns:
+            List of dicts with kind, identifier_hash, application_ids and family_ids,
+            largest groups first
+        """
+        kind_codes = {self.KINDS.index(kind) for kind in (kinds or self.IDENTIFIER_FIELDS)}
+        statuses = set(statuses) if statuses is not None else None
+        
+        with self._lock:
+            candidates = {key: kind for key, kind in self._key_kinds.items() if kind in kind_codes}
+            base = self._base
+            if base is not None:
+                keys, first, counts = np.unique(base['keys'], return_index=True, return_counts=True)
+                kinds_of_keys = base['key_kinds'][first]
+                mask = (counts > 1) & np.isin(kinds_of_keys, list(kind_codes))
+                for key, kind in zip(keys[mask].tolist(), kinds_of_keys[mask].tolist()):
+                    candidates.setdefault(key, kind)
+        
+        groups = []
+        for key, kind_code in candidates.items():
+            records = [
+                (application_id, family_id)
+                for application_id, (family_id, _, status) in self._resolve(key)
+                if statuses is None or status in statuses
+            ]
+            family_ids = sorted({family_id for _, family_id in records})
+            if len(family_ids) >= min_families:
+                groups.append({
+                    'kind': self.KINDS[kind_code],
+                    'identifier_hash': f"{key:016x}",
+                    'application_ids': sorted(application_id for application_id, _ in records),
+                    'family_ids': family_ids
+                })
+        
+        groups.sort(key=lambda group: len(group['family_ids']), reverse=True)
+        return groups
+    
+    def __len__(self) -> int:
+        with self._lock:
+            live = sum(1 for record in self._applications.values() if record is not None)
+            if self._base is None:
+                return live
+            shadowed = int(np.isin(
+                self._base['app_ids'],
+                np.fromiter(self._applications.keys(), dtype=np.int64, count=len(self._applications))
+            ).sum())
+            return len(self._base['app_ids']) - shadowed + live
+    
+    def stats(self) -> Dict[str, Any]:
+        """Index size and freshness"""
+        return {
+            'applications': len(self),
+            'in_memory_keys': len(self._by_key),
+            'snapshot_keys': len(self._base['keys']) if self._base is not None else 0,
+            'last_event_id': self.last_event_id,
+            'built_at': self.built_at,
+            'refreshed_at': self.refreshed_at
+        }
+    
+    def build(self, db_connection, batch_size: int = 50000) -> int:
+        """
+        Build the index from a bulk scan of the application tables
+        
+        Args:
+            db_connection: psycopg2 connection to the application database
+            batch_size: Rows fetched per round-trip from the server-side cursor
+        
+        Returns:
+            Number of applications indexed
+        """
+        started = time.monotonic()
+        last_event_id, last_updated_at = self._load_watermarks(db_connection)
+        
+        with self._lock:
+            self._by_key.clear()
+            self._key_kinds.clear()
+            self._applications.clear()
+            self._base = None
+        
+        cursor = db_connection.cursor(name='duplicate_index_scan')
+        cursor.itersize = batch_size
+        cursor.execute(self._application_query(), [None, None])
+        
+        count = 0
+        for row in cursor:
+            self._add_row(row)
+            count += 1
+        cursor.close()
+        db_connection.commit()
+        
+        self.last_event_id = last_event_id
+        self.last_updated_at = last_updated_at
+        self.built_at = self.refreshed_at = time.monotonic()
+        
+        print(f"✅ Duplicate index built: {count} applications in {time.monotonic() - started:.2f}s")
+        return count
+    
+    def refresh(self, db_connection) -> int:
+        """
+        Re-index applications with new events or updates since the last build/refresh
+        
+        Returns:
+            Number of applications re-indexed
+        """
+        last_event_id, last_updated_at = self._load_watermarks(db_connection)
+        
+        cursor = db_connection.cursor()
+        cursor.execute("""
+            SELECT application_id
+            FROM application.application_events
+            WHERE event_id > %s
+                AND application_id IS NOT NULL
+            UNION
+            SELECT application_id
+            FROM application.applications
+            WHERE %s::timestamp IS NOT NULL
+                AND updated_at >= %s
+        """, [self.last_event_id, self.last_updated_at, self.last_updated_at])
+        application_ids = [row[0] for row in cursor.fetchall()]
+        
+        if application_ids:
+            cursor.execute(self._application_query(), [application_ids, application_ids])
+            rows = cursor.fetchall()
+            found = set()
+            for row in rows:
+                self._add_row(row)
+                found.add(row[0])
+            for application_id in set(application_ids) - found:
+                self.remove_application(application_id)
+        
+        cursor.close()
+        db_connection.commit()
+        
+        self.last_event_id = last_event_id
+        self.last_updated_at = last_updated_at
+        self.refreshed_at = time.monotonic()
+        return len(application_ids)
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built or loaded"""
+        return self.built_at is not None
+    
+    def start_background_build(
+        self,
+        connect: Callable[[], Any],
+        snapshot_path: Optional[str] = None
+    ) -> bool:
+        """
+        Build (or load the snapshot) on a background thread
+        
+        Args:
+            connect: Returns a new psycopg2 connection to the application
+                database; the build uses (and closes) its own connection so
+                the caller's connection stays free for requests
+            snapshot_path: Optional snapshot directory to load instead of a full scan
+        
+        Returns:
+            False if the index is already built, a build is running or the
+            last build failed less than BUILD_RETRY_SECONDS ago
+        """
+        with self._build_lock:
+            if self.ready or (self._build_thread is not None and self._build_thread.is_alive()):
+                return False
+            if self._build_failed_at is not None and \
+                    time.monotonic() - self._build_failed_at < self.BUILD_RETRY_SECONDS:
+                return False
+            self._build_thread = threading.Thread(
+                target=self._background_build,
+                args=(connect, snapshot_path),
+                name='duplicate-index-build',
+                daemon=True
+            )
+            self._build_thread.start()
+        print("🔧 Building duplicate index in the background...")
+        return True
+    
+    def _background_build(self, connect: Callable[[], Any], snapshot_path: Optional[str]):
+        connection = None
+        try:
+            connection = connect()
+            with self._refresh_lock:
+                self._initialize(connection, snapshot_path)
+        except Exception as e:
+            self._build_failed_at = time.monotonic()
+            print(f"⚠️  Duplicate index build failed (retrying in {self.BUILD_RETRY_SECONDS}s): {e}")
+        finally:
+            if connection is not None:
+                connection.close()
+    
+    def _initialize(self, db_connection, snapshot_path: Optional[str]):
+        """Load the snapshot and catch up, or build from a full scan"""
+        if snapshot_path and (Path(snapshot_path) / 'meta.json').exists():
+            self._load_snapshot(snapshot_path, mmap=True)
+            self.refresh(db_connection)
+        else:
+            self.build(db_connection)
+    
+    def ensure_current(
+        self,
+        db_connection,
+        refresh_interval_seconds: float = 5,
+        snapshot_path: Optional[str] = None,
+        connect: Optional[Callable[[], Any]] = None
+    ) -> bool:
+        """
+        Build (or load the snapshot) on first use, then refresh at most once per interval
+        
+        Args:
+            connect: When given, a missing index is built in the background
+                (see start_background_build) instead of inside this call
+        
+        Returns:
+            Whether the index is ready to answer lookups
+        """
+        if not self.ready:
+            if connect is not None:
+                self.start_background_build(connect, snapshot_path)
+                return False
+            with self._refresh_lock:
+                if not self.ready:
+                    self._initialize(db_connection, snapshot_path)
+            return True
+        
+        if time.monotonic() - self.refreshed_at < refresh_interval_seconds:
+            return True
+        
+        with self._refresh_lock:
+            if time.monotonic() - self.refreshed_at >= refresh_interval_seconds:
+                self.refresh(db_connection)
+        return True
+    
+    def _application_query(self) -> str:
+        """Applications with their identifier fields (optionally filtered by ID)"""
+        return """
+            SELECT
+                a.application_id,
+                a.family_id::text,
+                a.scheme_code,
+                a.status,
+                MAX(CASE WHEN f.field_name = 'bank_account_number' THEN f.field_value #>> '{}' END),
+                MAX(CASE WHEN f.field_name = 'mobile_number' THEN f.field_value #>> '{}' END),
+                MAX(CASE WHEN f.field_name = 'aadhaar_number' THEN f.field_value #>> '{}' END)
+            FROM application.applications a
+            LEFT JOIN application.application_fields f
+                ON f.application_id = a.application_id
+                AND f.field_name IN ('bank_account_number', 'mobile_number', 'aadhaar_number')
+            WHERE %s::int[] IS NULL OR a.application_id = ANY(%s::int[])
+            GROUP BY a.application_id
+        """
+    
+    def _add_row(self, row: Tuple):
+        """Index one row of _application_query"""
+        application_id, family_id, scheme_code, status, bank_account, mobile, aadhaar = row
+        self.add_application(application_id, family_id, scheme_code, status, {
+            'bank_account': bank_account,
+            'mobile': mobile,
+            'aadhaar': aadhaar
+        })
+    
+    @staticmethod
+    def _load_watermarks(db_connection) -> Tuple[int, Any]:
+        """Current max event ID and application update time"""
+        cursor = db_connection.cursor()
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(MAX(event_id), 0) FROM application.application_events),
+                (SELECT MAX(updated_at) FROM application.applications)
+        """)
+        last_event_id, last_updated_at = cursor.fetchone()
+        cursor.close()
+        return last_event_id, last_updated_at
+    
+    def save(self, path: str):
+        """Write the full index as a snapshot directory of .npy arrays"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        with self._lock:
+            keys, key_apps, key_kinds = [], [], []
+            app_ids, families, schemes, statuses = [], [], [], []
+            
+            base = self._base
+            if base is not None:
+                keep = ~np.isin(base['key_apps'], list(self._applications.keys()))
+                keys.append(base['keys'][keep])
+                key_apps.append(base['key_apps'][keep])
+                key_kinds.append(base['key_kinds'][keep])
+                
+                keep_apps = ~np.isin(base['app_ids'], list(self._applications.keys()))
+                for i in np.nonzero(keep_apps)[0].tolist():
+                    app_ids.append(int(base['app_ids'][i]))
+                    families.append(str(base['families'][base['app_family'][i]]))
+                    schemes.append(base['schemes'][base['app_scheme'][i]])
+                    statuses.append(base['statuses'][base['app_status'][i]])
+            
+            delta_keys, delta_apps, delta_kinds = [], [], []
+            for application_id, record in self._applications.items():
+                if record is None:
+                    continue
+                family_id, scheme_code, status, record_keys = record
+                app_ids.append(application_id)
+                families.append(family_id)
+                schemes.append(scheme_code)
+                statuses.append(status)
+                for key in record_keys:
+                    delta_keys.append(key)
+                    delta_apps.append(application_id)
+                    delta_kinds.append(self._key_kinds[key])
+            
+            keys.append(np.array(delta_keys, dtype=np.uint64))
+            key_apps.append(np.array(delta_apps, dtype=np.int64))
+            key_kinds.append(np.array(delta_kinds, dtype=np.int8))
+        
+        keys = np.concatenate(keys)
+        key_apps = np.concatenate(key_apps)
+        key_kinds = np.concatenate(key_kinds)
+        order = np.argsort(keys, kind='stable')
+        
+        app_ids = np.array(app_ids, dtype=np.int64)
+        app_order = np.argsort(app_ids, kind='stable')
+        family_values, family_codes = np.unique(np.array(families, dtype=str), return_inverse=True)
+        scheme_values, scheme_codes = np.unique(np.array(schemes, dtype=str), return_inverse=True)
+        status_values, status_codes = np.unique(np.array(statuses, dtype=str), return_inverse=True)
+        
+        arrays = {
+            'keys': keys[order],
+            'key_apps': key_apps[order],
+            'key_kinds': key_kinds[order],
+            'app_ids': app_ids[app_order],
+            'app_family': family_codes.astype(np.int32)[app_order],
+            'app_scheme': scheme_codes.astype(np.int32)[app_order],
+            'app_status': status_codes.astype(np.int16)[app_order],
+            'families': family_values
+        }
+        for name, array in arrays.items():
+            tmp_path = path / f"{name}.npy.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path / f"{name}.npy")
+        
+        meta = {
+            'schemes': scheme_values.tolist(),
+            'statuses': status_values.tolist(),
+            'last_event_id': self.last_event_id,
+            'last_updated_at': self.last_updated_at.isoformat() if self.last_updated_at else None,
+            'key_fingerprint': hashlib.blake2b(self.hash_key, digest_size=8).hexdigest(),
+            'saved_at': time.time()
+        }
+        with open(path / 'meta.json', 'w') as f:
+            json.dump(meta, f)
+        
+        print(f"✅ Duplicate index snapshot saved: {len(app_ids)} applications -> {path}")
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, hash_key: Optional[str] = None) -> 'DuplicateIndex':
+        """
+        Load a snapshot written by save()
+        
+        Args:
+            mmap: Memory-map the arrays instead of reading them into memory
+        """
+        index = cls(hash_key)
+        index._load_snapshot(path, mmap)
+        return index
+    
+    def _load_snapshot(self, path: str, mmap: bool):
+        """Attach snapshot arrays as the index base"""
+        path = Path(path)
+        with open(path / 'meta.json') as f:
+            meta = json.load(f)
+        
+        if meta['key_fingerprint'] != hashlib.blake2b(self.hash_key, digest_size=8).hexdigest():
+            raise ValueError(f"Duplicate index snapshot {path} was written with a different hash key")
+        
+        base = {
+            name: np.load(path / f"{name}.npy", mmap_mode='r' if mmap else None)
+            for name in self.SNAPSHOT_ARRAYS
+        }
+        base['schemes'] = meta['schemes']
+        base['statuses'] = meta['statuses']
+        
+        with self._lock:
+            self._by_key.clear()
+            self._key_kinds.clear()
+            self._applications.clear()
+            self._base = base
+        
+        self.last_event_id = meta['last_event_id']
+        self.last_updated_at = (
+            datetime.fromisoformat(meta['last_updated_at']) if meta['last_updated_at'] else None
+        )
+        self.built_at = self.refreshed_at = time.monotonic()
+
+
+_indexes: Dict[Optional[str], DuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_duplicate_index(hash_key: Optional[str] = None) -> DuplicateIndex:
+    """Get the process-wide duplicate index for a hash key (created empty on first call)"""
+    index = _indexes.get(hash_key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(hash_key, DuplicateIndex(hash_key))
+    return index
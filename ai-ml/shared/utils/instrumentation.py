@@ -0,0 +1,598 @@
+"""
+Instrumentation
+Per-query-fingerprint latency histograms, row and call counts for every
+statement run through DBConnector connections, plus per-stage spans for the
+orchestrators, exposed in Prometheus text format and as an offline report
+
+Disabled by default. Enable before connections are opened, either in code
+(enable_instrumentation()) or with environment variables:
+    SMART_INSTRUMENTATION=1                  enable at import
+    SMART_METRICS_PORT=9464                  serve /metrics on this port
+    SMART_INSTRUMENTATION_REPORT=path.json   write a report at exit ({pid} is expanded)
+
+When disabled, connections use the plain psycopg2 cursor and spans are a
+single flag check.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import bisect
+import hashlib
+import contextlib
+import threading
+import functools
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Iterable
+
+import psycopg2.extensions
+from psycopg2 import sql as pg_sql
+
+
+# Histogram bucket upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statement text kept in reports and the Prometheus info metric
+STATEMENT_PREVIEW_CHARS = 300
+
+_enabled = False
+_lock = threading.Lock()
+_queries: Dict[str, '_QueryStats'] = {}
+_spans: Dict[str, '_SpanStats'] = {}
+_active = threading.local()
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+
+class _Histogram:
+    """Latency histogram over LATENCY_BUCKETS (non-cumulative counts)"""
+    
+    __slots__ = ('counts', 'total_seconds', 'max_seconds')
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+    
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+
+class _QueryStats(_Histogram):
+    __slots__ = ('fingerprint', 'statement', 'calls', 'errors', 'rows', 'stages')
+    
+    def __init__(self, fingerprint: str, statement: str):
+        super().__init__()
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.stages: Dict[str, int] = {}
+
+
+class _SpanStats(_Histogram):
+    __slots__ = ('stage', 'calls', 'errors', 'queries', 'query_seconds')
+    
+    def __init__(self, stage: str):
+        super().__init__()
+        self.stage = stage
+        self.calls = 0
+        self.errors = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# ----------------------------------------------------------------------
+# Query fingerprints
+# ----------------------------------------------------------------------
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRINGS = re.compile(r"[EeBbXx]?'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r'%\([^)]+\)s|%s')
+_NUMBERS = re.compile(r'(?<![\w$.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+_TUPLES = re.compile(r'\(\s*\?(?:\s*(?:::\s*\w+(?:\[\])?)?\s*,\s*\?)*\s*(?:::\s*\w+(?:\[\])?)?\s*\)')
+_TUPLE_LISTS = re.compile(r'\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+')
+_ARRAYS = re.compile(r'ARRAY\[[^\]]*\]', re.I)
+_KEYWORD_VALUES = re.compile(r'([(,]\s*)(?:NULL|TRUE|FALSE|DEFAULT)\b', re.I)
+_WHITESPACE = re.compile(r'\s+')
+_VALUES_KEYWORD = re.compile(r'\bVALUES\s*\(', re.I)
+# One row of a VALUES list (string literals already replaced, one level of nested parentheses)
+_ROW = re.compile(r'\((?:[^()]|\([^()]*\))*\)')
+
+# execute_values joins the rows of a page with a bare comma
+_ROW_SEPARATOR = '),('
+
+
+# Longer statements (execute_values pages with inlined rows) are reduced to
+# their template first; if that fails or is still long they are normalized
+# every time instead of filling the cache
+CACHED_STATEMENT_CHARS = 4096
+
+
+def _normalize(statement: str) -> str:
+    """Statement with literals, placeholders and value lists replaced by ?"""
+    if len(statement) <= CACHED_STATEMENT_CHARS:
+        return _normalize_cached(statement)
+    template = _values_template(statement)
+    if template is not None and len(template) <= CACHED_STATEMENT_CHARS:
+        return _normalize_cached(template)
+    return _normalize_text(statement)
+
+
+def _values_template(statement: str) -> Optional[str]:
+    """
+    Statement with its inlined VALUES rows replaced by one (?...) row, found
+    from the first and last row separators so the rows are never scanned
+    (None if the statement has no multi-row VALUES list)
+    """
+    first = statement.find(_ROW_SEPARATOR)
+    if first < 0:
+        return None
+    keyword = None
+    for keyword in _VALUES_KEYWORD.finditer(statement, 0, first + 1):
+        pass
+    if keyword is None:
+        return None
+    
+    last_row = _STRINGS.sub('?', statement[statement.rfind(_ROW_SEPARATOR) + 2:])
+    row = _ROW.match(last_row)
+    if row is None:
+        return None
+    return statement[:keyword.start()] + 'VALUES (?...)' + last_row[row.end():]
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(statement: str) -> str:
+    return _normalize_text(statement)
+
+
+def _normalize_text(statement: str) -> str:
+    text = _COMMENTS.sub(' ', statement)
+    text = _STRINGS.sub('?', text)
+    text = _PLACEHOLDERS.sub('?', text)
+    text = _NUMBERS.sub('?', text)
+    text = _ARRAYS.sub('?', text)
+    text = _KEYWORD_VALUES.sub(r'\1?', text)
+    text = _TUPLES.sub('(?...)', text)
+    text = _TUPLE_LISTS.sub('(?...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """Stable 12-hex id of a normalized statement"""
+    return hashlib.md5(_normalize(statement).encode('utf-8')).hexdigest()[:12]
+
+
+def _statement_text(cursor, query) -> str:
+    if isinstance(query, bytes):
+        return query.decode('utf-8', errors='replace')
+    if isinstance(query, pg_sql.Composable):
+        return query.as_string(cursor)
+    return str(query)
+
+
+# ----------------------------------------------------------------------
+# Recording
+# ----------------------------------------------------------------------
+
+def _span_stack() -> List[str]:
+    stack = getattr(_active, 'stack', None)
+    if stack is None:
+        stack = _active.stack = []
+    return stack
+
+
+def _record_query(statement: str, seconds: float, rows: int, error: bool):
+    normalized = _normalize(statement)
+    stack = _span_stack()
+    stage = stack[-1] if stack else None
+    
+    with _lock:
+        stats = _queries.get(normalized)
+        if stats is None:
+            stats = _queries[normalized] = _QueryStats(
+                hashlib.md5(normalized.encode('utf-8')).hexdigest()[:12], normalized
+            )
+        stats.observe(seconds)
+        stats.calls += 1
+        stats.rows += max(rows, 0)
+        if error:
+            stats.errors += 1
+        if stage is not None:
+            stats.stages[stage] = stats.stages.get(stage, 0) + 1
+            span_stats = _spans.get(stage)
+            if span_stats is None:
+                span_stats = _spans[stage] = _SpanStats(stage)
+            span_stats.queries += 1
+            span_stats.query_seconds += seconds
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """psycopg2 cursor that records latency and row counts per statement fingerprint"""
+    
+    def _timed(self, statement, call, *args):
+        started = time.perf_counter()
+        try:
+            result = call(*args)
+        except Exception:
+            _record_query(_statement_text(self, statement), time.perf_counter() - started, 0, True)
+            raise
+        _record_query(_statement_text(self, statement), time.perf_counter() - started, self.rowcount, False)
+        return result
+    
+    def execute(self, query, vars=None):
+        return self._timed(query, super().execute, query, vars)
+    
+    def executemany(self, query, vars_list):
+        return self._timed(query, super().executemany, query, vars_list)
+    
+    def copy_expert(self, sql, file, size=8192):
+        return self._timed(sql, super().copy_expert, sql, file, size)
+    
+    def copy_from(self, file, table, *args, **kwargs):
+        return self._timed(f"COPY {table} FROM STDIN", functools.partial(super().copy_from, file, table, *args, **kwargs))
+    
+    def copy_to(self, file, table, *args, **kwargs):
+        return self._timed(f"COPY {table} TO STDOUT", functools.partial(super().copy_to, file, table, *args, **kwargs))
+
+
+def cursor_factory():
+    """Cursor class for new connections (None = psycopg2 default when disabled)"""
+    return InstrumentedCursor if _enabled else None
+
+
+class _Span:
+    __slots__ = ('stage', 'started')
+    
+    def __init__(self, stage: str):
+        self.stage = stage
+    
+    def __enter__(self):
+        _span_stack().append(self.stage)
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        seconds = time.perf_counter() - self.started
+        stack = _span_stack()
+        if stack:
+            stack.pop()
+        with _lock:
+            stats = _spans.get(self.stage)
+            if stats is None:
+                stats = _spans[self.stage] = _SpanStats(self.stage)
+            stats.observe(seconds)
+            stats.calls += 1
+            if exc_type is not None:
+                stats.errors += 1
+        return False
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(stage: str):
+    """
+    Context manager timing a pipeline stage
+    
+    Statements executed inside the span are attributed to it (innermost span
+    per thread), so the report shows how much of a stage is database time.
+    """
+    return _Span(stage) if _enabled else _NO_SPAN
+
+
+def traced(stage: str):
+    """Decorator: run the function inside span(stage) when instrumentation is enabled"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Control
+# ----------------------------------------------------------------------
+
+def enable_instrumentation(metrics_port: Optional[int] = None, metrics_host: str = '0.0.0.0'):
+    """Enable recording (affects connections opened from now on)"""
+    global _enabled
+    _enabled = True
+    if metrics_port:
+        start_metrics_server(metrics_port, metrics_host)
+
+
+def disable_instrumentation():
+    """Stop recording; collected data is kept until reset_instrumentation()"""
+    global _enabled
+    _enabled = False
+
+
+def instrumentation_enabled() -> bool:
+    return _enabled
+
+
+def reset_instrumentation():
+    with _lock:
+        _queries.clear()
+        _spans.clear()
+
+
+# ----------------------------------------------------------------------
+# Snapshots and reports
+# ----------------------------------------------------------------------
+
+def _histogram_dict(stats: _Histogram) -> Dict[str, Any]:
+    return {
+        'histogram': list(stats.counts),
+        'total_seconds': stats.total_seconds,
+        'max_seconds': stats.max_seconds
+    }
+
+
+def snapshot() -> Dict[str, Any]:
+    """Point-in-time copy of all collected statistics (JSON-serialisable)"""
+    with _lock:
+        queries = [
+            dict(fingerprint=s.fingerprint, statement=s.statement, calls=s.calls, errors=s.errors,
+                 rows=s.rows, stages=dict(s.stages), **_histogram_dict(s))
+            for s in _queries.values()
+        ]
+        spans = [
+            dict(stage=s.stage, calls=s.calls, errors=s.errors, queries=s.queries,
+                 query_seconds=s.query_seconds, **_histogram_dict(s))
+            for s in _spans.values()
+        ]
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'pid': os.getpid(),
+        'buckets': list(LATENCY_BUCKETS),
+        'queries': queries,
+        'spans': spans
+    }
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine snapshots from several processes (same bucket layout)"""
+    queries: Dict[str, Dict[str, Any]] = {}
+    spans: Dict[str, Dict[str, Any]] = {}
+    
+    for snap in snapshots:
+        if snap['buckets'] != list(LATENCY_BUCKETS):
+            raise ValueError(f"Snapshot from pid {snap.get('pid')} uses different latency buckets")
+        for entries, key, merged in ((snap['queries'], 'fingerprint', queries), (snap['spans'], 'stage', spans)):
+            for entry in entries:
+                target = merged.get(entry[key])
+                if target is None:
+                    merged[entry[key]] = json.loads(json.dumps(entry))
+                    continue
+                for field, value in entry.items():
+                    if field == 'histogram':
+                        target[field] = [a + b for a, b in zip(target[field], value)]
+                    elif field == 'stages':
+                        for stage, calls in value.items():
+                            target[field][stage] = target[field].get(stage, 0) + calls
+                    elif field == 'max_seconds':
+                        target[field] = max(target[field], value)
+                    elif isinstance(value, (int, float)):
+                        target[field] += value
+    
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'pid': None,
+        'buckets': list(LATENCY_BUCKETS),
+        'queries': list(queries.values()),
+        'spans': list(spans.values())
+    }
+
+
+def estimate_quantile(entry: Dict[str, Any], q: float) -> float:
+    """Quantile (seconds) interpolated within histogram buckets, as histogram_quantile does"""
+    counts = entry['histogram']
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if seen + count >= rank and count > 0:
+            if index == len(LATENCY_BUCKETS):
+                return entry['max_seconds']
+            lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+            value = lower + (LATENCY_BUCKETS[index] - lower) * (rank - seen) / count
+            return min(value, entry['max_seconds'])
+        seen += count
+    return entry['max_seconds']
+
+
+def write_report(path: str, snap: Optional[Dict[str, Any]] = None) -> str:
+    """Write a snapshot as JSON ({pid} in the path is expanded); returns the path"""
+    path = path.replace('{pid}', str(os.getpid()))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(snap or snapshot(), f, indent=2)
+    return path
+
+
+REPORT_SORT_KEYS = {
+    'total': lambda e: e['total_seconds'],
+    'calls': lambda e: e['calls'],
+    'mean': lambda e: e['total_seconds'] / e['calls'] if e['calls'] else 0.0,
+    'p95': lambda e: estimate_quantile(e, 0.95),
+    'rows': lambda e: e.get('rows', 0)
+}
+
+
+def format_report(snap: Optional[Dict[str, Any]] = None, top: int = 20, sort_by: str = 'total') -> str:
+    """Text report: top statements by sort_by, then all stages by total time"""
+    snap = snap or snapshot()
+    key = REPORT_SORT_KEYS[sort_by]
+    lines = []
+    
+    queries = sorted(snap['queries'], key=key, reverse=True)
+    db_seconds = sum(e['total_seconds'] for e in queries)
+    lines.append(f"📊 Queries: {len(queries)} fingerprints, {sum(e['calls'] for e in queries):,} calls, "
+                 f"{db_seconds:.2f}s (top {min(top, len(queries))} by {sort_by})")
+    lines.append(f"   {'fingerprint':<12} {'calls':>9} {'total s':>9} {'share':>6} {'mean ms':>9} "
+                 f"{'p95 ms':>9} {'max ms':>9} {'rows':>11} {'err':>5}")
+    for entry in queries[:top]:
+        calls = entry['calls'] or 1
+        lines.append(
+            f"   {entry['fingerprint']:<12} {entry['calls']:>9,} {entry['total_seconds']:>9.3f} "
+            f"{entry['total_seconds'] / db_seconds if db_seconds else 0:>6.1%} "
+            f"{entry['total_seconds'] / calls * 1000:>9.2f} {estimate_quantile(entry, 0.95) * 1000:>9.2f} "
+            f"{entry['max_seconds'] * 1000:>9.2f} {entry['rows']:>11,} {entry['errors']:>5}"
+        )
+        lines.append(f"      {entry['statement'][:STATEMENT_PREVIEW_CHARS]}")
+        if entry['stages']:
+            stages = ', '.join(f"{stage} ({calls:,})" for stage, calls in
+                               sorted(entry['stages'].items(), key=lambda item: -item[1]))
+            lines.append(f"      stages: {stages}")
+    
+    spans = sorted(snap['spans'], key=lambda e: e['total_seconds'], reverse=True)
+    if spans:
+        lines.append("")
+        lines.append(f"⏱️  Stages: {len(spans)}")
+        lines.append(f"   {'stage':<44} {'calls':>9} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} "
+                     f"{'queries':>9} {'db share':>8} {'err':>5}")
+        for entry in spans:
+            calls = entry['calls'] or 1
+            db_share = entry['query_seconds'] / entry['total_seconds'] if entry['total_seconds'] else 0.0
+            lines.append(
+                f"   {entry['stage']:<44} {entry['calls']:>9,} {entry['total_seconds']:>9.3f} "
+                f"{entry['total_seconds'] / calls * 1000:>9.2f} {estimate_quantile(entry, 0.95) * 1000:>9.2f} "
+                f"{entry['queries']:>9,} {db_share:>8.1%} {entry['errors']:>5}"
+            )
+    
+    return '\n'.join(lines)
+
+
+# ----------------------------------------------------------------------
+# Prometheus exposition
+# ----------------------------------------------------------------------
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(name: str, labels: str, entry: Dict[str, Any]) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, entry['histogram']):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {entry["calls"]}')
+    lines.append(f'{name}_sum{{{labels}}} {entry["total_seconds"]:.6f}')
+    lines.append(f'{name}_count{{{labels}}} {entry["calls"]}')
+    return lines
+
+
+def render_prometheus(snap: Optional[Dict[str, Any]] = None) -> str:
+    """Statistics in Prometheus text exposition format (0.0.4)"""
+    snap = snap or snapshot()
+    lines = [
+        '# HELP smart_db_query_duration_seconds Statement latency by query fingerprint',
+        '# TYPE smart_db_query_duration_seconds histogram'
+    ]
+    for entry in snap['queries']:
+        lines.extend(_histogram_lines('smart_db_query_duration_seconds', f'fingerprint="{entry["fingerprint"]}"', entry))
+    
+    for metric, field, help_text in (
+        ('smart_db_query_rows_total', 'rows', 'Rows returned or affected by query fingerprint'),
+        ('smart_db_query_errors_total', 'errors', 'Failed statements by query fingerprint')
+    ):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        lines.extend(f'{metric}{{fingerprint="{e["fingerprint"]}"}} {e[field]}' for e in snap['queries'])
+    
+    lines.append('# HELP smart_db_query_info Normalized statement of a query fingerprint')
+    lines.append('# TYPE smart_db_query_info gauge')
+    lines.extend(
+        f'smart_db_query_info{{fingerprint="{e["fingerprint"]}",statement="{_label(e["statement"][:STATEMENT_PREVIEW_CHARS])}"}} 1'
+        for e in snap['queries']
+    )
+    
+    lines.append('# HELP smart_stage_duration_seconds Pipeline stage latency')
+    lines.append('# TYPE smart_stage_duration_seconds histogram')
+    for entry in snap['spans']:
+        lines.extend(_histogram_lines('smart_stage_duration_seconds', f'stage="{_label(entry["stage"])}"', entry))
+    
+    for metric, field, kind, help_text in (
+        ('smart_stage_errors_total', 'errors', 'counter', 'Pipeline stage calls that raised'),
+        ('smart_stage_queries_total', 'queries', 'counter', 'Statements executed inside the stage'),
+        ('smart_stage_query_seconds_total', 'query_seconds', 'counter', 'Statement time inside the stage')
+    ):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        lines.extend(f'{metric}{{stage="{_label(e["stage"])}"}} {e[field]}' for e in snap['spans'])
+    
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int = 9464, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread (one server per process)"""
+    global _metrics_server
+    if _metrics_server is None:
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        _metrics_server.daemon_threads = True
+        threading.Thread(target=_metrics_server.serve_forever, name='metrics-server', daemon=True).start()
+        print(f"📊 Metrics endpoint: http://{host}:{port}/metrics")
+    return _metrics_server
+
+
+def _write_exit_report(path: str):
+    if _queries or _spans:
+        print(f"📊 Instrumentation report written to {write_report(path)}")
+
+
+if os.environ.get('SMART_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable_instrumentation(metrics_port=int(os.environ.get('SMART_METRICS_PORT', 0)) or None)
+    if os.environ.get('SMART_INSTRUMENTATION_REPORT'):
+        atexit.register(_write_exit_report, os.environ['SMART_INSTRUMENTATION_REPORT'])
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Merge instrumentation reports and print the top statements and stages')
+    parser.add_argument('reports', nargs='+', help='Report JSON files (one per process)')
+    parser.add_argument('--top', type=int, default=20, help='Statements to show (default: 20)')
+    parser.add_argument('--sort', choices=list(REPORT_SORT_KEYS), default='total', help='Statement order (default: total)')
+    parser.add_argument('--prometheus', action='store_true', help='Print the merged report in Prometheus text format')
+    args = parser.parse_args()
+    
+    snapshots = []
+    for report_path in args.reports:
+        with open(report_path, 'r') as f:
+            snapshots.append(json.load(f))
+    merged = merge_snapshots(snapshots)
+    print(render_prometheus(merged) if args.prometheus else format_report(merged, top=args.top, sort_by=args.sort))
@@ -0,0 +1,422 @@
+"""
+Statistics Rollups
+Per-hour and per-day row counters for the dashboard statistics, maintained by
+statement-level triggers on the source tables and rebuilt by a backfill
+"""
+
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
+
+
+# Metric -> source table, bucket time and dimension (SQL expressions over a source row).
+# Counters are current-state counts: an UPDATE that changes the dimension moves
+# the row from the old dimension to the new one within its original bucket.
+ROLLUP_METRICS: Dict[str, Dict[str, str]] = {
+    'intimation.campaigns': {
+        'table': 'intimation.campaigns',
+        'time': 'created_at',
+        'dimension': 'status'
+    },
+    'intimation.campaign_candidates': {
+        'table': 'intimation.campaign_candidates',
+        'time': 'created_at',
+        'dimension': 'scheme_code'
+    },
+    'intimation.message_logs': {
+        'table': 'intimation.message_logs',
+        'time': 'created_at',
+        'dimension': 'status'
+    },
+    'intimation.consent_records': {
+        'table': 'intimation.consent_records',
+        'time': 'created_at',
+        'dimension': 'status'
+    },
+    'application.applications': {
+        'table': 'application.applications',
+        'time': 'created_at',
+        'dimension': 'status'
+    },
+    'decision.decisions': {
+        'table': 'decision.decisions',
+        'time': 'COALESCE(decision_timestamp, created_at)',
+        'dimension': 'decision_type'
+    },
+    'detection.detection_runs': {
+        'table': 'detection.detection_runs',
+        'time': 'run_date',
+        'dimension': 'run_type'
+    },
+    'detection.detected_cases': {
+        'table': 'detection.detected_cases',
+        'time': 'detection_timestamp',
+        'dimension': 'case_type'
+    },
+    'eligibility_checker.eligibility_checks': {
+        'table': 'eligibility_checker.eligibility_checks',
+        'time': 'check_timestamp',
+        'dimension': 'user_type'
+    },
+    'eligibility_checker.recommendation_sets': {
+        'table': 'eligibility_checker.recommendation_sets',
+        'time': 'generated_at',
+        'dimension': "CASE WHEN is_active THEN 'ACTIVE' ELSE 'INACTIVE' END"
+    },
+    'inclusion.priority_households': {
+        'table': 'inclusion.priority_households',
+        'time': 'detected_at',
+        'dimension': "CASE WHEN is_active THEN priority_level ELSE 'INACTIVE' END"
+    },
+    'inclusion.exception_flags': {
+        'table': 'inclusion.exception_flags',
+        'time': 'detected_at',
+        'dimension': 'review_status'
+    },
+    'inclusion.nudge_records': {
+        'table': 'inclusion.nudge_records',
+        'time': 'created_at',
+        'dimension': 'nudge_type'
+    },
+}
+
+ROLLUP_SCHEMA_SQL = """
+CREATE SCHEMA IF NOT EXISTS dashboard;
+
+CREATE TABLE IF NOT EXISTS dashboard.stat_rollups (
+    metric VARCHAR(100) NOT NULL,
+    granularity VARCHAR(10) NOT NULL,  -- 'HOUR', 'DAY'
+    bucket_start TIMESTAMP NOT NULL,
+    dimension VARCHAR(100) NOT NULL DEFAULT '',
+    row_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (metric, granularity, bucket_start, dimension)
+);
+
+-- Statement-level trigger: aggregates the statement's transition table(s) into
+-- one upsert per (granularity, bucket, dimension), so bulk inserts and COPY
+-- touch a handful of counter rows instead of one per source row.
+-- Arguments: metric, bucket time expression, dimension expression
+CREATE OR REPLACE FUNCTION dashboard.apply_stat_rollup()
+RETURNS TRIGGER AS $$
+DECLARE
+    bucket_time TEXT := format('COALESCE(%s, CURRENT_TIMESTAMP)', TG_ARGV[1]);
+    dimension TEXT := format('COALESCE((%s)::text, '''')', TG_ARGV[2]);
+    changes TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changes := format('SELECT %s AS bucket_time, %s AS dimension, 1 AS delta FROM new_rows',
+                          bucket_time, dimension);
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := format('SELECT %s AS bucket_time, %s AS dimension, -1 AS delta FROM old_rows',
+                          bucket_time, dimension);
+    ELSE
+        changes := format('SELECT %1$s AS bucket_time, %2$s AS dimension, 1 AS delta FROM new_rows '
+                          'UNION ALL SELECT %1$s, %2$s, -1 FROM old_rows',
+                          bucket_time, dimension);
+    END IF;
+    
+    -- Sorted upserts keep concurrent writers from locking counter rows in different orders
+    EXECUTE format($sql$
+        INSERT INTO dashboard.stat_rollups AS r (metric, granularity, bucket_start, dimension, row_count)
+        SELECT %L, g.granularity, date_trunc(g.unit, c.bucket_time), c.dimension, SUM(c.delta)
+        FROM (%s) AS c
+        CROSS JOIN (VALUES ('HOUR', 'hour'), ('DAY', 'day')) AS g(granularity, unit)
+        GROUP BY 2, 3, 4
+        HAVING SUM(c.delta) <> 0
+        ORDER BY 2, 3, 4
+        ON CONFLICT (metric, granularity, bucket_start, dimension) DO UPDATE SET
+            row_count = r.row_count + EXCLUDED.row_count,
+            updated_at = CURRENT_TIMESTAMP
+    $sql$, TG_ARGV[0], changes);
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Created by install and backfill (a backfill-only run may precede the first install)
+ROLLUP_REGISTRY_SQL = """
+CREATE SCHEMA IF NOT EXISTS dashboard;
+
+-- Registry of installed (triggers created) and fully backfilled metrics.
+-- installed_at is reset whenever the triggers had to be created, so a metric
+-- only counts as complete after a full backfill that followed its install.
+CREATE TABLE IF NOT EXISTS dashboard.stat_rollup_metrics (
+    metric VARCHAR(100) PRIMARY KEY,
+    source_table VARCHAR(200) NOT NULL,
+    installed_at TIMESTAMP,
+    backfilled_at TIMESTAMP
+);
+
+-- Metrics the dashboards may read from the rollups: registered, backfilled
+-- after install and all three triggers still present on the source table
+CREATE OR REPLACE VIEW dashboard.stat_rollup_ready_metrics AS
+SELECT m.metric
+FROM dashboard.stat_rollup_metrics m
+WHERE m.backfilled_at >= m.installed_at
+  AND (
+      SELECT COUNT(*) FROM pg_trigger t
+      WHERE t.tgrelid = to_regclass(m.source_table)
+        AND t.tgname IN (
+            'stat_rollup_' || replace(m.metric, '.', '_') || '_insert',
+            'stat_rollup_' || replace(m.metric, '.', '_') || '_update',
+            'stat_rollup_' || replace(m.metric, '.', '_') || '_delete'
+        )
+  ) = 3;
+"""
+
+# Dashboards read totals from DAY buckets (one row per day per dimension)
+ROLLUP_TOTALS_QUERY = """
+    SELECT metric, dimension, SUM(row_count)::bigint as row_count
+    FROM dashboard.stat_rollups
+    WHERE granularity = 'DAY' AND metric = ANY(%s)
+    GROUP BY metric, dimension
+"""
+
+
+def _literal(value: str) -> str:
+    """SQL string literal for trigger arguments"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _trigger_name(metric: str, operation: str) -> str:
+    return f"stat_rollup_{metric.replace('.', '_')}_{operation.lower()}"
+
+
+def _resolve_metrics(metrics: Optional[List[str]]) -> List[str]:
+    names = list(metrics) if metrics else list(ROLLUP_METRICS)
+    unknown = [name for name in names if name not in ROLLUP_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown rollup metrics: {unknown}")
+    return names
+
+
+def _table_exists(cursor, table: str) -> bool:
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (table,))
+    return bool(cursor.fetchone()[0])
+
+
+def install_rollups(connection, metrics: Optional[List[str]] = None) -> List[str]:
+    """
+    Create dashboard.stat_rollups and (re)create the rollup triggers
+    
+    Metrics whose source table does not exist yet are skipped. Installed
+    metrics are registered in dashboard.stat_rollup_metrics; a metric whose
+    triggers were missing needs a full backfill before dashboards read it.
+    
+    Returns:
+        Metrics with triggers installed
+    """
+    names = _resolve_metrics(metrics)
+    installed = []
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute(ROLLUP_SCHEMA_SQL)
+        cursor.execute(ROLLUP_REGISTRY_SQL)
+        
+        for metric in names:
+            spec = ROLLUP_METRICS[metric]
+            if not _table_exists(cursor, spec['table']):
+                print(f"⚠️  Skipping rollup {metric}: table {spec['table']} not found")
+                continue
+            
+            triggers = [_trigger_name(metric, operation) for operation in ('INSERT', 'UPDATE', 'DELETE')]
+            cursor.execute(
+                "SELECT COUNT(*) FROM pg_trigger WHERE tgrelid = to_regclass(%s) AND tgname = ANY(%s);",
+                (spec['table'], triggers)
+            )
+            had_triggers = cursor.fetchone()[0] == len(triggers)
+            
+            arguments = ', '.join(_literal(value) for value in (metric, spec['time'], spec['dimension']))
+            # Transition tables are only allowed on single-event triggers
+            for operation, referencing in (
+                ('INSERT', 'NEW TABLE AS new_rows'),
+                ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+                ('DELETE', 'OLD TABLE AS old_rows')
+            ):
+                trigger = _trigger_name(metric, operation)
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {spec['table']};")
+                cursor.execute(f"""
+                    CREATE TRIGGER {trigger}
+                        AFTER {operation} ON {spec['table']}
+                        REFERENCING {referencing}
+                        FOR EACH STATEMENT EXECUTE FUNCTION dashboard.apply_stat_rollup({arguments});
+                """)
+            
+            # Replacing existing triggers in this transaction loses no rows, so the
+            # previous backfill stays valid; new triggers start the clock again
+            cursor.execute("""
+                INSERT INTO dashboard.stat_rollup_metrics AS m (metric, source_table, installed_at)
+                VALUES (%s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (metric) DO UPDATE SET
+                    source_table = EXCLUDED.source_table,
+                    installed_at = CASE WHEN %s AND m.installed_at IS NOT NULL
+                                        THEN m.installed_at ELSE EXCLUDED.installed_at END;
+            """, (metric, spec['table'], had_triggers))
+            installed.append(metric)
+        
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    print(f"✅ Installed rollup triggers for {len(installed)} metrics")
+    return installed
+
+
+def backfill_rollups(
+    connection,
+    metrics: Optional[List[str]] = None,
+    since: Optional[Union[date, datetime]] = None
+) -> Dict[str, int]:
+    """
+    Rebuild rollup buckets from the source tables
+    
+    Each metric is rebuilt in its own transaction while its source table is
+    held in SHARE mode, so writes are blocked for the duration of the recount
+    and the triggers continue exactly where the backfill stopped. A full
+    backfill (no since) marks the metric as backfilled in the registry.
+    
+    Args:
+        connection: psycopg2 connection
+        metrics: Metrics to rebuild (default: all)
+        since: Only rebuild buckets from this day on (default: everything)
+    
+    Returns:
+        Metric -> bucket rows written
+    """
+    names = _resolve_metrics(metrics)
+    since_day = datetime(since.year, since.month, since.day) if since is not None else None
+    written = {}
+    cursor = connection.cursor()
+    
+    try:
+        # A backfill-only run on a fresh database creates the rollup table too
+        cursor.execute(ROLLUP_SCHEMA_SQL)
+        cursor.execute(ROLLUP_REGISTRY_SQL)
+        connection.commit()
+        
+        for metric in names:
+            spec = ROLLUP_METRICS[metric]
+            if not _table_exists(cursor, spec['table']):
+                print(f"⚠️  Skipping backfill of {metric}: table {spec['table']} not found")
+                connection.rollback()
+                continue
+            
+            bucket_time = f"COALESCE({spec['time']}, CURRENT_TIMESTAMP)"
+            params: List[Any] = [metric]
+            bucket_filter = ""
+            row_filter = ""
+            if since_day is not None:
+                params.append(since_day)
+                bucket_filter = "AND bucket_start >= %s"
+                row_filter = f"WHERE {bucket_time} >= %s"
+            
+            cursor.execute(f"LOCK TABLE {spec['table']} IN SHARE MODE;")
+            cursor.execute(
+                f"DELETE FROM dashboard.stat_rollups WHERE metric = %s {bucket_filter};",
+                params
+            )
+            cursor.execute(f"""
+                INSERT INTO dashboard.stat_rollups (metric, granularity, bucket_start, dimension, row_count)
+                SELECT %s, g.granularity, date_trunc(g.unit, c.bucket_time), c.dimension, COUNT(*)
+                FROM (
+                    SELECT {bucket_time} AS bucket_time,
+                           COALESCE(({spec['dimension']})::text, '') AS dimension
+                    FROM {spec['table']}
+                    {row_filter}
+                ) AS c
+                CROSS JOIN (VALUES ('HOUR', 'hour'), ('DAY', 'day')) AS g(granularity, unit)
+                GROUP BY 2, 3, 4;
+            """, params)
+            written[metric] = cursor.rowcount
+            
+            if since_day is None:
+                cursor.execute("""
+                    INSERT INTO dashboard.stat_rollup_metrics AS m (metric, source_table, backfilled_at)
+                    VALUES (%s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (metric) DO UPDATE SET backfilled_at = EXCLUDED.backfilled_at;
+                """, (metric, spec['table']))
+            connection.commit()
+            print(f"   {metric}: {written[metric]} buckets")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    return written
+
+
+def rollup_totals(connection, metrics: List[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Current totals per metric and dimension
+    
+    Returns:
+        metric -> {dimension: count}
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(ROLLUP_TOTALS_QUERY, (list(metrics),))
+        rows = cursor.fetchall()
+        connection.commit()
+    finally:
+        cursor.close()
+    
+    totals: Dict[str, Dict[str, int]] = {metric: {} for metric in metrics}
+    for metric, dimension, count in rows:
+        totals[metric][dimension] = int(count)
+    return totals
+
+
+def rollup_ready_metrics(connection) -> Set[str]:
+    """Metrics whose rollups are installed and fully backfilled"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT metric FROM dashboard.stat_rollup_ready_metrics;")
+        rows = cursor.fetchall()
+        connection.commit()
+    finally:
+        cursor.close()
+    return {row[0] for row in rows}
+
+
+def rollup_stats_queries(columns: List[Tuple[str, str, Optional[str], str]]) -> Tuple[str, str]:
+    """
+    Single-row dashboard statistics queries
+    
+    The rollup query reads each counter from the DAY buckets when its metric
+    is in dashboard.stat_rollup_ready_metrics and runs the direct count
+    otherwise, so a metric that was skipped, installed without a backfill or
+    not installed at all is never shown as 0. The count query (direct counts
+    only) is the fallback while the rollup tables do not exist.
+    
+    Args:
+        columns: (alias, metric, filter on the rollup dimension or None, direct COUNT query)
+    
+    Returns:
+        (rollup query, count query)
+    """
+    rollup_columns = []
+    count_columns = []
+    for alias, metric, dimension_filter, count_sql in columns:
+        _resolve_metrics([metric])
+        condition = f" AND ({dimension_filter})" if dimension_filter else ""
+        rollup_columns.append(f"""
+        CASE WHEN EXISTS (SELECT 1 FROM ready WHERE metric = {_literal(metric)})
+            THEN (SELECT COALESCE(SUM(row_count), 0) FROM dashboard.stat_rollups
+                  WHERE granularity = 'DAY' AND metric = {_literal(metric)}{condition})
+            ELSE ({count_sql})
+        END::bigint as {alias}""")
+        count_columns.append(f"""
+        ({count_sql}) as {alias}""")
+    
+    rollup_sql = (
+        "\n    WITH ready AS (SELECT metric FROM dashboard.stat_rollup_ready_metrics)"
+        "\n    SELECT" + ",".join(rollup_columns) + "\n"
+    )
+    count_sql = "\n    SELECT" + ",".join(count_columns) + "\n"
+    return rollup_sql, count_sql
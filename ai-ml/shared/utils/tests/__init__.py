@@ -0,0 +1,2 @@
+# Unit Tests for Shared Utilities
+
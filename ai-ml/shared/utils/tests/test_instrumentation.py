@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Instrumentation
+Query fingerprint normalization and snapshot merging
+"""
+
+import sys
+import os
+import unittest
+import uuid
+
+# Add shared utils to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import instrumentation
+from instrumentation import (
+    _normalize, _normalize_text, fingerprint, merge_snapshots, CACHED_STATEMENT_CHARS, LATENCY_BUCKETS
+)
+
+
+def _values_page(rows: int, tail: str = " ON CONFLICT (family_id) DO UPDATE SET score = EXCLUDED.score") -> str:
+    """INSERT as execute_values sends it: the rows inlined and joined by bare commas"""
+    values = ','.join(
+        f"('{uuid.uuid4()}'::uuid, {i}, 'name {i} (test)', NULL, TRUE, '2024-01-01'::timestamp)"
+        for i in range(rows)
+    )
+    return f"INSERT INTO forecast.scores (family_id, rank, label, note, active, created_at) VALUES {values}{tail}"
+
+
+def _snapshot(pid, queries, spans=None):
+    return {'pid': pid, 'buckets': list(LATENCY_BUCKETS), 'queries': queries, 'spans': spans or []}
+
+
+def _histogram(index):
+    counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    counts[index] = 1
+    return counts
+
+
+class TestNormalize(unittest.TestCase):
+    """Test cases for statement normalization"""
+    
+    def test_literals_and_placeholders(self):
+        """Test strings, numbers and placeholders are replaced by ?"""
+        normalized = _normalize(
+            "SELECT * FROM t WHERE a = 'x' AND b = 42 AND c = %s AND d = %(name)s -- note\n LIMIT 10"
+        )
+        self.assertEqual(normalized, "SELECT * FROM t WHERE a = ? AND b = ? AND c = ? AND d = ? LIMIT ?")
+    
+    def test_identifiers_keep_digits(self):
+        """Test digits inside identifiers are kept"""
+        self.assertEqual(_normalize("SELECT col1 FROM t2"), "SELECT col1 FROM t2")
+    
+    def test_value_lists_collapse(self):
+        """Test row lists of any length share one fingerprint"""
+        self.assertEqual(
+            _normalize("INSERT INTO t (a, b) VALUES (1, 'x'), (2, NULL), (3, TRUE)"),
+            "INSERT INTO t (a, b) VALUES (?...)"
+        )
+        self.assertEqual(fingerprint("SELECT 1 WHERE a IN (1, 2, 3)"), fingerprint("SELECT 2 WHERE a IN (4)"))
+    
+    def test_long_values_page_matches_full_normalization(self):
+        """Test a long execute_values page gets the same text as the regex normalization"""
+        page = _values_page(1000)
+        self.assertGreater(len(page), CACHED_STATEMENT_CHARS)
+        self.assertEqual(_normalize(page), _normalize_text(page))
+        self.assertEqual(_normalize(page), _normalize(_values_page(2)))
+    
+    def test_long_values_page_keeps_tail(self):
+        """Test the statement after the rows stays part of the fingerprint"""
+        ignore = _values_page(1000, tail=" ON CONFLICT (family_id) DO NOTHING")
+        self.assertNotEqual(fingerprint(ignore), fingerprint(_values_page(1000)))
+        self.assertTrue(_normalize(ignore).endswith("VALUES (?...) ON CONFLICT (family_id) DO NOTHING"))
+    
+    def test_long_values_page_is_cached(self):
+        """Test long pages normalize through the cache by their template"""
+        instrumentation._normalize_cached.cache_clear()
+        _normalize(_values_page(500))
+        _normalize(_values_page(800))
+        info = instrumentation._normalize_cached.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+    
+    def test_long_statement_without_rows(self):
+        """Test long statements without a row list fall back to full normalization"""
+        statement = "SELECT * FROM t WHERE a IN (" + ", ".join(str(i) for i in range(2000)) + ")"
+        self.assertGreater(len(statement), CACHED_STATEMENT_CHARS)
+        self.assertEqual(_normalize(statement), "SELECT * FROM t WHERE a IN (?...)")
+
+
+class TestMergeSnapshots(unittest.TestCase):
+    """Test cases for merging per-process snapshots"""
+    
+    def test_merge_sums_by_fingerprint(self):
+        """Test counters and histograms add up and max_seconds takes the maximum"""
+        first = _snapshot(1, [{
+            'fingerprint': 'abc', 'statement': 'SELECT ?', 'calls': 2, 'errors': 0, 'rows': 5,
+            'stages': {'load': 2}, 'histogram': _histogram(0), 'total_seconds': 0.5, 'max_seconds': 0.4
+        }], [{
+            'stage': 'load', 'calls': 1, 'errors': 0, 'queries': 2, 'query_seconds': 0.5,
+            'histogram': _histogram(3), 'total_seconds': 0.6, 'max_seconds': 0.6
+        }])
+        second = _snapshot(2, [{
+            'fingerprint': 'abc', 'statement': 'SELECT ?', 'calls': 3, 'errors': 1, 'rows': 7,
+            'stages': {'load': 1, 'save': 2}, 'histogram': _histogram(0), 'total_seconds': 1.5, 'max_seconds': 0.9
+        }, {
+            'fingerprint': 'def', 'statement': 'DELETE FROM t', 'calls': 1, 'errors': 0, 'rows': 0,
+            'stages': {}, 'histogram': _histogram(1), 'total_seconds': 0.1, 'max_seconds': 0.1
+        }])
+        
+        merged = merge_snapshots([first, second])
+        queries = {entry['fingerprint']: entry for entry in merged['queries']}
+        
+        self.assertEqual(set(queries), {'abc', 'def'})
+        self.assertEqual(queries['abc']['calls'], 5)
+        self.assertEqual(queries['abc']['errors'], 1)
+        self.assertEqual(queries['abc']['rows'], 12)
+        self.assertEqual(queries['abc']['stages'], {'load': 3, 'save': 2})
+        self.assertEqual(queries['abc']['histogram'][0], 2)
+        self.assertAlmostEqual(queries['abc']['total_seconds'], 2.0)
+        self.assertEqual(queries['abc']['max_seconds'], 0.9)
+        self.assertEqual(queries['abc']['statement'], 'SELECT ?')
+        self.assertEqual(len(merged['spans']), 1)
+        self.assertIsNone(merged['pid'])
+    
+    def test_merge_does_not_modify_inputs(self):
+        """Test the first snapshot's entries are copied, not updated in place"""
+        entry = {
+            'fingerprint': 'abc', 'statement': 'SELECT ?', 'calls': 1, 'errors': 0, 'rows': 1,
+            'stages': {'load': 1}, 'histogram': _histogram(0), 'total_seconds': 0.1, 'max_seconds': 0.1
+        }
+        merge_snapshots([_snapshot(1, [entry]), _snapshot(2, [dict(entry, stages={'load': 4})])])
+        
+        self.assertEqual(entry['calls'], 1)
+        self.assertEqual(entry['stages'], {'load': 1})
+    
+    def test_merge_rejects_different_buckets(self):
+        """Test snapshots with another bucket layout are refused"""
+        snap = _snapshot(1, [])
+        snap['buckets'] = [0.1, 1.0]
+        with self.assertRaises(ValueError):
+            merge_snapshots([_snapshot(2, []), snap])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Build Statistics Rollups
+Installs the dashboard rollup table and triggers in smart_warehouse and
+backfills the hourly/daily counters from the existing rows
+"""
+
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+# Add shared utils to path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from db_connector import DBConnector
+from stat_rollups import ROLLUP_METRICS, install_rollups, backfill_rollups, rollup_totals, rollup_ready_metrics
+
+# The AI-04..AI-09 dashboards all read smart_warehouse
+DEFAULT_CONFIG = Path(__file__).parent.parent.parent / "04_intimation_smart_consent_triggering" / "config" / "db_config.yaml"
+
+
+def build_stat_rollups(args):
+    """Install triggers, backfill buckets and print the resulting totals"""
+    print("=" * 80)
+    print("Building Dashboard Statistics Rollups")
+    print("=" * 80)
+    
+    with open(args.config, 'r') as f:
+        db_config = yaml.safe_load(f)['database']
+    
+    db = DBConnector(
+        host=db_config['host'],
+        port=db_config['port'],
+        database=db_config['name'],
+        user=db_config['user'],
+        password=db_config['password']
+    )
+    
+    try:
+        db.connect()
+        metrics = args.metric or None
+        
+        if not args.backfill_only:
+            print("\n🔧 Installing rollup table and triggers...")
+            metrics = install_rollups(db.connection, metrics)
+        
+        if not args.install_only and metrics != []:
+            since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+            print(f"\n🔁 Backfilling rollups{f' from {args.since}' if since else ''}...")
+            written = backfill_rollups(db.connection, metrics, since=since)
+            print(f"   Wrote {sum(written.values())} buckets for {len(written)} metrics")
+        
+        # Dashboards only read metrics that are installed and fully backfilled
+        print("\n📊 Rollup totals:")
+        totals = rollup_totals(db.connection, metrics or list(ROLLUP_METRICS))
+        ready = rollup_ready_metrics(db.connection)
+        for metric, counts in totals.items():
+            status = "ready" if metric in ready else "not ready (install + full backfill needed)"
+            print(f"   {metric:<42} {sum(counts.values()):>10}  {status}  {dict(sorted(counts.items()))}")
+        
+        print("\n" + "=" * 80)
+    
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Install and backfill dashboard statistics rollups')
+    parser.add_argument('--config', default=str(DEFAULT_CONFIG), help='db_config.yaml of the dashboard database')
+    parser.add_argument('--metric', action='append', choices=sorted(ROLLUP_METRICS),
+                        help='Metric to install/backfill (repeatable, default: all)')
+    parser.add_argument('--since', help='Only rebuild buckets from this day on (YYYY-MM-DD)')
+    parser.add_argument('--install-only', action='store_true', help='Install triggers without backfilling')
+    parser.add_argument('--backfill-only', action='store_true', help='Backfill without (re)creating triggers')
+    build_stat_rollups(parser.parse_args())
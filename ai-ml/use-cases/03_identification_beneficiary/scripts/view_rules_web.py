@@ -6,14 +6,14 @@ Run this script and open http://localhost:5001 in your browser
 
 import sys
 from pathlib import Path
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, render_template_string, jsonify, request
 from datetime import datetime
 import pandas as pd
-import yaml
 
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
-from db_connector import DBConnector
+from dashboard_data import get_dashboard_source, all_dashboard_sources, conditional_json
+from stat_rollups import rollup_stats_queries
 
 app = Flask(__name__)
 
@@ -21,18 +21,59 @@ app = Flask(__name__)
 def get_db_connection():
     """Get database connection"""
     db_config_path = Path(__file__).parent.parent / "config" / "db_config.yaml"
-    with open(db_config_path, 'r') as f:
-        db_config = yaml.safe_load(f)['database']
+    return get_source(db_config_path).checkout()
+
+
+# Pooled data sources: one connection pool per database, list queries served
+# one keyset page at a time, stats from snapshots refreshed in the background
+STATS_TTL_SECONDS = 30
+STATS_MAX_AGE_SECONDS = 10
+
+
+def get_source(config_path):
+    """Get pooled data source for a use case db_config.yaml"""
+    return get_dashboard_source(config_path, stats_ttl_seconds=STATS_TTL_SECONDS)
+
+
+def first_page(source, lists, name, limit=None):
+    """First page of a list query as records (same coercion as pd.read_sql)"""
+    sql, order_by = lists[name]
+    return source.page(sql, order_by, limit=limit, as_frame=True)['items'].to_dict('records')
+
+
+def list_page_response(source, lists, name):
+    """JSON page of a list query (?cursor=<next_cursor>&limit=<rows>)"""
+    sql, order_by = lists[name]
+    try:
+        result = source.page(
+            sql,
+            order_by,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
     
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    db.connect()
-    return db
+    return jsonify({name: result['items'], 'next_cursor': result['next_cursor'], 'limit': result['limit']})
+
+
+def stats_response(source, name, query, fallback_query=None):
+    """Cached stats snapshot as JSON with ETag/Last-Modified (304 when unchanged)"""
+    try:
+        snapshot = source.get_stats(name, query, fallback_query)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    return conditional_json(snapshot.data, snapshot.etag, snapshot.changed_at, max_age=STATS_MAX_AGE_SECONDS)
+
+
+def register_list_endpoints(prefix, get_source_func, lists):
+    """Add a paginated /<prefix>/api/<name> route per list query"""
+    for name in lists:
+        def view(name=name):
+            return list_page_response(get_source_func(), lists, name)
+        app.add_url_rule(f'/{prefix}/api/{name}', endpoint=f'{prefix}_api_{name}', view_func=view)
 
 # HTML Template
 HTML_TEMPLATE = """
@@ -465,21 +506,79 @@ def index():
 
 
 # Intimation Campaign Results Routes
-def get_intimation_db_connection():
-    """Get database connection for intimation use case"""
+def get_intimation_source():
+    """Get pooled data source for intimation use case"""
     config_path = Path(__file__).parent.parent.parent / "04_intimation_smart_consent_triggering" / "config" / "db_config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    db_config = config['database']
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    return db
+    return get_source(config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+INTIMATION_STATS_COLUMNS = [
+    ('total_campaigns', 'intimation.campaigns', None,
+     "SELECT COUNT(*) FROM intimation.campaigns"),
+    ('total_candidates', 'intimation.campaign_candidates', None,
+     "SELECT COUNT(*) FROM intimation.campaign_candidates"),
+    ('total_messages', 'intimation.message_logs', None,
+     "SELECT COUNT(*) FROM intimation.message_logs"),
+    ('total_consents', 'intimation.consent_records', None,
+     "SELECT COUNT(*) FROM intimation.consent_records"),
+]
+INTIMATION_STATS_QUERY, INTIMATION_STATS_COUNT_QUERY = rollup_stats_queries(INTIMATION_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai04/api/<name>
+INTIMATION_LISTS = {
+    'campaigns': ("""
+        SELECT 
+            campaign_id,
+            campaign_name,
+            scheme_code,
+            status,
+            created_at,
+            (SELECT COUNT(*) FROM intimation.campaign_candidates 
+             WHERE campaign_id = c.campaign_id) as candidate_count
+        FROM intimation.campaigns c
+    """, [('created_at', 'DESC'), ('campaign_id', 'DESC')]),
+    'candidates': ("""
+        SELECT 
+            candidate_id,
+            campaign_id,
+            family_id,
+            scheme_code,
+            eligibility_score,
+            priority_score
+        FROM intimation.campaign_candidates
+    """, [('candidate_id', 'DESC')]),
+    'messages': ("""
+        SELECT 
+            ml.message_id,
+            ml.recipient_id as family_id,
+            cc.scheme_code,
+            ml.channel,
+            ml.message_language as language,
+            ml.message_body,
+            ml.status,
+            ml.created_at
+        FROM intimation.message_logs ml
+        LEFT JOIN intimation.campaign_candidates cc ON ml.candidate_id = cc.candidate_id
+    """, [('created_at', 'DESC'), ('message_id', 'DESC')]),
+    'consents': ("""
+        SELECT 
+            consent_id,
+            family_id,
+            scheme_code,
+            consent_type,
+            status,
+            consent_method,
+            consent_channel,
+            created_at
+        FROM intimation.consent_records
+    """, [('created_at', 'DESC'), ('consent_id', 'DESC')]),
+}
+
+
+register_list_endpoints('ai04', get_intimation_source, INTIMATION_LISTS)
 
 
 INTIMATION_HTML_TEMPLATE = """
@@ -855,91 +954,23 @@ INTIMATION_HTML_TEMPLATE = """
 @app.route('/ai04/')
 def intimation_index():
     """Main page displaying all campaign results"""
-    db = get_intimation_db_connection()
-    
     try:
-        db.connect()
+        source = get_intimation_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM intimation.campaigns) as total_campaigns,
-                (SELECT COUNT(*) FROM intimation.campaign_candidates) as total_candidates,
-                (SELECT COUNT(*) FROM intimation.message_logs) as total_messages,
-                (SELECT COUNT(*) FROM intimation.consent_records) as total_consents
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('intimation', INTIMATION_STATS_QUERY, INTIMATION_STATS_COUNT_QUERY).data)
         
-        # Get recent campaigns
-        campaigns_query = """
-            SELECT 
-                campaign_id,
-                campaign_name,
-                scheme_code,
-                status,
-                created_at,
-                (SELECT COUNT(*) FROM intimation.campaign_candidates 
-                 WHERE campaign_id = c.campaign_id) as candidate_count
-            FROM intimation.campaigns c
-            ORDER BY created_at DESC
-            LIMIT 10
-        """
-        campaigns_df = pd.read_sql(campaigns_query, db.connection)
-        campaigns = campaigns_df.to_dict('records')
+        # Get recent campaigns (first page, more via /ai04/api/campaigns)
+        campaigns = first_page(source, INTIMATION_LISTS, 'campaigns', limit=10)
         
-        # Get recent candidates
-        candidates_query = """
-            SELECT 
-                candidate_id,
-                campaign_id,
-                family_id,
-                scheme_code,
-                eligibility_score,
-                priority_score
-            FROM intimation.campaign_candidates
-            ORDER BY candidate_id DESC
-            LIMIT 20
-        """
-        candidates_df = pd.read_sql(candidates_query, db.connection)
-        candidates = candidates_df.to_dict('records')
+        # Get recent candidates (first page, more via /ai04/api/candidates)
+        candidates = first_page(source, INTIMATION_LISTS, 'candidates')
         
-        # Get recent messages
-        messages_query = """
-            SELECT 
-                ml.message_id,
-                ml.recipient_id as family_id,
-                cc.scheme_code,
-                ml.channel,
-                ml.message_language as language,
-                ml.message_body,
-                ml.status,
-                ml.created_at
-            FROM intimation.message_logs ml
-            LEFT JOIN intimation.campaign_candidates cc ON ml.candidate_id = cc.candidate_id
-            ORDER BY ml.created_at DESC
-            LIMIT 20
-        """
-        messages_df = pd.read_sql(messages_query, db.connection)
-        messages = messages_df.to_dict('records')
+        # Get recent messages (first page, more via /ai04/api/messages)
+        messages = first_page(source, INTIMATION_LISTS, 'messages')
         
-        # Get recent consents
-        consents_query = """
-            SELECT 
-                consent_id,
-                family_id,
-                scheme_code,
-                consent_type,
-                status,
-                consent_method,
-                consent_channel,
-                created_at
-            FROM intimation.consent_records
-            ORDER BY created_at DESC
-            LIMIT 20
-        """
-        consents_df = pd.read_sql(consents_query, db.connection)
-        consents = consents_df.to_dict('records')
+        # Get recent consents (first page, more via /ai04/api/consents)
+        consents = first_page(source, INTIMATION_LISTS, 'consents')
         
         # Format timestamps
         for campaign in campaigns:
@@ -976,48 +1007,66 @@ def intimation_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
 
 
 @app.route('/ai04/api/stats')
 def intimation_api_stats():
-    """API endpoint for statistics"""
-    db = get_intimation_db_connection()
-    
-    try:
-        db.connect()
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM intimation.campaigns) as total_campaigns,
-                (SELECT COUNT(*) FROM intimation.campaign_candidates) as total_candidates,
-                (SELECT COUNT(*) FROM intimation.message_logs) as total_messages,
-                (SELECT COUNT(*) FROM intimation.consent_records) as total_consents
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        return jsonify(stats_df.iloc[0].to_dict())
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        db.disconnect()
+    """API endpoint for statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_intimation_source(), 'intimation', INTIMATION_STATS_QUERY, INTIMATION_STATS_COUNT_QUERY)
 
 
 # Application Submission Routes (AI-PLATFORM-05)
-def get_application_db_connection():
-    """Get database connection for application submission use case"""
+def get_application_source():
+    """Get pooled data source for application submission use case"""
     config_path = Path(__file__).parent.parent.parent / "05_auto_app_submission_post_consent" / "config" / "db_config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    db_config = config['database']
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    return db
+    return get_source(config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+APPLICATION_STATS_COLUMNS = [
+    ('total_applications', 'application.applications', None,
+     "SELECT COUNT(*) FROM application.applications"),
+    ('submitted_applications', 'application.applications', "dimension = 'submitted'",
+     "SELECT COUNT(*) FROM application.applications WHERE status = 'submitted'"),
+    ('pending_applications', 'application.applications', "dimension IN ('creating', 'mapped', 'validated', 'pending_review')",
+     "SELECT COUNT(*) FROM application.applications WHERE status IN ('creating', 'mapped', 'validated', 'pending_review')"),
+    ('error_applications', 'application.applications', "dimension = 'error'",
+     "SELECT COUNT(*) FROM application.applications WHERE status = 'error'"),
+]
+APPLICATION_STATS_QUERY, APPLICATION_STATS_COUNT_QUERY = rollup_stats_queries(APPLICATION_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai05/api/<name>
+APPLICATION_LISTS = {
+    'applications': ("""
+        SELECT 
+            a.application_id,
+            a.family_id,
+            a.scheme_code,
+            a.status,
+            a.submission_mode,
+            a.eligibility_score,
+            a.created_at,
+            (SELECT COUNT(*) FROM application.application_fields WHERE application_id = a.application_id) as fields_count
+        FROM application.applications a
+    """, [('created_at', 'DESC'), ('application_id', 'DESC')]),
+    'submissions': ("""
+        SELECT 
+            s.submission_id,
+            s.application_id,
+            a.scheme_code,
+            s.response_status as status,
+            s.department_application_number as dept_response_code,
+            s.submitted_at,
+            COALESCE(s.submitted_at, TIMESTAMP '1970-01-01') as sort_time
+        FROM application.application_submissions s
+        JOIN application.applications a ON s.application_id = a.application_id
+    """, [('sort_time', 'DESC'), ('submission_id', 'DESC')]),
+}
+
+
+register_list_endpoints('ai05', get_application_source, APPLICATION_LISTS)
 
 
 APPLICATION_HTML_TEMPLATE = """
@@ -1358,56 +1407,17 @@ APPLICATION_HTML_TEMPLATE = """
 @app.route('/ai05/')
 def application_index():
     """Main page displaying application submission results"""
-    db = get_application_db_connection()
-    
     try:
-        db.connect()
+        source = get_application_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM application.applications) as total_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status = 'submitted') as submitted_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status IN ('creating', 'mapped', 'validated', 'pending_review')) as pending_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status = 'error') as error_applications
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('application', APPLICATION_STATS_QUERY, APPLICATION_STATS_COUNT_QUERY).data)
         
-        # Get recent applications
-        applications_query = """
-            SELECT 
-                a.application_id,
-                a.family_id,
-                a.scheme_code,
-                a.status,
-                a.submission_mode,
-                a.eligibility_score,
-                a.created_at,
-                (SELECT COUNT(*) FROM application.application_fields WHERE application_id = a.application_id) as fields_count
-            FROM application.applications a
-            ORDER BY a.created_at DESC
-            LIMIT 20
-        """
-        applications_df = pd.read_sql(applications_query, db.connection)
-        applications = applications_df.to_dict('records')
+        # Get recent applications (first page, more via /ai05/api/applications)
+        applications = first_page(source, APPLICATION_LISTS, 'applications')
         
-        # Get recent submissions
-        submissions_query = """
-            SELECT 
-                s.submission_id,
-                s.application_id,
-                a.scheme_code,
-                s.response_status as status,
-                s.department_application_number as dept_response_code,
-                s.submitted_at
-            FROM application.application_submissions s
-            JOIN application.applications a ON s.application_id = a.application_id
-            ORDER BY s.submitted_at DESC NULLS LAST
-            LIMIT 20
-        """
-        submissions_df = pd.read_sql(submissions_query, db.connection)
-        submissions = submissions_df.to_dict('records')
+        # Get recent submissions (first page, more via /ai05/api/submissions)
+        submissions = first_page(source, APPLICATION_LISTS, 'submissions')
         
         # Format timestamps
         for app in applications:
@@ -1436,53 +1446,65 @@ def application_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
 
 
 @app.route('/ai05/api/stats')
 def application_api_stats():
-    """API endpoint for application statistics"""
-    db = get_application_db_connection()
-    
-    try:
-        db.connect()
-        
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM application.applications) as total_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status = 'submitted') as submitted_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status IN ('creating', 'mapped', 'validated', 'pending_review')) as pending_applications,
-                (SELECT COUNT(*) FROM application.applications WHERE status = 'error') as error_applications
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
-        
-        return jsonify(stats)
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    
-    finally:
-        db.disconnect()
+    """API endpoint for application statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_application_source(), 'application', APPLICATION_STATS_QUERY, APPLICATION_STATS_COUNT_QUERY)
 
 
 # Decision Evaluation Routes (AI-PLATFORM-06)
-def get_decision_db_connection():
-    """Get database connection for decision evaluation use case"""
+def get_decision_source():
+    """Get pooled data source for decision evaluation use case"""
     config_path = Path(__file__).parent.parent.parent / "06_auto_approval_straight_processing" / "config" / "db_config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    db_config = config['database']
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    return db
+    return get_source(config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+DECISION_STATS_COLUMNS = [
+    ('total_decisions', 'decision.decisions', None,
+     "SELECT COUNT(*) FROM decision.decisions"),
+    ('auto_approved', 'decision.decisions', "dimension = 'AUTO_APPROVE'",
+     "SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_APPROVE'"),
+    ('officer_reviewed', 'decision.decisions', "dimension IN ('ROUTE_TO_OFFICER', 'ROUTE_TO_FRAUD')",
+     "SELECT COUNT(*) FROM decision.decisions WHERE decision_type IN ('ROUTE_TO_OFFICER', 'ROUTE_TO_FRAUD')"),
+    ('rejected', 'decision.decisions', "dimension = 'AUTO_REJECT'",
+     "SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_REJECT'"),
+]
+DECISION_STATS_QUERY, DECISION_STATS_COUNT_QUERY = rollup_stats_queries(DECISION_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai06/api/<name>
+DECISION_LISTS = {
+    'decisions': ("""
+        SELECT 
+            d.decision_id,
+            d.application_id,
+            d.scheme_code,
+            d.decision_type,
+            d.decision_status,
+            d.risk_score,
+            d.risk_band,
+            d.decision_timestamp,
+            COALESCE(d.decision_timestamp, d.created_at, TIMESTAMP '1970-01-01') as sort_time
+        FROM decision.decisions d
+    """, [('sort_time', 'DESC'), ('decision_id', 'DESC')]),
+    'payment_triggers': ("""
+        SELECT 
+            pt.trigger_id,
+            pt.decision_id,
+            pt.payment_status,
+            pt.payment_system,
+            pt.triggered_at,
+            COALESCE(pt.triggered_at, TIMESTAMP '1970-01-01') as sort_time
+        FROM decision.payment_triggers pt
+    """, [('sort_time', 'DESC'), ('trigger_id', 'DESC')]),
+}
+
+
+register_list_endpoints('ai06', get_decision_source, DECISION_LISTS)
 
 
 DECISION_HTML_TEMPLATE = """
@@ -1854,54 +1876,17 @@ DECISION_HTML_TEMPLATE = """
 @app.route('/ai06/')
 def decision_index():
     """Main page displaying decision evaluation results"""
-    db = get_decision_db_connection()
-    
     try:
-        db.connect()
+        source = get_decision_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM decision.decisions) as total_decisions,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_APPROVE') as auto_approved,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type IN ('ROUTE_TO_OFFICER', 'ROUTE_TO_FRAUD')) as officer_reviewed,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_REJECT') as rejected
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('decision', DECISION_STATS_QUERY, DECISION_STATS_COUNT_QUERY).data)
         
-        # Get recent decisions
-        decisions_query = """
-            SELECT 
-                d.decision_id,
-                d.application_id,
-                d.scheme_code,
-                d.decision_type,
-                d.decision_status,
-                d.risk_score,
-                d.risk_band,
-                d.decision_timestamp
-            FROM decision.decisions d
-            ORDER BY d.decision_timestamp DESC NULLS LAST, d.created_at DESC
-            LIMIT 20
-        """
-        decisions_df = pd.read_sql(decisions_query, db.connection)
-        decisions = decisions_df.to_dict('records')
+        # Get recent decisions (first page, more via /ai06/api/decisions)
+        decisions = first_page(source, DECISION_LISTS, 'decisions')
         
-        # Get payment triggers
-        payment_query = """
-            SELECT 
-                pt.trigger_id,
-                pt.decision_id,
-                pt.payment_status,
-                pt.payment_system,
-                pt.triggered_at
-            FROM decision.payment_triggers pt
-            ORDER BY pt.triggered_at DESC NULLS LAST
-            LIMIT 20
-        """
-        payment_df = pd.read_sql(payment_query, db.connection)
-        payment_triggers = payment_df.to_dict('records')
+        # Get payment triggers (first page, more via /ai06/api/payment_triggers)
+        payment_triggers = first_page(source, DECISION_LISTS, 'payment_triggers')
         
         # Format timestamps
         for decision in decisions:
@@ -1934,53 +1919,68 @@ def decision_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
 
 
 @app.route('/ai06/api/stats')
 def decision_api_stats():
-    """API endpoint for decision statistics"""
-    db = get_decision_db_connection()
-    
-    try:
-        db.connect()
-        
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM decision.decisions) as total_decisions,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_APPROVE') as auto_approved,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type IN ('ROUTE_TO_OFFICER', 'ROUTE_TO_FRAUD')) as officer_reviewed,
-                (SELECT COUNT(*) FROM decision.decisions WHERE decision_type = 'AUTO_REJECT') as rejected
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
-        
-        return jsonify(stats)
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    
-    finally:
-        db.disconnect()
+    """API endpoint for decision statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_decision_source(), 'decision', DECISION_STATS_QUERY, DECISION_STATS_COUNT_QUERY)
 
 
 # Beneficiary Detection Routes (AI-PLATFORM-07)
-def get_detection_db_connection():
-    """Get database connection for beneficiary detection use case"""
+def get_detection_source():
+    """Get pooled data source for beneficiary detection use case"""
     config_path = Path(__file__).parent.parent.parent / "07_ineligible_mistargeted_beneficiary_detection" / "config" / "db_config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    db_config = config['database']
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    return db
+    return get_source(config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+DETECTION_STATS_COLUMNS = [
+    ('total_runs', 'detection.detection_runs', None,
+     "SELECT COUNT(*) FROM detection.detection_runs"),
+    ('total_cases', 'detection.detected_cases', None,
+     "SELECT COUNT(*) FROM detection.detected_cases"),
+    ('hard_ineligible', 'detection.detected_cases', "dimension = 'HARD_INELIGIBLE'",
+     "SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'HARD_INELIGIBLE'"),
+    ('mis_targeted', 'detection.detected_cases', "dimension = 'LIKELY_MIS_TARGETED'",
+     "SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'LIKELY_MIS_TARGETED'"),
+]
+DETECTION_STATS_QUERY, DETECTION_STATS_COUNT_QUERY = rollup_stats_queries(DETECTION_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai07/api/<name>
+DETECTION_LISTS = {
+    'detection_runs': ("""
+        SELECT 
+            run_id,
+            run_type,
+            run_status,
+            total_beneficiaries_scanned,
+            total_cases_flagged,
+            started_by,
+            run_date
+        FROM detection.detection_runs
+    """, [('run_date', 'DESC'), ('run_id', 'DESC')]),
+    'detected_cases': ("""
+        SELECT 
+            case_id,
+            beneficiary_id,
+            scheme_code,
+            case_type,
+            confidence_level,
+            case_status,
+            priority,
+            financial_exposure,
+            risk_score,
+            detection_timestamp,
+            COALESCE(priority, 2147483647) as sort_priority
+        FROM detection.detected_cases
+    """, [('sort_priority', 'ASC'), ('detection_timestamp', 'DESC'), ('case_id', 'DESC')]),
+}
+
+
+register_list_endpoints('ai07', get_detection_source, DETECTION_LISTS)
 
 
 DETECTION_HTML_TEMPLATE = """
@@ -2368,58 +2368,17 @@ DETECTION_HTML_TEMPLATE = """
 @app.route('/ai07/')
 def detection_index():
     """Main page displaying beneficiary detection results"""
-    db = get_detection_db_connection()
-    
     try:
-        db.connect()
+        source = get_detection_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM detection.detection_runs) as total_runs,
-                (SELECT COUNT(*) FROM detection.detected_cases) as total_cases,
-                (SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'HARD_INELIGIBLE') as hard_ineligible,
-                (SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'LIKELY_MIS_TARGETED') as mis_targeted
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('detection', DETECTION_STATS_QUERY, DETECTION_STATS_COUNT_QUERY).data)
         
-        # Get recent detection runs
-        runs_query = """
-            SELECT 
-                run_id,
-                run_type,
-                run_status,
-                total_beneficiaries_scanned,
-                total_cases_flagged,
-                started_by,
-                run_date
-            FROM detection.detection_runs
-            ORDER BY run_date DESC
-            LIMIT 10
-        """
-        runs_df = pd.read_sql(runs_query, db.connection)
-        detection_runs = runs_df.to_dict('records')
+        # Get recent detection runs (first page, more via /ai07/api/detection_runs)
+        detection_runs = first_page(source, DETECTION_LISTS, 'detection_runs', limit=10)
         
-        # Get recent detected cases
-        cases_query = """
-            SELECT 
-                case_id,
-                beneficiary_id,
-                scheme_code,
-                case_type,
-                confidence_level,
-                case_status,
-                priority,
-                financial_exposure,
-                risk_score,
-                detection_timestamp
-            FROM detection.detected_cases
-            ORDER BY priority ASC, detection_timestamp DESC
-            LIMIT 20
-        """
-        cases_df = pd.read_sql(cases_query, db.connection)
-        detected_cases = cases_df.to_dict('records')
+        # Get recent detected cases (first page, more via /ai07/api/detected_cases)
+        detected_cases = first_page(source, DETECTION_LISTS, 'detected_cases')
         
         # Format timestamps
         for run in detection_runs:
@@ -2448,26 +2407,54 @@ def detection_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
 
 
 # Eligibility Checker Viewer Routes (AI-PLATFORM-08)
-def get_eligibility_checker_db_connection():
-    """Get database connection for eligibility checker use case"""
+def get_eligibility_checker_source():
+    """Get pooled data source for eligibility checker use case"""
     config_path = Path(__file__).parent.parent.parent / "08_eligibility_checker_recommendation" / "config" / "db_config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    db_config = config['database']
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    return db
+    return get_source(config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+ELIGIBILITY_CHECKER_STATS_COLUMNS = [
+    ('total_checks', 'eligibility_checker.eligibility_checks', None,
+     "SELECT COUNT(*) FROM eligibility_checker.eligibility_checks"),
+    ('logged_in_checks', 'eligibility_checker.eligibility_checks', "dimension = 'LOGGED_IN'",
+     "SELECT COUNT(*) FROM eligibility_checker.eligibility_checks WHERE user_type = 'LOGGED_IN'"),
+    ('guest_checks', 'eligibility_checker.eligibility_checks', "dimension = 'GUEST'",
+     "SELECT COUNT(*) FROM eligibility_checker.eligibility_checks WHERE user_type = 'GUEST'"),
+    ('total_recommendations', 'eligibility_checker.recommendation_sets', "dimension = 'ACTIVE'",
+     "SELECT COUNT(*) FROM eligibility_checker.recommendation_sets WHERE is_active = TRUE"),
+]
+ELIGIBILITY_CHECKER_STATS_QUERY, ELIGIBILITY_CHECKER_STATS_COUNT_QUERY = rollup_stats_queries(ELIGIBILITY_CHECKER_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai08/api/<name>
+ELIGIBILITY_CHECKER_LISTS = {
+    'checks': ("""
+        SELECT 
+            check_id, user_type, check_type, check_mode,
+            total_schemes_checked, eligible_count, possible_eligible_count, not_eligible_count,
+            check_timestamp
+        FROM eligibility_checker.eligibility_checks
+    """, [('check_timestamp', 'DESC'), ('check_id', 'DESC')]),
+    'scheme_results': ("""
+        SELECT 
+            ser.check_id, ser.scheme_code, ser.scheme_name, ser.eligibility_status,
+            ser.eligibility_score, ser.confidence_level, ser.recommendation_rank,
+            ser.explanation_text,
+            ser.result_id,
+            ec.check_timestamp,
+            COALESCE(ser.recommendation_rank, 2147483647) as sort_rank
+        FROM eligibility_checker.scheme_eligibility_results ser
+        INNER JOIN eligibility_checker.eligibility_checks ec ON ser.check_id = ec.check_id
+    """, [('check_timestamp', 'DESC'), ('check_id', 'DESC'), ('sort_rank', 'ASC'), ('result_id', 'ASC')]),
+}
+
+
+register_list_endpoints('ai08', get_eligibility_checker_source, ELIGIBILITY_CHECKER_LISTS)
 
 ELIGIBILITY_CHECKER_HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -2873,34 +2860,14 @@ ELIGIBILITY_CHECKER_HTML_TEMPLATE = """
 @app.route('/ai08/')
 def eligibility_checker_index():
     """Main page displaying eligibility checker results"""
-    db = get_eligibility_checker_db_connection()
-    
     try:
-        db.connect()
+        source = get_eligibility_checker_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM eligibility_checker.eligibility_checks) as total_checks,
-                (SELECT COUNT(*) FROM eligibility_checker.eligibility_checks WHERE user_type = 'LOGGED_IN') as logged_in_checks,
-                (SELECT COUNT(*) FROM eligibility_checker.eligibility_checks WHERE user_type = 'GUEST') as guest_checks,
-                (SELECT COUNT(*) FROM eligibility_checker.recommendation_sets WHERE is_active = TRUE) as total_recommendations
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('eligibility_checker', ELIGIBILITY_CHECKER_STATS_QUERY, ELIGIBILITY_CHECKER_STATS_COUNT_QUERY).data)
         
-        # Get recent eligibility checks
-        checks_query = """
-            SELECT 
-                check_id, user_type, check_type, check_mode,
-                total_schemes_checked, eligible_count, possible_eligible_count, not_eligible_count,
-                check_timestamp
-            FROM eligibility_checker.eligibility_checks
-            ORDER BY check_timestamp DESC
-            LIMIT 15
-        """
-        checks_df = pd.read_sql(checks_query, db.connection)
-        checks = checks_df.to_dict('records')
+        # Get recent eligibility checks (first page, more via /ai08/api/checks)
+        checks = first_page(source, ELIGIBILITY_CHECKER_LISTS, 'checks', limit=15)
         
         # Get top recommendations (from recent checks)
         recommendations_query = """
@@ -2916,22 +2883,11 @@ def eligibility_checker_index():
             ORDER BY ser.scheme_code, ser.recommendation_rank, ec.check_timestamp DESC
             LIMIT 20
         """
-        recommendations_df = pd.read_sql(recommendations_query, db.connection)
+        recommendations_df = source.query_df(recommendations_query)
         recommendations = recommendations_df.to_dict('records')
         
-        # Get recent scheme results
-        scheme_results_query = """
-            SELECT 
-                ser.check_id, ser.scheme_code, ser.scheme_name, ser.eligibility_status,
-                ser.eligibility_score, ser.confidence_level, ser.recommendation_rank,
-                ser.explanation_text
-            FROM eligibility_checker.scheme_eligibility_results ser
-            INNER JOIN eligibility_checker.eligibility_checks ec ON ser.check_id = ec.check_id
-            ORDER BY ec.check_timestamp DESC, ser.recommendation_rank ASC NULLS LAST
-            LIMIT 30
-        """
-        scheme_results_df = pd.read_sql(scheme_results_query, db.connection)
-        scheme_results = scheme_results_df.to_dict('records')
+        # Get recent scheme results (first page, more via /ai08/api/scheme_results)
+        scheme_results = first_page(source, ELIGIBILITY_CHECKER_LISTS, 'scheme_results', limit=30)
         
         # Format timestamps
         for check in checks:
@@ -2973,55 +2929,73 @@ def eligibility_checker_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
+
+
+@app.route('/ai08/api/stats')
+def eligibility_checker_api_stats():
+    """API endpoint for eligibility checker statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_eligibility_checker_source(), 'eligibility_checker', ELIGIBILITY_CHECKER_STATS_QUERY, ELIGIBILITY_CHECKER_STATS_COUNT_QUERY)
 
 @app.route('/ai07/api/stats')
 def detection_api_stats():
-    """API endpoint for detection statistics"""
-    db = get_detection_db_connection()
-    
-    try:
-        db.connect()
-        
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM detection.detection_runs) as total_runs,
-                (SELECT COUNT(*) FROM detection.detected_cases) as total_cases,
-                (SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'HARD_INELIGIBLE') as hard_ineligible,
-                (SELECT COUNT(*) FROM detection.detected_cases WHERE case_type = 'LIKELY_MIS_TARGETED') as mis_targeted
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
-        
-        return jsonify(stats)
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    
-    finally:
-        db.disconnect()
+    """API endpoint for detection statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_detection_source(), 'detection', DETECTION_STATS_QUERY, DETECTION_STATS_COUNT_QUERY)
 
 
-def get_inclusion_db_connection():
-    """Get database connection for inclusion schema"""
+def get_inclusion_source():
+    """Get pooled data source for inclusion schema"""
     db_config_path = Path(__file__).parent.parent.parent / "09_proactive_inclusion_exception_handling" / "config" / "db_config.yaml"
     if not db_config_path.exists():
         # Fallback to default config
         db_config_path = Path(__file__).parent.parent / "config" / "db_config.yaml"
     
-    with open(db_config_path, 'r') as f:
-        db_config = yaml.safe_load(f)['database']
-    
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    db.connect()
-    return db
+    return get_source(db_config_path)
+
+
+# Dashboard counters: (column, rollup metric, rollup dimension filter, direct count).
+# Read from the daily rollups (shared/utils/stat_rollups.py) per metric once it is
+# installed and backfilled; the count query serves databases without the rollups.
+INCLUSION_STATS_COLUMNS = [
+    ('total_priority_households', 'inclusion.priority_households', "dimension <> 'INACTIVE'",
+     "SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE"),
+    ('high_priority', 'inclusion.priority_households', "dimension = 'HIGH'",
+     "SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE AND priority_level = 'HIGH'"),
+    ('total_exceptions', 'inclusion.exception_flags', "dimension = 'PENDING_REVIEW'",
+     "SELECT COUNT(*) FROM inclusion.exception_flags WHERE review_status = 'PENDING_REVIEW'"),
+    ('total_nudges', 'inclusion.nudge_records', None,
+     "SELECT COUNT(*) FROM inclusion.nudge_records"),
+]
+INCLUSION_STATS_QUERY, INCLUSION_STATS_COUNT_QUERY = rollup_stats_queries(INCLUSION_STATS_COLUMNS)
+
+# List name -> (query, keyset sort order); served at /ai09/api/<name>
+INCLUSION_LISTS = {
+    'priority_households': ("""
+        SELECT 
+            priority_id, family_id, district, inclusion_gap_score,
+            vulnerability_score, priority_level, priority_segments,
+            eligibility_gap_count, detected_at
+        FROM inclusion.priority_households
+        WHERE is_active = TRUE
+    """, [('inclusion_gap_score', 'DESC'), ('vulnerability_score', 'DESC'), ('priority_id', 'DESC')]),
+    'exceptions': ("""
+        SELECT 
+            exception_id, family_id, exception_category, exception_description,
+            anomaly_score, review_status, detected_at,
+            COALESCE(anomaly_score, -1) as sort_score
+        FROM inclusion.exception_flags
+        WHERE review_status = 'PENDING_REVIEW'
+    """, [('sort_score', 'DESC'), ('detected_at', 'DESC'), ('exception_id', 'DESC')]),
+    'nudges': ("""
+        SELECT 
+            nudge_id, family_id, nudge_type, nudge_message,
+            channel, priority_level, delivery_status, scheduled_at,
+            COALESCE(scheduled_at, TIMESTAMP '1970-01-01') as sort_time
+        FROM inclusion.nudge_records
+    """, [('sort_time', 'DESC'), ('nudge_id', 'DESC')]),
+}
+
+
+register_list_endpoints('ai09', get_inclusion_source, INCLUSION_LISTS)
 
 
 INCLUSION_HTML_TEMPLATE = """
@@ -3320,60 +3294,20 @@ INCLUSION_HTML_TEMPLATE = """
 @app.route('/ai09/')
 def inclusion_index():
     """Main page displaying inclusion and exception handling results"""
-    db = get_inclusion_db_connection()
-    
     try:
-        db.connect()
+        source = get_inclusion_source()
         
-        # Get statistics
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE) as total_priority_households,
-                (SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE AND priority_level = 'HIGH') as high_priority,
-                (SELECT COUNT(*) FROM inclusion.exception_flags WHERE review_status = 'PENDING_REVIEW') as total_exceptions,
-                (SELECT COUNT(*) FROM inclusion.nudge_records) as total_nudges
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
+        # Get statistics (cached snapshot)
+        stats = dict(source.get_stats('inclusion', INCLUSION_STATS_QUERY, INCLUSION_STATS_COUNT_QUERY).data)
         
-        # Get priority households
-        households_query = """
-            SELECT 
-                priority_id, family_id, district, inclusion_gap_score,
-                vulnerability_score, priority_level, priority_segments,
-                eligibility_gap_count, detected_at
-            FROM inclusion.priority_households
-            WHERE is_active = TRUE
-            ORDER BY inclusion_gap_score DESC, vulnerability_score DESC
-            LIMIT 20
-        """
-        households_df = pd.read_sql(households_query, db.connection)
-        priority_households = households_df.to_dict('records')
+        # Get priority households (first page, more via /ai09/api/priority_households)
+        priority_households = first_page(source, INCLUSION_LISTS, 'priority_households')
         
-        # Get exception flags
-        exceptions_query = """
-            SELECT 
-                exception_id, family_id, exception_category, exception_description,
-                anomaly_score, review_status, detected_at
-            FROM inclusion.exception_flags
-            WHERE review_status = 'PENDING_REVIEW'
-            ORDER BY anomaly_score DESC, detected_at DESC
-            LIMIT 20
-        """
-        exceptions_df = pd.read_sql(exceptions_query, db.connection)
-        exceptions = exceptions_df.to_dict('records')
+        # Get exception flags (first page, more via /ai09/api/exceptions)
+        exceptions = first_page(source, INCLUSION_LISTS, 'exceptions')
         
-        # Get recent nudges
-        nudges_query = """
-            SELECT 
-                nudge_id, family_id, nudge_type, nudge_message,
-                channel, priority_level, delivery_status, scheduled_at
-            FROM inclusion.nudge_records
-            ORDER BY scheduled_at DESC
-            LIMIT 20
-        """
-        nudges_df = pd.read_sql(nudges_query, db.connection)
-        nudges = nudges_df.to_dict('records')
+        # Get recent nudges (first page, more via /ai09/api/nudges)
+        nudges = first_page(source, INCLUSION_LISTS, 'nudges')
         
         # Format timestamps
         for hh in priority_households:
@@ -3414,53 +3348,45 @@ def inclusion_index():
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             error=str(e)
         )
-    finally:
-        db.disconnect()
 
 
 @app.route('/ai09/api/stats')
 def inclusion_api_stats():
-    """API endpoint for inclusion statistics"""
-    db = get_inclusion_db_connection()
-    
-    try:
-        db.connect()
-        
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE) as total_priority_households,
-                (SELECT COUNT(*) FROM inclusion.priority_households WHERE is_active = TRUE AND priority_level = 'HIGH') as high_priority,
-                (SELECT COUNT(*) FROM inclusion.exception_flags WHERE review_status = 'PENDING_REVIEW') as total_exceptions,
-                (SELECT COUNT(*) FROM inclusion.nudge_records) as total_nudges
-        """
-        stats_df = pd.read_sql(stats_query, db.connection)
-        stats = stats_df.iloc[0].to_dict()
-        
-        return jsonify(stats)
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    
-    finally:
-        db.disconnect()
+    """API endpoint for inclusion statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_inclusion_source(), 'inclusion', INCLUSION_STATS_QUERY, INCLUSION_STATS_COUNT_QUERY)
 
 
 # Forecast database connection helper
-def get_forecast_db_connection():
-    """Get forecast database connection"""
+def get_forecast_source():
+    """Get pooled forecast data source"""
     db_config_path = Path(__file__).parent.parent.parent / "10_entitlement_benefit_forecast" / "config" / "db_config.yaml"
-    with open(db_config_path, 'r') as f:
-        db_config = yaml.safe_load(f)['database']
-    
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    db.connect()
-    return db
+    return get_source(db_config_path)
+
+
+def get_forecast_db_connection():
+    """Get forecast database connection (pooled, already connected)"""
+    return get_forecast_source().checkout()
+
+
+FORECAST_STATS_QUERY = """
+    SELECT 
+        (SELECT COUNT(*) FROM forecast.forecast_records WHERE status = 'COMPLETED') as total_forecasts,
+        (SELECT COUNT(DISTINCT scheme_code) FROM forecast.forecast_projections) as total_schemes,
+        (SELECT COALESCE(SUM(total_annual_value), 0) FROM forecast.forecast_records WHERE status = 'COMPLETED') as total_annual_value,
+        (SELECT COUNT(*) FROM forecast.aggregate_forecasts) as total_aggregate_forecasts
+"""
+
+# Completed forecasts, newest first (keyset-paginated)
+FORECAST_LIST_QUERY = """
+    SELECT 
+        forecast_id, family_id, horizon_months, forecast_date,
+        forecast_type, scenario_name, status,
+        total_annual_value, total_forecast_value, scheme_count,
+        uncertainty_level, generated_at
+    FROM forecast.forecast_records
+    WHERE status = 'COMPLETED'
+"""
+FORECAST_LIST_ORDER = [('generated_at', 'DESC'), ('forecast_id', 'DESC')]
 
 
 FORECAST_HTML_TEMPLATE = """
@@ -3798,24 +3724,40 @@ def forecast_index():
 
 @app.route('/ai10/api/forecasts')
 def forecast_api_forecasts():
-    """API endpoint for forecasts"""
+    """API endpoint for forecasts (?cursor=<next_cursor>&limit=<rows>)"""
+    try:
+        page = get_forecast_source().page(
+            FORECAST_LIST_QUERY,
+            FORECAST_LIST_ORDER,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
     db = get_forecast_db_connection()
     try:
         cursor = db.connection.cursor()
         
-        cursor.execute("""
-            SELECT 
-                forecast_id, family_id, horizon_months, forecast_date,
-                forecast_type, scenario_name, status,
-                total_annual_value, total_forecast_value, scheme_count,
-                uncertainty_level, generated_at
-            FROM forecast.forecast_records
-            WHERE status = 'COMPLETED'
-            ORDER BY generated_at DESC
-            LIMIT 20
-        """)
+        forecasts_data = [tuple(row.values()) for row in page['items']]
         
-        forecasts_data = cursor.fetchall()
+        # Projections of all forecasts on the page in one query
+        projections_by_forecast = {}
+        if forecasts_data:
+            cursor.execute("""
+                SELECT 
+                    forecast_id, projection_id, scheme_code, scheme_name, projection_type,
+                    period_start, period_end, period_type,
+                    benefit_amount, benefit_frequency, probability, confidence_level,
+                    assumptions, life_stage_event, event_date
+                FROM forecast.forecast_projections
+                WHERE forecast_id = ANY(%s)
+                ORDER BY forecast_id, period_start, scheme_code
+            """, ([row[0] for row in forecasts_data],))
+            for proj_row in cursor.fetchall():
+                projections_by_forecast.setdefault(proj_row[0], []).append(proj_row[1:])
         
         forecasts = []
         total_annual_value = 0
@@ -3825,18 +3767,7 @@ def forecast_api_forecasts():
         for row in forecasts_data:
             forecast_id, family_id, horizon_months, forecast_date, forecast_type, scenario_name, status, total_annual, total_forecast, scheme_count, uncertainty, generated_at = row
             
-            cursor.execute("""
-                SELECT 
-                    projection_id, scheme_code, scheme_name, projection_type,
-                    period_start, period_end, period_type,
-                    benefit_amount, benefit_frequency, probability, confidence_level,
-                    assumptions, life_stage_event, event_date
-                FROM forecast.forecast_projections
-                WHERE forecast_id = %s
-                ORDER BY period_start, scheme_code
-            """, (forecast_id,))
-            
-            projections_data = cursor.fetchall()
+            projections_data = projections_by_forecast.get(forecast_id, [])
             projections = []
             
             for proj_row in projections_data:
@@ -3899,7 +3830,8 @@ def forecast_api_forecasts():
             'total_forecasts': len(forecasts),
             'total_schemes': len(total_schemes),
             'total_annual_value': total_annual_value,
-            'avg_uncertainty': avg_uncertainty
+            'avg_uncertainty': avg_uncertainty,
+            'next_cursor': page['next_cursor']
         })
     
     except Exception as e:
@@ -3909,6 +3841,12 @@ def forecast_api_forecasts():
         db.disconnect()
 
 
+@app.route('/ai10/api/stats')
+def forecast_api_stats():
+    """API endpoint for forecast statistics (cached snapshot, supports If-None-Match)"""
+    return stats_response(get_forecast_source(), 'forecast', FORECAST_STATS_QUERY)
+
+
 # AI-PLATFORM-11: Personalized Communication & Nudging
 NUDGE_HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -4277,29 +4215,35 @@ NUDGE_HTML_TEMPLATE = """
 </html>
 """
 
-def get_nudge_db_connection():
-    """Get database connection for nudging schema"""
+def get_nudge_source():
+    """Get pooled data source for nudging schema"""
     try:
         db_config_path = Path(__file__).parent.parent.parent / "11_personalized_communication_nudging" / "config" / "db_config.yaml"
-        if db_config_path.exists():
-            with open(db_config_path, 'r') as f:
-                db_config = yaml.safe_load(f)['database']
-        else:
+        if not db_config_path.exists():
             raise FileNotFoundError
     except:
         db_config_path = Path(__file__).parent.parent / "config" / "db_config.yaml"
-        with open(db_config_path, 'r') as f:
-            db_config = yaml.safe_load(f)['database']
     
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    db.connect()
-    return db
+    return get_source(db_config_path)
+
+
+def get_nudge_db_connection():
+    """Get database connection for nudging schema (pooled, already connected)"""
+    return get_nudge_source().checkout()
+
+
+# Nudges, most recently scheduled first (keyset-paginated)
+NUDGE_LIST_QUERY = """
+    SELECT 
+        n.nudge_id, n.family_id, n.action_type, n.urgency, n.scheduled_channel,
+        n.scheduled_time, n.status, n.delivery_status,
+        n.sent_at, n.delivered_at, n.opened_at, n.clicked_at,
+        n.responded_at, n.completed_at, n.personalized_content,
+        t.template_name, t.tone
+    FROM nudging.nudges n
+    LEFT JOIN nudging.nudge_templates t ON n.template_id = t.template_id
+"""
+NUDGE_LIST_ORDER = [('scheduled_time', 'DESC'), ('nudge_id', 'DESC')]
 
 @app.route('/ai11')
 @app.route('/ai11/')
@@ -4310,24 +4254,14 @@ def nudge_index():
 @app.route('/ai11/api/nudges')
 def nudge_api_nudges():
     """API endpoint for nudges"""
-    db = get_nudge_db_connection()
     try:
-        cursor = db.connection.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                n.nudge_id, n.family_id, n.action_type, n.urgency, n.scheduled_channel,
-                n.scheduled_time, n.status, n.delivery_status,
-                n.sent_at, n.delivered_at, n.opened_at, n.clicked_at,
-                n.responded_at, n.completed_at, n.personalized_content,
-                t.template_name, t.tone
-            FROM nudging.nudges n
-            LEFT JOIN nudging.nudge_templates t ON n.template_id = t.template_id
-            ORDER BY n.scheduled_time DESC
-            LIMIT 50
-        """)
-        
-        nudges_data = cursor.fetchall()
+        page = get_nudge_source().page(
+            NUDGE_LIST_QUERY,
+            NUDGE_LIST_ORDER,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', 50, type=int)
+        )
+        nudges_data = [tuple(row.values()) for row in page['items']]
         
         nudges = []
         status_counts = {}
@@ -4362,22 +4296,20 @@ def nudge_api_nudges():
                 'tone': tone
             })
         
-        cursor.close()
-        
         return jsonify({
             'nudges': nudges,
             'total_nudges': len(nudges),
             'channels_used': len(channels_used),
-            'status_counts': status_counts
+            'status_counts': status_counts,
+            'next_cursor': page['next_cursor']
         })
     
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    
-    finally:
-        db.disconnect()
 
 
 if __name__ == '__main__':
@@ -4398,5 +4330,9 @@ if __name__ == '__main__':
     print("\n⚠️  Press Ctrl+C to stop the server\n")
     print("=" * 70)
     
+    # Keep stats snapshots warm so page loads never wait on COUNT(*) queries
+    for source in all_dashboard_sources():
+        source.start_stats_refresher()
+    
     app.run(host='0.0.0.0', port=5001, debug=False)
 
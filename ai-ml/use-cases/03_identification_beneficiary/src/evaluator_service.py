@@ -20,6 +20,7 @@ from prioritizer import Prioritizer
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 class EligibilityEvaluationService:
@@ -69,6 +70,7 @@ class EligibilityEvaluationService:
         self.event_driven_enabled = eval_config['event_driven']['enabled']
         self.on_demand_enabled = eval_config['on_demand']['enabled']
     
+    @traced('eligibility.evaluate_family')
     def evaluate_family(
         self,
         family_id: str,
@@ -104,22 +106,8 @@ class EligibilityEvaluationService:
         evaluations = []
         for scheme_id in scheme_ids:
             try:
-                # Evaluate eligibility
-                eval_result = self.evaluator.evaluate(
-                    scheme_id, family_data, use_ml=use_ml
-                )
-                
-                # Add metadata
-                eval_result['evaluation_timestamp'] = datetime.now()
-                eval_result['evaluation_type'] = 'ON_DEMAND'
-                # Ensure scheme_code is set (scheme_id is actually scheme_code)
-                eval_result['scheme_code'] = scheme_id
-                eval_result['scheme_id'] = scheme_id  # Keep for backward compatibility
-                
-                # Record versions (rule set, dataset versions)
-                eval_result['rule_set_version'] = self._get_current_rule_set_version(scheme_id)
-                eval_result['dataset_version_golden_records'] = self._get_current_dataset_version('golden_records')
-                eval_result['dataset_version_profile_360'] = self._get_current_dataset_version('profile_360')
+                # Evaluate eligibility (with timestamp and version metadata)
+                eval_result = self.evaluate_scheme(scheme_id, family_data, use_ml=use_ml)
                 
                 # Save to database if requested
                 if save_results:
@@ -144,6 +132,80 @@ class EligibilityEvaluationService:
             'evaluations': evaluations
         }
     
+    def evaluate_scheme(
+        self,
+        scheme_id: str,
+        family_data: Dict,
+        use_ml: bool = True,
+        evaluation_type: str = 'ON_DEMAND',
+        versions: Optional[Dict[str, str]] = None,
+        evaluator: Optional[HybridEvaluator] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate one scheme for loaded family data, recording evaluation metadata
+        
+        Args:
+            scheme_id: Scheme code
+            family_data: Family data from load_family()
+            use_ml: Whether to use ML scorer if available
+            evaluation_type: Evaluation type recorded with the result
+            versions: The scheme's entry from get_evaluation_versions()
+                (looked up here when not given)
+            evaluator: HybridEvaluator to use instead of the service's own
+                (callers evaluating from several threads pass one per thread)
+        
+        Returns:
+            Evaluation result with timestamp, type, rule set and dataset versions
+        """
+        eval_result = (evaluator or self.evaluator).evaluate(scheme_id, family_data, use_ml=use_ml)
+        
+        # Add metadata
+        eval_result['evaluation_timestamp'] = datetime.now()
+        eval_result['evaluation_type'] = evaluation_type
+        # Ensure scheme_code is set (scheme_id is actually scheme_code)
+        eval_result['scheme_code'] = scheme_id
+        eval_result['scheme_id'] = scheme_id  # Keep for backward compatibility
+        
+        # Record versions (rule set, dataset versions)
+        if versions is None:
+            versions = self.get_evaluation_versions([scheme_id])[scheme_id]
+        eval_result.update(versions)
+        
+        return eval_result
+    
+    def get_evaluation_versions(self, scheme_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Rule set and dataset versions recorded with each scheme's evaluation
+        
+        Dataset versions are looked up once for all schemes.
+        
+        Returns:
+            scheme_id -> {rule_set_version, dataset_version_golden_records, dataset_version_profile_360}
+        """
+        golden_records_version = self._get_current_dataset_version('golden_records')
+        profile_360_version = self._get_current_dataset_version('profile_360')
+        return {
+            scheme_id: {
+                'rule_set_version': self._get_current_rule_set_version(scheme_id),
+                'dataset_version_golden_records': golden_records_version,
+                'dataset_version_profile_360': profile_360_version
+            }
+            for scheme_id in scheme_ids
+        }
+    
+    def load_family(self, family_id: str) -> Optional[Dict]:
+        """
+        Load family data (Golden Records + 360° Profile) for evaluate_scheme()
+        
+        Args:
+            family_id: Family ID (UUID string)
+        
+        Returns:
+            Dictionary with combined family data, None if not found
+        """
+        return self._load_family_data(family_id)
+    
+    @traced('eligibility.evaluate_batch')
     def evaluate_batch(
         self,
         batch_id: Optional[str] = None,
@@ -265,6 +327,7 @@ class EligibilityEvaluationService:
             'completed_at': datetime.now().isoformat()
         }
     
+    @traced('eligibility.evaluate_event_driven')
     def evaluate_event_driven(
         self,
         family_id: str,
@@ -477,6 +540,7 @@ class EligibilityEvaluationService:
         
         return worklist
     
+    @traced('eligibility.load_family')
     def _load_family_data(self, family_id: str) -> Optional[Dict]:
         """
         Load family data from Golden Records + 360° Profile
@@ -682,6 +746,7 @@ class EligibilityEvaluationService:
             print(f"❌ Error loading family data for {family_id}: {e}")
             return None
     
+    @traced('eligibility.load_families')
     def _load_families_for_batch(
         self,
         district_ids: Optional[List[int]],
@@ -797,6 +862,7 @@ class EligibilityEvaluationService:
         df = pd.read_sql(query, self.db.connection, params=(categories,))
         return df['scheme_code'].tolist()
     
+    @traced('eligibility.rule_set_version')
     def _get_current_rule_set_version(self, scheme_code: str) -> str:
         """
         Get current rule set version for a scheme
@@ -826,6 +892,7 @@ class EligibilityEvaluationService:
             # If table doesn't exist or error occurs, return default
             return "CURRENT"
     
+    @traced('eligibility.dataset_version')
     def _get_current_dataset_version(self, dataset_name: str) -> str:
         """
         Get current dataset version
@@ -855,6 +922,7 @@ class EligibilityEvaluationService:
             # If table doesn't exist or error occurs, return default
             return "CURRENT"
     
+    @traced('eligibility.save_snapshot')
     def _save_evaluation_snapshot(self, eval_result: Dict) -> Optional[int]:
         """Save evaluation result to database"""
         cursor = self.db.connection.cursor()
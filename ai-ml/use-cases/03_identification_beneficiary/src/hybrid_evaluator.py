@@ -16,6 +16,7 @@ from ml_scorer import MLEligibilityScorer
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 class HybridEvaluator:
@@ -53,6 +54,7 @@ class HybridEvaluator:
         self.ml_weight = hybrid_config.get('ml_weight', 0.4)
         self.confidence_threshold = hybrid_config.get('confidence_threshold', 0.7)
     
+    @traced('eligibility.evaluate_scheme')
     def evaluate(
         self,
         scheme_id: str,
@@ -15,6 +15,7 @@ import pandas as pd
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 @dataclass
@@ -111,6 +112,7 @@ class CampaignManager:
         with open(use_case_config_path, 'r') as f:
             self.use_case_config = yaml.safe_load(f)
     
+    @traced('campaign.intake_signals')
     def intake_eligibility_signals(
         self,
         scheme_code: Optional[str] = None,
@@ -194,6 +196,7 @@ class CampaignManager:
         
         return candidates
     
+    @traced('campaign.apply_policies')
     def apply_campaign_policies(
         self,
         candidates: List[Candidate],
@@ -248,6 +251,7 @@ class CampaignManager:
         
         return filtered
     
+    @traced('campaign.create')
     def create_campaign(
         self,
         scheme_code: str,
@@ -361,6 +365,7 @@ class CampaignManager:
         finally:
             cursor.close()
     
+    @traced('campaign.schedule_sends')
     def schedule_campaign_sends(self, campaign_id: int) -> None:
         """
         Schedule send times for campaign candidates
@@ -429,6 +434,7 @@ class CampaignManager:
         finally:
             cursor.close()
     
+    @traced('campaign.load_contact_info')
     def _load_contact_info(self, family_id: str) -> Dict[str, Any]:
         """
         Load contact information from Golden Records
@@ -492,6 +498,7 @@ class CampaignManager:
             'max_intimations_per_family': 3
         }
     
+    @traced('campaign.check_fatigue')
     def _check_fatigue_limit(self, family_id: str, scheme_code: str) -> bool:
         """Check if family has exceeded message fatigue limit"""
         # Check monthly limit
@@ -14,6 +14,7 @@ import pandas as pd
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 class SmartOrchestrator:
@@ -49,6 +50,7 @@ class SmartOrchestrator:
         with open(use_case_config_path, 'r') as f:
             self.use_case_config = yaml.safe_load(f)
     
+    @traced('intimation.schedule_retries')
     def schedule_retries(self, campaign_id: Optional[int] = None) -> int:
         """
         Schedule retries for candidates who haven't responded
@@ -138,6 +140,7 @@ class SmartOrchestrator:
         finally:
             cursor.close()
     
+    @traced('intimation.check_fatigue')
     def check_fatigue_limits(self, family_id: str, scheme_code: str) -> bool:
         """
         Check if family has exceeded fatigue limits
@@ -231,6 +234,7 @@ class SmartOrchestrator:
         finally:
             cursor.close()
     
+    @traced('intimation.process_expired_consents')
     def process_expired_consents(self) -> int:
         """
         Process expired consents and update status
@@ -68,6 +68,7 @@ CREATE INDEX idx_applications_status ON application.applications(status);
 CREATE INDEX idx_applications_scheme ON application.applications(scheme_code);
 CREATE INDEX idx_applications_consent ON application.applications(consent_id) WHERE consent_id IS NOT NULL;
 CREATE INDEX idx_applications_created ON application.applications(created_at);
+CREATE INDEX idx_applications_updated ON application.applications(updated_at); -- Duplicate index refresh
 
 -- Application Fields
 -- Field-level data with source tracking for compliance
@@ -451,6 +452,41 @@ CREATE INDEX idx_app_events_application ON application.application_events(applic
 CREATE INDEX idx_app_events_timestamp ON application.application_events(event_timestamp);
 CREATE INDEX idx_app_events_status ON application.application_events(event_status) WHERE event_status = 'pending';
 
+-- Submission Outbox
+-- Transactional outbox of pending department submissions, drained asynchronously
+-- by the submission worker (retries, per-department caps, circuit breaking)
+CREATE TABLE IF NOT EXISTS application.submission_outbox (
+    outbox_id BIGSERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES application.applications(application_id) ON DELETE CASCADE,
+    scheme_code VARCHAR(50) NOT NULL,
+    submission_mode VARCHAR(50) DEFAULT 'auto', -- auto, review (submitted after citizen review)
+    
+    -- Status
+    status VARCHAR(50) DEFAULT 'pending', -- pending, in_flight, succeeded, failed
+    attempt_count INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    
+    -- Worker Lease
+    locked_by VARCHAR(255), -- Worker ID holding the lease
+    locked_at TIMESTAMP,
+    
+    -- Last Attempt
+    last_submission_id INTEGER, -- FK to application_submissions
+    last_status_code INTEGER,
+    last_error TEXT,
+    
+    -- Timestamps
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+CREATE INDEX idx_submission_outbox_due ON application.submission_outbox(next_attempt_at) WHERE status = 'pending';
+CREATE INDEX idx_submission_outbox_lease ON application.submission_outbox(locked_at) WHERE status = 'in_flight';
+CREATE INDEX idx_submission_outbox_application ON application.submission_outbox(application_id);
+CREATE UNIQUE INDEX idx_submission_outbox_active ON application.submission_outbox(application_id)
+    WHERE status IN ('pending', 'in_flight');
+
 -- ============================================================================
 -- TRIGGERS & FUNCTIONS
 -- ============================================================================
@@ -493,6 +529,10 @@ CREATE TRIGGER trigger_department_connectors_updated_at
     BEFORE UPDATE ON application.department_connectors
     FOR EACH ROW EXECUTE FUNCTION application.update_updated_at();
 
+CREATE TRIGGER trigger_submission_outbox_updated_at
+    BEFORE UPDATE ON application.submission_outbox
+    FOR EACH ROW EXECUTE FUNCTION application.update_updated_at();
+
 -- ============================================================================
 -- COMMENTS
 -- ============================================================================
@@ -509,4 +549,5 @@ COMMENT ON TABLE application.scheme_field_mappings IS 'Mapping rules from GR/360
 COMMENT ON TABLE application.submission_modes_config IS 'Per-scheme submission mode configuration';
 COMMENT ON TABLE application.department_connectors IS 'Department API configurations';
 COMMENT ON TABLE application.application_events IS 'Event log for downstream integration';
+COMMENT ON TABLE application.submission_outbox IS 'Transactional outbox of pending department submissions';
 
@@ -0,0 +1,67 @@
+"""
+Build Duplicate Index
+Builds the duplicate index from a bulk scan of application tables, optionally
+saves a memory-mappable snapshot and runs a cross-application fraud sweep
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add src and shared utils to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from validation_engine import ValidationEngine
+from duplicate_index import DuplicateIndex
+
+
+def build_duplicate_index(args):
+    """Build index, save snapshot and sweep for shared identifiers"""
+    print("=" * 80)
+    print("Building Duplicate Index")
+    print("=" * 80)
+    
+    # ValidationEngine is used for its config and application DB connection
+    validator = ValidationEngine()
+    index_config = validator.validation_config.get('duplicate_index', {})
+    snapshot_path = args.snapshot or index_config.get('snapshot_path')
+    
+    try:
+        validator.connect()
+        
+        index = DuplicateIndex(index_config.get('hash_key'))
+        index.build(validator.db.connection, batch_size=args.batch_size)
+        
+        if snapshot_path:
+            index.save(snapshot_path)
+        
+        if args.sweep:
+            print(f"\n🔎 Sweeping for identifiers shared by {args.min_families}+ families...")
+            started = time.monotonic()
+            groups = index.sweep(min_families=args.min_families)
+            print(f"   Found {len(groups)} shared identifiers in {time.monotonic() - started:.2f}s")
+            
+            for group in groups[:args.top]:
+                print(f"   {group['kind']:<13} {group['identifier_hash']}  "
+                      f"families={len(group['family_ids'])} applications={group['application_ids'][:10]}")
+        
+        print(f"\n📊 Index stats: {index.stats()}")
+        print("\n" + "=" * 80)
+    
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        validator.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build duplicate identifier index')
+    parser.add_argument('--snapshot', help='Snapshot directory to write (default: config snapshot_path)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Rows fetched per round-trip')
+    parser.add_argument('--sweep', action='store_true', help='Run cross-application fraud sweep')
+    parser.add_argument('--min-families', type=int, default=2)
+    parser.add_argument('--top', type=int, default=20, help='Shared identifiers to print')
+    build_duplicate_index(parser.parse_args())
@@ -0,0 +1,152 @@
+"""
+Fake Department Server
+Local stand-in for department APIs (matches the MOCK_*_TEST connectors) with
+configurable latency, server errors and throttling, for exercising the
+submission outbox worker without real department endpoints
+"""
+
+import sys
+import json
+import random
+import threading
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeDepartmentState:
+    """Behaviour knobs and counters shared by all request handlers"""
+    
+    def __init__(
+        self,
+        latency_ms: int = 50,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after_seconds: int = 1
+    ):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.accepted = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def make_handler(state: FakeDepartmentState):
+    """Build request handler bound to a state object"""
+    
+    class FakeDepartmentHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like real department gateways
+        
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            
+            if self.path.endswith('/oauth/token'):
+                self._send(200, {'access_token': f'fake-token-{time.time():.0f}', 'expires_in': 3600})
+                return
+            
+            with state.lock:
+                state.requests += 1
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            
+            try:
+                time.sleep(state.latency_ms / 1000.0)
+                roll = random.random()
+                
+                if roll < state.throttle_rate:
+                    self._send(429, {'message': 'Too many requests'},
+                               {'Retry-After': str(state.retry_after_seconds)})
+                    return
+                
+                if roll < state.throttle_rate + state.error_rate:
+                    self._send(503, {'message': 'Department service unavailable'})
+                    return
+                
+                try:
+                    payload = json.loads(body or b'{}')
+                except ValueError:
+                    payload = {}
+                
+                application_id = payload.get('application_id') or \
+                    payload.get('application', {}).get('applicationId') or ''
+                
+                with state.lock:
+                    state.accepted += 1
+                
+                self._send(200, {
+                    'application_number': f'DEPT-{application_id}-{random.randint(100000, 999999)}',
+                    'status': 'RECEIVED'
+                })
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+        
+        def _send(self, status_code, data, headers=None):
+            payload = json.dumps(data).encode()
+            self.send_response(status_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return FakeDepartmentHandler
+
+
+def start_fake_department_server(
+    port: int = 8080,
+    **state_kwargs
+):
+    """
+    Start fake department server in a background thread
+    
+    Returns:
+        (server, state) - call server.shutdown() to stop
+    """
+    state = FakeDepartmentState(**state_kwargs)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a fake department API server')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency-ms', type=int, default=50, help='Response latency per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 503 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on 429')
+    args = parser.parse_args()
+    
+    server, state = start_fake_department_server(
+        port=args.port,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after
+    )
+    print(f"🏛️  Fake department server on http://127.0.0.1:{args.port}/mock-api (Ctrl+C to stop)")
+    
+    try:
+        while True:
+            time.sleep(5)
+            print(f"   requests={state.requests} accepted={state.accepted} "
+                  f"max_in_flight={state.max_in_flight}")
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
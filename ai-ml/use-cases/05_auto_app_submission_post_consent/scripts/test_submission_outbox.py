@@ -0,0 +1,113 @@
+"""
+Test Submission Outbox
+Queues applications through the outbox and drains them with the async
+submission worker against the local fake department server
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from submission_handler import SubmissionHandler
+from submission_worker import SubmissionWorker
+
+sys.path.append(str(Path(__file__).parent))
+from fake_department_server import start_fake_department_server
+
+
+def test_submission_outbox(args):
+    """Enqueue applications and drain the outbox"""
+    print("=" * 80)
+    print("Testing Submission Outbox")
+    print("=" * 80)
+    
+    server, state = start_fake_department_server(
+        port=args.port,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=1
+    )
+    print(f"\n🏛️  Fake department server: http://127.0.0.1:{args.port}/mock-api "
+          f"(latency {args.latency_ms}ms, errors {args.error_rate:.0%}, throttled {args.throttle_rate:.0%})")
+    
+    handler = SubmissionHandler()
+    handler.outbox_enabled = True
+    # MOCK_REST_TEST points at http://localhost:8080/mock-api (scripts/create_mock_connectors.py)
+    handler.default_connector_name = args.connector
+    
+    worker = SubmissionWorker(handler=handler)
+    worker.lane_defaults = {**worker.lane_defaults, 'max_concurrency': args.concurrency}
+    
+    try:
+        handler.connect()
+        
+        # Step 1: Find applications to submit
+        print(f"\n📋 Finding up to {args.limit} applications...")
+        cursor = handler.db.connection.cursor()
+        cursor.execute("""
+            SELECT application_id, scheme_code
+            FROM application.applications
+            WHERE status IN ('draft', 'pending_review', 'submission_failed')
+            ORDER BY created_at DESC
+            LIMIT %s
+        """, [args.limit])
+        applications = cursor.fetchall()
+        cursor.close()
+        
+        if not applications:
+            print("   ⚠️  No applications found")
+            print("   Please run create_sample_applications.py first")
+            return
+        
+        # Step 2: Enqueue (this is what the consent flow now waits for)
+        print(f"\n📥 Enqueueing {len(applications)} applications...")
+        latencies = []
+        for application_id, scheme_code in applications:
+            started = time.perf_counter()
+            result = handler.handle_submission(application_id, scheme_code, 'auto')
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not result['success']:
+                print(f"   ❌ {application_id}: {result.get('error')}")
+        
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"   ✅ Enqueue latency p50={p50:.1f}ms p99={p99:.1f}ms")
+        
+        # Step 3: Drain outbox
+        print("\n📤 Draining outbox...")
+        started = time.perf_counter()
+        stats = asyncio.run(worker.run_until_idle())
+        elapsed = time.perf_counter() - started
+        
+        print(f"   ✅ Drained in {elapsed:.2f}s: {stats}")
+        print(f"   Department requests: {state.requests}, accepted: {state.accepted}, "
+              f"max concurrent: {state.max_in_flight} (cap {args.concurrency})")
+        print(f"   Outbox status: {handler.outbox.get_status_counts()}")
+        
+        print("\n" + "=" * 80)
+    
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        server.shutdown()
+        worker.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Test submission outbox against a fake department')
+    parser.add_argument('--limit', type=int, default=50, help='Applications to submit')
+    parser.add_argument('--connector', default='MOCK_REST_TEST', help='Connector name to use')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency-ms', type=int, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.1)
+    parser.add_argument('--throttle-rate', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=4, help='Per-department concurrency cap')
+    test_submission_outbox(parser.parse_args())
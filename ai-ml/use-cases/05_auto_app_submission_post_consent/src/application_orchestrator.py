@@ -12,6 +12,7 @@ import yaml
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 class ApplicationOrchestrator:
@@ -67,6 +68,7 @@ class ApplicationOrchestrator:
         for ext_db in self.external_dbs.values():
             ext_db.disconnect()
     
+    @traced('application.trigger_on_consent')
     def trigger_on_consent(
         self,
         family_id: str,
@@ -7,6 +7,8 @@ import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
+import threading
+import time
 import requests
 import json
 
@@ -17,25 +19,28 @@ from department_connector import DepartmentConnector, SubmissionResult, Submissi
 class APISetuConnector(DepartmentConnector):
     """API Setu gateway connector for government API submissions"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], session: Optional[requests.Session] = None):
         """Initialize API Setu connector"""
-        super().__init__(config)
-        self.api_setu_config = config.get('api_setu_config', {})
+        super().__init__(config, session or requests.Session())
+        self.api_setu_config = config.get('api_setu_config') or {}
         self.api_key = self.api_setu_config.get('api_key', '')
         self.client_id = self.api_setu_config.get('client_id', '')
         self.client_secret = self.api_setu_config.get('client_secret', '')
         self.timeout = config.get('timeout', {}).get('read_timeout_seconds', 60)
         
-        # OAuth2 token (would be refreshed in production)
+        # OAuth2 token, fetched lazily and refreshed ahead of expiry
         self.access_token = None
-        self._get_access_token()
+        self.token_expires_at = 0.0
+        self.token_refresh_margin_seconds = self.api_setu_config.get('token_refresh_margin_seconds', 60)
+        self.default_token_ttl_seconds = self.api_setu_config.get('default_token_ttl_seconds', 3600)
+        self._token_lock = threading.Lock()
     
     def _get_access_token(self):
         """Get OAuth2 access token from API Setu"""
         try:
             token_url = f"{self.base_url.rstrip('/')}/oauth/token"
             
-            response = requests.post(
+            response = self.session.post(
                 token_url,
                 data={
                     'grant_type': 'client_credentials',
@@ -51,12 +56,29 @@ class APISetuConnector(DepartmentConnector):
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data.get('access_token')
+                expires_in = token_data.get('expires_in') or self.default_token_ttl_seconds
+                self.token_expires_at = time.monotonic() + float(expires_in)
             else:
                 print(f"⚠️  Failed to get API Setu access token: {response.status_code}")
         
         except Exception as e:
             print(f"⚠️  Error getting API Setu access token: {e}")
     
+    def _ensure_access_token(self, force_refresh: bool = False) -> Optional[str]:
+        """Return a valid access token, refreshing it shortly before it expires"""
+        refresh_at = self.token_expires_at - self.token_refresh_margin_seconds
+        if not force_refresh and self.access_token and time.monotonic() < refresh_at:
+            return self.access_token
+        
+        with self._token_lock:
+            # Another thread may have refreshed while we waited
+            refresh_at = self.token_expires_at - self.token_refresh_margin_seconds
+            if force_refresh or not self.access_token or time.monotonic() >= refresh_at:
+                self.access_token = None
+                self._get_access_token()
+        
+        return self.access_token
+    
     def submit_application(
         self,
         application_data: Dict[str, Any],
@@ -65,11 +87,8 @@ class APISetuConnector(DepartmentConnector):
     ) -> SubmissionResult:
         """Submit application via API Setu"""
         try:
-            # Refresh token if needed
-            if not self.access_token:
-                self._get_access_token()
-            
-            if not self.access_token:
+            # Refresh token if missing or about to expire
+            if not self._ensure_access_token():
                 return SubmissionResult(
                     success=False,
                     department_application_number=None,
@@ -83,21 +102,12 @@ class APISetuConnector(DepartmentConnector):
             # Build URL
             url = f"{self.base_url.rstrip('/')}/{self.endpoint_path.lstrip('/')}"
             
-            # Prepare headers (API Setu standard format)
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.access_token}',
-                'X-API-Key': self.api_key,
-                'Accept': 'application/json'
-            }
+            # Make request (pooled keep-alive session)
+            response = self._post_with_token(url, payload)
             
-            # Make request
-            response = requests.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=self.timeout
-            )
+            # Token revoked or expired early: refresh once and retry
+            if response.status_code == 401 and self._ensure_access_token(force_refresh=True):
+                response = self._post_with_token(url, payload)
             
             # Parse response
             return self.parse_response(response)
@@ -120,6 +130,23 @@ class APISetuConnector(DepartmentConnector):
                 retry_required=False
             )
     
+    def _post_with_token(self, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST payload with current bearer token"""
+        # Prepare headers (API Setu standard format)
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.access_token}',
+            'X-API-Key': self.api_key,
+            'Accept': 'application/json'
+        }
+        
+        return self.session.post(
+            url,
+            json=payload,
+            headers=headers,
+            timeout=self.timeout
+        )
+    
     def format_payload(
         self,
         application_data: Dict[str, Any],
@@ -174,13 +201,21 @@ class APISetuConnector(DepartmentConnector):
                           error_info.get('description') or \
                           f'API Setu error: {status_code}'
             
+            if status_code == 429:
+                status = SubmissionStatus.RETRY_REQUIRED
+            elif status_code >= 500:
+                status = SubmissionStatus.ERROR
+            else:
+                status = SubmissionStatus.VALIDATION_ERROR
+            
             return SubmissionResult(
                 success=False,
                 department_application_number=None,
-                status=SubmissionStatus.ERROR if status_code >= 500 else SubmissionStatus.VALIDATION_ERROR,
+                status=status,
                 status_code=status_code,
                 error_message=error_message,
                 response_data=response_data,
-                retry_required=(status_code >= 500)
+                retry_required=(status_code >= 500 or status_code == 429),
+                retry_after_seconds=self.parse_retry_after(response.headers)
             )
 
@@ -18,12 +18,16 @@ class ConnectorFactory:
     """Factory for creating department connectors"""
     
     @staticmethod
-    def create_connector(connector_config: Dict[str, Any]) -> DepartmentConnector:
+    def create_connector(
+        connector_config: Dict[str, Any],
+        session: Optional[Any] = None
+    ) -> DepartmentConnector:
         """
         Create connector instance based on configuration
         
         Args:
             connector_config: Connector configuration from database
+            session: Optional shared HTTP session (see ConnectorRegistry)
         
         Returns:
             Connector instance
@@ -31,13 +35,13 @@ class ConnectorFactory:
         connector_type = connector_config.get('connector_type', '').upper()
         
         if connector_type == 'REST':
-            return RESTConnector(connector_config)
+            return RESTConnector(connector_config, session)
         
         elif connector_type == 'SOAP':
-            return SOAPConnector(connector_config)
+            return SOAPConnector(connector_config, session)
         
         elif connector_type == 'API_SETU':
-            return APISetuConnector(connector_config)
+            return APISetuConnector(connector_config, session)
         
         else:
             raise ValueError(f"Unknown connector type: {connector_type}")
@@ -59,6 +63,36 @@ class ConnectorFactory:
         Returns:
             Connector instance or None
         """
+        config = ConnectorFactory.load_connector_config_from_db(
+            db_connection, connector_name, scheme_code
+        )
+        if not config:
+            return None
+        
+        try:
+            return ConnectorFactory.create_connector(config)
+        
+        except Exception as e:
+            print(f"⚠️  Error loading connector from database: {e}")
+            return None
+    
+    @staticmethod
+    def load_connector_config_from_db(
+        db_connection,
+        connector_name: str,
+        scheme_code: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load connector configuration from database
+        
+        Args:
+            db_connection: Database connection
+            connector_name: Connector name
+            scheme_code: Optional scheme code (to find scheme-specific connector)
+        
+        Returns:
+            Parsed connector configuration or None
+        """
         try:
             cursor = db_connection.cursor()
             
@@ -122,13 +156,13 @@ class ConnectorFactory:
                 cursor.execute(query, [connector_name])
             
             row = cursor.fetchone()
+            columns = [desc[0] for desc in cursor.description]
             cursor.close()
             
             if not row:
                 return None
             
             # Build config dict
-            columns = [desc[0] for desc in cursor.description]
             config = dict(zip(columns, row))
             
             # Parse JSON fields
@@ -147,10 +181,9 @@ class ConnectorFactory:
             elif config.get('retry_on_status_codes'):
                 config['retry_on_status_codes'] = json.loads(config['retry_on_status_codes'])
             
-            # Create connector
-            return ConnectorFactory.create_connector(config)
+            return config
         
         except Exception as e:
-            print(f"⚠️  Error loading connector from database: {e}")
+            print(f"⚠️  Error loading connector config from database: {e}")
             return None
 
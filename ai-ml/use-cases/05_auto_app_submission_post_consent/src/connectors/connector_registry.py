@@ -0,0 +1,153 @@
+"""
+Connector Registry
+Caches department connector instances per scheme and shares pooled HTTP sessions
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(str(Path(__file__).parent))
+from department_connector import DepartmentConnector
+from connector_factory import ConnectorFactory
+
+
+class ConnectorRegistry:
+    """
+    Process-wide cache of department connectors
+    
+    Connectors are built once per (connector_name, scheme_code) and reused
+    until connector_cache_ttl_seconds elapses. All connectors pointing at the
+    same department host share one requests.Session with a pooled HTTPAdapter,
+    so submissions reuse keep-alive connections instead of opening a new
+    TCP/TLS connection per application.
+    """
+    
+    def __init__(self, department_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize connector registry
+        
+        Args:
+            department_config: 'department' section of use_case_config.yaml
+        """
+        department_config = department_config or {}
+        pool_config = department_config.get('connection_pool', {})
+        
+        self.pool_connections = pool_config.get('pool_connections', 10)
+        self.pool_maxsize = pool_config.get('pool_maxsize', 50)
+        self.connector_cache_ttl = pool_config.get('connector_cache_ttl_seconds', 300)
+        self.timeout_config = department_config.get('timeout', {})
+        
+        self._connectors: Dict[Tuple[str, Optional[str]], Tuple[DepartmentConnector, float]] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+    
+    def get_connector(
+        self,
+        db_connection,
+        connector_name: str,
+        scheme_code: Optional[str] = None
+    ) -> Optional[DepartmentConnector]:
+        """
+        Get cached connector, loading it from the database on first use or expiry
+        
+        Args:
+            db_connection: Database connection
+            connector_name: Connector name
+            scheme_code: Optional scheme code (to find scheme-specific connector)
+        
+        Returns:
+            Connector instance or None
+        """
+        key = (connector_name, scheme_code)
+        now = time.monotonic()
+        
+        cached = self._connectors.get(key)
+        if cached and now - cached[1] < self.connector_cache_ttl:
+            return cached[0]
+        
+        config = ConnectorFactory.load_connector_config_from_db(
+            db_connection, connector_name, scheme_code
+        )
+        if not config:
+            return None
+        
+        # Department-level timeouts apply unless the connector overrides them
+        if not config.get('timeout') and self.timeout_config:
+            config['timeout'] = self.timeout_config
+        
+        try:
+            connector = ConnectorFactory.create_connector(
+                config,
+                session=self.get_session(config.get('base_url') or config.get('wsdl_url') or '')
+            )
+        except Exception as e:
+            print(f"⚠️  Error creating connector {connector_name}: {e}")
+            return None
+        
+        with self._lock:
+            self._connectors[key] = (connector, now)
+        
+        return connector
+    
+    def get_session(self, url: str) -> requests.Session:
+        """Get shared pooled session for the host of a URL"""
+        host = urlparse(url).netloc or url
+        
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=False
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+        
+        return session
+    
+    def invalidate(self, connector_name: Optional[str] = None):
+        """Drop cached connectors (all, or those with the given name)"""
+        with self._lock:
+            if connector_name is None:
+                self._connectors.clear()
+            else:
+                for key in [k for k in self._connectors if k[0] == connector_name]:
+                    del self._connectors[key]
+    
+    def close(self):
+        """Close all pooled sessions and drop cached connectors"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._connectors.clear()
+
+
+_default_registry: Optional[ConnectorRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_connector_registry(department_config: Optional[Dict[str, Any]] = None) -> ConnectorRegistry:
+    """Get the process-wide connector registry (created on first call)"""
+    global _default_registry
+    
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ConnectorRegistry(department_config)
+    
+    return _default_registry
@@ -37,19 +37,22 @@ class SubmissionResult:
 class DepartmentConnector(ABC):
     """Abstract base class for department connectors"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], session: Optional[Any] = None):
         """
         Initialize department connector
         
         Args:
             config: Connector-specific configuration from database
+            session: Optional shared HTTP session (connection-pooled, keep-alive)
         """
         self.config = config
+        self.session = session
         self.connector_name = config.get('connector_name', 'unknown')
         self.connector_type = config.get('connector_type', 'UNKNOWN')
         self.base_url = config.get('base_url', '')
         self.endpoint_path = config.get('endpoint_path', '')
-        self.auth_config = config.get('auth_config', {})
+        self.auth_config = config.get('auth_config') or {}
+        self.auth_type = config.get('auth_type') or 'NONE'
         self.max_retries = config.get('max_retries', 3)
         self.retry_delay_seconds = config.get('retry_delay_seconds', 5)
         self.retry_on_status_codes = config.get('retry_on_status_codes', [500, 502, 503, 504, 408])
@@ -148,4 +151,34 @@ class DepartmentConnector(ABC):
             Delay in seconds
         """
         return self.retry_delay_seconds * (2 ** (attempt_number - 1))
+    
+    @staticmethod
+    def parse_retry_after(headers: Optional[Dict[str, Any]]) -> Optional[int]:
+        """
+        Parse Retry-After header (delta-seconds or HTTP date)
+        
+        Args:
+            headers: Response headers
+        
+        Returns:
+            Seconds to wait before retrying, or None if not present
+        """
+        if not headers:
+            return None
+        
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+        
+        try:
+            return max(0, int(float(value)))
+        except (TypeError, ValueError):
+            pass
+        
+        try:
+            from email.utils import parsedate_to_datetime
+            retry_at = parsedate_to_datetime(value)
+            return max(0, int((retry_at - datetime.now(retry_at.tzinfo)).total_seconds()))
+        except (TypeError, ValueError):
+            return None
 
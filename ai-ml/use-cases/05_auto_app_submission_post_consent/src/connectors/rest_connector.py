@@ -17,14 +17,13 @@ from department_connector import DepartmentConnector, SubmissionResult, Submissi
 class RESTConnector(DepartmentConnector):
     """REST API connector for department submissions"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], session: Optional[requests.Session] = None):
         """Initialize REST connector"""
-        super().__init__(config)
+        super().__init__(config, session or requests.Session())
         self.timeout = config.get('timeout', {}).get('read_timeout_seconds', 60)
         self.connection_timeout = config.get('timeout', {}).get('connection_timeout_seconds', 30)
         
         # Setup authentication
-        self.auth_type = config.get('auth_type', 'NONE')
         self._setup_auth()
     
     def _setup_auth(self):
@@ -72,8 +71,8 @@ class RESTConnector(DepartmentConnector):
                 **self.auth_headers
             }
             
-            # Make request
-            response = requests.post(
+            # Make request (pooled keep-alive session)
+            response = self.session.post(
                 url,
                 json=payload,
                 headers=headers,
@@ -169,6 +168,19 @@ class RESTConnector(DepartmentConnector):
                 response_data=response_data
             )
         
+        elif status_code == 429:
+            # Throttled by department - retry after the advertised delay
+            return SubmissionResult(
+                success=False,
+                department_application_number=None,
+                status=SubmissionStatus.RETRY_REQUIRED,
+                status_code=status_code,
+                error_message=response_data.get('message') or 'Rate limited by department',
+                response_data=response_data,
+                retry_required=True,
+                retry_after_seconds=self.parse_retry_after(response.headers)
+            )
+        
         elif 400 <= status_code < 500:
             # Client error (validation error, bad request, etc.)
             error_message = response_data.get('message') or \
@@ -198,6 +210,7 @@ class RESTConnector(DepartmentConnector):
                 status_code=status_code,
                 error_message=error_message,
                 response_data=response_data,
-                retry_required=True
+                retry_required=True,
+                retry_after_seconds=self.parse_retry_after(response.headers)
             )
 
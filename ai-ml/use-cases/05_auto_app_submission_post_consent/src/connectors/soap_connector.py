@@ -7,9 +7,12 @@ import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
+import threading
 
 try:
     from zeep import Client, Settings
+    from zeep.cache import InMemoryCache
+    from zeep.transports import Transport
     ZEEP_AVAILABLE = True
 except ImportError:
     ZEEP_AVAILABLE = False
@@ -18,12 +21,24 @@ sys.path.append(str(Path(__file__).parent))
 from department_connector import DepartmentConnector, SubmissionResult, SubmissionStatus
 
 
+# Parsed WSDL clients shared across connector instances.
+# Keyed by (wsdl_url, WS-Security username) because set_wsse mutates the client.
+_WSDL_CLIENT_CACHE: Dict[tuple, Any] = {}
+_WSDL_CLIENT_LOCK = threading.Lock()
+
+
+def clear_wsdl_client_cache():
+    """Drop all cached WSDL clients (e.g. after a department publishes a new WSDL)"""
+    with _WSDL_CLIENT_LOCK:
+        _WSDL_CLIENT_CACHE.clear()
+
+
 class SOAPConnector(DepartmentConnector):
     """SOAP/XML web service connector for department submissions"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], session: Optional[Any] = None):
         """Initialize SOAP connector"""
-        super().__init__(config)
+        super().__init__(config, session)
         self.wsdl_url = config.get('wsdl_url', '')
         
         if not ZEEP_AVAILABLE:
@@ -33,21 +48,40 @@ class SOAPConnector(DepartmentConnector):
         self._setup_client()
     
     def _setup_client(self):
-        """Setup SOAP client"""
-        if self.wsdl_url:
-            settings = Settings(strict=False, xml_huge_tree=True)
-            self.client = Client(wsdl=self.wsdl_url, settings=settings)
-            
-            # Setup authentication if needed
-            if self.auth_type == 'WSS':
-                # WS-Security authentication
-                from zeep.wsse.username import UsernameToken
-                username = self.auth_config.get('username', '')
-                password = self.auth_config.get('password', '')
-                if username and password:
-                    self.client.set_wsse(UsernameToken(username, password))
-        else:
+        """Setup SOAP client (parsed WSDL is cached per URL and credentials)"""
+        if not self.wsdl_url:
             self.client = None
+            return
+        
+        username = self.auth_config.get('username', '') if self.auth_type == 'WSS' else ''
+        cache_key = (self.wsdl_url, username)
+        
+        with _WSDL_CLIENT_LOCK:
+            client = _WSDL_CLIENT_CACHE.get(cache_key)
+            if client is None:
+                client = self._build_client()
+                _WSDL_CLIENT_CACHE[cache_key] = client
+        
+        self.client = client
+    
+    def _build_client(self):
+        """Parse WSDL and build a zeep client"""
+        settings = Settings(strict=False, xml_huge_tree=True)
+        transport_kwargs = {'cache': InMemoryCache()}
+        if self.session is not None:
+            transport_kwargs['session'] = self.session
+        client = Client(wsdl=self.wsdl_url, settings=settings, transport=Transport(**transport_kwargs))
+        
+        # Setup authentication if needed
+        if self.auth_type == 'WSS':
+            # WS-Security authentication
+            from zeep.wsse.username import UsernameToken
+            username = self.auth_config.get('username', '')
+            password = self.auth_config.get('password', '')
+            if username and password:
+                client.set_wsse(UsernameToken(username, password))
+        
+        return client
     
     def submit_application(
         self,
@@ -3,18 +3,33 @@ Form Mapper Service
 Maps data from Golden Records and 360° Profiles to scheme-specific form fields
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import sys
+import time
 from pathlib import Path
 import yaml
 import json
 import pandas as pd
 from jinja2 import Template
+from psycopg2.extras import execute_values
 
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
+
+
+@dataclass
+class MappingPlan:
+    """Compiled mapping plan for a scheme (sorted, pre-parsed, pre-compiled)"""
+    scheme_code: str
+    version: str
+    form_schema: Dict[str, Any]
+    mappings: List[Dict[str, Any]] = field(default_factory=list)
+    compiled_at: datetime = field(default_factory=datetime.now)
+    checked_at: float = field(default_factory=time.monotonic)
 
 
 class FormMapper:
@@ -57,6 +72,14 @@ class FormMapper:
                 self.use_case_config = yaml.safe_load(f)
         else:
             self.use_case_config = {}
+        
+        # Compiled mapping plans per scheme (invalidated on version change)
+        mapping_config = self.use_case_config.get('mapping', {})
+        plan_cache_config = mapping_config.get('plan_cache', {})
+        self.plan_cache_enabled = plan_cache_config.get('enabled', True)
+        self.version_check_interval = plan_cache_config.get('version_check_interval_seconds', 60)
+        self.batch_chunk_size = mapping_config.get('batch', {}).get('chunk_size', 1000)
+        self._plan_cache: Dict[str, MappingPlan] = {}
     
     def connect(self):
         """Connect to all databases"""
@@ -70,6 +93,7 @@ class FormMapper:
         for ext_db in self.external_dbs.values():
             ext_db.disconnect()
     
+    @traced('form_mapping.map_form_fields')
     def map_form_fields(
         self,
         application_id: int,
@@ -96,12 +120,119 @@ class FormMapper:
         profile_data = self._load_360_profile(family_id)
         eligibility_data = self._load_eligibility_snapshot(family_id, scheme_code)
         
-        # Load form schema and mappings
-        form_schema = self._load_form_schema(scheme_code)
-        mappings = self._load_field_mappings(scheme_code)
+        # Load compiled mapping plan (form schema + sorted, compiled mappings)
+        plan = self.get_mapping_plan(scheme_code)
         
         # Build context for mapping
-        context = {
+        context = self._build_context(
+            gr_data, profile_data, eligibility_data, family_id, member_id, scheme_code
+        )
+        
+        # Apply mappings
+        mapped_fields, field_sources = self._apply_plan(plan, context)
+        
+        # Store mapped fields in database
+        self._store_application_fields(application_id, mapped_fields, field_sources)
+        
+        # Build complete form data
+        form_data = self._build_form_data(mapped_fields, plan.form_schema)
+        
+        print(f"✅ Mapped {len(mapped_fields)} fields")
+        
+        return {
+            'success': True,
+            'application_id': application_id,
+            'mapped_fields_count': len(mapped_fields),
+            'form_data': form_data,
+            'field_sources': field_sources
+        }
+    
+    @traced('form_mapping.map_many')
+    def map_many(
+        self,
+        applications: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Map form fields for many applications in one pass
+        
+        Source data (Golden Records, 360° Profiles, eligibility snapshots) is
+        batch-loaded per chunk and mapped fields are written with one bulk
+        INSERT per chunk.
+        
+        Args:
+            applications: List of dicts with application_id, family_id,
+                scheme_code and optional member_id
+            chunk_size: Applications per batch (defaults to mapping.batch.chunk_size)
+        
+        Returns:
+            List of mapping results in the same order and shape as map_form_fields
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        results = []
+        started = time.monotonic()
+        
+        print(f"\n🔄 Mapping form fields for {len(applications)} applications")
+        
+        for start in range(0, len(applications), chunk_size):
+            chunk = applications[start:start + chunk_size]
+            family_ids = sorted({str(app['family_id']) for app in chunk})
+            scheme_codes = sorted({app['scheme_code'] for app in chunk})
+            
+            plans = self.get_mapping_plans(scheme_codes)
+            gr_by_family = self._load_golden_records_bulk(family_ids)
+            profile_by_family = self._load_360_profiles_bulk(family_ids)
+            eligibility_by_key = self._load_eligibility_snapshots_bulk(family_ids, scheme_codes)
+            
+            chunk_fields = []
+            for app in chunk:
+                family_id = str(app['family_id'])
+                scheme_code = app['scheme_code']
+                member_id = app.get('member_id')
+                
+                context = self._build_context(
+                    gr_by_family.get(family_id, {}),
+                    profile_by_family.get(family_id, {}),
+                    eligibility_by_key.get((family_id, scheme_code), {}),
+                    family_id,
+                    member_id,
+                    scheme_code
+                )
+                plan = plans[scheme_code]
+                mapped_fields, field_sources = self._apply_plan(plan, context)
+                chunk_fields.append((app['application_id'], mapped_fields, field_sources))
+                
+                results.append({
+                    'success': True,
+                    'application_id': app['application_id'],
+                    'mapped_fields_count': len(mapped_fields),
+                    'form_data': self._build_form_data(mapped_fields, plan.form_schema),
+                    'field_sources': field_sources
+                })
+            
+            failed = set(self._store_application_fields_bulk(chunk_fields))
+            for result in results[start:start + len(chunk)]:
+                if result['application_id'] in failed:
+                    result['success'] = False
+                    result['error'] = 'Failed to store mapped fields'
+        
+        elapsed = time.monotonic() - started
+        rate = len(applications) / elapsed if elapsed > 0 else 0.0
+        print(f"✅ Mapped {len(applications)} applications in {elapsed:.2f}s ({rate:.0f}/s)")
+        
+        return results
+    
+    def _build_context(
+        self,
+        gr_data: Dict[str, Any],
+        profile_data: Dict[str, Any],
+        eligibility_data: Dict[str, Any],
+        family_id: str,
+        member_id: Optional[str],
+        scheme_code: str
+    ) -> Dict[str, Any]:
+        """Build evaluation context for mapping rules"""
+        return {
             'GR': gr_data,
             'PROFILE_360': profile_data,
             'ELIGIBILITY': eligibility_data,
@@ -109,15 +240,21 @@ class FormMapper:
             'member_id': member_id,
             'scheme_code': scheme_code
         }
-        
-        # Apply mappings
+    
+    def _apply_plan(
+        self,
+        plan: MappingPlan,
+        context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Apply a compiled mapping plan to a context"""
         mapped_fields = {}
         field_sources = {}
         
-        for mapping in sorted(mappings, key=lambda x: x['priority']):
+        # Mappings are pre-sorted by priority (lower value = higher priority)
+        for mapping in plan.mappings:
             target_field = mapping['target_field_name']
             
-            # Skip if already mapped (lower priority mappings come first)
+            # Skip if already mapped by a higher priority mapping
             if target_field in mapped_fields:
                 continue
             
@@ -133,21 +270,279 @@ class FormMapper:
             except Exception as e:
                 print(f"⚠️  Error mapping field {target_field}: {e}")
         
-        # Store mapped fields in database
-        self._store_application_fields(application_id, mapped_fields, field_sources)
+        return mapped_fields, field_sources
+    
+    # ------------------------------------------------------------------
+    # Mapping plan cache
+    # ------------------------------------------------------------------
+    
+    def get_mapping_plan(self, scheme_code: str) -> MappingPlan:
+        """Get compiled mapping plan for a scheme (cached, version-checked)"""
+        return self.get_mapping_plans([scheme_code])[scheme_code]
+    
+    def get_mapping_plans(self, scheme_codes: List[str]) -> Dict[str, MappingPlan]:
+        """
+        Get compiled mapping plans for several schemes
         
-        # Build complete form data
-        form_data = self._build_form_data(mapped_fields, form_schema)
+        Cached plans are re-validated against the stored mapping/schema version
+        at most once per version_check_interval_seconds; plans whose version
+        changed are recompiled.
+        """
+        now = time.monotonic()
+        plans = {}
+        to_check = []
         
-        print(f"✅ Mapped {len(mapped_fields)} fields")
+        for scheme_code in scheme_codes:
+            plan = self._plan_cache.get(scheme_code) if self.plan_cache_enabled else None
+            if plan and now - plan.checked_at < self.version_check_interval:
+                plans[scheme_code] = plan
+            else:
+                to_check.append(scheme_code)
         
-        return {
-            'success': True,
-            'application_id': application_id,
-            'mapped_fields_count': len(mapped_fields),
-            'form_data': form_data,
-            'field_sources': field_sources
-        }
+        if to_check:
+            versions = self._load_plan_versions(to_check)
+            for scheme_code in to_check:
+                version = versions.get(scheme_code, '')
+                plan = self._plan_cache.get(scheme_code) if self.plan_cache_enabled else None
+                if plan is None or plan.version != version:
+                    plan = self._compile_plan(scheme_code, version)
+                    if self.plan_cache_enabled:
+                        self._plan_cache[scheme_code] = plan
+                plan.checked_at = now
+                plans[scheme_code] = plan
+        
+        return plans
+    
+    def invalidate_plan(self, scheme_code: Optional[str] = None):
+        """Drop cached mapping plan for a scheme (or all schemes)"""
+        if scheme_code is None:
+            self._plan_cache.clear()
+        else:
+            self._plan_cache.pop(scheme_code, None)
+    
+    def _load_plan_versions(self, scheme_codes: List[str]) -> Dict[str, str]:
+        """Load mapping/schema version fingerprints for schemes in one query"""
+        try:
+            query = """
+                SELECT
+                    s.scheme_code,
+                    COALESCE((
+                        SELECT MAX(m.updated_at)::text || '/' || COUNT(*)::text
+                        FROM application.scheme_field_mappings m
+                        WHERE m.scheme_code = s.scheme_code
+                            AND m.is_active = true
+                    ), '') AS mappings_version,
+                    COALESCE((
+                        SELECT f.schema_version || '@' || f.updated_at::text
+                        FROM application.scheme_form_schemas f
+                        WHERE f.scheme_code = s.scheme_code
+                            AND f.is_active = true
+                        ORDER BY f.created_at DESC
+                        LIMIT 1
+                    ), '') AS schema_version
+                FROM unnest(%s::text[]) AS s(scheme_code)
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, [list(scheme_codes)])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return {
+                scheme_code: f"{mappings_version}|{schema_version}"
+                for scheme_code, mappings_version, schema_version in rows
+            }
+        
+        except Exception as e:
+            print(f"⚠️  Error loading mapping plan versions: {e}")
+            self.db.connection.rollback()
+            return {}
+    
+    def _compile_plan(self, scheme_code: str, version: str) -> MappingPlan:
+        """Load and compile form schema and field mappings for a scheme"""
+        form_schema = self._load_form_schema(scheme_code)
+        mappings = self._load_field_mappings(scheme_code)
+        
+        compiled = [
+            self._compile_mapping(mapping)
+            for mapping in sorted(mappings, key=lambda x: (x['priority'], x['mapping_id']))
+        ]
+        
+        return MappingPlan(
+            scheme_code=scheme_code,
+            version=version,
+            form_schema=form_schema,
+            mappings=compiled
+        )
+    
+    def _compile_mapping(self, mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """Pre-resolve source paths and pre-compile expressions of a mapping"""
+        compiled = dict(mapping)
+        
+        if mapping.get('source_field'):
+            compiled['_field_path'] = self._resolve_field_path(
+                mapping['source_field'], mapping['source_type']
+            )
+        
+        source_fields = mapping.get('source_fields') or []
+        compiled['_source_fields'] = [
+            tuple(f.split('.', 1)) if '.' in f else (mapping['source_type'], f)
+            for f in source_fields
+        ]
+        
+        if mapping.get('transformation_expression'):
+            compiled['_transformation'] = self._compile_transformation(
+                mapping['transformation_expression']
+            )
+        
+        if mapping.get('condition_expression'):
+            compiled['_condition'] = self._compile_condition(mapping['condition_expression'])
+        
+        return compiled
+    
+    @staticmethod
+    def _resolve_field_path(source_field: str, source_type: str) -> List[str]:
+        """Resolve source field to a path within its source (strips source prefix)"""
+        # Handle nested field paths (e.g., "GR.first_name" or "PROFILE_360.income_band")
+        if '.' in source_field:
+            parts = source_field.split('.', 1)
+            if parts[0] == source_type:
+                field_path = parts[1] if len(parts) > 1 else parts[0]
+            else:
+                field_path = source_field
+        else:
+            field_path = source_field
+        
+        return field_path.split('.')
+    
+    @staticmethod
+    def _compile_transformation(expression: str) -> Tuple[Optional[Template], Any]:
+        """Compile transformation into (Jinja2 template, Python code object)"""
+        try:
+            template = Template(expression)
+        except Exception:
+            template = None
+        
+        try:
+            code = compile(expression, '<transformation>', 'eval')
+        except Exception:
+            code = None
+        
+        return template, code
+    
+    @staticmethod
+    def _compile_condition(expression: str) -> Any:
+        """Compile condition expression (None if it cannot be compiled)"""
+        try:
+            return compile(expression, '<condition>', 'eval')
+        except Exception:
+            return None
+    
+    # ------------------------------------------------------------------
+    # Bulk source loaders
+    # ------------------------------------------------------------------
+    
+    def _load_golden_records_bulk(self, family_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load latest active Golden Record for many families"""
+        try:
+            if 'golden_records' not in self.external_dbs or not family_ids:
+                return {}
+            
+            gr_db = self.external_dbs['golden_records']
+            
+            query = """
+                SELECT DISTINCT ON (family_id) *
+                FROM golden_records
+                WHERE family_id::text = ANY(%s)
+                    AND status = 'active'
+                ORDER BY family_id, updated_at DESC
+            """
+            
+            cursor = gr_db.connection.cursor()
+            cursor.execute(query, [family_ids])
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            records = {}
+            for row in rows:
+                gr_data = dict(zip(columns, row))
+                records[str(gr_data['family_id'])] = gr_data
+            
+            return records
+        
+        except Exception as e:
+            print(f"⚠️  Error bulk loading Golden Records: {e}")
+            return {}
+    
+    def _load_360_profiles_bulk(self, family_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load latest 360° Profile for many families"""
+        try:
+            if 'profile_360' not in self.external_dbs or not family_ids:
+                return {}
+            
+            profile_db = self.external_dbs['profile_360']
+            
+            query = """
+                SELECT DISTINCT ON (family_id)
+                    family_id::text,
+                    profile_data,
+                    income_band,
+                    cluster_id,
+                    vulnerability_level
+                FROM profile_360
+                WHERE family_id::text = ANY(%s)
+                ORDER BY family_id, updated_at DESC
+            """
+            
+            cursor = profile_db.connection.cursor()
+            cursor.execute(query, [family_ids])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return {row[0]: self._profile_row_to_dict(row[1:]) for row in rows}
+        
+        except Exception as e:
+            print(f"⚠️  Error bulk loading 360° Profiles: {e}")
+            return {}
+    
+    def _load_eligibility_snapshots_bulk(
+        self,
+        family_ids: List[str],
+        scheme_codes: List[str]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Load latest eligibility snapshot for many (family, scheme) pairs"""
+        try:
+            if 'eligibility' not in self.external_dbs or not family_ids:
+                return {}
+            
+            eligibility_db = self.external_dbs['eligibility']
+            
+            query = """
+                SELECT DISTINCT ON (family_id, scheme_code)
+                    family_id::text,
+                    scheme_code,
+                    eligibility_score,
+                    evaluation_status,
+                    rules_passed,
+                    rules_failed,
+                    reason_codes
+                FROM eligibility.eligibility_snapshots
+                WHERE family_id::text = ANY(%s)
+                    AND scheme_code = ANY(%s)
+                ORDER BY family_id, scheme_code, evaluation_timestamp DESC
+            """
+            
+            cursor = eligibility_db.connection.cursor()
+            cursor.execute(query, [family_ids, scheme_codes])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return {(row[0], row[1]): self._eligibility_row_to_dict(row[2:]) for row in rows}
+        
+        except Exception as e:
+            print(f"⚠️  Error bulk loading eligibility snapshots: {e}")
+            return {}
     
     def _load_golden_record(self, family_id: str, member_id: Optional[str] = None) -> Dict[str, Any]:
         """Load Golden Record data"""
@@ -210,25 +605,7 @@ class FormMapper:
             cursor.close()
             
             if row:
-                profile_data, income_band, cluster_id, vulnerability_level = row
-                
-                # Parse profile_data if it's JSON
-                if isinstance(profile_data, str):
-                    try:
-                        profile_dict = json.loads(profile_data)
-                    except:
-                        profile_dict = {}
-                elif isinstance(profile_data, dict):
-                    profile_dict = profile_data
-                else:
-                    profile_dict = {}
-                
-                return {
-                    **profile_dict,
-                    'income_band': income_band,
-                    'cluster_id': cluster_id,
-                    'vulnerability_level': vulnerability_level
-                }
+                return self._profile_row_to_dict(row)
             
             return {}
         
@@ -236,6 +613,29 @@ class FormMapper:
             print(f"⚠️  Error loading 360° Profile: {e}")
             return {}
     
+    @staticmethod
+    def _profile_row_to_dict(row: tuple) -> Dict[str, Any]:
+        """Convert (profile_data, income_band, cluster_id, vulnerability_level) row"""
+        profile_data, income_band, cluster_id, vulnerability_level = row
+        
+        # Parse profile_data if it's JSON
+        if isinstance(profile_data, str):
+            try:
+                profile_dict = json.loads(profile_data)
+            except:
+                profile_dict = {}
+        elif isinstance(profile_data, dict):
+            profile_dict = profile_data
+        else:
+            profile_dict = {}
+        
+        return {
+            **profile_dict,
+            'income_band': income_band,
+            'cluster_id': cluster_id,
+            'vulnerability_level': vulnerability_level
+        }
+    
     def _load_eligibility_snapshot(self, family_id: str, scheme_code: str) -> Dict[str, Any]:
         """Load eligibility snapshot data"""
         try:
@@ -264,14 +664,7 @@ class FormMapper:
             cursor.close()
             
             if row:
-                score, status, rules_passed, rules_failed, reason_codes = row
-                return {
-                    'eligibility_score': float(score) if score else 0.0,
-                    'evaluation_status': status,
-                    'rules_passed': rules_passed or [],
-                    'rules_failed': rules_failed or [],
-                    'reason_codes': reason_codes or []
-                }
+                return self._eligibility_row_to_dict(row)
             
             return {}
         
@@ -279,6 +672,18 @@ class FormMapper:
             print(f"⚠️  Error loading eligibility snapshot: {e}")
             return {}
     
+    @staticmethod
+    def _eligibility_row_to_dict(row: tuple) -> Dict[str, Any]:
+        """Convert (score, status, rules_passed, rules_failed, reason_codes) row"""
+        score, status, rules_passed, rules_failed, reason_codes = row
+        return {
+            'eligibility_score': float(score) if score else 0.0,
+            'evaluation_status': status,
+            'rules_passed': rules_passed or [],
+            'rules_failed': rules_failed or [],
+            'reason_codes': reason_codes or []
+        }
+    
     def _load_form_schema(self, scheme_code: str) -> Dict[str, Any]:
         """Load form schema for scheme"""
         try:
@@ -366,7 +771,9 @@ class FormMapper:
         
         # Check condition if present
         if mapping.get('condition_expression'):
-            if not self._evaluate_condition(mapping['condition_expression'], context):
+            if not self._evaluate_condition(
+                mapping['condition_expression'], context, mapping.get('_condition', False)
+            ):
                 return None, None
         
         # Get source value based on mapping type
@@ -390,7 +797,9 @@ class FormMapper:
         
         # Apply transformation if needed
         if value is not None and mapping.get('transformation_expression'):
-            value = self._apply_transformation(mapping['transformation_expression'], value, context)
+            value = self._apply_transformation(
+                mapping['transformation_expression'], value, context, mapping.get('_transformation')
+            )
         
         # Use default if value is None
         if value is None and mapping.get('default_value'):
@@ -408,19 +817,12 @@ class FormMapper:
         if not source_data:
             return None
         
-        # Handle nested field paths (e.g., "GR.first_name" or "PROFILE_360.income_band")
-        if '.' in source_field:
-            parts = source_field.split('.', 1)
-            if parts[0] == source_type:
-                field_path = parts[1] if len(parts) > 1 else parts[0]
-            else:
-                field_path = source_field
-        else:
-            field_path = source_field
+        # Use pre-resolved path from the compiled plan when available
+        field_path = mapping.get('_field_path') or self._resolve_field_path(source_field, source_type)
         
         # Navigate nested structure
         value = source_data
-        for part in field_path.split('.'):
+        for part in field_path:
             if isinstance(value, dict):
                 value = value.get(part)
             else:
@@ -441,7 +843,9 @@ class FormMapper:
         # Apply transformation
         transformation = mapping.get('transformation_expression')
         if transformation:
-            return self._apply_transformation(transformation, source_value, context)
+            return self._apply_transformation(
+                transformation, source_value, context, mapping.get('_transformation')
+            )
         
         return source_value
     
@@ -451,15 +855,14 @@ class FormMapper:
         if not source_fields:
             return None
         
-        values = []
-        for field in source_fields:
+        parsed_fields = mapping.get('_source_fields') or [
             # Parse source field (e.g., "GR.first_name")
-            if '.' in field:
-                source_type, field_path = field.split('.', 1)
-            else:
-                source_type = mapping['source_type']
-                field_path = field
-            
+            tuple(field.split('.', 1)) if '.' in field else (mapping['source_type'], field)
+            for field in source_fields
+        ]
+        
+        values = []
+        for source_type, field_path in parsed_fields:
             source_data = context.get(source_type, {})
             if isinstance(source_data, dict):
                 value = source_data.get(field_path)
@@ -482,30 +885,52 @@ class FormMapper:
         """Get conditional value based on conditions"""
         # Evaluate condition and return appropriate value
         condition = mapping.get('condition_expression')
-        if condition and self._evaluate_condition(condition, context):
+        if condition and self._evaluate_condition(condition, context, mapping.get('_condition', False)):
             return self._get_direct_value(mapping, context)
         return None
     
-    def _apply_transformation(self, expression: str, value: Any, context: Dict[str, Any]) -> Any:
-        """Apply transformation expression"""
-        try:
-            # Simple Jinja2 template transformation
-            template = Template(expression)
-            return template.render(value=value, context=context, **context)
-        except:
-            # Fallback to Python eval for simple expressions (use with caution)
+    def _apply_transformation(
+        self,
+        expression: str,
+        value: Any,
+        context: Dict[str, Any],
+        compiled: Optional[Tuple[Optional[Template], Any]] = None
+    ) -> Any:
+        """Apply transformation expression (uses pre-compiled form if given)"""
+        template, code = compiled or self._compile_transformation(expression)
+        
+        # Simple Jinja2 template transformation
+        if template is not None:
+            try:
+                return template.render(value=value, context=context, **context)
+            except:
+                pass
+        
+        # Fallback to Python eval for simple expressions (use with caution)
+        if code is not None:
             try:
                 safe_dict = {'value': value, 'context': context, **context}
-                return eval(expression, {"__builtins__": {}}, safe_dict)
+                return eval(code, {"__builtins__": {}}, safe_dict)
             except:
-                return value
+                pass
+        
+        return value
     
-    def _evaluate_condition(self, expression: str, context: Dict[str, Any]) -> bool:
-        """Evaluate condition expression"""
+    def _evaluate_condition(
+        self,
+        expression: str,
+        context: Dict[str, Any],
+        compiled: Any = False
+    ) -> bool:
+        """Evaluate condition expression (uses pre-compiled code if given)"""
+        code = self._compile_condition(expression) if compiled is False else compiled
+        if code is None:
+            return False
+        
         try:
             # Simple Python eval (use with caution in production)
             safe_dict = {**context}
-            result = eval(expression, {"__builtins__": {}}, safe_dict)
+            result = eval(code, {"__builtins__": {}}, safe_dict)
             return bool(result)
         except:
             return False
@@ -517,54 +942,106 @@ class FormMapper:
         field_sources: Dict[str, Any]
     ):
         """Store mapped fields in database with source tracking"""
+        self._store_application_fields_bulk([(application_id, mapped_fields, field_sources)])
+    
+    def _store_application_fields_bulk(
+        self,
+        applications: List[Tuple[int, Dict[str, Any], Dict[str, Any]]]
+    ) -> List[int]:
+        """
+        Store mapped fields for many applications with a single bulk INSERT
+        
+        If the bulk INSERT fails, each application is inserted on its own so
+        one bad record does not drop the rest of the chunk.
+        
+        Returns:
+            IDs of applications whose fields could not be stored
+        """
+        failed = []
+        rows_by_application = []
+        for application_id, mapped_fields, field_sources in applications:
+            try:
+                rows_by_application.append(
+                    (application_id, self._field_rows(application_id, mapped_fields, field_sources))
+                )
+            except (TypeError, ValueError) as e:
+                print(f"⚠️  Error serializing fields for application {application_id}: {e}")
+                failed.append(application_id)
+        
+        rows = [row for _, application_rows in rows_by_application for row in application_rows]
+        if not rows or self._insert_field_rows(rows):
+            return failed
+        
+        if len(rows_by_application) == 1:
+            return failed + [rows_by_application[0][0]]
+        for application_id, application_rows in rows_by_application:
+            if application_rows and not self._insert_field_rows(application_rows):
+                failed.append(application_id)
+        return failed
+    
+    def _field_rows(
+        self,
+        application_id: int,
+        mapped_fields: Dict[str, Any],
+        field_sources: Dict[str, Any]
+    ) -> List[Tuple]:
+        """application_fields rows of one application (dates and other values JSON-encoded as strings)"""
+        rows = []
+        for field_name, field_value in mapped_fields.items():
+            source_info = field_sources.get(field_name, {})
+            rows.append((
+                application_id,
+                field_name,
+                json.dumps(field_value, default=str),
+                self._field_type(field_value),
+                source_info.get('source_type', 'UNKNOWN'),
+                json.dumps(source_info, default=str),
+                source_info.get('mapping_type'),
+                source_info.get('mapping_id')
+            ))
+        return rows
+    
+    def _insert_field_rows(self, rows: List[Tuple]) -> bool:
+        """Insert application_fields rows in one transaction"""
         try:
             cursor = self.db.connection.cursor()
             
-            for field_name, field_value in mapped_fields.items():
-                source_info = field_sources.get(field_name, {})
-                
-                # Determine field type
-                if isinstance(field_value, bool):
-                    field_type = 'boolean'
-                elif isinstance(field_value, (int, float)):
-                    field_type = 'number'
-                elif isinstance(field_value, list):
-                    field_type = 'array'
-                elif isinstance(field_value, dict):
-                    field_type = 'object'
-                else:
-                    field_type = 'string'
-                
-                query = """
-                    INSERT INTO application.application_fields (
-                        application_id,
-                        field_name,
-                        field_value,
-                        field_type,
-                        source_type,
-                        source_detail,
-                        mapping_type,
-                        mapping_rule_id
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                cursor.execute(query, (
+            query = """
+                INSERT INTO application.application_fields (
                     application_id,
                     field_name,
-                    json.dumps(field_value),
+                    field_value,
                     field_type,
-                    source_info.get('source_type', 'UNKNOWN'),
-                    json.dumps(source_info),
-                    source_info.get('mapping_type'),
-                    source_info.get('mapping_id')
-                ))
+                    source_type,
+                    source_detail,
+                    mapping_type,
+                    mapping_rule_id
+                ) VALUES %s
+            """
+            
+            execute_values(cursor, query, rows, page_size=1000)
             
             self.db.connection.commit()
             cursor.close()
+            return True
         
         except Exception as e:
             print(f"⚠️  Error storing application fields: {e}")
             self.db.connection.rollback()
+            return False
+    
+    @staticmethod
+    def _field_type(field_value: Any) -> str:
+        """Determine stored field type for a mapped value"""
+        if isinstance(field_value, bool):
+            return 'boolean'
+        elif isinstance(field_value, (int, float)):
+            return 'number'
+        elif isinstance(field_value, list):
+            return 'array'
+        elif isinstance(field_value, dict):
+            return 'object'
+        return 'string'
     
     def _build_form_data(self, mapped_fields: Dict[str, Any], form_schema: Dict[str, Any]) -> Dict[str, Any]:
         """Build complete form data structure"""
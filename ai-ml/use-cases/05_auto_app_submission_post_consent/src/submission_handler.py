@@ -3,7 +3,7 @@ Submission Handler
 Handles application submission based on mode (auto/review/assisted)
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -16,8 +16,9 @@ from db_connector import DBConnector
 
 # Import connectors
 sys.path.append(str(Path(__file__).parent / "connectors"))
-from connector_factory import ConnectorFactory
-from department_connector import SubmissionResult
+from connector_registry import get_connector_registry
+from department_connector import DepartmentConnector, SubmissionResult
+from submission_outbox import SubmissionOutbox
 
 
 class SubmissionHandler:
@@ -49,6 +50,15 @@ class SubmissionHandler:
                 self.use_case_config = yaml.safe_load(f)
         else:
             self.use_case_config = {}
+        
+        # Process-wide connector cache with pooled keep-alive sessions
+        department_config = self.use_case_config.get('department', {})
+        self.connector_registry = get_connector_registry(department_config)
+        self.default_connector_name = department_config.get('default_connector_name', 'DEFAULT_REST')
+        
+        # Asynchronous submission via transactional outbox (drained by SubmissionWorker)
+        self.outbox_enabled = department_config.get('outbox', {}).get('enabled', False)
+        self.outbox = SubmissionOutbox(self.db)
     
     def connect(self):
         """Connect to database"""
@@ -93,50 +103,32 @@ class SubmissionHandler:
             }
     
     def _auto_submit(
+        self,
+        application_id: int,
+        scheme_code: str,
+        submission_mode: str = 'auto'
+    ) -> Dict[str, Any]:
+        """Auto-submit application (queued to the outbox when enabled)"""
+        if self.outbox_enabled:
+            return self._enqueue_submission(application_id, scheme_code, submission_mode)
+        
+        return self.submit_now(application_id, scheme_code)
+    
+    def submit_now(
         self,
         application_id: int,
         scheme_code: str
     ) -> Dict[str, Any]:
-        """Auto-submit application directly to department"""
+        """Submit application synchronously to department"""
         try:
-            # Load application data
-            application_data = self._load_application_data(application_id)
-            
-            # Get connector
-            connector = self._get_connector(scheme_code)
+            connector, result = self.submit_to_department(application_id, scheme_code)
             if not connector:
                 return {
                     'success': False,
                     'error': 'No connector configured for scheme'
                 }
             
-            # Submit application
-            result = connector.submit_application(
-                application_data=application_data,
-                scheme_code=scheme_code
-            )
-            
-            # Store submission record
-            submission_id = self._store_submission_record(
-                application_id=application_id,
-                result=result,
-                connector_name=connector.connector_name,
-                connector_type=connector.connector_type
-            )
-            
-            # Update application status
-            if result.success:
-                self._update_application_status(application_id, 'submitted', result.department_application_number)
-                self._publish_event(application_id, 'APPLICATION_SUBMITTED', {
-                    'department_application_number': result.department_application_number,
-                    'submission_id': submission_id
-                })
-            else:
-                self._update_application_status(application_id, 'submission_failed')
-                self._publish_event(application_id, 'APPLICATION_SUBMISSION_FAILED', {
-                    'error': result.error_message,
-                    'submission_id': submission_id
-                })
+            submission_id = self.record_submission_result(application_id, connector, result)
             
             return {
                 'success': result.success,
@@ -153,6 +145,106 @@ class SubmissionHandler:
                 'error': str(e)
             }
     
+    def submit_to_department(
+        self,
+        application_id: int,
+        scheme_code: str
+    ) -> Tuple[Optional[DepartmentConnector], Optional[SubmissionResult]]:
+        """Load application data and submit it through the scheme's connector"""
+        # Load application data
+        application_data = self._load_application_data(application_id)
+        
+        # Get connector
+        connector = self._get_connector(scheme_code)
+        if not connector:
+            return None, None
+        
+        # Submit application
+        result = connector.submit_application(
+            application_data=application_data,
+            scheme_code=scheme_code
+        )
+        
+        return connector, result
+    
+    def record_submission_result(
+        self,
+        application_id: int,
+        connector: DepartmentConnector,
+        result: SubmissionResult,
+        attempt_number: int = 1,
+        final: bool = True
+    ) -> Optional[int]:
+        """
+        Store submission attempt and update application status
+        
+        Args:
+            final: False when a failed attempt will be retried, so the
+                application stays in pending_submission
+        
+        Returns:
+            Submission ID
+        """
+        # Store submission record
+        submission_id = self._store_submission_record(
+            application_id=application_id,
+            result=result,
+            connector_name=connector.connector_name,
+            connector_type=connector.connector_type,
+            attempt_number=attempt_number
+        )
+        
+        # Update application status
+        if result.success:
+            self._update_application_status(application_id, 'submitted', result.department_application_number)
+            self._publish_event(application_id, 'APPLICATION_SUBMITTED', {
+                'department_application_number': result.department_application_number,
+                'submission_id': submission_id
+            })
+        elif final:
+            self._update_application_status(application_id, 'submission_failed')
+            self._publish_event(application_id, 'APPLICATION_SUBMISSION_FAILED', {
+                'error': result.error_message,
+                'submission_id': submission_id
+            })
+        
+        return submission_id
+    
+    def _enqueue_submission(
+        self,
+        application_id: int,
+        scheme_code: str,
+        submission_mode: str
+    ) -> Dict[str, Any]:
+        """Queue application in the submission outbox (same transaction as status change)"""
+        try:
+            cursor = self.db.connection.cursor()
+            cursor.execute("""
+                UPDATE application.applications
+                SET status = 'pending_submission',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE application_id = %s
+            """, [application_id])
+            outbox_id = self.outbox.enqueue(cursor, application_id, scheme_code, submission_mode)
+            self.db.connection.commit()
+            cursor.close()
+            
+            return {
+                'success': True,
+                'status': 'pending_submission',
+                'outbox_id': outbox_id,
+                'message': 'Application queued for submission' if outbox_id
+                           else 'Application already queued for submission'
+            }
+        
+        except Exception as e:
+            print(f"❌ Error queueing submission: {e}")
+            self.db.connection.rollback()
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def _store_for_review(
         self,
         application_id: int,
@@ -216,7 +308,7 @@ class SubmissionHandler:
     ) -> Dict[str, Any]:
         """Submit application after citizen review"""
         # Same as auto_submit but for reviewed applications
-        return self._auto_submit(application_id, scheme_code)
+        return self._auto_submit(application_id, scheme_code, 'review')
     
     def _load_application_data(self, application_id: int) -> Dict[str, Any]:
         """Load complete application data"""
@@ -287,20 +379,20 @@ class SubmissionHandler:
             return {'application_id': application_id}
     
     def _get_connector(self, scheme_code: str):
-        """Get connector for scheme"""
+        """Get connector for scheme (cached in the connector registry)"""
         try:
             # Try to find scheme-specific connector
-            connector = ConnectorFactory.load_connector_from_db(
+            connector = self.connector_registry.get_connector(
                 self.db.connection,
-                'DEFAULT_REST',  # Default connector name
+                self.default_connector_name,
                 scheme_code
             )
             
             if not connector:
                 # Fallback to default
-                connector = ConnectorFactory.load_connector_from_db(
+                connector = self.connector_registry.get_connector(
                     self.db.connection,
-                    'DEFAULT_REST'
+                    self.default_connector_name
                 )
             
             return connector
@@ -314,7 +406,8 @@ class SubmissionHandler:
         application_id: int,
         result: SubmissionResult,
         connector_name: str,
-        connector_type: str
+        connector_type: str,
+        attempt_number: int = 1
     ) -> Optional[int]:
         """Store submission record in database"""
         try:
@@ -333,8 +426,10 @@ class SubmissionHandler:
                     response_message,
                     submitted_at,
                     responded_at,
-                    submitted_by
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    submitted_by,
+                    attempt_number,
+                    is_retry
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 RETURNING submission_id
             """
             
@@ -353,7 +448,9 @@ class SubmissionHandler:
                 result.error_message,
                 result.submitted_at or datetime.now(),
                 datetime.now() if result.submitted_at else None,
-                'submission_handler'
+                'submission_handler',
+                attempt_number,
+                attempt_number > 1
             ))
             
             submission_id = cursor.fetchone()[0]
@@ -0,0 +1,256 @@
+"""
+Submission Outbox
+Transactional outbox of pending department submissions (application.submission_outbox)
+"""
+
+from typing import Dict, Any, Optional, List
+import sys
+from pathlib import Path
+
+# Add shared utils to path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from db_connector import DBConnector
+
+
+class SubmissionOutbox:
+    """Enqueue, claim and settle outbox entries for the submission worker"""
+    
+    def __init__(self, db: DBConnector):
+        """
+        Initialize submission outbox
+        
+        Args:
+            db: Connected database connector (application schema)
+        """
+        self.db = db
+    
+    def enqueue(
+        self,
+        cursor,
+        application_id: int,
+        scheme_code: str,
+        submission_mode: str = 'auto'
+    ) -> Optional[int]:
+        """
+        Add a submission to the outbox using the caller's cursor
+        
+        The caller commits, so the outbox row is written atomically with the
+        application status change that requested the submission.
+        
+        Returns:
+            Outbox ID, or None if the application is already queued
+        """
+        query = """
+            INSERT INTO application.submission_outbox (
+                application_id,
+                scheme_code,
+                submission_mode,
+                status,
+                next_attempt_at
+            ) VALUES (%s, %s, %s, 'pending', CURRENT_TIMESTAMP)
+            ON CONFLICT (application_id) WHERE status IN ('pending', 'in_flight')
+            DO NOTHING
+            RETURNING outbox_id
+        """
+        
+        cursor.execute(query, (application_id, scheme_code, submission_mode))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def claim_due(self, worker_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` due entries for this worker
+        
+        Uses FOR UPDATE SKIP LOCKED so several workers can drain concurrently.
+        """
+        if limit <= 0:
+            return []
+        
+        try:
+            query = """
+                UPDATE application.submission_outbox o
+                SET status = 'in_flight',
+                    locked_by = %s,
+                    locked_at = CURRENT_TIMESTAMP
+                WHERE o.outbox_id IN (
+                    SELECT outbox_id
+                    FROM application.submission_outbox
+                    WHERE status = 'pending'
+                        AND next_attempt_at <= CURRENT_TIMESTAMP
+                    ORDER BY next_attempt_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING
+                    o.outbox_id,
+                    o.application_id,
+                    o.scheme_code,
+                    o.submission_mode,
+                    o.attempt_count
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, (worker_id, limit))
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+            self.db.connection.commit()
+            cursor.close()
+            
+            return [dict(zip(columns, row)) for row in rows]
+        
+        except Exception as e:
+            print(f"⚠️  Error claiming outbox entries: {e}")
+            self.db.connection.rollback()
+            return []
+    
+    def reclaim_expired(self, lease_seconds: int) -> int:
+        """Return in-flight entries whose worker lease expired to pending"""
+        try:
+            query = """
+                UPDATE application.submission_outbox
+                SET status = 'pending',
+                    locked_by = NULL,
+                    locked_at = NULL
+                WHERE status = 'in_flight'
+                    AND locked_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 second')
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, (lease_seconds,))
+            reclaimed = cursor.rowcount
+            self.db.connection.commit()
+            cursor.close()
+            
+            return reclaimed
+        
+        except Exception as e:
+            print(f"⚠️  Error reclaiming outbox leases: {e}")
+            self.db.connection.rollback()
+            return 0
+    
+    def mark_succeeded(
+        self,
+        outbox_id: int,
+        submission_id: Optional[int],
+        status_code: Optional[int]
+    ):
+        """Mark entry as successfully submitted"""
+        self._settle(outbox_id, 'succeeded', submission_id, status_code, None, count_attempt=True)
+    
+    def mark_failed(
+        self,
+        outbox_id: int,
+        error: Optional[str],
+        status_code: Optional[int] = None,
+        submission_id: Optional[int] = None
+    ):
+        """Mark entry as permanently failed (no further retries)"""
+        self._settle(outbox_id, 'failed', submission_id, status_code, error, count_attempt=True)
+    
+    def reschedule(
+        self,
+        outbox_id: int,
+        delay_seconds: float,
+        error: Optional[str],
+        status_code: Optional[int] = None,
+        submission_id: Optional[int] = None,
+        count_attempt: bool = True
+    ):
+        """
+        Put entry back to pending with a delayed next attempt
+        
+        Args:
+            count_attempt: False when the entry was deferred without contacting
+                the department (e.g. open circuit), so retries are not consumed
+        """
+        try:
+            query = """
+                UPDATE application.submission_outbox
+                SET status = 'pending',
+                    attempt_count = attempt_count + %s,
+                    next_attempt_at = CURRENT_TIMESTAMP + (%s * INTERVAL '1 second'),
+                    locked_by = NULL,
+                    locked_at = NULL,
+                    last_submission_id = COALESCE(%s, last_submission_id),
+                    last_status_code = COALESCE(%s, last_status_code),
+                    last_error = %s
+                WHERE outbox_id = %s
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, (
+                1 if count_attempt else 0,
+                float(delay_seconds),
+                submission_id,
+                status_code,
+                error,
+                outbox_id
+            ))
+            self.db.connection.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error rescheduling outbox entry {outbox_id}: {e}")
+            self.db.connection.rollback()
+    
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get number of outbox entries per status"""
+        try:
+            query = """
+                SELECT status, COUNT(*)
+                FROM application.submission_outbox
+                GROUP BY status
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            self.db.connection.commit()
+            cursor.close()
+            
+            return {status: count for status, count in rows}
+        
+        except Exception as e:
+            print(f"⚠️  Error loading outbox status counts: {e}")
+            self.db.connection.rollback()
+            return {}
+    
+    def _settle(
+        self,
+        outbox_id: int,
+        status: str,
+        submission_id: Optional[int],
+        status_code: Optional[int],
+        error: Optional[str],
+        count_attempt: bool
+    ):
+        """Move entry to a terminal status"""
+        try:
+            query = """
+                UPDATE application.submission_outbox
+                SET status = %s,
+                    attempt_count = attempt_count + %s,
+                    locked_by = NULL,
+                    locked_at = NULL,
+                    last_submission_id = COALESCE(%s, last_submission_id),
+                    last_status_code = COALESCE(%s, last_status_code),
+                    last_error = %s,
+                    completed_at = CURRENT_TIMESTAMP
+                WHERE outbox_id = %s
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, (
+                status,
+                1 if count_attempt else 0,
+                submission_id,
+                status_code,
+                error,
+                outbox_id
+            ))
+            self.db.connection.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error settling outbox entry {outbox_id}: {e}")
+            self.db.connection.rollback()
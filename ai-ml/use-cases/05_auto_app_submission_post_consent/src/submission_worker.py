@@ -0,0 +1,366 @@
+"""
+Submission Worker
+Drains the submission outbox asynchronously with per-department concurrency
+and rate caps, backoff scheduling and per-connector circuit breakers
+"""
+
+from typing import Dict, Any, Optional
+import asyncio
+import functools
+import os
+import random
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    # Try relative imports first (when used as package)
+    from .submission_handler import SubmissionHandler
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from submission_handler import SubmissionHandler
+
+sys.path.append(str(Path(__file__).parent / "connectors"))
+from department_connector import DepartmentConnector, SubmissionResult, SubmissionStatus
+
+
+class CircuitBreaker:
+    """Per-connector circuit breaker (closed -> open -> half-open -> closed)"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent to the department now"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        
+        if self.state == self.HALF_OPEN:
+            # Only a single probe request while half-open
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        
+        return True
+    
+    def record_success(self):
+        """Close the circuit after a healthy response"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Count a transport/server failure, opening the circuit at the threshold"""
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+    
+    def seconds_until_retry(self) -> float:
+        """Seconds until the circuit allows a probe request"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout_seconds - (time.monotonic() - self.opened_at))
+
+
+class RateLimiter:
+    """Async token-bucket rate limiter"""
+    
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        self.rate = rate_per_second
+        self.capacity = burst or max(1, int(rate_per_second))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a request token is available"""
+        if self.rate <= 0:
+            return
+        
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DepartmentLane:
+    """Concurrency cap, rate limiter and circuit breaker for one department"""
+    
+    def __init__(self, name: str, lane_config: Dict[str, Any]):
+        self.name = name
+        self.semaphore = asyncio.Semaphore(lane_config.get('max_concurrency', 4))
+        self.rate_limiter = RateLimiter(
+            lane_config.get('rate_per_second', 10),
+            lane_config.get('burst')
+        )
+        self.breaker = CircuitBreaker(
+            lane_config.get('failure_threshold', 5),
+            lane_config.get('reset_timeout_seconds', 60)
+        )
+
+
+class SubmissionWorker:
+    """Asyncio worker pool that drains application.submission_outbox"""
+    
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        handler: Optional[SubmissionHandler] = None,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize Submission Worker
+        
+        Args:
+            config_path: Path to db_config.yaml
+            handler: Existing SubmissionHandler to reuse (its DB connection and connectors)
+            worker_id: Lease owner ID (defaults to host-pid)
+        """
+        self.handler = handler or SubmissionHandler(config_path)
+        self.outbox = self.handler.outbox
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        
+        outbox_config = self.handler.use_case_config.get('department', {}).get('outbox', {})
+        self.batch_size = outbox_config.get('batch_size', 100)
+        self.max_in_flight = outbox_config.get('max_in_flight', 64)
+        self.poll_interval_seconds = outbox_config.get('poll_interval_seconds', 1.0)
+        self.lease_seconds = outbox_config.get('lease_seconds', 300)
+        self.retry_jitter = outbox_config.get('retry_jitter', 0.2)
+        self.max_error_attempts = outbox_config.get('max_error_attempts', 5)
+        self.lane_defaults = outbox_config.get('lane_defaults', {})
+        self.lane_overrides = outbox_config.get('departments', {})
+        
+        self._lanes: Dict[str, DepartmentLane] = {}
+        self._tasks = set()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        self._stopping = False
+        self.stats = {'succeeded': 0, 'retried': 0, 'failed': 0, 'deferred': 0}
+    
+    def connect(self):
+        """Connect to database"""
+        self.handler.connect()
+    
+    def disconnect(self):
+        """Disconnect from database and release worker threads"""
+        self._executor.shutdown(wait=False)
+        self.handler.disconnect()
+    
+    def stop(self):
+        """Ask run() to exit after the current in-flight submissions finish"""
+        self._stopping = True
+    
+    async def run(self):
+        """Drain the outbox until stop() is called"""
+        print(f"🚀 Submission worker {self.worker_id} started")
+        
+        while not self._stopping:
+            claimed = self.drain_once()
+            if not claimed:
+                await asyncio.sleep(self.poll_interval_seconds)
+            else:
+                # Yield so claimed submissions start before the next claim
+                await asyncio.sleep(0)
+        
+        await self._wait_for_tasks()
+        print(f"🛑 Submission worker {self.worker_id} stopped: {self.stats}")
+    
+    async def run_until_idle(self) -> Dict[str, int]:
+        """Drain entries that are currently due and return stats"""
+        while True:
+            claimed = self.drain_once()
+            if not claimed and not self._tasks:
+                break
+            if self._tasks:
+                await asyncio.wait(set(self._tasks), timeout=self.poll_interval_seconds)
+            else:
+                await asyncio.sleep(0)
+        
+        return dict(self.stats)
+    
+    def drain_once(self) -> int:
+        """Claim due entries up to free capacity and schedule them; returns number claimed"""
+        self.outbox.reclaim_expired(self.lease_seconds)
+        
+        free = self.max_in_flight - len(self._tasks)
+        items = self.outbox.claim_due(self.worker_id, min(self.batch_size, free))
+        
+        for item in items:
+            task = asyncio.create_task(self._process(item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        
+        return len(items)
+    
+    async def _wait_for_tasks(self):
+        """Wait for in-flight submissions to finish"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def _lane_for(self, connector: DepartmentConnector) -> DepartmentLane:
+        """Get (or create) the lane for a connector's department"""
+        name = connector.config.get('department_name') or connector.connector_name
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane_config = {**self.lane_defaults, **self.lane_overrides.get(name, {})}
+            lane = DepartmentLane(name, lane_config)
+            self._lanes[name] = lane
+        return lane
+    
+    async def _process(self, item: Dict[str, Any]):
+        """Submit one outbox entry and settle or reschedule it"""
+        outbox_id = item['outbox_id']
+        application_id = item['application_id']
+        scheme_code = item['scheme_code']
+        attempt_number = item['attempt_count'] + 1
+        lane = None
+        
+        try:
+            connector = self.handler._get_connector(scheme_code)
+            if not connector:
+                self.outbox.mark_failed(outbox_id, 'No connector configured for scheme')
+                self.handler._update_application_status(application_id, 'submission_failed')
+                self.stats['failed'] += 1
+                return
+            
+            lane = self._lane_for(connector)
+            if not lane.breaker.allow_request():
+                # Department is unhealthy: defer without consuming a retry
+                self.outbox.reschedule(
+                    outbox_id,
+                    lane.breaker.seconds_until_retry() or self.poll_interval_seconds,
+                    f'Circuit open for {lane.name}',
+                    count_attempt=False
+                )
+                self.stats['deferred'] += 1
+                return
+            
+            async with lane.semaphore:
+                await lane.rate_limiter.acquire()
+                application_data = self.handler._load_application_data(application_id)
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self._executor,
+                        functools.partial(
+                            connector.submit_application,
+                            application_data=application_data,
+                            scheme_code=scheme_code
+                        )
+                    )
+                except Exception:
+                    # The department call itself failed
+                    lane.breaker.record_failure()
+                    raise
+            
+            if self._is_department_failure(result):
+                lane.breaker.record_failure()
+            else:
+                lane.breaker.record_success()
+            
+            retry = not result.success and connector.should_retry(result, attempt_number)
+            submission_id = self.handler.record_submission_result(
+                application_id, connector, result,
+                attempt_number=attempt_number,
+                final=not retry
+            )
+            
+            if result.success:
+                self.outbox.mark_succeeded(outbox_id, submission_id, result.status_code)
+                self.stats['succeeded'] += 1
+            elif retry:
+                self.outbox.reschedule(
+                    outbox_id,
+                    self._retry_delay(connector, result, attempt_number),
+                    result.error_message,
+                    result.status_code,
+                    submission_id
+                )
+                self.stats['retried'] += 1
+            else:
+                self.outbox.mark_failed(outbox_id, result.error_message, result.status_code, submission_id)
+                self.stats['failed'] += 1
+        
+        except Exception as e:
+            print(f"❌ Error processing outbox entry {outbox_id}: {e}")
+            if attempt_number >= self.max_error_attempts:
+                self.outbox.mark_failed(outbox_id, str(e))
+                self.handler._update_application_status(application_id, 'submission_failed')
+                self.stats['failed'] += 1
+            else:
+                self.outbox.reschedule(
+                    outbox_id,
+                    min(self.poll_interval_seconds * 2 ** (attempt_number - 1), self.lease_seconds),
+                    str(e)
+                )
+                self.stats['retried'] += 1
+    
+    @staticmethod
+    def _is_department_failure(result: SubmissionResult) -> bool:
+        """Failures that indicate an unhealthy department (counted by the circuit breaker)"""
+        if result.success:
+            return False
+        if result.status == SubmissionStatus.TIMEOUT:
+            return True
+        if result.status_code is not None:
+            return result.status_code >= 500 or result.status_code == 429
+        return result.retry_required
+    
+    def _retry_delay(
+        self,
+        connector: DepartmentConnector,
+        result: SubmissionResult,
+        attempt_number: int
+    ) -> float:
+        """Exponential backoff with jitter, never shorter than the department's Retry-After"""
+        delay = connector.get_retry_delay(attempt_number)
+        delay *= 1 + random.uniform(-self.retry_jitter, self.retry_jitter)
+        return max(float(result.retry_after_seconds or 0), delay)
+
+
+def main():
+    """Run the submission worker"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Drain the application submission outbox')
+    parser.add_argument('--config', help='Path to db_config.yaml')
+    parser.add_argument('--once', action='store_true',
+                        help='Drain currently due submissions and exit')
+    args = parser.parse_args()
+    
+    worker = SubmissionWorker(args.config)
+    worker.connect()
+    
+    try:
+        if args.once:
+            stats = asyncio.run(worker.run_until_idle())
+            print(f"✅ Outbox drained: {stats}")
+        else:
+            asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        print("\nInterrupted")
+    finally:
+        worker.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,52 @@ Validation Engine
 Validates application forms for completeness, correctness, and compliance
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import sys
+import time
 from pathlib import Path
 import yaml
 import json
 import re
 import pandas as pd
 from dateutil import parser as date_parser
+from psycopg2.extras import execute_values
 
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from duplicate_index import DuplicateIndex, get_duplicate_index
+
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MOBILE_PATTERN = re.compile(r'^[0-9]{10}$')
+AADHAAR_PATTERN = re.compile(r'^[0-9]{12}$')
+
+# Statuses in which another application's bank account counts as a duplicate
+DUPLICATE_ACCOUNT_STATUSES = ('submitted', 'pending_submission')
+
+TYPE_MAP = {
+    'string': str,
+    'number': (int, float),
+    'integer': int,
+    'boolean': bool,
+    'array': list,
+    'object': dict
+}
+
+
+@dataclass
+class CompiledValidator:
+    """Compiled form validator for a scheme version (field checks, mandatory fields)"""
+    scheme_code: str
+    version: str
+    form_schema: Dict[str, Any]
+    field_checks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    mandatory_fields: Tuple[str, ...] = ()
+    compiled_at: datetime = field(default_factory=datetime.now)
+    checked_at: float = field(default_factory=time.monotonic)
 
 
 class ValidationEngine:
@@ -49,10 +82,28 @@ class ValidationEngine:
             self.use_case_config = {}
         
         self.validation_config = self.use_case_config.get('validation', {})
+        
+        # Compiled validator cache (per scheme, invalidated on schema version change)
+        cache_config = self.validation_config.get('validator_cache', {})
+        self.validator_cache_enabled = cache_config.get('enabled', True)
+        self.version_check_interval = cache_config.get('version_check_interval_seconds', 60)
+        self.batch_chunk_size = self.validation_config.get('batch', {}).get('chunk_size', 1000)
+        self._validator_cache: Dict[str, CompiledValidator] = {}
+        
+        # Shared in-memory duplicate index (falls back to SQL lookups when disabled)
+        self.duplicate_index_config = self.validation_config.get('duplicate_index', {})
+        self.duplicate_index_enabled = self.duplicate_index_config.get('enabled', False)
     
     def connect(self):
         """Connect to database"""
         self.db.connect()
+        
+        # Build the duplicate index at startup so no request pays for the scan
+        if self.duplicate_index_enabled:
+            get_duplicate_index(self.duplicate_index_config.get('hash_key')).start_background_build(
+                self._connect_duplicate_index,
+                self.duplicate_index_config.get('snapshot_path')
+            )
     
     def disconnect(self):
         """Disconnect from database"""
@@ -77,8 +128,206 @@ class ValidationEngine:
         
         # Load application fields
         fields = self._load_application_fields(application_id)
+        validator = self.get_validator(scheme_code)
+        
+        validation_results = self._run_validation(application_id, scheme_code, fields, validator)
+        
+        # Store validation results
+        self._store_validation_results(application_id, validation_results)
+        
+        # Update application status if invalid
+        if not validation_results['is_valid']:
+            self._update_application_status(application_id, 'validation_failed')
+        
+        print(f"✅ Validation complete: {'PASSED' if validation_results['is_valid'] else 'FAILED'}")
+        print(f"   Errors: {len(validation_results['errors'])}, Warnings: {len(validation_results['warnings'])}")
+        
+        return validation_results
+    
+    def validate_many(
+        self,
+        applications: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate many applications in one pass
+        
+        Application fields are loaded, duplicate checks run and results and
+        status updates written with one bulk query each per chunk.
+        
+        Args:
+            applications: List of dicts with application_id and scheme_code
+            chunk_size: Applications per batch (defaults to validation.batch.chunk_size)
+        
+        Returns:
+            List of validation results in the same order and shape as validate_application
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        results = []
+        started = time.monotonic()
+        
+        print(f"\n🔍 Validating {len(applications)} applications")
+        
+        for start in range(0, len(applications), chunk_size):
+            chunk = applications[start:start + chunk_size]
+            application_ids = [app['application_id'] for app in chunk]
+            
+            validators = self.get_validators(sorted({app['scheme_code'] for app in chunk}))
+            fields_by_application = self._load_application_fields_bulk(application_ids)
+            
+            duplicate_accounts = None
+            if self._duplicate_bank_account_check_enabled() and self._get_duplicate_index() is None:
+                duplicate_accounts = self._load_bank_account_usage_bulk([
+                    fields['bank_account_number']
+                    for fields in fields_by_application.values()
+                    if 'bank_account_number' in fields
+                ])
+            
+            chunk_results = []
+            for app in chunk:
+                application_id = app['application_id']
+                chunk_results.append(self._run_validation(
+                    application_id,
+                    app['scheme_code'],
+                    fields_by_application.get(application_id, {}),
+                    validators[app['scheme_code']],
+                    duplicate_accounts
+                ))
+            
+            self._store_validation_results_bulk(chunk_results)
+            self._update_application_status_bulk(
+                [result['application_id'] for result in chunk_results if not result['is_valid']],
+                'validation_failed'
+            )
+            results.extend(chunk_results)
+        
+        elapsed = time.monotonic() - started
+        rate = len(applications) / elapsed if elapsed > 0 else 0.0
+        passed = sum(1 for result in results if result['is_valid'])
+        print(f"✅ Validated {len(applications)} applications in {elapsed:.2f}s ({rate:.0f}/s): "
+              f"{passed} passed, {len(results) - passed} failed")
+        
+        return results
+    
+    def get_validator(self, scheme_code: str) -> CompiledValidator:
+        """Get compiled validator for a scheme (cached, version-checked)"""
+        return self.get_validators([scheme_code])[scheme_code]
+    
+    def get_validators(self, scheme_codes: List[str]) -> Dict[str, CompiledValidator]:
+        """
+        Get compiled validators for several schemes
+        
+        Cached validators are re-checked against the active form schema version
+        at most once per version_check_interval_seconds and recompiled when
+        the schema changed.
+        """
+        now = time.monotonic()
+        validators = {}
+        to_check = []
+        
+        for scheme_code in scheme_codes:
+            validator = self._validator_cache.get(scheme_code) if self.validator_cache_enabled else None
+            if validator and now - validator.checked_at < self.version_check_interval:
+                validators[scheme_code] = validator
+            else:
+                to_check.append(scheme_code)
+        
+        if to_check:
+            versions = self._load_schema_versions(to_check)
+            for scheme_code in to_check:
+                version = versions.get(scheme_code, '')
+                validator = self._validator_cache.get(scheme_code) if self.validator_cache_enabled else None
+                if validator is None or validator.version != version:
+                    validator = self._compile_validator(scheme_code, version)
+                    if self.validator_cache_enabled:
+                        self._validator_cache[scheme_code] = validator
+                validator.checked_at = now
+                validators[scheme_code] = validator
+        
+        return validators
+    
+    def invalidate_validator(self, scheme_code: Optional[str] = None):
+        """Drop cached validator for a scheme (or all schemes)"""
+        if scheme_code is None:
+            self._validator_cache.clear()
+        else:
+            self._validator_cache.pop(scheme_code, None)
+    
+    def _load_schema_versions(self, scheme_codes: List[str]) -> Dict[str, str]:
+        """Load active form schema version fingerprints for schemes in one query"""
+        try:
+            query = """
+                SELECT
+                    s.scheme_code,
+                    COALESCE((
+                        SELECT f.schema_version || '@' || f.updated_at::text
+                        FROM application.scheme_form_schemas f
+                        WHERE f.scheme_code = s.scheme_code
+                            AND f.is_active = true
+                        ORDER BY f.created_at DESC
+                        LIMIT 1
+                    ), '') AS schema_version
+                FROM unnest(%s::text[]) AS s(scheme_code)
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, [list(scheme_codes)])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return {scheme_code: version for scheme_code, version in rows}
+        
+        except Exception as e:
+            print(f"⚠️  Error loading form schema versions: {e}")
+            self.db.connection.rollback()
+            return {}
+    
+    def _compile_validator(self, scheme_code: str, version: str) -> CompiledValidator:
+        """Load form schema and compile its field checks"""
         form_schema = self._load_form_schema(scheme_code)
+        schema_props = form_schema.get('schema', {}).get('properties', {})
         
+        return CompiledValidator(
+            scheme_code=scheme_code,
+            version=version,
+            form_schema=form_schema,
+            field_checks={
+                field_name: self._compile_field_check(field_name, field_def)
+                for field_name, field_def in schema_props.items()
+            },
+            mandatory_fields=tuple(dict.fromkeys(form_schema.get('mandatory_fields', [])))
+        )
+    
+    @staticmethod
+    def _compile_field_check(field_name: str, field_def: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile a JSON Schema property into a field check"""
+        pattern = field_def.get('pattern')
+        pattern_regex = None
+        if pattern:
+            try:
+                pattern_regex = re.compile(pattern)
+            except re.error as e:
+                print(f"⚠️  Invalid pattern for field {field_name}: {e}")
+        
+        return {
+            'type': field_def.get('type'),
+            'python_type': TYPE_MAP.get(field_def.get('type')),
+            'format': field_def.get('format'),
+            'pattern': pattern,
+            'pattern_regex': pattern_regex,
+            'min_length': field_def.get('minLength'),
+            'max_length': field_def.get('maxLength')
+        }
+    
+    def _run_validation(
+        self,
+        application_id: int,
+        scheme_code: str,
+        fields: Dict[str, Any],
+        validator: CompiledValidator,
+        duplicate_accounts: Optional[Dict[str, set]] = None
+    ) -> Dict[str, Any]:
+        """Run all validation stages for one application"""
         validation_results = {
             'application_id': application_id,
             'is_valid': True,
@@ -89,7 +338,7 @@ class ValidationEngine:
         }
         
         # 1. Syntactic Validation
-        syntactic_results = self._validate_syntactic(fields, form_schema)
+        syntactic_results = self._validate_syntactic(fields, validator)
         validation_results['errors'].extend(syntactic_results['errors'])
         validation_results['warnings'].extend(syntactic_results['warnings'])
         validation_results['passed_checks'].extend(syntactic_results['passed'])
@@ -103,7 +352,7 @@ class ValidationEngine:
         validation_results['failed_checks'].extend(semantic_results['failed'])
         
         # 3. Completeness Check
-        completeness_results = self._validate_completeness(fields, form_schema)
+        completeness_results = self._validate_completeness(fields, validator)
         validation_results['errors'].extend(completeness_results['errors'])
         validation_results['warnings'].extend(completeness_results['warnings'])
         validation_results['passed_checks'].extend(completeness_results['passed'])
@@ -111,7 +360,9 @@ class ValidationEngine:
         
         # 4. Pre-Fraud Checks (optional, for high-risk schemes)
         if self.validation_config.get('enable_fraud_checks', False):
-            fraud_results = self._validate_fraud_checks(application_id, fields, scheme_code)
+            fraud_results = self._validate_fraud_checks(
+                application_id, fields, scheme_code, duplicate_accounts
+            )
             validation_results['warnings'].extend(fraud_results['warnings'])
             validation_results['passed_checks'].extend(fraud_results['passed'])
             validation_results['failed_checks'].extend(fraud_results['failed'])
@@ -119,16 +370,6 @@ class ValidationEngine:
         # Determine overall validity
         validation_results['is_valid'] = len(validation_results['errors']) == 0
         
-        # Store validation results
-        self._store_validation_results(application_id, validation_results)
-        
-        # Update application status if invalid
-        if not validation_results['is_valid']:
-            self._update_application_status(application_id, 'validation_failed')
-        
-        print(f"✅ Validation complete: {'PASSED' if validation_results['is_valid'] else 'FAILED'}")
-        print(f"   Errors: {len(validation_results['errors'])}, Warnings: {len(validation_results['warnings'])}")
-        
         return validation_results
     
     def _load_application_fields(self, application_id: int) -> Dict[str, Any]:
@@ -147,13 +388,7 @@ class ValidationEngine:
             
             fields = {}
             for field_name, field_value, field_type in rows:
-                if isinstance(field_value, str):
-                    try:
-                        fields[field_name] = json.loads(field_value)
-                    except:
-                        fields[field_name] = field_value
-                else:
-                    fields[field_name] = field_value
+                fields[field_name] = self._decode_field_value(field_value)
             
             return fields
         
@@ -161,6 +396,43 @@ class ValidationEngine:
             print(f"⚠️  Error loading application fields: {e}")
             return {}
     
+    def _load_application_fields_bulk(self, application_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Load fields for many applications in one query"""
+        fields_by_application = {application_id: {} for application_id in application_ids}
+        if not application_ids:
+            return fields_by_application
+        
+        try:
+            query = """
+                SELECT application_id, field_name, field_value
+                FROM application.application_fields
+                WHERE application_id = ANY(%s)
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, [list(application_ids)])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            for application_id, field_name, field_value in rows:
+                fields_by_application[application_id][field_name] = self._decode_field_value(field_value)
+        
+        except Exception as e:
+            print(f"⚠️  Error loading application fields: {e}")
+            self.db.connection.rollback()
+        
+        return fields_by_application
+    
+    @staticmethod
+    def _decode_field_value(field_value: Any) -> Any:
+        """Decode JSON-encoded field value (plain strings are returned as-is)"""
+        if isinstance(field_value, str):
+            try:
+                return json.loads(field_value)
+            except:
+                return field_value
+        return field_value
+    
     def _load_form_schema(self, scheme_code: str) -> Dict[str, Any]:
         """Load form schema"""
         try:
@@ -200,7 +472,7 @@ class ValidationEngine:
             print(f"⚠️  Error loading form schema: {e}")
             return {'schema': {}, 'mandatory_fields': [], 'validation_rules': {}, 'semantic_rules': {}}
     
-    def _validate_syntactic(self, fields: Dict[str, Any], form_schema: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_syntactic(self, fields: Dict[str, Any], validator: CompiledValidator) -> Dict[str, Any]:
         """Perform syntactic validation (type, length, format)"""
         results = {
             'errors': [],
@@ -209,17 +481,18 @@ class ValidationEngine:
             'failed': []
         }
         
-        schema_props = form_schema.get('schema', {}).get('properties', {})
+        field_checks = validator.field_checks
         
         for field_name, field_value in fields.items():
-            if field_name not in schema_props:
+            check = field_checks.get(field_name)
+            if check is None:
                 continue
             
-            field_def = schema_props[field_name]
-            field_type = field_def.get('type')
+            field_type = check['type']
             
             # Type validation
-            type_valid = self._validate_type(field_value, field_type)
+            type_valid = field_value is None or check['python_type'] is None or \
+                isinstance(field_value, check['python_type'])
             if not type_valid:
                 results['errors'].append({
                     'field': field_name,
@@ -234,7 +507,7 @@ class ValidationEngine:
             
             # Format validation (for strings)
             if field_type == 'string' and field_value:
-                format_check = self._validate_format(field_value, field_def)
+                format_check = self._validate_format(field_value, check)
                 if not format_check['valid']:
                     if format_check.get('required'):
                         results['errors'].append({
@@ -255,7 +528,7 @@ class ValidationEngine:
             
             # Length validation
             if field_type == 'string' and field_value:
-                length_check = self._validate_length(field_value, field_def)
+                length_check = self._validate_length(field_value, check)
                 if not length_check['valid']:
                     results['errors'].append({
                         'field': field_name,
@@ -270,37 +543,13 @@ class ValidationEngine:
         
         return results
     
-    def _validate_type(self, value: Any, expected_type: str) -> bool:
-        """Validate field type"""
-        if value is None:
-            return True  # Null is allowed (handled by required check)
-        
-        type_map = {
-            'string': str,
-            'number': (int, float),
-            'integer': int,
-            'boolean': bool,
-            'array': list,
-            'object': dict
-        }
-        
-        expected = type_map.get(expected_type)
-        if expected is None:
-            return True
-        
-        if isinstance(expected, tuple):
-            return isinstance(value, expected)
-        
-        return isinstance(value, expected)
-    
-    def _validate_format(self, value: str, field_def: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate string format"""
-        format_type = field_def.get('format')
-        pattern = field_def.get('pattern')
+    def _validate_format(self, value: str, check: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate string format against a compiled field check"""
+        format_type = check['format']
+        pattern_regex = check['pattern_regex']
         
         if format_type == 'email':
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, value):
+            if not EMAIL_PATTERN.match(value):
                 return {
                     'valid': False,
                     'required': True,
@@ -317,20 +566,20 @@ class ValidationEngine:
                     'message': f'Invalid date format: {value}'
                 }
         
-        if pattern:
-            if not re.match(pattern, value):
+        if pattern_regex is not None:
+            if not pattern_regex.match(value):
                 return {
                     'valid': False,
                     'required': True,
-                    'message': f'Value does not match required pattern: {pattern}'
+                    'message': f'Value does not match required pattern: {check["pattern"]}'
                 }
         
         return {'valid': True}
     
-    def _validate_length(self, value: str, field_def: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_length(self, value: str, check: Dict[str, Any]) -> Dict[str, Any]:
         """Validate string length"""
-        min_length = field_def.get('minLength')
-        max_length = field_def.get('maxLength')
+        min_length = check['min_length']
+        max_length = check['max_length']
         
         length = len(value)
         
@@ -357,10 +606,6 @@ class ValidationEngine:
             'failed': []
         }
         
-        # Load semantic rules from schema
-        form_schema = self._load_form_schema(scheme_code)
-        semantic_rules = form_schema.get('semantic_rules', {})
-        
         # Common semantic validations
         # Age validation (for pension schemes)
         if 'date_of_birth' in fields and scheme_code in ['OLD_AGE_PENSION', 'DISABILITY_PENSION']:
@@ -380,7 +625,7 @@ class ValidationEngine:
         # Mobile number format (Indian)
         if 'mobile_number' in fields:
             mobile = str(fields['mobile_number'])
-            if not re.match(r'^[0-9]{10}$', mobile):
+            if not MOBILE_PATTERN.match(mobile):
                 results['errors'].append({
                     'field': 'mobile_number',
                     'type': 'semantic',
@@ -395,7 +640,7 @@ class ValidationEngine:
         # Aadhaar format
         if 'aadhaar_number' in fields:
             aadhaar = str(fields['aadhaar_number'])
-            if not re.match(r'^[0-9]{12}$', aadhaar):
+            if not AADHAAR_PATTERN.match(aadhaar):
                 results['errors'].append({
                     'field': 'aadhaar_number',
                     'type': 'semantic',
@@ -409,7 +654,7 @@ class ValidationEngine:
         
         return results
     
-    def _validate_completeness(self, fields: Dict[str, Any], form_schema: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_completeness(self, fields: Dict[str, Any], validator: CompiledValidator) -> Dict[str, Any]:
         """Validate completeness (mandatory fields)"""
         results = {
             'errors': [],
@@ -418,9 +663,7 @@ class ValidationEngine:
             'failed': []
         }
         
-        mandatory_fields = form_schema.get('mandatory_fields', [])
-        
-        for field_name in mandatory_fields:
+        for field_name in validator.mandatory_fields:
             if field_name not in fields or fields[field_name] is None or fields[field_name] == '':
                 results['errors'].append({
                     'field': field_name,
@@ -435,8 +678,21 @@ class ValidationEngine:
         
         return results
     
-    def _validate_fraud_checks(self, application_id: int, fields: Dict[str, Any], scheme_code: str) -> Dict[str, Any]:
-        """Perform pre-fraud checks"""
+    def _validate_fraud_checks(
+        self,
+        application_id: int,
+        fields: Dict[str, Any],
+        scheme_code: str,
+        duplicate_accounts: Optional[Dict[str, set]] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform pre-fraud checks
+        
+        Args:
+            duplicate_accounts: Pre-loaded bank account usage from
+                _load_bank_account_usage_bulk (batch path); queried per
+                application when None
+        """
         results = {
             'warnings': [],
             'passed': [],
@@ -447,7 +703,14 @@ class ValidationEngine:
         
         # Duplicate bank account check
         if fraud_config.get('duplicate_bank_account') and 'bank_account_number' in fields:
-            if self._check_duplicate_bank_account(application_id, fields['bank_account_number']):
+            bank_account = fields['bank_account_number']
+            if duplicate_accounts is not None:
+                used_by = duplicate_accounts.get(json.dumps(bank_account), set())
+                is_duplicate = any(other_id != application_id for other_id in used_by)
+            else:
+                is_duplicate = self._check_duplicate_bank_account(application_id, bank_account)
+            
+            if is_duplicate:
                 results['warnings'].append({
                     'field': 'bank_account_number',
                     'type': 'fraud_check',
@@ -462,6 +725,15 @@ class ValidationEngine:
     
     def _check_duplicate_bank_account(self, application_id: int, bank_account: str) -> bool:
         """Check for duplicate bank account"""
+        index = self._get_duplicate_index()
+        if index is not None:
+            return bool(index.find(
+                'bank_account',
+                bank_account,
+                statuses=DUPLICATE_ACCOUNT_STATUSES,
+                exclude_application_id=application_id
+            ))
+        
         try:
             query = """
                 SELECT COUNT(*) as count
@@ -470,11 +742,11 @@ class ValidationEngine:
                 WHERE af1.field_name = 'bank_account_number'
                     AND af1.field_value::text = %s
                     AND a1.application_id != %s
-                    AND a1.status IN ('submitted', 'pending_submission')
+                    AND a1.status = ANY(%s)
             """
             
             cursor = self.db.connection.cursor()
-            cursor.execute(query, [json.dumps(bank_account), application_id])
+            cursor.execute(query, [json.dumps(bank_account), application_id, list(DUPLICATE_ACCOUNT_STATUSES)])
             count = cursor.fetchone()[0]
             cursor.close()
             
@@ -483,6 +755,75 @@ class ValidationEngine:
         except:
             return False
     
+    def _get_duplicate_index(self) -> Optional[DuplicateIndex]:
+        """Get the process-wide duplicate index, refreshed as needed (None if disabled, still building or unavailable)"""
+        if not self.duplicate_index_enabled:
+            return None
+        
+        try:
+            index = get_duplicate_index(self.duplicate_index_config.get('hash_key'))
+            ready = index.ensure_current(
+                self.db.connection,
+                self.duplicate_index_config.get('refresh_interval_seconds', 5),
+                self.duplicate_index_config.get('snapshot_path'),
+                connect=self._connect_duplicate_index
+            )
+            return index if ready else None
+        
+        except Exception as e:
+            print(f"⚠️  Duplicate index unavailable, using SQL lookups: {e}")
+            self.db.connection.rollback()
+            return None
+    
+    def _connect_duplicate_index(self):
+        """Open a dedicated database connection for the background index build"""
+        db_config = self.config['database']
+        return DBConnector(
+            host=db_config['host'],
+            port=db_config['port'],
+            database=db_config['name'],
+            user=db_config['user'],
+            password=db_config['password']
+        ).connect()
+    
+    def _duplicate_bank_account_check_enabled(self) -> bool:
+        """Check whether the duplicate bank account fraud check is on"""
+        return bool(
+            self.validation_config.get('enable_fraud_checks', False) and
+            self.validation_config.get('fraud_checks', {}).get('duplicate_bank_account')
+        )
+    
+    def _load_bank_account_usage_bulk(self, bank_accounts: List[Any]) -> Dict[str, set]:
+        """Map bank accounts (JSON-encoded) to submitted application IDs using them, in one query"""
+        encoded = sorted({json.dumps(bank_account) for bank_account in bank_accounts})
+        if not encoded:
+            return {}
+        
+        try:
+            query = """
+                SELECT af.field_value::text, a.application_id
+                FROM application.application_fields af
+                JOIN application.applications a ON af.application_id = a.application_id
+                WHERE af.field_name = 'bank_account_number'
+                    AND af.field_value::text = ANY(%s)
+                    AND a.status = ANY(%s)
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, [encoded, list(DUPLICATE_ACCOUNT_STATUSES)])
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            usage = {}
+            for bank_account, application_id in rows:
+                usage.setdefault(bank_account, set()).add(application_id)
+            return usage
+        
+        except Exception as e:
+            print(f"⚠️  Error loading bank account usage: {e}")
+            self.db.connection.rollback()
+            return {}
+    
     def _calculate_age(self, dob: Any) -> int:
         """Calculate age from date of birth"""
         try:
@@ -501,25 +842,17 @@ class ValidationEngine:
     
     def _store_validation_results(self, application_id: int, results: Dict[str, Any]):
         """Store validation results in database"""
-        try:
-            cursor = self.db.connection.cursor()
+        self._store_validation_results_bulk([{**results, 'application_id': application_id}])
+    
+    def _store_validation_results_bulk(self, results_list: List[Dict[str, Any]]) -> bool:
+        """Store errors and warnings of many validations with a single bulk INSERT"""
+        rows = []
+        for results in results_list:
+            application_id = results['application_id']
             
-            # Store errors
+            # Errors
             for error in results['errors']:
-                query = """
-                    INSERT INTO application.application_validation_results (
-                        application_id,
-                        validation_type,
-                        validation_category,
-                        is_valid,
-                        severity,
-                        field_name,
-                        error_code,
-                        error_message,
-                        error_details
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (
+                rows.append((
                     application_id,
                     error['type'],
                     error['category'],
@@ -531,22 +864,9 @@ class ValidationEngine:
                     json.dumps(error)
                 ))
             
-            # Store warnings
+            # Warnings
             for warning in results['warnings']:
-                query = """
-                    INSERT INTO application.application_validation_results (
-                        application_id,
-                        validation_type,
-                        validation_category,
-                        is_valid,
-                        severity,
-                        field_name,
-                        error_code,
-                        error_message,
-                        error_details
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (
+                rows.append((
                     application_id,
                     warning.get('type', 'validation'),
                     warning.get('category', 'warning'),
@@ -557,13 +877,37 @@ class ValidationEngine:
                     warning['message'],
                     json.dumps(warning)
                 ))
+        
+        if not rows:
+            return True
+        
+        try:
+            cursor = self.db.connection.cursor()
+            
+            query = """
+                INSERT INTO application.application_validation_results (
+                    application_id,
+                    validation_type,
+                    validation_category,
+                    is_valid,
+                    severity,
+                    field_name,
+                    error_code,
+                    error_message,
+                    error_details
+                ) VALUES %s
+            """
+            
+            execute_values(cursor, query, rows, page_size=1000)
             
             self.db.connection.commit()
             cursor.close()
+            return True
         
         except Exception as e:
             print(f"⚠️  Error storing validation results: {e}")
             self.db.connection.rollback()
+            return False
     
     def _update_application_status(self, application_id: int, status: str):
         """Update application status"""
@@ -582,4 +926,25 @@ class ValidationEngine:
         except Exception as e:
             print(f"⚠️  Error updating application status: {e}")
             self.db.connection.rollback()
+    
+    def _update_application_status_bulk(self, application_ids: List[int], status: str):
+        """Update status of many applications in one query"""
+        if not application_ids:
+            return
+        
+        try:
+            query = """
+                UPDATE application.applications
+                SET status = %s, updated_at = CURRENT_TIMESTAMP
+                WHERE application_id = ANY(%s)
+            """
+            
+            cursor = self.db.connection.cursor()
+            cursor.execute(query, [status, list(application_ids)])
+            self.db.connection.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error updating application status: {e}")
+            self.db.connection.rollback()
 
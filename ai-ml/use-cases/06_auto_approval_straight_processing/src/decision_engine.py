@@ -14,6 +14,7 @@ import json
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 
 class DecisionEngine:
@@ -108,6 +109,7 @@ class DecisionEngine:
             self.risk_scorer.disconnect()
             self.decision_router.disconnect()
     
+    @traced('decision.evaluate_application')
     def evaluate_application(
         self,
         application_id: int,
@@ -191,6 +193,7 @@ class DecisionEngine:
                 'application_id': application_id
             }
     
+    @traced('decision.fetch_application')
     def _fetch_application(self, application_id: int) -> Optional[Dict[str, Any]]:
         """Fetch application details from application schema"""
         conn = self.external_dbs['application'].connection
@@ -275,14 +278,17 @@ class DecisionEngine:
             'mandatory_checks': []
         }
     
+    @traced('decision.evaluate_rules')
     def _evaluate_rules(self, application_id: int, family_id: str, scheme_code: str) -> Dict[str, Any]:
         """Evaluate rule-based checks using RuleEngine"""
         return self.rule_engine.evaluate_rules(application_id, family_id, scheme_code)
     
+    @traced('decision.risk_score')
     def _calculate_risk_score(self, application_id: int, family_id: str, scheme_code: str) -> Dict[str, Any]:
         """Calculate risk score using RiskScorer"""
         return self.risk_scorer.calculate_risk_score(application_id, family_id, scheme_code)
     
+    @traced('decision.route')
     def _make_decision(
         self,
         application_id: int,
@@ -370,6 +376,7 @@ class DecisionEngine:
                     'risk_band': risk_band
                 }
     
+    @traced('decision.save')
     def _save_decision(
         self,
         application_id: int,
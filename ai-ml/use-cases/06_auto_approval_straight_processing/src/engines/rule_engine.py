@@ -9,10 +9,15 @@ from datetime import datetime
 import sys
 from pathlib import Path
 import json
+import yaml
 
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from duplicate_index import DuplicateIndex, get_duplicate_index
+
+# Statuses of another application for the same family and scheme that make this one a duplicate
+DUPLICATE_APPLICATION_STATUSES = ('submitted', 'accepted', 'pending_review', 'pending_submission')
 
 
 class RuleEngine:
@@ -24,7 +29,6 @@ class RuleEngine:
             base_dir = Path(__file__).parent.parent.parent
             config_path = base_dir / "config" / "db_config.yaml"
         
-        import yaml
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
@@ -48,12 +52,32 @@ class RuleEngine:
                 user=ext_config['user'],
                 password=ext_config['password']
             )
+        
+        # Load use case config
+        use_case_config_path = Path(config_path).parent / "use_case_config.yaml"
+        if use_case_config_path.exists():
+            with open(use_case_config_path, 'r') as f:
+                self.use_case_config = yaml.safe_load(f) or {}
+        else:
+            self.use_case_config = {}
+        
+        # Shared in-memory duplicate index (falls back to SQL lookups when disabled)
+        rule_config = self.use_case_config.get('rule_engine', {})
+        self.duplicate_index_config = rule_config.get('duplicate_index', {})
+        self.duplicate_index_enabled = self.duplicate_index_config.get('enabled', False)
     
     def connect(self):
         """Connect to all databases"""
         self.db.connect()
         for ext_db in self.external_dbs.values():
             ext_db.connect()
+        
+        # Build the duplicate index at startup so no request pays for the scan
+        if self.duplicate_index_enabled:
+            get_duplicate_index(self.duplicate_index_config.get('hash_key')).start_background_build(
+                self._connect_duplicate_index,
+                self.duplicate_index_config.get('snapshot_path')
+            )
     
     def disconnect(self):
         """Disconnect from all databases"""
@@ -316,25 +340,34 @@ class RuleEngine:
         scheme_code: str
     ) -> Dict[str, Any]:
         """Evaluate duplicate application checks"""
-        conn = self.external_dbs['application'].connection
-        cursor = conn.cursor()
-        
-        # Check for existing approved/pending applications
-        cursor.execute("""
-            SELECT COUNT(*) 
-            FROM application.applications
-            WHERE family_id = %s 
-                AND scheme_code = %s
-                AND application_id != %s
-                AND status IN ('submitted', 'accepted', 'pending_review', 'pending_submission')
-        """, (family_id, scheme_code, application_id))
-        
-        duplicate_count = cursor.fetchone()[0] or 0
+        index = self._get_duplicate_index()
+        if index is not None:
+            duplicate_count = len(index.find_family_scheme(
+                family_id,
+                scheme_code,
+                statuses=DUPLICATE_APPLICATION_STATUSES,
+                exclude_application_id=application_id
+            ))
+        else:
+            conn = self.external_dbs['application'].connection
+            cursor = conn.cursor()
+            
+            # Check for existing approved/pending applications
+            cursor.execute("""
+                SELECT COUNT(*) 
+                FROM application.applications
+                WHERE family_id = %s 
+                    AND scheme_code = %s
+                    AND application_id != %s
+                    AND status = ANY(%s)
+            """, (family_id, scheme_code, application_id, list(DUPLICATE_APPLICATION_STATUSES)))
+            
+            duplicate_count = cursor.fetchone()[0] or 0
+            
+            cursor.close()
         
         has_duplicate = duplicate_count > 0
         
-        cursor.close()
-        
         return {
             'rule_category': 'DUPLICATE',
             'rule_name': 'DUPLICATE_CHECK',
@@ -347,6 +380,38 @@ class RuleEngine:
             }
         }
     
+    def _get_duplicate_index(self) -> Optional[DuplicateIndex]:
+        """Get the process-wide duplicate index, refreshed as needed (None if disabled, still building or unavailable)"""
+        if not self.duplicate_index_enabled:
+            return None
+        
+        conn = self.external_dbs['application'].connection
+        try:
+            index = get_duplicate_index(self.duplicate_index_config.get('hash_key'))
+            ready = index.ensure_current(
+                conn,
+                self.duplicate_index_config.get('refresh_interval_seconds', 5),
+                self.duplicate_index_config.get('snapshot_path'),
+                connect=self._connect_duplicate_index
+            )
+            return index if ready else None
+        
+        except Exception as e:
+            print(f"⚠️  Duplicate index unavailable, using SQL lookups: {e}")
+            conn.rollback()
+            return None
+    
+    def _connect_duplicate_index(self):
+        """Open a dedicated application database connection for the background index build"""
+        ext_config = self.config['external_databases']['application']
+        return DBConnector(
+            host=ext_config['host'],
+            port=ext_config['port'],
+            database=ext_config['name'],
+            user=ext_config['user'],
+            password=ext_config['password']
+        ).connect()
+    
     def _evaluate_cross_scheme(self, family_id: str, scheme_code: str) -> Dict[str, Any]:
         """Evaluate cross-scheme conflicts (exclusive schemes)"""
         # Get scheme category to check for conflicts
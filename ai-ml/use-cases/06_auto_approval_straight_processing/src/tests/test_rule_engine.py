@@ -6,6 +6,7 @@ Use Case ID: AI-PLATFORM-06
 
 import sys
 import os
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
@@ -15,6 +16,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'shared', 'utils'))
 
 from engines.rule_engine import RuleEngine
+from duplicate_index import DuplicateIndex
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "db_config.yaml"
 
 
 class TestRuleEngine(unittest.TestCase):
@@ -22,7 +26,7 @@ class TestRuleEngine(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures"""
-        self.engine = RuleEngine()
+        self.engine = RuleEngine(config_path=CONFIG_PATH)
         # Mock database connections
         self.engine.db = Mock()
         self.engine.external_dbs = {
@@ -30,6 +34,8 @@ class TestRuleEngine(unittest.TestCase):
             'golden_records': Mock(),
             'scheme_master': Mock()
         }
+        # SQL lookups unless a test enables the duplicate index
+        self.engine.duplicate_index_enabled = False
     
     def test_evaluate_eligibility_pass(self):
         """Test eligibility check passes"""
@@ -126,6 +132,63 @@ class TestRuleEngine(unittest.TestCase):
         self.assertFalse(result['passed'])
         self.assertEqual(result['severity'], 'CRITICAL')
     
+    def test_evaluate_duplicates_uses_index(self):
+        """Test duplicate check is answered from the duplicate index when enabled"""
+        index = DuplicateIndex()
+        index.add_application(1, 'family-123', 'CHIRANJEEVI', 'draft', {})
+        index.add_application(2, 'family-123', 'CHIRANJEEVI', 'submitted', {})
+        index.add_application(3, 'family-123', 'CHIRANJEEVI', 'rejected', {})
+        index.add_application(4, 'family-456', 'CHIRANJEEVI', 'submitted', {})
+        
+        with patch.object(self.engine, '_get_duplicate_index', return_value=index):
+            result = self.engine._evaluate_duplicates(1, 'family-123', 'CHIRANJEEVI')
+        
+        self.assertFalse(result['passed'])
+        self.assertEqual(result['result_details']['duplicate_count'], 1)
+        self.engine.external_dbs['application'].connection.cursor.assert_not_called()
+    
+    def test_evaluate_duplicates_index_miss_skips_database(self):
+        """Test a "no duplicate" index answer does not query the database"""
+        index = DuplicateIndex()
+        index.add_application(1, 'family-123', 'CHIRANJEEVI', 'draft', {})
+        
+        with patch.object(self.engine, '_get_duplicate_index', return_value=index), \
+                patch.object(index, 'refresh') as refresh:
+            result = self.engine._evaluate_duplicates(1, 'family-123', 'CHIRANJEEVI')
+        
+        self.assertTrue(result['passed'])
+        refresh.assert_not_called()
+        self.engine.external_dbs['application'].connection.cursor.assert_not_called()
+    
+    def test_duplicate_index_refreshes_at_most_once_per_interval(self):
+        """Test ensure_current only refreshes once the interval has elapsed"""
+        index = DuplicateIndex()
+        index.built_at = index.refreshed_at = time.monotonic()
+        conn = Mock()
+        
+        with patch.object(index, 'refresh') as refresh:
+            self.assertTrue(index.ensure_current(conn, refresh_interval_seconds=60))
+            self.assertTrue(index.ensure_current(conn, refresh_interval_seconds=60))
+            refresh.assert_not_called()
+            
+            index.refreshed_at -= 60
+            index.ensure_current(conn, refresh_interval_seconds=60)
+            refresh.assert_called_once_with(conn)
+    
+    def test_duplicate_index_normalizes_identifiers(self):
+        """Test identifiers are matched after normalization"""
+        index = DuplicateIndex()
+        index.add_application(1, 'family-123', 'CHIRANJEEVI', 'submitted', {
+            'bank_account': '0012-3456 78',
+            'mobile': '+91 98765 43210',
+            'aadhaar': '1234 5678 9012'
+        })
+        
+        self.assertEqual(len(index.find('bank_account', '001234567 8')), 1)
+        self.assertEqual(len(index.find('mobile', '9876543210')), 1)
+        self.assertEqual(len(index.find('aadhaar', '123456789012', exclude_application_id=1)), 0)
+        self.assertEqual(index.find('aadhaar', '1234'), [])
+    
     def test_evaluate_rules_all_pass(self):
         """Test complete rule evaluation when all rules pass"""
         # Mock all rule checks to pass
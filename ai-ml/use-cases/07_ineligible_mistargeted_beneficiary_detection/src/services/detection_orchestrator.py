@@ -15,6 +15,7 @@ import uuid
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
+from instrumentation import traced
 
 # Import detectors
 sys.path.append(str(Path(__file__).parent.parent))
@@ -72,6 +73,7 @@ class DetectionOrchestrator:
         self.ml_detector.disconnect()
         self.db.disconnect()
     
+    @traced('detection.run')
     def run_detection(
         self,
         run_type: str = 'FULL',
@@ -139,6 +141,7 @@ class DetectionOrchestrator:
             self._fail_detection_run(run_id, str(e))
             raise
     
+    @traced('detection.detect_beneficiary')
     def detect_beneficiary(
         self,
         beneficiary_id: str,
@@ -256,6 +259,7 @@ class DetectionOrchestrator:
         finally:
             cursor.close()
     
+    @traced('detection.load_beneficiaries')
     def _get_beneficiaries_to_check(
         self,
         scheme_codes: Optional[List[str]],
@@ -339,6 +343,7 @@ class DetectionOrchestrator:
         finally:
             cursor.close()
     
+    @traced('detection.create_case')
     def _create_detected_case(
         self,
         beneficiary_id: str,
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load Test Guest Eligibility Checks
+Use Case ID: AI-PLATFORM-08
+
+Measures guest (questionnaire) eligibility check throughput and latency
+against the in-memory scheme catalog. Uses the live scheme/rule tables by
+default, or a synthetic catalog (--synthetic-schemes) without a database.
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "03_identification_beneficiary" / "src"))
+
+from services.eligibility_checker import EligibilityChecker
+
+
+DISTRICTS = ['Jaipur', 'Jodhpur', 'Udaipur', 'Kota', 'Ajmer', 'Bikaner']
+INCOME_BANDS = ['Below 5000', '5000-10000', '10000-20000', 'Above 20000']
+CATEGORIES = ['General', 'OBC', 'SC', 'ST']
+
+
+def synthetic_catalog(scheme_count: int, rules_per_scheme: int, seed: int):
+    """Build synthetic scheme and rule rows covering all questionnaire predicates"""
+    rng = random.Random(seed)
+    templates = [
+        lambda: ('age >= {v}', '>=' + str(rng.choice([18, 40, 60]))),
+        lambda: ('age <= {v}', '<=' + str(rng.choice([35, 60, 80]))),
+        lambda: ("income_band IN ('VERY_LOW', 'LOW')", 'LOW'),
+        lambda: ('category = {v}', rng.choice(['SC', 'ST', 'OBC'])),
+        lambda: ('disability = true', 'true'),
+        lambda: ('land_holding <= 2', '2'),
+    ]
+    
+    schemes, rules = [], []
+    for i in range(scheme_count):
+        scheme_code = f"SCHEME_{i:04d}"
+        schemes.append({
+            'scheme_code': scheme_code,
+            'scheme_name': f"Synthetic Scheme {i}",
+            'category': rng.choice(['HEALTH', 'FOOD', 'EDUCATION', 'FINANCIAL']),
+            'is_active': True
+        })
+        for j in range(rules_per_scheme):
+            expression, value = rng.choice(templates)()
+            rules.append({
+                'rule_id': i * rules_per_scheme + j,
+                'scheme_code': scheme_code,
+                'rule_name': f"{scheme_code}_RULE_{j}",
+                'rule_expression': expression,
+                'rule_value': value,
+                'is_mandatory': rng.random() < 0.6,
+                'rule_category': 'ELIGIBILITY'
+            })
+    return schemes, rules
+
+
+def random_responses(rng: random.Random):
+    """Random guest questionnaire responses"""
+    return {
+        'age': rng.randint(18, 90),
+        'gender': rng.choice(['Male', 'Female']),
+        'district': rng.choice(DISTRICTS),
+        'income_band': rng.choice(INCOME_BANDS),
+        'category': rng.choice(CATEGORIES),
+        'disability': rng.random() < 0.1
+    }
+
+
+def percentile(sorted_values, pct):
+    """Percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def run_load_test(args):
+    """Run guest check load test"""
+    print("=" * 80)
+    print("Load Testing Guest Eligibility Checks")
+    print("=" * 80)
+    
+    checker = EligibilityChecker()
+    
+    if args.synthetic_schemes:
+        schemes, rules = synthetic_catalog(args.synthetic_schemes, args.rules_per_scheme, args.seed)
+        checker.scheme_catalog.load(schemes, rules, version='synthetic')
+        checker.scheme_catalog.refresh_interval_seconds = float('inf')
+        print(f"🧪 Synthetic catalog: {len(schemes)} schemes, {len(rules)} rules")
+    else:
+        checker.connect()
+        print("✅ Connected to databases")
+    
+    try:
+        scheme_codes = checker._get_active_scheme_codes()
+        rng = random.Random(args.seed)
+        payloads = [random_responses(rng) for _ in range(min(args.requests, 10000))]
+        
+        def one_request(i):
+            responses = payloads[i % len(payloads)]
+            started = time.perf_counter()
+            if args.record:
+                checker.check_eligibility(questionnaire_responses=responses, scheme_codes=scheme_codes)
+            else:
+                checker._check_guest_user(responses, scheme_codes)
+            return time.perf_counter() - started
+        
+        # Warm-up (loads the catalog when using the database)
+        for i in range(min(100, args.requests)):
+            one_request(i)
+        
+        print(f"\n🚀 {args.requests} guest checks over {len(scheme_codes)} schemes "
+              f"({args.threads} thread{'s' if args.threads > 1 else ''}"
+              f"{', recording results' if args.record else ''})...")
+        
+        started = time.perf_counter()
+        if args.threads > 1:
+            with ThreadPoolExecutor(max_workers=args.threads) as executor:
+                latencies = list(executor.map(one_request, range(args.requests)))
+        else:
+            latencies = [one_request(i) for i in range(args.requests)]
+        elapsed = time.perf_counter() - started
+        
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        print("\n📊 Results:")
+        print(f"   Requests/sec: {args.requests / elapsed:,.0f}")
+        print(f"   Latency p50: {percentile(latencies_ms, 50):.3f} ms")
+        print(f"   Latency p95: {percentile(latencies_ms, 95):.3f} ms")
+        print(f"   Latency p99: {percentile(latencies_ms, 99):.3f} ms")
+        print(f"   Latency max: {latencies_ms[-1]:.3f} ms")
+        print("\n" + "=" * 80)
+    
+    finally:
+        if not args.synthetic_schemes:
+            checker.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test guest eligibility checks')
+    parser.add_argument('--requests', type=int, default=10000, help='Number of guest checks')
+    parser.add_argument('--threads', type=int, default=1, help='Concurrent request threads')
+    parser.add_argument('--synthetic-schemes', type=int, default=0,
+                        help='Use a synthetic catalog with this many schemes (no database)')
+    parser.add_argument('--rules-per-scheme', type=int, default=5)
+    parser.add_argument('--record', action='store_true',
+                        help='Run full check_eligibility including result writes (needs database)')
+    parser.add_argument('--seed', type=int, default=42)
+    run_load_test(parser.parse_args())
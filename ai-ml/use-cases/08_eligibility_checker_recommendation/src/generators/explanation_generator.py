@@ -5,9 +5,13 @@ Use Case ID: AI-PLATFORM-08
 Generates human-readable explanations for eligibility status using NLG templates.
 """
 
+import re
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import yaml
 import json
 
@@ -16,6 +20,39 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "
 from db_connector import DBConnector
 
 
+PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+
+@dataclass
+class CompiledTemplate:
+    """Explanation template compiled into a format plan"""
+    template_key: str
+    template_text: str
+    placeholders: Any
+    # Format plan: (literal text, placeholder key or None) pairs, in order
+    plan: Tuple[Tuple[str, Optional[str]], ...]
+    
+    @classmethod
+    def compile(cls, template_key: str, template_text: str, placeholders: Any = None) -> 'CompiledTemplate':
+        """Resolve placeholder positions once"""
+        plan = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(template_text):
+            plan.append((template_text[position:match.start()], match.group(1)))
+            position = match.end()
+        plan.append((template_text[position:], None))
+        return cls(template_key, template_text, placeholders, tuple(plan))
+    
+    def render(self, tokens: Dict[str, Any]) -> str:
+        """Fill placeholders from tokens (placeholders without a token are kept as-is)"""
+        parts = []
+        for literal, key in self.plan:
+            parts.append(literal)
+            if key is not None:
+                parts.append(str(tokens[key]) if key in tokens else '{' + key + '}')
+        return ''.join(parts)
+
+
 class ExplanationGenerator:
     """
     Explanation Generator Service
@@ -41,6 +78,15 @@ class ExplanationGenerator:
         self.include_next_steps = self.explanation_config.get('include_next_steps', True)
         self.supported_languages = self.explanation_config.get('supported_languages', ['en'])
         
+        # Compiled templates by (status, language), reloaded when the table changes
+        template_cache_config = self.explanation_config.get('template_cache', {})
+        self.template_cache_enabled = template_cache_config.get('enabled', True)
+        self.template_version_check_interval = template_cache_config.get('version_check_interval_seconds', 60)
+        self._templates: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self._templates_version: Optional[str] = None
+        self._templates_checked_at = 0.0
+        self._templates_lock = threading.Lock()
+        
         # Database
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
         with open(db_config_path, 'r') as f:
@@ -77,14 +123,20 @@ class ExplanationGenerator:
         Returns:
             Dictionary with explanation text, template ID, and tokens
         """
+        template = self._get_template(eval_result.get('eligibility_status'), language)
+        return self._render_explanation(eval_result, template)
+    
+    def _render_explanation(
+        self,
+        eval_result: Dict[str, Any],
+        template: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Render explanation for eligibility result from a resolved template"""
         status = eval_result.get('eligibility_status')
         scheme_code = eval_result.get('scheme_code')
         met_rules = eval_result.get('met_rules', [])
         failed_rules = eval_result.get('failed_rules', [])
-        rule_evaluations = eval_result.get('rule_evaluations', {})
         
-        # Get template
-        template = self._get_template(status, language)
         if not template:
             # Fallback template
             explanation_text = self._generate_fallback_explanation(eval_result)
@@ -99,7 +151,11 @@ class ExplanationGenerator:
         tokens = self._extract_tokens(eval_result, met_rules, failed_rules)
         
         # Fill template
-        explanation_text = self._fill_template(template.get('template_text', ''), tokens)
+        compiled = template.get('compiled')
+        if compiled is not None:
+            explanation_text = compiled.render(tokens)
+        else:
+            explanation_text = self._fill_template(template.get('template_text', ''), tokens)
         
         # Generate next steps
         next_steps = self._generate_next_steps(status, failed_rules, scheme_code)
@@ -111,8 +167,106 @@ class ExplanationGenerator:
             'next_steps': next_steps
         }
     
+    def generate_explanations(
+        self,
+        eval_results: List[Dict[str, Any]],
+        language: str = 'en'
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate explanations for many eligibility results
+        
+        Templates are resolved once per status for the whole batch.
+        
+        Args:
+            eval_results: Eligibility evaluation results
+            language: Language code (en, hi, etc.)
+        
+        Returns:
+            Explanation dictionaries in the same order as eval_results
+        """
+        templates = {}
+        for status in {eval_result.get('eligibility_status') for eval_result in eval_results}:
+            templates[status] = self._get_template(status, language)
+        
+        return [
+            self._render_explanation(eval_result, templates[eval_result.get('eligibility_status')])
+            for eval_result in eval_results
+        ]
+    
+    def invalidate_templates(self):
+        """Drop compiled templates (reloaded on next use)"""
+        with self._templates_lock:
+            self._templates = {}
+            self._templates_version = None
+            self._templates_checked_at = 0.0
+    
     def _get_template(self, status: str, language: str) -> Optional[Dict[str, Any]]:
-        """Get explanation template"""
+        """Get explanation template (compiled, from the template cache when enabled)"""
+        if self.template_cache_enabled and self._ensure_templates_current():
+            compiled = self._templates.get((status, language))
+            if compiled is None and language != 'en':
+                # Try English fallback
+                compiled = self._templates.get((status, 'en'))
+            if compiled is None:
+                return None
+            return {
+                'template_key': compiled.template_key,
+                'template_text': compiled.template_text,
+                'placeholders': compiled.placeholders,
+                'compiled': compiled
+            }
+        
+        return self._query_template(status, language)
+    
+    def _ensure_templates_current(self) -> bool:
+        """Load / reload compiled templates when the template table changed"""
+        if self._templates_version is not None and \
+                time.monotonic() - self._templates_checked_at < self.template_version_check_interval:
+            return True
+        
+        with self._templates_lock:
+            if self._templates_version is not None and \
+                    time.monotonic() - self._templates_checked_at < self.template_version_check_interval:
+                return True
+            
+            conn = self.db.connection
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("""
+                    SELECT COUNT(*)::text || '/' || COALESCE(MAX(updated_at)::text, '')
+                    FROM eligibility_checker.explanation_templates
+                """)
+                version = cursor.fetchone()[0]
+                
+                if version != self._templates_version:
+                    # Latest active version per (status, language)
+                    cursor.execute("""
+                        SELECT DISTINCT ON (applies_to_status, language)
+                               applies_to_status, language, template_key, template_text, placeholders
+                        FROM eligibility_checker.explanation_templates
+                        WHERE is_active = TRUE
+                        ORDER BY applies_to_status, language, version DESC, template_id DESC
+                    """)
+                    self._templates = {
+                        (row[0], row[1]): CompiledTemplate.compile(row[2], row[3] or '', row[4])
+                        for row in cursor.fetchall()
+                    }
+                    self._templates_version = version
+                
+                cursor.close()
+                self._templates_checked_at = time.monotonic()
+                return True
+            
+            except Exception as e:
+                print(f"⚠️  Error loading explanation templates: {e}")
+                conn.rollback()
+                cursor.close()
+                # Keep serving previously loaded templates
+                return self._templates_version is not None
+    
+    def _query_template(self, status: str, language: str) -> Optional[Dict[str, Any]]:
+        """Get explanation template from the database"""
         conn = self.db.connection
         cursor = conn.cursor()
         
@@ -128,9 +282,9 @@ class ExplanationGenerator:
             """, (status, language))
             
             row = cursor.fetchone()
-            cursor.close()
             
             if row:
+                cursor.close()
                 return {
                     'template_key': row[0],
                     'template_text': row[1],
@@ -159,10 +313,13 @@ class ExplanationGenerator:
                         'placeholders': row[2]
                     }
             
+            cursor.close()
             return None
         
         except Exception as e:
             print(f"⚠️  Error fetching template: {e}")
+            conn.rollback()
+            cursor.close()
             return None
     
     def _extract_tokens(
@@ -6,8 +6,13 @@ Ranks schemes based on eligibility score, impact, under-coverage, and time sensi
 """
 
 import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import yaml
 import json
 
@@ -16,6 +21,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "
 from db_connector import DBConnector
 
 
+# Confidence level multipliers applied to the eligibility component
+CONFIDENCE_MULTIPLIERS = {'HIGH': 1.0, 'MEDIUM': 0.8, 'LOW': 0.6}
+
+# scheme_master columns that may hold an application deadline (first present is used)
+DEADLINE_COLUMNS = ('application_deadline', 'application_end_date', 'deadline', 'end_date')
+
+
+@dataclass
+class SchemeRankingTables:
+    """Per-scheme ranking inputs preloaded into arrays indexed by scheme"""
+    scheme_codes: List[str]
+    index: Dict[str, int]
+    impact: np.ndarray  # Impact score per scheme (+ default for unknown schemes at [-1])
+    urgency: np.ndarray  # Urgency weight per scheme (+ default at [-1])
+    deadline_days: np.ndarray  # Deadline as days since epoch, NaN when none (+ NaN at [-1])
+    under_coverage: np.ndarray  # Share of analysed families with the scheme as a gap (+ 0 at [-1])
+    loaded_at: float
+
+
 class SchemeRanker:
     """
     Scheme Ranking Service
@@ -43,8 +67,18 @@ class SchemeRanker:
         self.time_sensitivity_weight = self.ranking_weights.get('time_sensitivity', 0.1)
         
         # Impact scores by category
-        self.impact_scores = self.config.get('scheme_ranking', {}).get('impact_scores', {})
-        self.urgency_weights = self.config.get('scheme_ranking', {}).get('urgency_weights', {})
+        ranking_config = self.config.get('scheme_ranking', {})
+        self.impact_scores = ranking_config.get('impact_scores', {})
+        self.urgency_weights = ranking_config.get('urgency_weights', {})
+        
+        # Preloaded scheme tables (impact, urgency, deadline, under-coverage)
+        tables_config = ranking_config.get('tables', {})
+        self.tables_refresh_interval = tables_config.get('refresh_interval_seconds', 300)
+        self.deadline_window_days = tables_config.get('deadline_window_days', 30)
+        self.under_coverage_lookback_days = tables_config.get('under_coverage_lookback_days', 90)
+        self.batch_chunk_size = ranking_config.get('batch', {}).get('chunk_size', 100000)
+        self._tables: Optional[SchemeRankingTables] = None
+        self._tables_lock = threading.Lock()
         
         # Database for scheme metadata
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
@@ -84,40 +118,263 @@ class SchemeRanker:
         Returns:
             List of evaluations with added ranking fields
         """
+        if not evaluations:
+            return []
+        
+        tables = self.get_tables()
+        scheme_idx = self._scheme_indices(tables, [e.get('scheme_code') for e in evaluations])
+        eligibility_scores = np.array([float(e.get('eligibility_score', 0.0)) for e in evaluations])
+        confidence = np.array([
+            CONFIDENCE_MULTIPLIERS.get(e.get('confidence_level', 'LOW'), 0.6) for e in evaluations
+        ])
+        
+        priority_scores = self._priority_scores(tables, scheme_idx, eligibility_scores, confidence)
+        impact_scores = tables.impact[scheme_idx]
+        under_coverage = tables.under_coverage[scheme_idx]
+        
+        # Sort by priority score (descending, stable for equal scores)
+        order = np.argsort(-priority_scores, kind='stable')
+        
         ranked = []
+        for rank, i in enumerate(order, 1):
+            ranked_result = evaluations[i].copy()
+            ranked_result['priority_score'] = float(priority_scores[i])
+            ranked_result['impact_score'] = float(impact_scores[i])
+            ranked_result['under_coverage_boost'] = float(under_coverage[i])
+            ranked_result['recommendation_rank'] = rank
+            ranked.append(ranked_result)
+        
+        return ranked
+    
+    def rank_batch(
+        self,
+        scheme_codes: List[str],
+        eligibility_scores: np.ndarray,
+        confidence_levels: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank schemes for many families at once (nightly precomputation)
+        
+        Args:
+            scheme_codes: Scheme codes of the matrix columns
+            eligibility_scores: (families x schemes) eligibility scores
+            confidence_levels: Optional (families x schemes) 'HIGH'/'MEDIUM'/'LOW'
+                labels (missing = LOW, as in rank_schemes)
+            top_k: Number of top schemes to return per family (None for all)
+        
+        Returns:
+            Tuple of (families x k) column indices into scheme_codes, best first,
+            and the matching (families x k) priority scores
+        """
+        eligibility_scores = np.asarray(eligibility_scores, dtype=np.float64)
+        n_families, n_schemes = eligibility_scores.shape
+        k = n_schemes if top_k is None else max(0, min(top_k, n_schemes))
         
-        for eval_result in evaluations:
-            scheme_code = eval_result.get('scheme_code')
+        tables = self.get_tables()
+        scheme_idx = self._scheme_indices(tables, scheme_codes)
+        
+        ranked_indices = np.empty((n_families, k), dtype=np.int64)
+        ranked_scores = np.empty((n_families, k), dtype=np.float64)
+        if k == 0:
+            return ranked_indices, ranked_scores
+        
+        for start in range(0, n_families, self.batch_chunk_size):
+            end = min(start + self.batch_chunk_size, n_families)
             
-            # Calculate priority score
-            priority_score = self._calculate_priority_score(
-                eval_result, family_id, context
-            )
+            if confidence_levels is not None:
+                confidence = self._confidence_multipliers(np.asarray(confidence_levels[start:end]))
+            else:
+                confidence = CONFIDENCE_MULTIPLIERS['LOW']
             
-            # Get impact score
-            impact_score = self._get_impact_score(scheme_code)
+            scores = self._priority_scores(tables, scheme_idx, eligibility_scores[start:end], confidence)
             
-            # Get under-coverage boost
-            under_coverage_boost = self._calculate_under_coverage_boost(
-                scheme_code, family_id, context
-            )
+            # Top-k per row: partition first, then sort only the k candidates
+            if k < n_schemes:
+                candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                candidates = np.broadcast_to(np.arange(n_schemes), scores.shape)
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1, kind='stable')
             
-            # Add ranking fields
-            ranked_result = eval_result.copy()
-            ranked_result['priority_score'] = priority_score
-            ranked_result['impact_score'] = impact_score
-            ranked_result['under_coverage_boost'] = under_coverage_boost
+            ranked_indices[start:end] = np.take_along_axis(candidates, order, axis=1)
+            ranked_scores[start:end] = np.take_along_axis(candidate_scores, order, axis=1)
+        
+        return ranked_indices, ranked_scores
+    
+    def get_tables(self, force_reload: bool = False) -> SchemeRankingTables:
+        """Get preloaded scheme tables, reloading them every refresh interval"""
+        tables = self._tables
+        if not force_reload and tables is not None and \
+                time.monotonic() - tables.loaded_at < self.tables_refresh_interval:
+            return tables
+        
+        with self._tables_lock:
+            tables = self._tables
+            if force_reload or tables is None or \
+                    time.monotonic() - tables.loaded_at >= self.tables_refresh_interval:
+                self._tables = self._load_tables()
+            return self._tables
+    
+    def _priority_scores(
+        self,
+        tables: SchemeRankingTables,
+        scheme_idx: np.ndarray,
+        eligibility_scores: np.ndarray,
+        confidence
+    ) -> np.ndarray:
+        """Vectorized priority score (broadcasts over a trailing scheme axis)"""
+        eligibility_component = eligibility_scores * confidence * self.eligibility_weight
+        impact_component = tables.impact[scheme_idx] * self.impact_weight
+        under_coverage_component = tables.under_coverage[scheme_idx] * self.under_coverage_weight
+        time_component = self._time_sensitivity(tables, scheme_idx) * self.time_sensitivity_weight
+        
+        priority = eligibility_component + impact_component + under_coverage_component + time_component
+        return np.clip(priority, 0.0, 1.0)
+    
+    def _time_sensitivity(self, tables: SchemeRankingTables, scheme_idx: np.ndarray) -> np.ndarray:
+        """
+        Time sensitivity per scheme
+        
+        Urgency weight, raised towards the IMMEDIATE weight as an application
+        deadline within deadline_window_days approaches.
+        """
+        urgency = tables.urgency[scheme_idx]
+        days_left = tables.deadline_days[scheme_idx] - (date.today() - date(1970, 1, 1)).days
+        
+        with np.errstate(invalid='ignore'):
+            in_window = (days_left >= 0) & (days_left <= self.deadline_window_days)
+        if not in_window.any():
+            return urgency
+        
+        closeness = 1.0 - np.where(in_window, days_left, self.deadline_window_days) / max(self.deadline_window_days, 1)
+        deadline_urgency = float(self.urgency_weights.get('IMMEDIATE', 1.0)) * closeness
+        return np.maximum(urgency, np.where(in_window, deadline_urgency, 0.0))
+    
+    @staticmethod
+    def _scheme_indices(tables: SchemeRankingTables, scheme_codes: List[str]) -> np.ndarray:
+        """Map scheme codes to table indices (unknown schemes map to the default slot)"""
+        default = len(tables.scheme_codes)
+        return np.array([tables.index.get(code, default) for code in scheme_codes], dtype=np.int64)
+    
+    @staticmethod
+    def _confidence_multipliers(confidence_levels: np.ndarray) -> np.ndarray:
+        """Map confidence labels to multipliers (unknown labels count as LOW)"""
+        multipliers = np.full(confidence_levels.shape, CONFIDENCE_MULTIPLIERS['LOW'])
+        multipliers[confidence_levels == 'HIGH'] = CONFIDENCE_MULTIPLIERS['HIGH']
+        multipliers[confidence_levels == 'MEDIUM'] = CONFIDENCE_MULTIPLIERS['MEDIUM']
+        return multipliers
+    
+    def _load_tables(self) -> SchemeRankingTables:
+        """Load impact, urgency, deadline and under-coverage for all schemes"""
+        schemes = self._load_scheme_metadata()
+        under_coverage_by_scheme = self._load_under_coverage()
+        
+        scheme_codes = [scheme['scheme_code'] for scheme in schemes]
+        default_impact = float(self.impact_scores.get('OTHER', 0.5))
+        
+        impact = np.empty(len(schemes) + 1)
+        urgency = np.empty(len(schemes) + 1)
+        deadline_days = np.full(len(schemes) + 1, np.nan)
+        under_coverage = np.zeros(len(schemes) + 1)
+        
+        for i, scheme in enumerate(schemes):
+            impact[i] = self._category_impact(scheme.get('category'))
+            urgency_level = (scheme.get('urgency_level') or '').upper()
+            urgency[i] = float(self.urgency_weights.get(urgency_level, 0.5)) if urgency_level else 0.5
+            deadline = scheme.get('deadline')
+            if deadline is not None:
+                if isinstance(deadline, datetime):
+                    deadline = deadline.date()
+                deadline_days[i] = (deadline - date(1970, 1, 1)).days
+            under_coverage[i] = under_coverage_by_scheme.get(scheme['scheme_code'], 0.0)
+        
+        # Default slot for schemes missing from scheme_master
+        impact[-1] = default_impact
+        urgency[-1] = 0.5
+        
+        return SchemeRankingTables(
+            scheme_codes=scheme_codes,
+            index={code: i for i, code in enumerate(scheme_codes)},
+            impact=impact,
+            urgency=urgency,
+            deadline_days=deadline_days,
+            under_coverage=under_coverage,
+            loaded_at=time.monotonic()
+        )
+    
+    def _category_impact(self, category: Optional[str]) -> float:
+        """Map scheme category to impact score"""
+        category_upper = (category or 'OTHER').upper()
+        for key, score in self.impact_scores.items():
+            if key in category_upper:
+                return float(score)
+        return float(self.impact_scores.get('OTHER', 0.5))
+    
+    def _load_scheme_metadata(self) -> List[Dict[str, Any]]:
+        """Load category, urgency and deadline of all schemes in one query"""
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            # scheme_master columns differ between deployments; read what exists
+            cursor.execute("SELECT * FROM public.scheme_master")
+            columns = [desc[0] for desc in cursor.description]
+            deadline_column = next((c for c in DEADLINE_COLUMNS if c in columns), None)
             
-            ranked.append(ranked_result)
+            schemes = []
+            for row in cursor.fetchall():
+                record = dict(zip(columns, row))
+                deadline = record.get(deadline_column) if deadline_column else None
+                schemes.append({
+                    'scheme_code': record.get('scheme_code'),
+                    'category': record.get('scheme_category') or record.get('category'),
+                    'urgency_level': record.get('urgency_level'),
+                    'deadline': deadline if isinstance(deadline, date) else None
+                })
+            
+            cursor.close()
+            return schemes
         
-        # Sort by priority score (descending)
-        ranked.sort(key=lambda x: x.get('priority_score', 0.0), reverse=True)
+        except Exception as e:
+            print(f"⚠️  Could not load scheme metadata for ranking: {e}")
+            conn.rollback()
+            cursor.close()
+            return []
+    
+    def _load_under_coverage(self) -> Dict[str, float]:
+        """
+        Load per-scheme under-coverage from recent inclusion gap analyses
         
-        # Assign ranks
-        for i, result in enumerate(ranked, 1):
-            result['recommendation_rank'] = i
+        Share of analysed families for which the scheme is an eligibility gap
+        (eligible but not enrolled), from AI-PLATFORM-09.
+        """
+        conn = self.db.connection
+        cursor = conn.cursor()
         
-        return ranked
+        try:
+            cursor.execute("""
+                WITH recent AS (
+                    SELECT DISTINCT ON (family_id) family_id, gap_schemes
+                    FROM inclusion.inclusion_gap_analysis
+                    WHERE analysis_date >= CURRENT_DATE - %s
+                    ORDER BY family_id, analysis_date DESC, analysis_id DESC
+                )
+                SELECT gap.scheme_code,
+                       COUNT(*)::float / NULLIF((SELECT COUNT(*) FROM recent), 0)
+                FROM recent, unnest(recent.gap_schemes) AS gap(scheme_code)
+                GROUP BY gap.scheme_code
+            """, (int(self.under_coverage_lookback_days),))
+            
+            under_coverage = {row[0]: float(row[1] or 0.0) for row in cursor.fetchall()}
+            cursor.close()
+            return under_coverage
+        
+        except Exception as e:
+            print(f"⚠️  Could not load under-coverage for ranking: {e}")
+            conn.rollback()
+            cursor.close()
+            return {}
     
     def _calculate_priority_score(
         self,
@@ -126,68 +383,16 @@ class SchemeRanker:
         context: Optional[Dict[str, Any]]
     ) -> float:
         """Calculate priority score for a scheme"""
-        # Eligibility component
-        eligibility_score = float(eval_result.get('eligibility_score', 0.0))
-        confidence_multiplier = {
-            'HIGH': 1.0,
-            'MEDIUM': 0.8,
-            'LOW': 0.6
-        }.get(eval_result.get('confidence_level', 'LOW'), 0.6)
-        
-        eligibility_component = eligibility_score * confidence_multiplier * self.eligibility_weight
-        
-        # Impact component
-        scheme_code = eval_result.get('scheme_code')
-        impact_score = self._get_impact_score(scheme_code)
-        impact_component = impact_score * self.impact_weight
-        
-        # Under-coverage component
-        under_coverage_boost = self._calculate_under_coverage_boost(
-            scheme_code, family_id, context
-        )
-        under_coverage_component = under_coverage_boost * self.under_coverage_weight
-        
-        # Time sensitivity component
-        time_sensitivity = self._get_time_sensitivity(scheme_code)
-        time_component = time_sensitivity * self.time_sensitivity_weight
-        
-        # Total priority score
-        priority_score = (
-            eligibility_component +
-            impact_component +
-            under_coverage_component +
-            time_component
-        )
-        
-        return min(1.0, max(0.0, priority_score))
+        tables = self.get_tables()
+        scheme_idx = self._scheme_indices(tables, [eval_result.get('scheme_code')])
+        confidence = CONFIDENCE_MULTIPLIERS.get(eval_result.get('confidence_level', 'LOW'), 0.6)
+        eligibility_score = np.array([float(eval_result.get('eligibility_score', 0.0))])
+        return float(self._priority_scores(tables, scheme_idx, eligibility_score, confidence)[0])
     
     def _get_impact_score(self, scheme_code: str) -> float:
         """Get impact score for a scheme based on category"""
-        try:
-            conn = self.db.connection
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT scheme_category, benefit_type
-                FROM public.scheme_master
-                WHERE scheme_code = %s
-            """, (scheme_code,))
-            
-            row = cursor.fetchone()
-            cursor.close()
-            
-            if row:
-                category = row[0] or 'OTHER'
-                # Map category to impact score
-                category_upper = category.upper()
-                for key, score in self.impact_scores.items():
-                    if key in category_upper:
-                        return float(score)
-            
-            return float(self.impact_scores.get('OTHER', 0.5))
-        
-        except Exception:
-            return 0.5  # Default impact score
+        tables = self.get_tables()
+        return float(tables.impact[self._scheme_indices(tables, [scheme_code])[0]])
     
     def _calculate_under_coverage_boost(
         self,
@@ -198,38 +403,13 @@ class SchemeRanker:
         """
         Calculate under-coverage boost
         
-        This would ideally check if similar families nearby are enrolled
-        but this family is not. For now, return a default value.
+        Scheme-level share of recently analysed families that are eligible
+        but not enrolled (AI-PLATFORM-09 inclusion gap analysis).
         """
-        # TODO: Implement actual under-coverage calculation
-        # - Get location from family/context
-        # - Find similar families in same area enrolled in scheme
-        # - Calculate boost based on coverage gap
-        
-        # Default: Return 0.0 (no boost) for now
-        return 0.0
+        tables = self.get_tables()
+        return float(tables.under_coverage[self._scheme_indices(tables, [scheme_code])[0]])
     
     def _get_time_sensitivity(self, scheme_code: str) -> float:
         """Get time sensitivity weight for a scheme"""
-        try:
-            conn = self.db.connection
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT urgency_level
-                FROM public.scheme_master
-                WHERE scheme_code = %s
-            """, (scheme_code,))
-            
-            row = cursor.fetchone()
-            cursor.close()
-            
-            if row and row[0]:
-                urgency = row[0].upper()
-                return float(self.urgency_weights.get(urgency, 0.5))
-            
-            return 0.5  # Default time sensitivity
-        
-        except Exception:
-            return 0.5
-
+        tables = self.get_tables()
+        return float(self._time_sensitivity(tables, self._scheme_indices(tables, [scheme_code]))[0])
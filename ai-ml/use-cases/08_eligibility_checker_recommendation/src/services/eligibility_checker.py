@@ -7,11 +7,16 @@ Main service for performing eligibility checks for both logged-in and guest user
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import uuid
 import json
 import yaml
+from psycopg2.extras import execute_values
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
@@ -19,12 +24,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "03_identifi
 
 from db_connector import DBConnector
 
+try:
+    from .scheme_catalog import SchemeCatalog, get_scheme_catalog
+except ImportError:
+    from scheme_catalog import SchemeCatalog, get_scheme_catalog
+
 # Import from AI-PLATFORM-03 (Eligibility Engine)
 try:
     from evaluator_service import EligibilityEvaluationService
+    from hybrid_evaluator import HybridEvaluator
 except ImportError:
     # Fallback if direct import fails
     EligibilityEvaluationService = None
+    HybridEvaluator = None
 
 
 class EligibilityChecker:
@@ -72,6 +84,7 @@ class EligibilityChecker:
         
         # Initialize eligibility evaluation service (AI-PLATFORM-03)
         eval_config_path = Path(__file__).parent.parent.parent.parent / "03_identification_beneficiary" / "config" / "use_case_config.yaml"
+        self.eval_config_path = str(eval_config_path)
         if eval_config_path.exists() and EligibilityEvaluationService:
             try:
                 self.evaluator_service = EligibilityEvaluationService(str(eval_config_path))
@@ -85,6 +98,25 @@ class EligibilityChecker:
         self.checker_config = self.use_case_config.get('eligibility_checker', {})
         self.guest_mode_enabled = self.checker_config.get('guest_mode_enabled', True)
         self.anonymous_allowed = self.checker_config.get('anonymous_checks_allowed', True)
+        
+        # Process-wide scheme catalog (schemes + pre-parsed rules) for guest checks
+        catalog_config = self.checker_config.get('scheme_catalog', {})
+        self.scheme_catalog_enabled = catalog_config.get('enabled', True)
+        self.scheme_catalog = get_scheme_catalog(catalog_config.get('refresh_interval_seconds', 60))
+        
+        # Logged-in checks: bounded per-scheme fan-out and per-family result cache
+        logged_in_config = self.checker_config.get('logged_in', {})
+        self.max_evaluation_workers = logged_in_config.get('max_workers', 8)
+        result_cache_config = logged_in_config.get('result_cache', {})
+        self.result_cache_enabled = result_cache_config.get('enabled', True)
+        self.result_cache_ttl = result_cache_config.get('ttl_seconds', 900)
+        self.result_cache_max_families = result_cache_config.get('max_families', 10000)
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self._evaluation_executor: Optional[ThreadPoolExecutor] = None
+        # Each evaluation worker thread gets its own HybridEvaluator (own DB connections and rule cache)
+        self._worker_state = threading.local()
+        self._worker_evaluators: List[Any] = []
     
     def connect(self):
         """Connect to databases"""
@@ -94,6 +126,12 @@ class EligibilityChecker:
     
     def disconnect(self):
         """Disconnect from databases"""
+        if self._evaluation_executor is not None:
+            self._evaluation_executor.shutdown(wait=True)
+            self._evaluation_executor = None
+        for evaluator in self._worker_evaluators:
+            evaluator.close()
+        self._worker_evaluators = []
         self.db.disconnect()
         for ext_db in self.external_dbs.values():
             ext_db.disconnect()
@@ -106,7 +144,8 @@ class EligibilityChecker:
         session_id: Optional[str] = None,
         scheme_codes: Optional[List[str]] = None,
         check_type: str = 'FULL_CHECK',
-        check_mode: str = 'WEB'
+        check_mode: str = 'WEB',
+        record_results: bool = True
     ) -> Dict[str, Any]:
         """
         Perform eligibility check
@@ -119,6 +158,8 @@ class EligibilityChecker:
             scheme_codes: List of scheme codes to check (None for all active)
             check_type: 'FULL_CHECK', 'SCHEME_SPECIFIC', 'QUICK_CHECK'
             check_mode: 'WEB', 'MOBILE_APP', 'CHATBOT', 'ASSISTED'
+            record_results: Whether to record the check and scheme results (False when
+                the caller records them together with its own rows, check_id is then None)
         
         Returns:
             Dictionary with eligibility check results
@@ -160,25 +201,24 @@ class EligibilityChecker:
         
         processing_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         
-        # Record check in database
-        check_id = self._record_eligibility_check(
-            family_id=family_id,
-            beneficiary_id=beneficiary_id,
-            session_id=session_id,
-            user_type=user_type,
-            check_type=check_type,
-            check_mode=check_mode,
-            questionnaire_responses=questionnaire_responses if user_type != 'LOGGED_IN' else None,
-            total_schemes_checked=len(scheme_codes),
-            eligible_count=eligible_count,
-            possible_eligible_count=possible_eligible_count,
-            not_eligible_count=not_eligible_count,
-            processing_time_ms=processing_time_ms
-        )
-        
-        # Record individual scheme results
-        for eval_result in evaluations:
-            self._record_scheme_result(check_id, eval_result)
+        # Record check and individual scheme results in one transaction
+        check_id = None
+        if record_results:
+            check_id = self._record_eligibility_check(
+                family_id=family_id,
+                beneficiary_id=beneficiary_id,
+                session_id=session_id,
+                user_type=user_type,
+                check_type=check_type,
+                check_mode=check_mode,
+                questionnaire_responses=questionnaire_responses if user_type != 'LOGGED_IN' else None,
+                total_schemes_checked=len(scheme_codes),
+                eligible_count=eligible_count,
+                possible_eligible_count=possible_eligible_count,
+                not_eligible_count=not_eligible_count,
+                processing_time_ms=processing_time_ms,
+                evaluations=evaluations
+            )
         
         return {
             'check_id': check_id,
@@ -196,34 +236,52 @@ class EligibilityChecker:
     
     def _check_logged_in_user(self, family_id: str, scheme_codes: List[str]) -> List[Dict[str, Any]]:
         """Check eligibility for logged-in user using eligibility engine"""
-        evaluations = []
-        
         if not self.evaluator_service:
             # Fallback: Basic rule-based evaluation
             return self._fallback_evaluation(family_id, scheme_codes)
         
         try:
-            # Use AI-PLATFORM-03 eligibility engine
-            result = self.evaluator_service.evaluate_family(
-                family_id=family_id,
-                scheme_ids=scheme_codes,
-                use_ml=True,
-                save_results=False  # We'll save separately in our schema
-            )
+            # Serve from the per-family cache when rules and profile are unchanged
+            cache_key = self._get_result_cache_key(family_id)
+            cached = self._get_cached_results(family_id, cache_key)
+            pending = [code for code in scheme_codes if code not in cached]
             
-            # Convert to our format
-            for eval_data in result.get('evaluations', []):
-                evaluation = {
-                    'scheme_code': eval_data.get('scheme_code') or eval_data.get('scheme_id'),
-                    'scheme_name': self._get_scheme_name(eval_data.get('scheme_code') or eval_data.get('scheme_id')),
-                    'eligibility_status': self._map_status(eval_data.get('evaluation_status')),
-                    'eligibility_score': float(eval_data.get('eligibility_score', 0.0)),
-                    'confidence_level': self._calculate_confidence(eval_data),
-                    'rule_evaluations': eval_data.get('rule_evaluations', {}),
-                    'met_rules': eval_data.get('met_rules', []),
-                    'failed_rules': eval_data.get('failed_rules', []),
-                    'rule_path': eval_data.get('rule_path', ''),
-                }
+            if pending:
+                # Use AI-PLATFORM-03 eligibility engine: load family and versions once,
+                # evaluate schemes in parallel
+                family_data = self.evaluator_service.load_family(family_id)
+                if not family_data:
+                    return []
+                versions = self.evaluator_service.get_evaluation_versions(pending)
+                
+                if len(pending) > 1 and self.max_evaluation_workers > 1 and HybridEvaluator:
+                    eval_results = list(self._get_evaluation_executor().map(
+                        lambda scheme_code: self._evaluate_scheme(
+                            family_id, scheme_code, family_data, versions[scheme_code],
+                            self._get_worker_evaluator()
+                        ),
+                        pending
+                    ))
+                else:
+                    eval_results = [
+                        self._evaluate_scheme(family_id, scheme_code, family_data, versions[scheme_code])
+                        for scheme_code in pending
+                    ]
+                
+                # Convert to our format
+                fresh = {}
+                for scheme_code, eval_data in zip(pending, eval_results):
+                    fresh[scheme_code] = self._convert_evaluation(eval_data)
+                    if eval_data.get('evaluation_status') == 'ERROR':
+                        fresh[scheme_code]['_error'] = True
+                
+                self._store_cached_results(family_id, cache_key, fresh)
+                cached.update(fresh)
+            
+            evaluations = []
+            for scheme_code in scheme_codes:
+                evaluation = dict(cached[scheme_code])
+                evaluation.pop('_error', None)
                 evaluations.append(evaluation)
         
         except Exception as e:
@@ -232,52 +290,242 @@ class EligibilityChecker:
         
         return evaluations
     
+    def _evaluate_scheme(
+        self,
+        family_id: str,
+        scheme_code: str,
+        family_data: Dict[str, Any],
+        versions: Dict[str, str],
+        evaluator: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Evaluate one scheme for a loaded family (evaluator is the worker's own on the thread pool)"""
+        try:
+            return self.evaluator_service.evaluate_scheme(
+                scheme_code, family_data, use_ml=True, versions=versions, evaluator=evaluator
+            )
+        
+        except Exception as e:
+            print(f"❌ Error evaluating {scheme_code} for family {family_id}: {e}")
+            return {
+                'scheme_id': scheme_code,
+                'scheme_code': scheme_code,
+                'family_id': family_id,
+                'evaluation_status': 'ERROR',
+                'error': str(e),
+                **versions
+            }
+    
+    def _convert_evaluation(self, eval_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an eligibility engine result to our format"""
+        scheme_code = eval_data.get('scheme_code') or eval_data.get('scheme_id')
+        return {
+            'scheme_code': scheme_code,
+            'scheme_name': self._get_scheme_name(scheme_code),
+            'eligibility_status': self._map_status(eval_data.get('evaluation_status')),
+            'eligibility_score': float(eval_data.get('eligibility_score', 0.0)),
+            'confidence_level': self._calculate_confidence(eval_data),
+            'rule_evaluations': eval_data.get('rule_evaluations', {}),
+            'met_rules': eval_data.get('met_rules', []),
+            'failed_rules': eval_data.get('failed_rules', []),
+            'rule_path': eval_data.get('rule_path', ''),
+            'rule_set_version': eval_data.get('rule_set_version'),
+            'dataset_version_golden_records': eval_data.get('dataset_version_golden_records'),
+            'dataset_version_profile_360': eval_data.get('dataset_version_profile_360'),
+            'evaluation_timestamp': eval_data.get('evaluation_timestamp'),
+        }
+    
+    def _get_worker_evaluator(self):
+        """
+        Get the HybridEvaluator of the current evaluation worker thread
+        
+        Evaluators query the database (rules, exclusions, ML models) and cache
+        rules without locking, so workers never share one; each is created on
+        the worker's first evaluation with its own connections.
+        """
+        evaluator = getattr(self._worker_state, 'evaluator', None)
+        if evaluator is None:
+            evaluator = HybridEvaluator(self.eval_config_path)
+            self._worker_state.evaluator = evaluator
+            with self._result_cache_lock:
+                self._worker_evaluators.append(evaluator)
+        return evaluator
+    
+    def _get_evaluation_executor(self) -> ThreadPoolExecutor:
+        """Get the bounded thread pool used for per-scheme evaluations"""
+        if self._evaluation_executor is None:
+            with self._result_cache_lock:
+                if self._evaluation_executor is None:
+                    self._evaluation_executor = ThreadPoolExecutor(
+                        max_workers=self.max_evaluation_workers,
+                        thread_name_prefix='eligibility-eval'
+                    )
+        return self._evaluation_executor
+    
+    def _get_result_cache_key(self, family_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Get (rule-set version, profile version) for a family
+        
+        Returns None when the result cache is disabled or a version cannot be
+        determined, in which case results are neither read from nor written to the cache.
+        """
+        if not self.result_cache_enabled:
+            return None
+        
+        catalog = self._get_scheme_catalog()
+        if catalog is None or catalog.version is None:
+            return None
+        
+        profile_version = self._get_profile_version(family_id)
+        if profile_version is None:
+            return None
+        
+        return (catalog.version, profile_version)
+    
+    def _get_profile_version(self, family_id: str) -> Optional[str]:
+        """
+        Version fingerprint of a family's Golden Record, 360° Profile and benefit history
+        
+        Member count and latest updated_at of the records, plus the latest
+        benefit_id (benefit events are append-only), all served from the
+        gr_id/family_id indexes.
+        """
+        try:
+            family_uuid = str(uuid.UUID(str(family_id)))
+        except ValueError:
+            return None  # Not a warehouse family ID, nothing to version
+        
+        conn = self.external_dbs['golden_records'].connection
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                WITH members AS (
+                    SELECT gr_id, updated_at
+                    FROM golden_records
+                    WHERE gr_id = %(family_id)s::uuid OR family_id = %(family_id)s::uuid
+                )
+                SELECT
+                    (SELECT COUNT(*)::text || '/' || COALESCE(MAX(updated_at)::text, '') FROM members)
+                    || '|' ||
+                    (SELECT COALESCE(MAX(updated_at)::text, '') FROM profile_360
+                     WHERE gr_id = %(family_id)s::uuid OR family_id = %(family_id)s::uuid)
+                    || '|' ||
+                    (SELECT COALESCE(MAX(benefit_id)::text, '') FROM benefit_events
+                     WHERE gr_id IN (SELECT gr_id FROM members))
+            """, {'family_id': family_uuid})
+            
+            row = cursor.fetchone()
+            cursor.close()
+            return row[0] if row else None
+        
+        except Exception as e:
+            print(f"⚠️  Could not determine profile version for {family_id}: {e}")
+            conn.rollback()
+            cursor.close()
+            return None
+    
+    def _get_cached_results(self, family_id: str, cache_key: Optional[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Get cached scheme results for a family (empty if missing, stale or expired)"""
+        if cache_key is None:
+            return {}
+        
+        with self._result_cache_lock:
+            entry = self._result_cache.get(family_id)
+            if entry is None:
+                return {}
+            
+            if entry['key'] != cache_key or \
+                    time.monotonic() - entry['cached_at'] > self.result_cache_ttl:
+                del self._result_cache[family_id]
+                return {}
+            
+            self._result_cache.move_to_end(family_id)
+            return dict(entry['results'])
+    
+    def _store_cached_results(
+        self,
+        family_id: str,
+        cache_key: Optional[Tuple[str, str]],
+        results: Dict[str, Dict[str, Any]]
+    ):
+        """Add scheme results to a family's cache entry (evaluation errors are not cached)"""
+        if cache_key is None:
+            return
+        
+        results = {code: result for code, result in results.items() if not result.get('_error')}
+        
+        with self._result_cache_lock:
+            entry = self._result_cache.get(family_id)
+            if entry is None or entry['key'] != cache_key:
+                entry = {'key': cache_key, 'cached_at': time.monotonic(), 'results': {}}
+                self._result_cache[family_id] = entry
+            
+            entry['results'].update(results)
+            self._result_cache.move_to_end(family_id)
+            
+            while len(self._result_cache) > self.result_cache_max_families:
+                self._result_cache.popitem(last=False)
+    
+    def invalidate_family(self, family_id: str):
+        """Drop cached results of a family (e.g. after a profile update event)"""
+        with self._result_cache_lock:
+            self._result_cache.pop(family_id, None)
+    
     def _check_guest_user(self, questionnaire_responses: Dict[str, Any], scheme_codes: List[str]) -> List[Dict[str, Any]]:
         """Check eligibility for guest user using questionnaire"""
         evaluations = []
-        
-        # Get basic attributes from questionnaire
-        age = questionnaire_responses.get('age')
-        gender = questionnaire_responses.get('gender')
-        district = questionnaire_responses.get('district')
-        income_band = questionnaire_responses.get('income_band')
-        category = questionnaire_responses.get('category', 'General')
-        disability = questionnaire_responses.get('disability', False)
+        catalog = self._get_scheme_catalog()
         
         # For each scheme, evaluate based on questionnaire
         for scheme_code in scheme_codes:
             try:
-                # Get scheme rules
-                rules = self._get_scheme_rules(scheme_code)
+                # Get pre-parsed scheme rules
+                if catalog is not None:
+                    scheme = catalog.get_scheme(scheme_code)
+                    rules = scheme['rules'] if scheme else []
+                else:
+                    rules = [
+                        {
+                            'rule_name': rule.get('rule_name'),
+                            'rule_category': rule.get('rule_category'),
+                            'is_mandatory': rule.get('is_mandatory'),
+                            'predicate': SchemeCatalog.compile_rule(rule)
+                        }
+                        for rule in self._get_scheme_rules(scheme_code)
+                    ]
                 
                 # Evaluate rules against questionnaire responses
                 rule_results = []
                 met_rules = []
                 failed_rules = []
                 all_mandatory_passed = True
+                optional_passed = 0
+                optional_total = 0
                 
                 for rule in rules:
-                    passed = self._evaluate_rule_against_questionnaire(rule, questionnaire_responses)
+                    passed = SchemeCatalog.evaluate_predicate(rule['predicate'], questionnaire_responses)
                     rule_results.append({
-                        'rule_name': rule.get('rule_name'),
-                        'rule_category': rule.get('rule_category'),
+                        'rule_name': rule['rule_name'],
+                        'rule_category': rule['rule_category'],
                         'passed': passed,
-                        'severity': 'CRITICAL' if rule.get('is_mandatory') else 'MEDIUM'
+                        'severity': 'CRITICAL' if rule['is_mandatory'] else 'MEDIUM'
                     })
                     
                     if passed:
-                        met_rules.append(rule.get('rule_name'))
+                        met_rules.append(rule['rule_name'])
                     else:
-                        failed_rules.append(rule.get('rule_name'))
-                        if rule.get('is_mandatory'):
+                        failed_rules.append(rule['rule_name'])
+                        if rule['is_mandatory']:
                             all_mandatory_passed = False
+                    
+                    if not rule['is_mandatory']:
+                        optional_total += 1
+                        if passed:
+                            optional_passed += 1
                 
                 # Determine eligibility status
                 if all_mandatory_passed:
                     # Check if we have high confidence (all mandatory + most optional passed)
-                    optional_passed = sum(1 for r in rule_results if not rules[rule_results.index(r)].get('is_mandatory') and r['passed'])
-                    optional_total = sum(1 for r in rules if not r.get('is_mandatory'))
-                    
                     if optional_total == 0 or (optional_passed / optional_total) >= 0.7:
                         status = 'ELIGIBLE'
                         score = 0.85
@@ -314,6 +562,28 @@ class EligibilityChecker:
         
         return evaluations
     
+    def _get_scheme_catalog(self) -> Optional[SchemeCatalog]:
+        """Get scheme catalog, loading/refreshing it as needed (None if disabled or unavailable)"""
+        if not self.scheme_catalog_enabled:
+            return None
+        
+        try:
+            self.scheme_catalog.ensure_current(
+                self.external_dbs['scheme_master'].connection,
+                self.external_dbs['eligibility'].connection
+            )
+            return self.scheme_catalog
+        
+        except Exception as e:
+            print(f"⚠️  Scheme catalog unavailable, querying rules per scheme: {e}")
+            for name in ('scheme_master', 'eligibility'):
+                try:
+                    self.external_dbs[name].connection.rollback()
+                except Exception:
+                    pass
+            # Keep serving a previously loaded snapshot
+            return self.scheme_catalog if self.scheme_catalog.version is not None else None
+    
     def _fallback_evaluation(self, family_id: str, scheme_codes: List[str]) -> List[Dict[str, Any]]:
         """Fallback evaluation when eligibility engine unavailable"""
         evaluations = []
@@ -335,39 +605,7 @@ class EligibilityChecker:
     
     def _evaluate_rule_against_questionnaire(self, rule: Dict[str, Any], responses: Dict[str, Any]) -> bool:
         """Evaluate a single rule against questionnaire responses"""
-        rule_expr = rule.get('rule_expression', '')
-        rule_type = rule.get('rule_type', '')
-        
-        # Simple rule evaluation (can be enhanced)
-        if 'age' in rule_expr.lower() and 'age' in responses:
-            # Extract age requirement from rule
-            age_val = responses.get('age')
-            if '>=' in rule_expr or '>=' in rule.get('rule_value', ''):
-                required_age = int(rule.get('rule_value', '0').replace('>=', '').strip())
-                return age_val >= required_age
-            elif '<=' in rule_expr or '<=' in rule.get('rule_value', ''):
-                required_age = int(rule.get('rule_value', '0').replace('<=', '').strip())
-                return age_val <= required_age
-        
-        if 'income' in rule_expr.lower() and 'income_band' in responses:
-            income_band = responses.get('income_band', '')
-            # Map income bands to levels
-            income_levels = {'Below 5000': 1, '5000-10000': 2, '10000-20000': 3, 'Above 20000': 4}
-            user_level = income_levels.get(income_band, 4)
-            # Assume rules require low income (level 1-2)
-            return user_level <= 2
-        
-        if 'category' in rule_expr.lower() and 'category' in responses:
-            required_category = rule.get('rule_value', '').upper()
-            user_category = responses.get('category', 'General').upper()
-            if required_category in ['SC', 'ST', 'OBC']:
-                return user_category == required_category
-        
-        if 'disability' in rule_expr.lower() and 'disability' in responses:
-            return responses.get('disability', False) == True
-        
-        # Default: Assume passed if we can't evaluate
-        return True
+        return SchemeCatalog.evaluate_predicate(SchemeCatalog.compile_rule(rule), responses)
     
     def _get_scheme_rules(self, scheme_code: str) -> List[Dict[str, Any]]:
         """Get rules for a scheme"""
@@ -409,6 +647,10 @@ class EligibilityChecker:
     
     def _get_active_scheme_codes(self) -> List[str]:
         """Get list of active scheme codes"""
+        catalog = self._get_scheme_catalog()
+        if catalog is not None and catalog.get_active_scheme_codes():
+            return catalog.get_active_scheme_codes()
+        
         try:
             conn = self.external_dbs['scheme_master'].connection
             cursor = conn.cursor()
@@ -430,6 +672,10 @@ class EligibilityChecker:
     
     def _get_scheme_name(self, scheme_code: str) -> str:
         """Get scheme name"""
+        catalog = self._get_scheme_catalog()
+        if catalog is not None:
+            return catalog.get_scheme_name(scheme_code)
+        
         try:
             conn = self.external_dbs['scheme_master'].connection
             cursor = conn.cursor()
@@ -482,9 +728,16 @@ class EligibilityChecker:
         eligible_count: int,
         possible_eligible_count: int,
         not_eligible_count: int,
-        processing_time_ms: int
+        processing_time_ms: int,
+        evaluations: Optional[List[Dict[str, Any]]] = None,
+        commit: bool = True
     ) -> int:
-        """Record eligibility check in database"""
+        """
+        Record eligibility check (and its scheme results) in database
+        
+        With commit=False the rows are written in the caller's transaction and
+        errors are raised instead of being swallowed.
+        """
         conn = self.db.connection
         cursor = conn.cursor()
         
@@ -509,14 +762,21 @@ class EligibilityChecker:
             ))
             
             check_id = cursor.fetchone()[0]
-            conn.commit()
+            
+            if evaluations:
+                self._insert_scheme_results(cursor, check_id, evaluations)
+            
+            if commit:
+                conn.commit()
             cursor.close()
             return check_id
         
         except Exception as e:
+            cursor.close()
+            if not commit:
+                raise
             print(f"⚠️  Error recording eligibility check: {e}")
             conn.rollback()
-            cursor.close()
             return 0
     
     def _record_scheme_result(self, check_id: int, eval_result: Dict[str, Any]):
@@ -525,13 +785,25 @@ class EligibilityChecker:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                INSERT INTO eligibility_checker.scheme_eligibility_results (
-                    check_id, scheme_code, scheme_name, eligibility_status,
-                    eligibility_score, confidence_level, rule_evaluations,
-                    met_rules, failed_rules, rule_path
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            self._insert_scheme_results(cursor, check_id, [eval_result])
+            conn.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error recording scheme result: {e}")
+            conn.rollback()
+            cursor.close()
+    
+    def _insert_scheme_results(self, cursor, check_id: int, evaluations: List[Dict[str, Any]]):
+        """Insert scheme eligibility results in one statement (caller commits)"""
+        execute_values(cursor, """
+            INSERT INTO eligibility_checker.scheme_eligibility_results (
+                check_id, scheme_code, scheme_name, eligibility_status,
+                eligibility_score, confidence_level, rule_evaluations,
+                met_rules, failed_rules, rule_path
+            ) VALUES %s
+        """, [
+            (
                 check_id,
                 eval_result.get('scheme_code'),
                 eval_result.get('scheme_name'),
@@ -542,13 +814,6 @@ class EligibilityChecker:
                 eval_result.get('met_rules', []),
                 eval_result.get('failed_rules', []),
                 eval_result.get('rule_path', '')
-            ))
-            
-            conn.commit()
-            cursor.close()
-        
-        except Exception as e:
-            print(f"⚠️  Error recording scheme result: {e}")
-            conn.rollback()
-            cursor.close()
-
+            )
+            for eval_result in evaluations
+        ], page_size=1000)
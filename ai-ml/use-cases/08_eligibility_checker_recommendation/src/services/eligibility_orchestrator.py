@@ -11,6 +11,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import uuid
 import yaml
+from psycopg2.extras import execute_values
 
 # Import services
 from services.eligibility_checker import EligibilityChecker
@@ -18,6 +19,10 @@ from models.scheme_ranker import SchemeRanker
 from generators.explanation_generator import ExplanationGenerator
 from services.questionnaire_handler import QuestionnaireHandler
 
+# Add shared utils to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from instrumentation import traced
+
 
 class EligibilityOrchestrator:
     """
@@ -62,6 +67,7 @@ class EligibilityOrchestrator:
         self.explanation_generator.disconnect()
         self.questionnaire_handler.disconnect()
     
+    @traced('eligibility_checker.check_and_recommend')
     def check_and_recommend(
         self,
         family_id: Optional[str] = None,
@@ -91,6 +97,10 @@ class EligibilityOrchestrator:
         Returns:
             Complete check result with recommendations
         """
+        # Logged-in checks with recommendations are recorded together with the
+        # recommendation set in one transaction (step 4)
+        record_with_recommendations = bool(generate_recommendations and family_id)
+        
         # 1. Perform eligibility check
         check_result = self.eligibility_checker.check_eligibility(
             family_id=family_id,
@@ -99,7 +109,8 @@ class EligibilityOrchestrator:
             session_id=session_id,
             scheme_codes=scheme_codes,
             check_type=check_type,
-            check_mode=check_mode
+            check_mode=check_mode,
+            record_results=not record_with_recommendations
         )
         
         evaluations = check_result.get('evaluations', [])
@@ -112,23 +123,25 @@ class EligibilityOrchestrator:
         )
         
         # 3. Generate explanations
-        for eval_result in ranked_evaluations:
-            explanation = self.explanation_generator.generate_explanation(
-                eval_result=eval_result,
-                language=language
-            )
+        explanations = self.explanation_generator.generate_explanations(
+            eval_results=ranked_evaluations,
+            language=language
+        )
+        for eval_result, explanation in zip(ranked_evaluations, explanations):
             eval_result.update(explanation)
         
         # 4. Generate recommendations if requested
         recommendations = None
         recommendation_id = None
         
-        if generate_recommendations and family_id:  # Only for logged-in users
+        if record_with_recommendations:  # Only for logged-in users
             recommendations_result = self._generate_recommendation_set(
                 family_id=family_id,
                 beneficiary_id=beneficiary_id,
                 ranked_evaluations=ranked_evaluations,
-                check_id=check_result.get('check_id')
+                check_result=check_result,
+                check_type=check_type,
+                check_mode=check_mode
             )
             recommendations = recommendations_result.get('recommendations')
             recommendation_id = recommendations_result.get('recommendation_id')
@@ -167,6 +180,7 @@ class EligibilityOrchestrator:
         
         return result
     
+    @traced('eligibility_checker.get_recommendations')
     def get_recommendations(
         self,
         family_id: str,
@@ -205,17 +219,41 @@ class EligibilityOrchestrator:
         family_id: str,
         beneficiary_id: Optional[str],
         ranked_evaluations: List[Dict[str, Any]],
-        check_id: Optional[int]
+        check_result: Dict[str, Any],
+        check_type: str = 'FULL_CHECK',
+        check_mode: str = 'WEB'
     ) -> Dict[str, Any]:
-        """Generate and save recommendation set"""
-        from db_connector import DBConnector
-        import json
+        """
+        Generate and save recommendation set
+        
+        The eligibility check, its scheme results, the recommendation set and its
+        items are written in one transaction with batched inserts. Sets
+        check_result['check_id'] to the recorded check.
+        """
+        check_record = {
+            'family_id': family_id,
+            'beneficiary_id': beneficiary_id,
+            'session_id': check_result.get('session_id'),
+            'user_type': check_result.get('user_type'),
+            'check_type': check_type,
+            'check_mode': check_mode,
+            'questionnaire_responses': None,
+            'total_schemes_checked': check_result.get('total_schemes_checked'),
+            'eligible_count': check_result.get('eligible_count'),
+            'possible_eligible_count': check_result.get('possible_eligible_count'),
+            'not_eligible_count': check_result.get('not_eligible_count'),
+            'processing_time_ms': check_result.get('processing_time_ms'),
+            'evaluations': ranked_evaluations
+        }
         
         # Use eligibility_checker's db connection
         conn = self.eligibility_checker.db.connection
         cursor = conn.cursor()
         
         try:
+            check_id = self.eligibility_checker._record_eligibility_check(**check_record, commit=False)
+            check_result['check_id'] = check_id
+            
             # Create recommendation set
             expires_at = datetime.now() + timedelta(days=30)  # Recommendations valid for 30 days
             
@@ -235,26 +273,30 @@ class EligibilityOrchestrator:
             recommendation_id = cursor.fetchone()[0]
             
             # Create recommendation items
-            for eval_result in ranked_evaluations[:self.top_recommendations_count]:
-                if eval_result.get('eligibility_status') in ['ELIGIBLE', 'POSSIBLE_ELIGIBLE']:
-                    cursor.execute("""
-                        INSERT INTO eligibility_checker.recommendation_items (
-                            recommendation_id, scheme_code, scheme_name,
-                            rank, priority_score, eligibility_status,
-                            eligibility_score, recommendation_reasons,
-                            benefit_summary
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        recommendation_id,
-                        eval_result.get('scheme_code'),
-                        eval_result.get('scheme_name'),
-                        eval_result.get('recommendation_rank'),
-                        eval_result.get('priority_score'),
-                        eval_result.get('eligibility_status'),
-                        eval_result.get('eligibility_score'),
-                        eval_result.get('recommendation_reasons', []),
-                        eval_result.get('explanation_text', '')[:100]
-                    ))
+            items = [
+                (
+                    recommendation_id,
+                    eval_result.get('scheme_code'),
+                    eval_result.get('scheme_name'),
+                    eval_result.get('recommendation_rank'),
+                    eval_result.get('priority_score'),
+                    eval_result.get('eligibility_status'),
+                    eval_result.get('eligibility_score'),
+                    eval_result.get('recommendation_reasons', []),
+                    eval_result.get('explanation_text', '')[:100]
+                )
+                for eval_result in ranked_evaluations[:self.top_recommendations_count]
+                if eval_result.get('eligibility_status') in ['ELIGIBLE', 'POSSIBLE_ELIGIBLE']
+            ]
+            if items:
+                execute_values(cursor, """
+                    INSERT INTO eligibility_checker.recommendation_items (
+                        recommendation_id, scheme_code, scheme_name,
+                        rank, priority_score, eligibility_status,
+                        eligibility_score, recommendation_reasons,
+                        benefit_summary
+                    ) VALUES %s
+                """, items)
             
             conn.commit()
             cursor.close()
@@ -268,6 +310,9 @@ class EligibilityOrchestrator:
             print(f"⚠️  Error generating recommendation set: {e}")
             conn.rollback()
             cursor.close()
+            
+            # Still record the check and its scheme results on their own
+            check_result['check_id'] = self.eligibility_checker._record_eligibility_check(**check_record)
             return {
                 'recommendation_id': None,
                 'recommendations': []
@@ -0,0 +1,281 @@
+"""
+Scheme Catalog
+Use Case ID: AI-PLATFORM-08
+
+Process-wide in-memory catalog of schemes and eligibility rules with
+pre-parsed questionnaire predicates, used for guest eligibility checks.
+"""
+
+import threading
+import time
+from datetime import date
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+# Income bands from the guest questionnaire mapped to levels
+INCOME_LEVELS = {'Below 5000': 1, '5000-10000': 2, '10000-20000': 3, 'Above 20000': 4}
+
+RESERVED_CATEGORIES = ('SC', 'ST', 'OBC')
+
+# A predicate is a list of (response_key, check) branches; the first branch whose
+# key is present in the responses decides the rule, otherwise the rule passes
+Predicate = List[Tuple[str, Callable[[Dict[str, Any]], bool]]]
+
+
+class SchemeCatalog:
+    """
+    In-memory scheme catalog
+    
+    Holds every scheme (name, category, active flag) and its currently
+    effective eligibility rules with compiled questionnaire predicates.
+    The catalog is reloaded when the scheme master / rule tables change,
+    checked at most once per refresh_interval_seconds; readers always see a
+    complete snapshot (the snapshot reference is swapped after a reload).
+    """
+    
+    def __init__(self, refresh_interval_seconds: float = 60):
+        """
+        Initialize empty scheme catalog
+        
+        Args:
+            refresh_interval_seconds: Minimum time between version checks
+        """
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def version(self) -> Optional[str]:
+        """Version fingerprint of the loaded snapshot"""
+        return self._snapshot['version'] if self._snapshot else None
+    
+    def ensure_current(self, scheme_master_conn, eligibility_conn):
+        """
+        Load the catalog on first use and reload it when the source tables changed
+        
+        Args:
+            scheme_master_conn: Connection to the database holding public.scheme_master
+            eligibility_conn: Connection to the database holding eligibility rules
+        """
+        if self._snapshot is not None and \
+                time.monotonic() - self._checked_at < self.refresh_interval_seconds:
+            return
+        
+        with self._lock:
+            if self._snapshot is not None and \
+                    time.monotonic() - self._checked_at < self.refresh_interval_seconds:
+                return
+            
+            version = self._load_version(scheme_master_conn, eligibility_conn)
+            if self._snapshot is None or self._snapshot['version'] != version:
+                schemes = self._load_schemes(scheme_master_conn)
+                rules = self._load_rules(eligibility_conn)
+                self.load(schemes, rules, version)
+                print(f"✅ Scheme catalog loaded: {len(schemes)} schemes, {len(rules)} rules")
+            self._checked_at = time.monotonic()
+    
+    def invalidate(self):
+        """Force a version check on the next ensure_current()"""
+        self._checked_at = 0.0
+    
+    def load(self, schemes: List[Dict[str, Any]], rules: List[Dict[str, Any]], version: str = ''):
+        """
+        Build a catalog snapshot from scheme and rule rows
+        
+        Args:
+            schemes: Dicts with scheme_code, scheme_name, category, is_active
+            rules: Rule dicts (as returned by EligibilityChecker._get_scheme_rules),
+                ordered by priority within each scheme
+            version: Version fingerprint of the source data
+        """
+        catalog = {}
+        for scheme in schemes:
+            catalog[scheme['scheme_code']] = {
+                'scheme_code': scheme['scheme_code'],
+                'scheme_name': scheme.get('scheme_name') or scheme['scheme_code'],
+                'category': scheme.get('category'),
+                'is_active': scheme.get('is_active', True),
+                'rules': []
+            }
+        
+        for rule in rules:
+            scheme = catalog.setdefault(rule['scheme_code'], {
+                'scheme_code': rule['scheme_code'],
+                'scheme_name': rule['scheme_code'],
+                'category': None,
+                'is_active': False,
+                'rules': []
+            })
+            scheme['rules'].append({
+                'rule_name': rule.get('rule_name'),
+                'rule_category': rule.get('rule_category', 'ELIGIBILITY'),
+                'is_mandatory': bool(rule.get('is_mandatory')),
+                'predicate': self.compile_rule(rule)
+            })
+        
+        for scheme in catalog.values():
+            scheme['optional_total'] = sum(1 for rule in scheme['rules'] if not rule['is_mandatory'])
+        
+        self._snapshot = {
+            'version': version,
+            'schemes': catalog,
+            'active_scheme_codes': sorted(code for code, s in catalog.items() if s['is_active'])
+        }
+        self._checked_at = time.monotonic()
+    
+    def get_scheme(self, scheme_code: str) -> Optional[Dict[str, Any]]:
+        """Get catalog entry (name, category, compiled rules) for a scheme"""
+        return self._snapshot['schemes'].get(scheme_code) if self._snapshot else None
+    
+    def get_scheme_name(self, scheme_code: str) -> str:
+        """Get scheme name (scheme code if unknown)"""
+        scheme = self.get_scheme(scheme_code)
+        return scheme['scheme_name'] if scheme else scheme_code
+    
+    def get_active_scheme_codes(self) -> List[str]:
+        """Get sorted active scheme codes"""
+        return list(self._snapshot['active_scheme_codes']) if self._snapshot else []
+    
+    @staticmethod
+    def compile_rule(rule: Dict[str, Any]) -> Predicate:
+        """
+        Pre-parse a rule expression into a questionnaire predicate
+        
+        Mirrors the questionnaire heuristics: age bounds, low income band,
+        reserved category match and disability flag.
+        """
+        expr = (rule.get('rule_expression') or '').lower()
+        raw_expr = rule.get('rule_expression') or ''
+        value = rule.get('rule_value') or ''
+        branches: Predicate = []
+        
+        if 'age' in expr:
+            for operator in ('>=', '<='):
+                if operator in raw_expr or operator in value:
+                    branches.append(('age', SchemeCatalog._age_check(operator, value)))
+                    break
+        
+        if 'income' in expr:
+            branches.append((
+                'income_band',
+                lambda responses: INCOME_LEVELS.get(responses.get('income_band', ''), 4) <= 2
+            ))
+        
+        if 'category' in expr:
+            required_category = value.upper()
+            if required_category in RESERVED_CATEGORIES:
+                branches.append((
+                    'category',
+                    lambda responses: responses.get('category', 'General').upper() == required_category
+                ))
+        
+        if 'disability' in expr:
+            branches.append(('disability', lambda responses: responses.get('disability', False) == True))
+        
+        return branches
+    
+    @staticmethod
+    def _age_check(operator: str, value: str) -> Callable[[Dict[str, Any]], bool]:
+        """Compile an age bound check"""
+        try:
+            required_age = int((value or '0').replace(operator, '').strip())
+        except ValueError as e:
+            error = str(e)
+            
+            def invalid(responses):
+                raise ValueError(error)
+            return invalid
+        
+        if operator == '>=':
+            return lambda responses: responses.get('age') >= required_age
+        return lambda responses: responses.get('age') <= required_age
+    
+    @staticmethod
+    def evaluate_predicate(predicate: Predicate, responses: Dict[str, Any]) -> bool:
+        """Evaluate a compiled predicate (rules that cannot be evaluated pass)"""
+        for key, check in predicate:
+            if key in responses:
+                return check(responses)
+        return True
+    
+    def _load_version(self, scheme_master_conn, eligibility_conn) -> str:
+        """Version fingerprint of scheme master and eligibility rules"""
+        cursor = scheme_master_conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*)::text || '/' || COALESCE(MAX(updated_at)::text, '')
+            FROM public.scheme_master
+        """)
+        schemes_version = cursor.fetchone()[0]
+        cursor.close()
+        
+        cursor = eligibility_conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*)::text || '/' || COALESCE(MAX(updated_at)::text, '')
+            FROM eligibility.scheme_eligibility_rules
+        """)
+        rules_version = cursor.fetchone()[0]
+        cursor.close()
+        
+        # Rules become effective / expire by date
+        return f"{schemes_version}|{rules_version}|{date.today().isoformat()}"
+    
+    def _load_schemes(self, scheme_master_conn) -> List[Dict[str, Any]]:
+        """Load all schemes in one query"""
+        cursor = scheme_master_conn.cursor()
+        cursor.execute("""
+            SELECT scheme_code, scheme_name, category,
+                   (is_active = TRUE OR is_active IS NULL) AS is_active
+            FROM public.scheme_master
+            ORDER BY scheme_code
+        """)
+        schemes = [
+            {'scheme_code': row[0], 'scheme_name': row[1], 'category': row[2], 'is_active': row[3]}
+            for row in cursor.fetchall()
+        ]
+        cursor.close()
+        return schemes
+    
+    def _load_rules(self, eligibility_conn) -> List[Dict[str, Any]]:
+        """Load currently effective rules of all schemes in one query"""
+        cursor = eligibility_conn.cursor()
+        cursor.execute("""
+            SELECT rule_id, scheme_code, rule_name, rule_type, rule_expression,
+                   rule_operator, rule_value, is_mandatory, priority
+            FROM eligibility.scheme_eligibility_rules
+            WHERE (effective_to IS NULL OR effective_to >= CURRENT_DATE)
+              AND (effective_from <= CURRENT_DATE)
+            ORDER BY scheme_code, priority DESC, rule_id
+        """)
+        rules = [
+            {
+                'rule_id': row[0],
+                'scheme_code': row[1],
+                'rule_name': row[2],
+                'rule_type': row[3],
+                'rule_expression': row[4],
+                'rule_operator': row[5],
+                'rule_value': row[6],
+                'is_mandatory': row[7],
+                'priority': row[8],
+                'rule_category': 'ELIGIBILITY'
+            }
+            for row in cursor.fetchall()
+        ]
+        cursor.close()
+        return rules
+
+
+_default_catalog: Optional[SchemeCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_scheme_catalog(refresh_interval_seconds: float = 60) -> SchemeCatalog:
+    """Get the process-wide scheme catalog (created empty on first call)"""
+    global _default_catalog
+    
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            if _default_catalog is None:
+                _default_catalog = SchemeCatalog(refresh_interval_seconds)
+    
+    return _default_catalog
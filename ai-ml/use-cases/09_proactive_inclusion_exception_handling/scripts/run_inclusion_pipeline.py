@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Run Inclusion Pipeline - Full Priority Household Refresh
+Use Case ID: AI-PLATFORM-09
+
+Streams all active households through gap scoring, exception detection and
+nudge generation on a process pool. Intended for scheduled (nightly) runs;
+re-running with the same --run-id resumes from the last checkpoint.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+
+from services.inclusion_pipeline import InclusionPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the inclusion pipeline (full priority household refresh)')
+    parser.add_argument('--district', help='Limit the refresh to one district')
+    parser.add_argument('--run-id', help='Run identifier (resumes the run if its checkpoint exists)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: pipeline.max_workers)')
+    parser.add_argument('--chunk-size', type=int, help='Households per chunk (default: pipeline.chunk_size)')
+    parser.add_argument('--no-resume', action='store_true', help='Ignore an existing checkpoint')
+    parser.add_argument('--dry-run', action='store_true', help='Score without writing results')
+    parser.add_argument('--report', help='Write the run report as JSON to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print("Inclusion Pipeline - Full Refresh")
+    print("=" * 80)
+    
+    pipeline = InclusionPipeline()
+    report = pipeline.run(
+        district=args.district,
+        run_id=args.run_id,
+        resume=not args.no_resume,
+        save_to_db=not args.dry_run,
+        max_workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+    
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report written to {args.report}")
+    
+    print("\n" + "=" * 80)
+
+
+if __name__ == '__main__':
+    main()
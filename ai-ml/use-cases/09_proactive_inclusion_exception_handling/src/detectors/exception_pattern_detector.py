@@ -6,13 +6,17 @@ Detects households/individuals with atypical circumstances that may fall through
 cracks of rigid rules (e.g., recently disabled, migrant workers, homeless).
 """
 
+import re
 import sys
+import uuid
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import yaml
 import json
 from datetime import datetime, timedelta
 import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
@@ -26,6 +30,21 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     print("⚠️  scikit-learn not available, using rule-based exception detection")
 
+# Address keywords suggesting homeless / informal settlement households
+INFORMAL_SETTLEMENT_KEYWORDS = ['slum', 'jhuggi', 'colony', 'basti', 'urban_village']
+
+# Column order of batch detection results
+EXCEPTION_COLUMNS = [
+    'family_id', 'beneficiary_id', 'exception_category', 'exception_description',
+    'anomaly_score', 'detected_features', 'requires_human_review'
+]
+
+# Family features reported with anomaly-based exceptions
+ANOMALY_FEATURES = [
+    'family_size', 'disabled_count', 'reserved_category_count',
+    'scheme_count', 'benefit_count', 'avg_benefit'
+]
+
 
 class ExceptionPatternDetector:
     """
@@ -51,6 +70,12 @@ class ExceptionPatternDetector:
         self.anomaly_threshold = exception_config.get('anomaly_threshold', 0.75)
         self.require_human_review = exception_config.get('require_human_review', True)
         self.exception_categories = exception_config.get('exception_categories', [])
+        self.informal_keywords = exception_config.get('informal_settlement_keywords', INFORMAL_SETTLEMENT_KEYWORDS)
+        self.informal_pattern = re.compile('|'.join(re.escape(k.lower()) for k in self.informal_keywords))
+        
+        # Batch detection (district sweeps)
+        batch_config = exception_config.get('batch', {})
+        self.batch_query_chunk_size = batch_config.get('query_chunk_size', 50000)
         
         # Database configuration
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
@@ -124,6 +149,322 @@ class ExceptionPatternDetector:
         
         return exceptions
     
+    def detect_exceptions_batch(
+        self,
+        district: Optional[str] = None,
+        family_ids: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Detect exception patterns for all households of a district (or a family list)
+        
+        Loads active members once, aggregates benefit history per beneficiary and
+        per family in set-based queries, and evaluates the rule-based, temporal
+        and anomaly patterns as vectorized masks.
+        
+        Args:
+            district: District to sweep (ignored when family_ids is given)
+            family_ids: Explicit families to check
+        
+        Returns:
+            DataFrame with one row per exception (EXCEPTION_COLUMNS), ordered by
+            family and category as detect_exceptions() reports them
+        """
+        if not self.enabled:
+            return pd.DataFrame(columns=EXCEPTION_COLUMNS)
+        
+        members = self._load_members(district, family_ids)
+        if members.empty:
+            return pd.DataFrame(columns=EXCEPTION_COLUMNS)
+        
+        # Representative beneficiary per family (as the per-household check)
+        heads = members.drop_duplicates('family_id').reset_index(drop=True)
+        families = pd.Index(heads['family_id'])
+        benefits = self._load_benefit_aggregates(list(families))
+        heads = heads.merge(benefits['beneficiaries'], on='beneficiary_id', how='left')
+        family_features = self._family_features(members, families, benefits['families'])
+        
+        frames = []
+        
+        # 1. Recently disabled: disability recorded, no disability benefit in 180 days
+        disability = heads['disability_status']
+        recently_disabled = (
+            disability.notna() &
+            disability.astype(str).str.upper().isin(['YES', 'TRUE', '1']) &
+            (heads['recent_disability_benefits'].fillna(0) == 0)
+        ).to_numpy()
+        frames.append(self._exception_frame(
+            heads, recently_disabled, 'RECENTLY_DISABLED',
+            'Disability status recently updated, may not be reflected in categorical databases',
+            0.8, [{'disability_status': d, 'recent_update': True}
+                  for d in disability[recently_disabled].tolist()]
+        ))
+        
+        # 2. Migrant worker: benefits across districts or very sparse in 365 days
+        benefit_count = family_features['benefit_count'].to_numpy()
+        migrant = (family_features['benefit_district_count'].to_numpy() > 1) | \
+                  ((benefit_count > 0) & (benefit_count < 3))
+        frames.append(self._exception_frame(
+            heads, migrant, 'MIGRANT_WORKER',
+            'Pattern suggests migrant worker - may miss address-based eligibility',
+            0.7, {'address_frequency': 'low', 'benefit_coverage': 'sparse'}
+        ))
+        
+        # 3. Homeless / informal settlement: address keyword automaton
+        address_text = heads['district'].fillna('').astype(str).str.lower()
+        for column in ('block', 'gram_panchayat'):
+            address_text = address_text + ' ' + heads[column].fillna('').astype(str).str.lower()
+        informal = address_text.str.contains(self.informal_pattern).to_numpy()
+        frames.append(self._exception_frame(
+            heads, informal, 'HOMELESS_INFORMAL_SETTLEMENT',
+            'Address pattern suggests informal settlement - may miss address-based eligibility',
+            0.75, [{'address_type': 'informal', 'location': f"{block}, {district}"}
+                   for block, district in zip(heads['block'][informal], heads['district'][informal])]
+        ))
+        
+        # 4. Dropout student: student age with no education benefits
+        dob = pd.to_datetime(heads['date_of_birth'], errors='coerce')
+        age = (pd.Timestamp(datetime.now().date()) - dob).dt.days // 365
+        dropout = (age.between(15, 25) & (heads['education_benefits'].fillna(0) == 0)).to_numpy()
+        frames.append(self._exception_frame(
+            heads, dropout, 'DROPOUT_STUDENT',
+            'Age pattern suggests student dropout - may miss education support schemes',
+            0.65, {'age_range': 'student_age', 'education_benefits': 'none'}
+        ))
+        
+        # 5. Anomaly scoring on family features
+        if SKLEARN_AVAILABLE:
+            anomaly_score = self._anomaly_scores(family_features)
+            atypical = anomaly_score >= self.anomaly_threshold
+            frames.append(self._exception_frame(
+                heads, atypical, 'OTHER_ATYPICAL',
+                'Anomaly detection flagged atypical pattern in profile features',
+                anomaly_score[atypical], family_features.loc[atypical, ANOMALY_FEATURES].to_dict('records')
+            ))
+        
+        exceptions = pd.concat(frames, ignore_index=True)
+        exceptions['_order'] = exceptions['family_id'].map(pd.Series(np.arange(len(families)), index=families))
+        exceptions = exceptions.sort_values('_order', kind='stable').drop(columns='_order')
+        return exceptions.reset_index(drop=True)[EXCEPTION_COLUMNS]
+    
+    def save_exceptions_bulk(self, exceptions: pd.DataFrame) -> int:
+        """
+        Record batch exceptions for human review in one multi-row INSERT
+        
+        Exceptions already pending review for the same family and category
+        are not recorded again, so sweeps can be re-run.
+        
+        Args:
+            exceptions: DataFrame from detect_exceptions_batch
+        
+        Returns:
+            Number of exception flags inserted
+        """
+        if exceptions.empty:
+            return 0
+        
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            rows = [
+                (
+                    row.family_id,
+                    row.beneficiary_id,
+                    row.exception_category,
+                    row.exception_description,
+                    float(row.anomaly_score),
+                    json.dumps(row.detected_features, default=str),
+                    'PENDING_REVIEW' if row.requires_human_review else 'RESOLVED'
+                )
+                for row in exceptions.itertuples(index=False)
+            ]
+            
+            inserted = execute_values(cursor, """
+                INSERT INTO inclusion.exception_flags (
+                    family_id, beneficiary_id, exception_category, exception_description,
+                    anomaly_score, detected_features, detected_by, review_status
+                )
+                SELECT v.family_id, v.beneficiary_id, v.exception_category, v.exception_description,
+                       v.anomaly_score, v.detected_features, 'BATCH_DETECTION', v.review_status
+                FROM (VALUES %s) AS v(
+                    family_id, beneficiary_id, exception_category, exception_description,
+                    anomaly_score, detected_features, review_status
+                )
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM inclusion.exception_flags ef
+                    WHERE ef.family_id = v.family_id
+                      AND ef.exception_category = v.exception_category
+                      AND ef.review_status = 'PENDING_REVIEW'
+                )
+                RETURNING exception_id
+            """, rows, template="(%s::uuid, %s, %s, %s, %s::numeric, %s::jsonb, %s)",
+                page_size=1000, fetch=True)
+            
+            conn.commit()
+            cursor.close()
+            return len(inserted)
+        
+        except Exception as e:
+            print(f"⚠️  Error saving exception flags: {e}")
+            conn.rollback()
+            cursor.close()
+            return 0
+    
+    def _load_members(self, district: Optional[str], family_ids: Optional[List[str]]) -> pd.DataFrame:
+        """Load active family members of a district (or families) in one query"""
+        columns = ['family_id', 'beneficiary_id', 'date_of_birth', 'category',
+                   'disability_status', 'district', 'block', 'gram_panchayat']
+        
+        conn = self.external_dbs['golden_records'].connection
+        cursor = conn.cursor(name=f"exception_members_{uuid.uuid4().hex[:8]}")
+        cursor.itersize = 50000
+        
+        query = """
+            SELECT family_id::text, beneficiary_id, date_of_birth, category,
+                   disability_status, address_district, address_block, address_gram_panchayat
+            FROM golden_records.beneficiaries
+            WHERE is_active = TRUE
+              AND family_id IS NOT NULL
+              {filter}
+            ORDER BY family_id, beneficiary_id
+        """
+        try:
+            if family_ids is not None:
+                cursor.execute(query.format(filter="AND family_id = ANY(%s::uuid[])"), (list(family_ids),))
+            elif district:
+                cursor.execute(query.format(filter="AND address_district = %s"), (district,))
+            else:
+                cursor.execute(query.format(filter=""))
+            members = pd.DataFrame(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+            conn.commit()
+        
+        return members
+    
+    def _load_benefit_aggregates(self, family_ids: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Aggregate benefit history for many families
+        
+        Returns per-beneficiary counts (recent disability / education benefits)
+        and per-family 365-day counts (districts, benefits, schemes, average amount).
+        """
+        beneficiary_rows, family_rows = [], []
+        
+        try:
+            conn = self.external_dbs['profile_360'].connection
+            cursor = conn.cursor()
+            
+            for start in range(0, len(family_ids), self.batch_query_chunk_size):
+                chunk = family_ids[start:start + self.batch_query_chunk_size]
+                cursor.execute("""
+                    SELECT bh.beneficiary_id,
+                           COUNT(*) FILTER (
+                               WHERE bh.scheme_code LIKE '%%DISABILITY%%'
+                                 AND bh.benefit_date >= CURRENT_DATE - INTERVAL '180 days'
+                           ) AS recent_disability_benefits,
+                           COUNT(*) FILTER (
+                               WHERE bh.scheme_code LIKE '%%SCHOLARSHIP%%'
+                                  OR bh.scheme_code LIKE '%%EDUCATION%%'
+                                  OR bh.scheme_code LIKE '%%STUDENT%%'
+                           ) AS education_benefits
+                    FROM profile_360.benefit_history bh
+                    INNER JOIN golden_records.beneficiaries b ON b.beneficiary_id = bh.beneficiary_id
+                    WHERE b.family_id = ANY(%s::uuid[])
+                    GROUP BY bh.beneficiary_id
+                """, (chunk,))
+                beneficiary_rows.extend(cursor.fetchall())
+                
+                cursor.execute("""
+                    SELECT b.family_id::text,
+                           COUNT(DISTINCT b.address_district) AS benefit_district_count,
+                           COUNT(*) AS benefit_count,
+                           COUNT(DISTINCT bh.scheme_code) AS scheme_count,
+                           AVG(bh.benefit_amount) AS avg_benefit
+                    FROM profile_360.benefit_history bh
+                    INNER JOIN golden_records.beneficiaries b ON b.beneficiary_id = bh.beneficiary_id
+                    WHERE b.family_id = ANY(%s::uuid[])
+                      AND bh.benefit_date >= CURRENT_DATE - INTERVAL '365 days'
+                    GROUP BY b.family_id
+                """, (chunk,))
+                family_rows.extend(cursor.fetchall())
+            
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error aggregating benefit history: {e}")
+            self.external_dbs['profile_360'].connection.rollback()
+        
+        return {
+            'beneficiaries': pd.DataFrame(beneficiary_rows, columns=[
+                'beneficiary_id', 'recent_disability_benefits', 'education_benefits'
+            ]),
+            'families': pd.DataFrame(family_rows, columns=[
+                'family_id', 'benefit_district_count', 'benefit_count', 'scheme_count', 'avg_benefit'
+            ])
+        }
+    
+    @staticmethod
+    def _family_features(members: pd.DataFrame, families: pd.Index, family_benefits: pd.DataFrame) -> pd.DataFrame:
+        """Anomaly feature table (one row per family, aligned with families)"""
+        member_counts = members.assign(
+            disabled=members['disability_status'].notna(),
+            reserved=members['category'].isin(['SC', 'ST'])
+        ).groupby('family_id', sort=False).agg(
+            family_size=('beneficiary_id', 'size'),
+            disabled_count=('disabled', 'sum'),
+            reserved_category_count=('reserved', 'sum')
+        ).reindex(families, fill_value=0)
+        
+        benefit_features = family_benefits.set_index('family_id').reindex(families)
+        features = pd.DataFrame({
+            'family_size': member_counts['family_size'].astype(int).to_numpy(),
+            'disabled_count': member_counts['disabled_count'].astype(int).to_numpy(),
+            'reserved_category_count': member_counts['reserved_category_count'].astype(int).to_numpy(),
+            'scheme_count': benefit_features['scheme_count'].fillna(0).astype(int).to_numpy(),
+            'benefit_count': benefit_features['benefit_count'].fillna(0).astype(int).to_numpy(),
+            'avg_benefit': benefit_features['avg_benefit'].fillna(0).astype(float).to_numpy()
+        })
+        features['benefit_district_count'] = benefit_features['benefit_district_count'].fillna(0).astype(int).to_numpy()
+        return features
+    
+    @staticmethod
+    def _anomaly_scores(features: pd.DataFrame) -> np.ndarray:
+        """Vectorized _calculate_simple_anomaly_score over a family feature table"""
+        family_size = features['family_size'].to_numpy()
+        benefit_count = features['benefit_count'].to_numpy()
+        
+        score = 0.3 * ((family_size > 5) & (benefit_count < 2))
+        score = score + 0.3 * ((features['disabled_count'].to_numpy() > 0) & (features['scheme_count'].to_numpy() == 0))
+        score = score + 0.2 * ((family_size > 0) & (benefit_count / np.maximum(family_size, 1) < 0.2))
+        return np.minimum(1.0, score)
+    
+    @staticmethod
+    def _exception_frame(
+        heads: pd.DataFrame,
+        mask: np.ndarray,
+        category: str,
+        description: str,
+        anomaly_score,
+        detected_features
+    ) -> pd.DataFrame:
+        """Exception rows for the households selected by mask"""
+        count = int(mask.sum())
+        if isinstance(detected_features, dict):
+            detected_features = [dict(detected_features) for _ in range(count)]
+        scores = np.asarray(anomaly_score, dtype=float)
+        if scores.ndim == 0:
+            scores = np.full(count, float(scores))
+        return pd.DataFrame({
+            'family_id': heads['family_id'].to_numpy()[mask],
+            'beneficiary_id': heads['beneficiary_id'].to_numpy()[mask],
+            'exception_category': category,
+            'exception_description': description,
+            'anomaly_score': scores,
+            'detected_features': pd.Series(detected_features, dtype=object),
+            'requires_human_review': True
+        }, columns=EXCEPTION_COLUMNS)
+    
     def _detect_rule_based_exceptions(
         self,
         family_id: str,
@@ -284,9 +625,6 @@ class ExceptionPatternDetector:
     
     def _is_homeless_informal_settlement(self, district: Optional[str], block: Optional[str], gp: Optional[str]) -> bool:
         """Check for homeless/informal settlement indicators"""
-        # Check for common informal settlement indicators in address
-        informal_keywords = ['slum', 'jhuggi', 'colony', 'basti', 'urban_village']
-        
         address_parts = []
         if district:
             address_parts.append(district.lower())
@@ -297,8 +635,8 @@ class ExceptionPatternDetector:
         
         address_text = ' '.join(address_parts)
         
-        # Simple keyword matching (can be enhanced)
-        return any(keyword in address_text for keyword in informal_keywords)
+        # Keyword matching with the compiled keyword pattern
+        return self.informal_pattern.search(address_text) is not None
     
     def _is_dropout_student_pattern(self, beneficiary_id: str, date_of_birth: Optional[datetime]) -> bool:
         """Check for dropout student pattern"""
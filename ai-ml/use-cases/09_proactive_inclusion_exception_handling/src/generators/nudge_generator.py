@@ -40,6 +40,9 @@ class NudgeGenerator:
         self.priority_levels = nudge_config.get('nudge_priority_levels', ['HIGH', 'MEDIUM', 'LOW'])
         self.channel_config = self.config.get('nudge_channels', {})
         
+        # Scheme names loaded once per run (see load_scheme_names)
+        self._scheme_names: Dict[str, str] = {}
+        
         # Database
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
         with open(db_config_path, 'r') as f:
@@ -186,8 +189,41 @@ class NudgeGenerator:
         
         return nudges
     
+    def load_scheme_names(self) -> int:
+        """
+        Load all scheme names in one query (per pipeline run)
+        
+        _get_scheme_name serves loaded names from memory instead of querying
+        scheme_master once per nudge.
+        
+        Returns:
+            Number of schemes loaded
+        """
+        try:
+            conn = self.external_dbs['golden_records'].connection
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT scheme_code, scheme_name
+                FROM public.scheme_master
+            """)
+            self._scheme_names = {row[0]: row[1] or row[0] for row in cursor.fetchall()}
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error loading scheme names: {e}")
+            self.external_dbs['golden_records'].connection.rollback()
+        
+        return len(self._scheme_names)
+    
+    def clear_scheme_names(self):
+        """Drop scheme names loaded for a run"""
+        self._scheme_names = {}
+    
     def _get_scheme_name(self, scheme_code: str) -> str:
         """Get scheme name"""
+        if scheme_code in self._scheme_names:
+            return self._scheme_names[scheme_code]
+        
         try:
             conn = self.external_dbs['golden_records'].connection
             cursor = conn.cursor()
@@ -203,6 +239,10 @@ class NudgeGenerator:
             row = cursor.fetchone()
             cursor.close()
             
+            if self._scheme_names:
+                # Loaded for this run: remember schemes added since
+                self._scheme_names[scheme_code] = row[0] if row else scheme_code
+            
             return row[0] if row else scheme_code
         
         except Exception:
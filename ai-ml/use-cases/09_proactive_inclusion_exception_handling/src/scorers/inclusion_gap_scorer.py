@@ -9,8 +9,11 @@ Calculates inclusion gap scores by combining:
 """
 
 import sys
+import uuid
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+import numpy as np
+import pandas as pd
 import yaml
 import json
 from datetime import datetime
@@ -45,6 +48,12 @@ class InclusionGapScorer:
         self.benchmark_weight = inclusion_config.get('benchmark_weight', 0.2)
         self.gap_threshold = inclusion_config.get('inclusion_gap_threshold', 0.6)
         
+        # Batch scoring (statewide sweeps)
+        batch_config = inclusion_config.get('batch', {})
+        self.batch_chunk_size = batch_config.get('chunk_size', 50000)
+        self.local_benchmark_enabled = batch_config.get('local_benchmark', True)
+        self.benchmark_min_households = batch_config.get('benchmark_min_households', 10)
+        
         # Database configuration
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
         with open(db_config_path, 'r') as f:
@@ -349,6 +358,436 @@ class InclusionGapScorer:
         
         return location
     
+    def iter_household_chunks(
+        self,
+        district: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream active households in block-aligned chunks
+        
+        Households are ordered by district and block and a block is never split
+        across chunks, so local coverage benchmarks see the whole block. The
+        stream runs on its own golden_records connection, so a rollback on the
+        shared connection cannot close the server-side cursor mid-stream.
+        
+        Args:
+            district: Optional district filter (None for statewide)
+            chunk_size: Target households per chunk
+        
+        Yields:
+            DataFrames with family_id, district, block_id, gram_panchayat
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        golden_records_db = self.external_dbs['golden_records']
+        stream_db = DBConnector(
+            host=golden_records_db.host,
+            port=golden_records_db.port,
+            database=golden_records_db.database,
+            user=golden_records_db.user,
+            password=golden_records_db.password
+        )
+        conn = stream_db.connect()
+        cursor = conn.cursor(name=f"inclusion_households_{uuid.uuid4().hex[:8]}")
+        cursor.itersize = min(chunk_size, 50000)
+        
+        query = """
+            SELECT family_id, district, block_id, gram_panchayat
+            FROM (
+                SELECT DISTINCT ON (family_id)
+                    family_id::text AS family_id,
+                    address_district AS district,
+                    address_block AS block_id,
+                    address_gram_panchayat AS gram_panchayat
+                FROM golden_records.beneficiaries
+                WHERE is_active = TRUE
+                  AND family_id IS NOT NULL
+                  {district_filter}
+                ORDER BY family_id
+            ) households
+            ORDER BY district NULLS LAST, block_id NULLS LAST, family_id
+        """
+        columns = ['family_id', 'district', 'block_id', 'gram_panchayat']
+        pending: List[tuple] = []
+        
+        try:
+            if district:
+                cursor.execute(query.format(district_filter="AND address_district = %s"), (district,))
+            else:
+                cursor.execute(query.format(district_filter=""))
+            
+            while True:
+                rows = cursor.fetchmany(cursor.itersize)
+                if not rows:
+                    break
+                pending.extend(rows)
+                
+                if len(pending) >= chunk_size:
+                    # Cut at the last block boundary so no block is split
+                    last_block = pending[-1][1:3]
+                    cut = len(pending)
+                    while cut > 0 and pending[cut - 1][1:3] == last_block:
+                        cut -= 1
+                    if cut > 0:
+                        yield pd.DataFrame(pending[:cut], columns=columns)
+                        pending = pending[cut:]
+            
+            if pending:
+                yield pd.DataFrame(pending, columns=columns)
+        
+        finally:
+            cursor.close()
+            stream_db.disconnect()
+    
+    def calculate_inclusion_gaps(
+        self,
+        households: pd.DataFrame,
+        analysis_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate inclusion gap scores for many households at once
+        
+        Predicted and enrolled schemes are loaded for all households in one query
+        each and held as sparse family x scheme matrices (COO coordinates);
+        coverage gap, vulnerability, benchmark and priority level are computed
+        as vectorized array operations.
+        
+        Args:
+            households: DataFrame with family_id, district, block_id, gram_panchayat
+                (e.g. a chunk from iter_household_chunks)
+            analysis_date: Date for analysis (default: today)
+        
+        Returns:
+            DataFrame with one row per household: scores, counts, priority level,
+            scheme lists, vulnerability flags/details and priority segments
+        """
+        if analysis_date is None:
+            analysis_date = datetime.now()
+        
+        households = households.drop_duplicates('family_id').reset_index(drop=True)
+        families = pd.Index(households['family_id'].astype(str))
+        family_ids = list(families)
+        n = len(families)
+        
+        # 1-2. Predicted eligible and enrolled schemes as sparse family x scheme matrices
+        predicted = self._load_predicted_eligible_pairs(family_ids)
+        enrolled = self._load_enrolled_pairs(family_ids)
+        schemes = pd.Index(pd.unique(pd.concat([predicted['scheme_code'], enrolled['scheme_code']])))
+        n_schemes = max(len(schemes), 1)
+        
+        predicted_keys = self._pair_keys(predicted, families, schemes, n_schemes)
+        enrolled_keys = self._pair_keys(enrolled, families, schemes, n_schemes)
+        gap_keys = predicted_keys[~np.isin(predicted_keys, enrolled_keys, assume_unique=True)]
+        
+        predicted_count = np.bincount(predicted_keys // n_schemes, minlength=n)
+        enrolled_count = np.bincount(enrolled_keys // n_schemes, minlength=n)
+        gap_count = np.bincount(gap_keys // n_schemes, minlength=n)
+        
+        # 3. Eligibility vs uptake gap
+        coverage_gap_score = np.where(
+            predicted_count > 0,
+            np.minimum(1.0, gap_count / np.maximum(predicted_count, 1)),
+            0.0
+        )
+        
+        # 4. Vulnerability indicators
+        vulnerability = self._load_vulnerability_frame(family_ids, families)
+        vulnerability_score = np.minimum(1.0, (
+            0.25 * vulnerability['tribal'] +
+            0.25 * vulnerability['pwd'] +
+            0.20 * vulnerability['single_woman'] +
+            0.15 * vulnerability['elderly_alone'] +
+            0.15 * vulnerability['remote_hamlet'] +
+            0.10 * vulnerability['low_income']
+        ))
+        
+        # 5. Local coverage benchmark (block-level): share of predicted schemes enrolled
+        covered_count = predicted_count - gap_count
+        household_coverage = covered_count / np.maximum(predicted_count, 1)
+        local_coverage, benchmark_score = self._local_benchmarks(households, household_coverage, predicted_count)
+        
+        # 6. Combined inclusion gap score
+        inclusion_gap_score = np.clip(
+            coverage_gap_score * self.coverage_gap_weight +
+            vulnerability_score * self.vulnerability_weight +
+            (1.0 - benchmark_score) * self.benchmark_weight,  # Lower benchmark = higher gap
+            0.0, 1.0
+        )
+        
+        # 7-8. Priority level
+        combined = (inclusion_gap_score * 0.7) + (vulnerability_score * 0.3)
+        priority_level = np.select([combined >= 0.75, combined >= 0.5], ['HIGH', 'MEDIUM'], default='LOW')
+        
+        result = households[['family_id', 'district', 'block_id', 'gram_panchayat']].copy()
+        result['analysis_date'] = analysis_date
+        result['inclusion_gap_score'] = inclusion_gap_score
+        result['vulnerability_score'] = vulnerability_score
+        result['coverage_gap_score'] = coverage_gap_score
+        result['benchmark_score'] = benchmark_score
+        result['local_benchmark_coverage'] = local_coverage
+        result['household_coverage'] = household_coverage
+        result['predicted_eligible_count'] = predicted_count
+        result['actual_enrolled_count'] = enrolled_count
+        result['eligibility_gap_count'] = gap_count
+        result['priority_level'] = priority_level
+        
+        # Scheme lists from the sparse coordinates
+        result['predicted_eligible_schemes'] = self._scheme_lists(predicted_keys, schemes, n_schemes, n)
+        result['actual_enrolled_schemes'] = self._scheme_lists(enrolled_keys, schemes, n_schemes, n)
+        result['gap_schemes'] = self._scheme_lists(gap_keys, schemes, n_schemes, n)
+        result['vulnerability_flags'] = vulnerability['flags']
+        result['vulnerability_details'] = vulnerability['details']
+        result['priority_segments'] = self._segment_lists(vulnerability, n)
+        
+        return result
+    
+    @staticmethod
+    def _pair_keys(pairs: pd.DataFrame, families: pd.Index, schemes: pd.Index, n_schemes: int) -> np.ndarray:
+        """Sorted unique family x scheme keys (family_index * n_schemes + scheme_index)"""
+        if pairs.empty:
+            return np.empty(0, dtype=np.int64)
+        family_idx = families.get_indexer(pairs['family_id'])
+        scheme_idx = schemes.get_indexer(pairs['scheme_code'])
+        valid = (family_idx >= 0) & (scheme_idx >= 0)
+        return np.unique(family_idx[valid].astype(np.int64) * n_schemes + scheme_idx[valid])
+    
+    @staticmethod
+    def _scheme_lists(keys: np.ndarray, schemes: pd.Index, n_schemes: int, n: int) -> List[List[str]]:
+        """Per-family scheme code lists (sorted by scheme code) from sparse keys"""
+        if len(keys) == 0:
+            return [[] for _ in range(n)]
+        family_idx = keys // n_schemes
+        codes = schemes.to_numpy().astype(str)[keys % n_schemes]
+        ordered = codes[np.lexsort((codes, family_idx))].tolist()
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(family_idx, minlength=n)))).tolist()
+        return [ordered[bounds[i]:bounds[i + 1]] for i in range(n)]
+    
+    def _local_benchmarks(
+        self,
+        households: pd.DataFrame,
+        household_coverage: np.ndarray,
+        predicted_count: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Block-level coverage benchmark
+        
+        Local coverage is the mean enrolled/predicted ratio of households with
+        predicted eligibility in the same block. The benchmark score is 0.5 at
+        the local average and moves towards 1 (0) as the household is covered
+        better (worse) than its block; 0.5 when the block is too small.
+        """
+        n = len(households)
+        local_coverage = np.full(n, np.nan)
+        benchmark_score = np.full(n, 0.5)
+        if not self.local_benchmark_enabled or n == 0:
+            return local_coverage, benchmark_score
+        
+        blocks = households['district'].astype(str) + '|' + households['block_id'].astype(str)
+        block_codes, _ = pd.factorize(blocks)
+        has_block = households['block_id'].notna().to_numpy()
+        counted = has_block & (predicted_count > 0)
+        
+        n_blocks = block_codes.max() + 1
+        coverage_sum = np.bincount(block_codes[counted], weights=household_coverage[counted], minlength=n_blocks)
+        coverage_n = np.bincount(block_codes[counted], minlength=n_blocks)
+        
+        enough = has_block & (coverage_n[block_codes] >= self.benchmark_min_households)
+        local_coverage[enough] = coverage_sum[block_codes[enough]] / coverage_n[block_codes[enough]]
+        benchmark_score[enough] = np.clip(0.5 + (household_coverage[enough] - local_coverage[enough]) / 2.0, 0.0, 1.0)
+        return local_coverage, benchmark_score
+    
+    def _segment_lists(self, vulnerability: Dict[str, Any], n: int) -> List[List[str]]:
+        """Priority segments per household from vulnerability masks"""
+        segment_masks = [
+            ('TRIBAL', vulnerability['tribal']),
+            ('PWD', vulnerability['pwd']),
+            ('SINGLE_WOMAN', vulnerability['single_woman'] | vulnerability['female_headed']),
+            ('ELDERLY_ALONE', vulnerability['elderly_alone']),
+            ('REMOTE_GEOGRAPHY', vulnerability['remote_hamlet']),
+            ('UNEMPLOYED_YOUTH', vulnerability['unemployed_youth'])
+        ]
+        segments: List[List[str]] = [[] for _ in range(n)]
+        for segment, mask in segment_masks:
+            for i in np.flatnonzero(mask).tolist():
+                segments[i].append(segment)
+        return segments
+    
+    def _load_predicted_eligible_pairs(self, family_ids: List[str]) -> pd.DataFrame:
+        """Load (family_id, scheme_code) predicted eligible pairs for many families"""
+        try:
+            conn = self.external_dbs['eligibility'].connection
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT family_id::text, scheme_code
+                FROM eligibility.scheme_eligibility_snapshots
+                WHERE family_id = ANY(%s::uuid[])
+                  AND evaluation_status IN ('RULE_ELIGIBLE', 'POSSIBLE_ELIGIBLE')
+                  AND snapshot_date >= CURRENT_DATE - INTERVAL '90 days'
+            """, (family_ids,))
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error fetching predicted eligible schemes: {e}")
+            self.external_dbs['eligibility'].connection.rollback()
+            # Fallback: Try eligibility_checker recommendations
+            try:
+                conn = self.external_dbs['eligibility_checker'].connection
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DISTINCT ec.family_id::text, ser.scheme_code
+                    FROM eligibility_checker.scheme_eligibility_results ser
+                    INNER JOIN eligibility_checker.eligibility_checks ec ON ser.check_id = ec.check_id
+                    WHERE ec.family_id = ANY(%s::uuid[])
+                      AND ser.eligibility_status IN ('ELIGIBLE', 'POSSIBLE_ELIGIBLE')
+                      AND ec.check_timestamp >= CURRENT_TIMESTAMP - INTERVAL '90 days'
+                """, (family_ids,))
+                rows = cursor.fetchall()
+                cursor.close()
+            except Exception as e2:
+                print(f"⚠️  Error in fallback query: {e2}")
+                self.external_dbs['eligibility_checker'].connection.rollback()
+                rows = []
+        
+        return pd.DataFrame(rows, columns=['family_id', 'scheme_code'])
+    
+    def _load_enrolled_pairs(self, family_ids: List[str]) -> pd.DataFrame:
+        """Load (family_id, scheme_code) enrolled pairs for many families"""
+        rows = []
+        
+        try:
+            conn = self.external_dbs['profile_360'].connection
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT b.family_id::text, bh.scheme_code
+                FROM profile_360.benefit_history bh
+                INNER JOIN golden_records.beneficiaries b ON b.beneficiary_id = bh.beneficiary_id
+                WHERE b.family_id = ANY(%s::uuid[])
+                  AND bh.status IN ('ACTIVE', 'PAID', 'ENROLLED')
+                  AND bh.benefit_date >= CURRENT_DATE - INTERVAL '365 days'
+            """, (family_ids,))
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error fetching enrolled schemes: {e}")
+            self.external_dbs['profile_360'].connection.rollback()
+        
+        return pd.DataFrame(rows, columns=['family_id', 'scheme_code'])
+    
+    def _load_vulnerability_frame(self, family_ids: List[str], families: pd.Index) -> Dict[str, Any]:
+        """
+        Load vulnerability indicators for many families
+        
+        Returns boolean masks (aligned with families) for each indicator plus
+        per-family flag lists and details, as in _get_vulnerability_indicators.
+        """
+        n = len(families)
+        masks = {name: np.zeros(n, dtype=bool) for name in (
+            'tribal', 'pwd', 'single_woman', 'female_headed', 'elderly_alone',
+            'remote_hamlet', 'low_income', 'unemployed_youth'
+        )}
+        flags: List[List[str]] = [[] for _ in range(n)]
+        details: List[Dict[str, Any]] = [{} for _ in range(n)]
+        
+        try:
+            conn = self.external_dbs['profile_360'].connection
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT ON (family_id)
+                    family_id::text,
+                    vulnerability_tags,
+                    income_band,
+                    is_tribal,
+                    is_pwd,
+                    is_single_woman_head,
+                    is_elderly_alone
+                FROM profile_360.household_profiles
+                WHERE family_id = ANY(%s::uuid[])
+                ORDER BY family_id
+            """, (family_ids,))
+            profiles = pd.DataFrame(cursor.fetchall(), columns=[
+                'family_id', 'tags', 'income_band', 'is_tribal', 'is_pwd',
+                'is_single_woman_head', 'is_elderly_alone'
+            ])
+            cursor.close()
+            
+            idx = families.get_indexer(profiles['family_id'])
+            profiles = profiles[idx >= 0]
+            idx = idx[idx >= 0]
+            
+            # Tags: explode once, then mark families per tag
+            tags = profiles['tags'].map(lambda t: t if isinstance(t, list) else [])
+            exploded = pd.DataFrame({'idx': np.repeat(idx, tags.map(len).to_numpy()),
+                                     'tag': [tag for tag_list in tags for tag in tag_list]})
+            lowered = exploded['tag'].astype(str).str.lower()
+            for name, tag_names in (
+                ('tribal', ['tribal']), ('pwd', ['pwd']), ('single_woman', ['single_woman']),
+                ('female_headed', ['female_headed']), ('elderly_alone', ['elderly_alone']),
+                ('remote_hamlet', ['remote_hamlet']), ('unemployed_youth', ['unemployed', 'youth'])
+            ):
+                masks[name][exploded['idx'].to_numpy()[lowered.isin(tag_names).to_numpy()]] = True
+            
+            for column, name in (('is_tribal', 'tribal'), ('is_pwd', 'pwd'),
+                                 ('is_single_woman_head', 'single_woman'), ('is_elderly_alone', 'elderly_alone')):
+                masks[name][idx[profiles[column].fillna(False).astype(bool).to_numpy()]] = True
+            
+            income = profiles['income_band'].fillna('').astype(str).str.upper()
+            masks['low_income'][idx[income.str.contains('BELOW').to_numpy()]] = True
+            
+            for i, tag_list, row in zip(idx.tolist(), tags, profiles.itertuples(index=False)):
+                flags[i] = list(tag_list)
+                if row.is_tribal:
+                    flags[i].append('tribal')
+                if row.is_pwd:
+                    flags[i].append('pwd')
+                if row.is_single_woman_head:
+                    flags[i].append('single_woman')
+                if row.is_elderly_alone:
+                    flags[i].append('elderly_alone')
+                details[i] = {
+                    'income_band': row.income_band,
+                    'is_tribal': row.is_tribal or False,
+                    'is_pwd': row.is_pwd or False,
+                    'is_single_woman_head': row.is_single_woman_head or False,
+                    'is_elderly_alone': row.is_elderly_alone or False
+                }
+        
+        except Exception as e:
+            print(f"⚠️  Error fetching vulnerability indicators: {e}")
+            self.external_dbs['profile_360'].connection.rollback()
+            # Fallback: Try golden_records
+            try:
+                conn = self.external_dbs['golden_records'].connection
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DISTINCT ON (family_id)
+                        family_id::text, category, disability_status, gender
+                    FROM golden_records.beneficiaries
+                    WHERE family_id = ANY(%s::uuid[])
+                      AND is_active = TRUE
+                    ORDER BY family_id
+                """, (family_ids,))
+                rows = pd.DataFrame(cursor.fetchall(), columns=['family_id', 'category', 'disability', 'gender'])
+                cursor.close()
+                
+                idx = families.get_indexer(rows['family_id'])
+                rows = rows[idx >= 0]
+                idx = idx[idx >= 0]
+                masks['tribal'][idx[rows['category'].fillna('').astype(str).str.upper().str.contains('ST').to_numpy()]] = True
+                masks['pwd'][idx[rows['disability'].fillna('').astype(str).str.upper().isin(['YES', 'TRUE', '1']).to_numpy()]] = True
+                masks['female_headed'][idx[(rows['gender'].fillna('').astype(str).str.upper() == 'FEMALE').to_numpy()]] = True
+                
+                for name in ('tribal', 'pwd', 'female_headed'):
+                    for i in np.flatnonzero(masks[name]).tolist():
+                        flags[i].append(name)
+            
+            except Exception as e2:
+                print(f"⚠️  Error in fallback vulnerability query: {e2}")
+                self.external_dbs['golden_records'].connection.rollback()
+        
+        return {**masks, 'flags': flags, 'details': [{'flags': f, 'details': d} for f, d in zip(flags, details)]}
+    
     def _calculate_coverage_gap_score(
         self,
         predicted_count: int,
@@ -11,12 +11,17 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import yaml
+from psycopg2.extras import execute_values
 
 # Import services
 from services.priority_household_identifier import PriorityHouseholdIdentifier
 from detectors.exception_pattern_detector import ExceptionPatternDetector
 from generators.nudge_generator import NudgeGenerator
 
+# Add shared utils to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from instrumentation import traced
+
 
 class InclusionOrchestrator:
     """
@@ -70,6 +75,7 @@ class InclusionOrchestrator:
         self.nudge_generator.disconnect()
         self.db.disconnect()
     
+    @traced('inclusion.get_priority_status')
     def get_priority_status(
         self,
         family_id: str,
@@ -116,6 +122,7 @@ class InclusionOrchestrator:
             'timestamp': datetime.now().isoformat()
         }
     
+    @traced('inclusion.get_priority_list')
     def get_priority_list(
         self,
         block_id: Optional[str] = None,
@@ -219,6 +226,7 @@ class InclusionOrchestrator:
                 'error': str(e)
             }
     
+    @traced('inclusion.schedule_nudge_delivery')
     def schedule_nudge_delivery(
         self,
         family_id: str,
@@ -300,4 +308,85 @@ class InclusionOrchestrator:
                 'success': False,
                 'error': str(e)
             }
+    
+    @traced('inclusion.schedule_nudge_deliveries_bulk')
+    def schedule_nudge_deliveries_bulk(
+        self,
+        nudges: List[Dict[str, Any]],
+        scheduled_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Schedule many nudges in one multi-row INSERT
+        
+        Nudges already scheduled for the same family, type and schemes are
+        skipped, so nightly refreshes do not repeat them.
+        
+        Args:
+            nudges: Nudges from NudgeGenerator.generate_nudges, each with family_id
+                and optionally household_head_id / priority_household_id
+            scheduled_at: Scheduled delivery time (default: now)
+        
+        Returns:
+            Number of nudges scheduled
+        """
+        if not nudges:
+            return 0
+        
+        if scheduled_at is None:
+            scheduled_at = datetime.now()
+        
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            rows = [
+                (
+                    nudge['family_id'],
+                    nudge.get('household_head_id'),
+                    nudge['nudge_type'],
+                    nudge['nudge_message'],
+                    nudge.get('recommended_actions', []),
+                    nudge.get('scheme_codes', []),
+                    nudge['channel'],
+                    nudge['priority_level'],
+                    scheduled_at,
+                    nudge.get('priority_household_id')
+                )
+                for nudge in nudges
+            ]
+            
+            inserted = execute_values(cursor, """
+                INSERT INTO inclusion.nudge_records (
+                    family_id, household_head_id, nudge_type, nudge_message,
+                    recommended_actions, scheme_codes, channel, priority_level,
+                    scheduled_at, delivery_status, priority_household_id
+                )
+                SELECT v.family_id, v.household_head_id, v.nudge_type, v.nudge_message,
+                       v.recommended_actions, v.scheme_codes, v.channel, v.priority_level,
+                       v.scheduled_at, 'SCHEDULED', v.priority_household_id
+                FROM (VALUES %s) AS v(
+                    family_id, household_head_id, nudge_type, nudge_message,
+                    recommended_actions, scheme_codes, channel, priority_level,
+                    scheduled_at, priority_household_id
+                )
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM inclusion.nudge_records nr
+                    WHERE nr.family_id = v.family_id
+                      AND nr.nudge_type = v.nudge_type
+                      AND nr.scheme_codes IS NOT DISTINCT FROM v.scheme_codes
+                      AND nr.delivery_status = 'SCHEDULED'
+                )
+                RETURNING nudge_id
+            """, rows, template="(%s::uuid, %s, %s, %s, %s::text[], %s::text[], %s, %s, %s::timestamp, %s::int)",
+                page_size=1000, fetch=True)
+            
+            conn.commit()
+            cursor.close()
+            return len(inserted)
+        
+        except Exception as e:
+            print(f"⚠️  Error scheduling nudges: {e}")
+            conn.rollback()
+            cursor.close()
+            return 0
 
@@ -0,0 +1,374 @@
+"""
+Inclusion Pipeline
+Use Case ID: AI-PLATFORM-09
+
+Pipeline runner for full priority household refreshes: streams households in
+block-aligned chunks through gap scoring, exception detection and nudge
+generation on a process pool, with per-chunk checkpoints and per-stage timing.
+"""
+
+import os
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+import yaml
+
+from scorers.inclusion_gap_scorer import InclusionGapScorer
+
+STAGES = ['gap_scoring', 'exception_detection', 'nudge_generation']
+
+# Per-process orchestrator used by pool workers (see _init_worker)
+_worker_orchestrator = None
+
+
+def _init_worker(config_path: Optional[str]):
+    """Create and connect one orchestrator per worker process, load scheme names once"""
+    global _worker_orchestrator
+    from services.inclusion_orchestrator import InclusionOrchestrator
+    
+    _worker_orchestrator = InclusionOrchestrator(config_path)
+    _worker_orchestrator.connect()
+    _worker_orchestrator.nudge_generator.load_scheme_names()
+
+
+def _run_chunk(chunk_index: int, households: pd.DataFrame, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run all stages for one chunk in a worker process"""
+    return process_chunk(_worker_orchestrator, chunk_index, households, options)
+
+
+def process_chunk(
+    orchestrator,
+    chunk_index: int,
+    households: pd.DataFrame,
+    options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Run gap scoring, exception detection and nudge generation for one chunk
+    
+    Args:
+        orchestrator: Connected InclusionOrchestrator
+        chunk_index: Chunk number within the run
+        households: DataFrame with family_id, district, block_id, gram_panchayat
+        options: save_to_db, detect_exceptions, generate_nudges
+    
+    Returns:
+        Chunk result with counts and per-stage seconds
+    """
+    save_to_db = options.get('save_to_db', True)
+    stage_seconds = {}
+    counts = {'households': len(households)}
+    
+    # 1. Gap scoring and priority households
+    started = time.perf_counter()
+    priority = orchestrator.priority_identifier.identify_priority_households_chunk(households, save_to_db=save_to_db)
+    stage_seconds['gap_scoring'] = time.perf_counter() - started
+    counts['priority_households'] = len(priority)
+    counts['by_priority_level'] = {str(k): int(v) for k, v in priority['priority_level'].value_counts().items()} \
+        if not priority.empty else {}
+    
+    # 2. Exception detection for all households of the chunk
+    counts['exceptions'] = 0
+    if options.get('detect_exceptions', True):
+        started = time.perf_counter()
+        exceptions = orchestrator.exception_detector.detect_exceptions_batch(
+            family_ids=households['family_id'].tolist()
+        )
+        counts['exceptions'] = len(exceptions)
+        if save_to_db:
+            orchestrator.exception_detector.save_exceptions_bulk(exceptions)
+        stage_seconds['exception_detection'] = time.perf_counter() - started
+    
+    # 3. Nudges for priority households
+    counts['nudges'] = 0
+    if options.get('generate_nudges', True) and not priority.empty:
+        started = time.perf_counter()
+        nudges = []
+        for row in priority.itertuples(index=False):
+            household_nudges = orchestrator.nudge_generator.generate_nudges(
+                family_id=row.family_id,
+                gap_analysis={'gap_schemes': row.gap_schemes},
+                priority_segments=row.priority_segments,
+                location_data={
+                    'district': row.district,
+                    'block_id': row.block_id,
+                    'gram_panchayat': row.gram_panchayat
+                }
+            )
+            for nudge in household_nudges:
+                nudge['household_head_id'] = row.household_head_id if isinstance(row.household_head_id, str) else None
+                priority_id = getattr(row, 'priority_id', None)
+                nudge['priority_household_id'] = None if pd.isna(priority_id) else int(priority_id)
+            nudges.extend(household_nudges)
+        counts['nudges'] = len(nudges)
+        if save_to_db:
+            orchestrator.schedule_nudge_deliveries_bulk(nudges)
+        stage_seconds['nudge_generation'] = time.perf_counter() - started
+    
+    return {
+        'chunk_index': chunk_index,
+        'first_family_id': households['family_id'].iloc[0] if len(households) else None,
+        'counts': counts,
+        'stage_seconds': stage_seconds
+    }
+
+
+class InclusionPipeline:
+    """
+    Inclusion Pipeline Runner
+    
+    Streams active households in block-aligned chunks (InclusionGapScorer.
+    iter_household_chunks) to a process pool; every worker holds its own
+    connected InclusionOrchestrator and loads scheme names once per run.
+    Completed chunks are checkpointed so an interrupted run can resume, and
+    per-stage time and throughput are reported at the end.
+    """
+    
+    def __init__(self, config_path: Optional[str] = None):
+        """Initialize Inclusion Pipeline"""
+        if config_path is None:
+            config_path = Path(__file__).parent.parent.parent / "config" / "use_case_config.yaml"
+        self.config_path = str(config_path)
+        
+        with open(config_path, 'r') as f:
+            self.config = yaml.safe_load(f)
+        
+        pipeline_config = self.config.get('pipeline', {})
+        self.chunk_size = pipeline_config.get(
+            'chunk_size', self.config.get('inclusion_detection', {}).get('batch', {}).get('chunk_size', 50000)
+        )
+        self.max_workers = pipeline_config.get('max_workers', 4)
+        self.max_pending_chunks = pipeline_config.get('max_pending_chunks', 2 * max(1, self.max_workers))
+        self.detect_exceptions = pipeline_config.get('detect_exceptions', True)
+        self.generate_nudges = pipeline_config.get('generate_nudges', True)
+        
+        checkpoint_dir = Path(pipeline_config.get('checkpoint_dir', 'checkpoints'))
+        if not checkpoint_dir.is_absolute():
+            checkpoint_dir = Path(__file__).parent.parent.parent / checkpoint_dir
+        self.checkpoint_dir = checkpoint_dir
+        
+        # Household streaming only needs the gap scorer's golden records connection
+        self.gap_scorer = InclusionGapScorer(self.config_path)
+    
+    def run(
+        self,
+        district: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resume: bool = True,
+        save_to_db: bool = True,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a full refresh
+        
+        Args:
+            district: Optional district filter (None for statewide refresh)
+            run_id: Run identifier; the checkpoint of an existing run is resumed
+            resume: Skip chunks completed in the run's checkpoint
+            save_to_db: Whether stages write their results
+            max_workers: Worker processes (0 or 1 runs in-process)
+            chunk_size: Households per chunk
+        
+        Returns:
+            Run report with totals, per-stage timing and throughput
+        """
+        max_workers = self.max_workers if max_workers is None else max_workers
+        chunk_size = chunk_size or self.chunk_size
+        if run_id is None:
+            run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{district or 'all'}_{uuid.uuid4().hex[:6]}"
+        
+        checkpoint = self._load_checkpoint(run_id) if resume else None
+        if checkpoint is None or checkpoint.get('chunk_size') != chunk_size or checkpoint.get('district') != district:
+            checkpoint = {
+                'run_id': run_id,
+                'district': district,
+                'chunk_size': chunk_size,
+                'started_at': datetime.now().isoformat(),
+                'completed_chunks': {}
+            }
+        completed = checkpoint['completed_chunks']
+        if completed:
+            print(f"🔁 Resuming run {run_id}: {len(completed)} chunks already completed")
+        
+        options = {
+            'save_to_db': save_to_db,
+            'detect_exceptions': self.detect_exceptions,
+            'generate_nudges': self.generate_nudges
+        }
+        
+        print(f"🚀 Inclusion pipeline run {run_id} "
+              f"({district or 'all districts'}, chunks of {chunk_size}, {max_workers} workers)")
+        
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        skipped = 0
+        
+        self.gap_scorer.external_dbs['golden_records'].connect()
+        try:
+            chunks = self.gap_scorer.iter_household_chunks(district=district, chunk_size=chunk_size)
+            
+            def pending_chunks():
+                nonlocal skipped
+                for chunk_index, households in enumerate(chunks):
+                    done = completed.get(str(chunk_index))
+                    if done and done.get('first_family_id') == households['family_id'].iloc[0]:
+                        skipped += 1
+                        continue
+                    yield chunk_index, households
+            
+            if max_workers <= 1:
+                results = self._run_in_process(pending_chunks(), options, checkpoint, started)
+            else:
+                results = self._run_pool(pending_chunks(), options, checkpoint, started, max_workers)
+        
+        finally:
+            self.gap_scorer.external_dbs['golden_records'].disconnect()
+        
+        report = self._build_report(run_id, district, results, skipped, time.perf_counter() - started)
+        checkpoint['finished_at'] = datetime.now().isoformat()
+        checkpoint['report'] = report
+        self._save_checkpoint(checkpoint)
+        self._print_report(report)
+        return report
+    
+    def _run_in_process(self, chunks, options, checkpoint, started) -> List[Dict[str, Any]]:
+        """Run chunks sequentially in this process"""
+        from services.inclusion_orchestrator import InclusionOrchestrator
+        
+        orchestrator = InclusionOrchestrator(self.config_path)
+        orchestrator.connect()
+        orchestrator.nudge_generator.load_scheme_names()
+        
+        results = []
+        try:
+            for chunk_index, households in chunks:
+                result = process_chunk(orchestrator, chunk_index, households, options)
+                self._complete_chunk(result, results, checkpoint, started)
+        finally:
+            orchestrator.disconnect()
+        
+        return results
+    
+    def _run_pool(self, chunks, options, checkpoint, started, max_workers) -> List[Dict[str, Any]]:
+        """Run chunks on a process pool with a bounded number of chunks in flight"""
+        results = []
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.config_path,)
+        ) as executor:
+            in_flight = set()
+            
+            for chunk_index, households in chunks:
+                in_flight.add(executor.submit(_run_chunk, chunk_index, households, options))
+                if len(in_flight) >= self.max_pending_chunks:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._complete_chunk(future.result(), results, checkpoint, started)
+            
+            for future in wait(in_flight).done:
+                self._complete_chunk(future.result(), results, checkpoint, started)
+        
+        return results
+    
+    def _complete_chunk(self, result, results, checkpoint, started):
+        """Record a finished chunk in the checkpoint and print progress"""
+        results.append(result)
+        checkpoint['completed_chunks'][str(result['chunk_index'])] = {
+            'first_family_id': result['first_family_id'],
+            'counts': result['counts'],
+            'stage_seconds': result['stage_seconds'],
+            'completed_at': datetime.now().isoformat()
+        }
+        self._save_checkpoint(checkpoint)
+        
+        households = sum(r['counts']['households'] for r in results)
+        elapsed = time.perf_counter() - started
+        print(f"   Chunk {result['chunk_index']}: {result['counts']['households']} households, "
+              f"{result['counts']['priority_households']} priority "
+              f"(total {households}, {households / max(elapsed, 1e-9):.0f} households/s)")
+    
+    def _build_report(
+        self,
+        run_id: str,
+        district: Optional[str],
+        results: List[Dict[str, Any]],
+        skipped: int,
+        elapsed: float
+    ) -> Dict[str, Any]:
+        """Totals, per-stage timing and throughput of a run"""
+        households = sum(r['counts']['households'] for r in results)
+        by_priority_level: Dict[str, int] = {}
+        for r in results:
+            for level, count in r['counts']['by_priority_level'].items():
+                by_priority_level[level] = by_priority_level.get(level, 0) + count
+        
+        stages = {}
+        for stage in STAGES:
+            seconds = [r['stage_seconds'][stage] for r in results if stage in r['stage_seconds']]
+            if not seconds:
+                continue
+            total = sum(seconds)
+            stages[stage] = {
+                'chunks': len(seconds),
+                'total_seconds': round(total, 3),
+                'max_chunk_seconds': round(max(seconds), 3),
+                'households_per_second': round(households / total, 1) if total > 0 else None
+            }
+        
+        return {
+            'run_id': run_id,
+            'district': district,
+            'chunks_processed': len(results),
+            'chunks_skipped': skipped,
+            'households': households,
+            'priority_households': sum(r['counts']['priority_households'] for r in results),
+            'by_priority_level': by_priority_level,
+            'exceptions': sum(r['counts']['exceptions'] for r in results),
+            'nudges': sum(r['counts']['nudges'] for r in results),
+            'elapsed_seconds': round(elapsed, 3),
+            'households_per_second': round(households / elapsed, 1) if elapsed > 0 else None,
+            'stages': stages
+        }
+    
+    def _print_report(self, report: Dict[str, Any]):
+        """Print run summary"""
+        print(f"\n📊 Run {report['run_id']} finished in {report['elapsed_seconds']:.1f}s")
+        print(f"   Chunks: {report['chunks_processed']} processed, {report['chunks_skipped']} skipped (checkpoint)")
+        print(f"   Households: {report['households']} ({report['households_per_second']} /s)")
+        print(f"   Priority households: {report['priority_households']} {report['by_priority_level']}")
+        print(f"   Exceptions: {report['exceptions']}, Nudges: {report['nudges']}")
+        for stage, timing in report['stages'].items():
+            print(f"   {stage:<20} {timing['total_seconds']:>10.2f}s worker time, "
+                  f"{timing['households_per_second']} households/s, slowest chunk {timing['max_chunk_seconds']:.2f}s")
+    
+    def _checkpoint_path(self, run_id: str) -> Path:
+        """Checkpoint file of a run"""
+        return self.checkpoint_dir / f"inclusion_pipeline_{run_id}.json"
+    
+    def _load_checkpoint(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Load a run's checkpoint if it exists"""
+        path = self._checkpoint_path(run_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {path}: {e}")
+            return None
+    
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Write checkpoint atomically (write temp file, then rename)"""
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(checkpoint['run_id'])
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2, default=str)
+        os.replace(tmp_path, path)
@@ -6,11 +6,14 @@ Identifies priority households and manages priority household records.
 """
 
 import sys
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import pandas as pd
 import yaml
 import json
 from datetime import datetime
+from psycopg2.extras import execute_values
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
@@ -123,6 +126,82 @@ class PriorityHouseholdIdentifier:
         
         return priority_record
     
+    def identify_priority_households_bulk(
+        self,
+        district: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        save_to_db: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Score all active households and record priority households in bulk
+        
+        Households are streamed in block-aligned chunks; each chunk is scored
+        with the batch gap scorer and its priority households are written with
+        a few set-based statements.
+        
+        Args:
+            district: Optional district filter (None for statewide sweep)
+            chunk_size: Households per chunk (default: inclusion_detection.batch.chunk_size)
+            save_to_db: Whether to save to database
+        
+        Returns:
+            Sweep summary with household and priority counts
+        """
+        started = time.monotonic()
+        summary = {
+            'households_scored': 0,
+            'priority_households': 0,
+            'by_priority_level': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0},
+            'chunks': 0
+        }
+        
+        for households in self.gap_scorer.iter_household_chunks(district=district, chunk_size=chunk_size):
+            priority = self.identify_priority_households_chunk(households, save_to_db=save_to_db)
+            
+            summary['chunks'] += 1
+            summary['households_scored'] += len(households)
+            summary['priority_households'] += len(priority)
+            for level, count in priority['priority_level'].value_counts().items():
+                summary['by_priority_level'][level] = summary['by_priority_level'].get(level, 0) + int(count)
+            
+            elapsed = time.monotonic() - started
+            print(f"   Chunk {summary['chunks']}: {summary['households_scored']} households scored, "
+                  f"{summary['priority_households']} priority ({summary['households_scored'] / max(elapsed, 1e-9):.0f}/s)")
+        
+        summary['elapsed_seconds'] = time.monotonic() - started
+        return summary
+    
+    def identify_priority_households_chunk(
+        self,
+        households: pd.DataFrame,
+        save_to_db: bool = True
+    ) -> pd.DataFrame:
+        """
+        Score a chunk of households and save those meeting the gap threshold
+        
+        Args:
+            households: DataFrame with family_id, district, block_id, gram_panchayat
+            save_to_db: Whether to save to database
+        
+        Returns:
+            Gap analysis rows of the priority households (with priority_id when saved)
+        """
+        gaps = self.gap_scorer.calculate_inclusion_gaps(households)
+        priority = gaps[gaps['inclusion_gap_score'] >= self.gap_threshold].reset_index(drop=True)
+        
+        if priority.empty:
+            return priority
+        
+        heads = self._get_household_heads_bulk(priority['family_id'].tolist())
+        priority['household_head_id'] = priority['family_id'].map(heads)
+        
+        if save_to_db:
+            priority_ids = self._save_priority_households_bulk(priority)
+            priority['priority_id'] = priority['family_id'].map(priority_ids)
+            self._save_gap_analyses_bulk(priority)
+        
+        return priority
+    
     def get_priority_household(self, family_id: str) -> Optional[Dict[str, Any]]:
         """Get existing priority household record"""
         conn = self.db.connection
@@ -340,4 +419,178 @@ class PriorityHouseholdIdentifier:
             print(f"⚠️  Error saving gap analysis: {e}")
             conn.rollback()
             cursor.close()
+    
+    def _get_household_heads_bulk(self, family_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Get household head beneficiary IDs for many families"""
+        conn = self.gap_scorer.external_dbs['golden_records'].connection
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT DISTINCT ON (family_id) family_id::text, beneficiary_id
+                FROM golden_records.beneficiaries
+                WHERE family_id = ANY(%s::uuid[])
+                  AND is_active = TRUE
+                  AND relationship_to_head IN ('SELF', 'HEAD', NULL)
+                ORDER BY family_id, date_of_birth ASC
+            """, (family_ids,))
+            
+            heads = {row[0]: row[1] for row in cursor.fetchall()}
+            cursor.close()
+            return heads
+        
+        except Exception:
+            conn.rollback()
+            cursor.close()
+            return {}
+    
+    def _save_priority_households_bulk(self, priority: pd.DataFrame) -> Dict[str, int]:
+        """
+        Upsert priority households in bulk
+        
+        Existing active records are updated with one UPDATE ... FROM (VALUES ...),
+        new ones inserted with one multi-row INSERT.
+        
+        Returns:
+            family_id -> priority_id
+        """
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            family_ids = priority['family_id'].tolist()
+            cursor.execute("""
+                SELECT DISTINCT ON (family_id) family_id::text, priority_id
+                FROM inclusion.priority_households
+                WHERE family_id = ANY(%s::uuid[]) AND is_active = TRUE
+                ORDER BY family_id, detected_at DESC
+            """, (family_ids,))
+            existing = {row[0]: row[1] for row in cursor.fetchall()}
+            
+            values = [
+                (
+                    row.family_id,
+                    row.household_head_id if isinstance(row.household_head_id, str) else None,
+                    row.block_id,
+                    row.district,
+                    row.gram_panchayat,
+                    float(row.inclusion_gap_score),
+                    float(row.vulnerability_score),
+                    float(row.coverage_gap_score),
+                    float(row.benchmark_score),
+                    row.priority_level,
+                    row.priority_segments,
+                    int(row.predicted_eligible_count),
+                    int(row.actual_enrolled_count),
+                    int(row.eligibility_gap_count)
+                )
+                for row in priority.itertuples(index=False)
+            ]
+            updates = [(existing[v[0]],) + v[1:] for v in values if v[0] in existing]
+            inserts = [v for v in values if v[0] not in existing]
+            
+            priority_ids = dict(existing)
+            
+            if updates:
+                execute_values(cursor, """
+                    UPDATE inclusion.priority_households AS ph
+                    SET 
+                        household_head_id = v.household_head_id,
+                        block_id = v.block_id,
+                        district = v.district,
+                        gram_panchayat = v.gram_panchayat,
+                        inclusion_gap_score = v.inclusion_gap_score,
+                        vulnerability_score = v.vulnerability_score,
+                        coverage_gap_score = v.coverage_gap_score,
+                        benchmark_score = v.benchmark_score,
+                        priority_level = v.priority_level,
+                        priority_segments = v.priority_segments,
+                        predicted_eligible_schemes_count = v.predicted_count,
+                        actual_enrolled_schemes_count = v.enrolled_count,
+                        eligibility_gap_count = v.gap_count,
+                        last_updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(
+                        priority_id, household_head_id, block_id, district, gram_panchayat,
+                        inclusion_gap_score, vulnerability_score, coverage_gap_score,
+                        benchmark_score, priority_level, priority_segments,
+                        predicted_count, enrolled_count, gap_count
+                    )
+                    WHERE ph.priority_id = v.priority_id
+                """, updates, template="""(
+                    %s, %s, %s, %s, %s, %s::numeric, %s::numeric, %s::numeric,
+                    %s::numeric, %s, %s::text[], %s::int, %s::int, %s::int
+                )""", page_size=1000)
+            
+            if inserts:
+                inserted = execute_values(cursor, """
+                    INSERT INTO inclusion.priority_households (
+                        family_id, household_head_id, block_id, district, gram_panchayat,
+                        inclusion_gap_score, vulnerability_score, coverage_gap_score,
+                        benchmark_score, priority_level, priority_segments,
+                        predicted_eligible_schemes_count, actual_enrolled_schemes_count,
+                        eligibility_gap_count
+                    ) VALUES %s
+                    RETURNING family_id::text, priority_id
+                """, inserts, template="(%s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::text[], %s, %s, %s)",
+                    page_size=1000, fetch=True)
+                priority_ids.update({row[0]: row[1] for row in inserted})
+            
+            conn.commit()
+            cursor.close()
+            return priority_ids
+        
+        except Exception as e:
+            print(f"⚠️  Error saving priority households: {e}")
+            conn.rollback()
+            cursor.close()
+            return {}
+    
+    def _save_gap_analyses_bulk(self, priority: pd.DataFrame):
+        """Save detailed gap analyses in one multi-row INSERT"""
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            rows = []
+            for row in priority.itertuples(index=False):
+                priority_id = getattr(row, 'priority_id', None)
+                rows.append((
+                    row.family_id,
+                    row.analysis_date.date() if isinstance(row.analysis_date, datetime) else row.analysis_date,
+                    json.dumps(row.predicted_eligible_schemes),
+                    row.actual_enrolled_schemes,
+                    row.gap_schemes,
+                    row.vulnerability_flags,
+                    json.dumps(row.vulnerability_details),
+                    None if pd.isna(row.local_benchmark_coverage) else float(row.local_benchmark_coverage),
+                    float(row.household_coverage),
+                    float(row.coverage_gap_score),
+                    float(row.inclusion_gap_score),
+                    json.dumps({
+                        'vulnerability': float(row.vulnerability_score),
+                        'coverage_gap': float(row.coverage_gap_score),
+                        'benchmark': float(row.benchmark_score)
+                    }),
+                    None if pd.isna(priority_id) else int(priority_id)
+                ))
+            
+            execute_values(cursor, """
+                INSERT INTO inclusion.inclusion_gap_analysis (
+                    family_id, analysis_date,
+                    predicted_eligible_schemes, actual_enrolled_schemes,
+                    gap_schemes, vulnerability_flags, vulnerability_details,
+                    local_benchmark_coverage, household_coverage, coverage_deviation,
+                    inclusion_gap_score, component_scores, priority_household_id
+                ) VALUES %s
+                ON CONFLICT DO NOTHING
+            """, rows, template="(%s::uuid, %s, %s, %s::text[], %s::text[], %s::text[], %s, %s, %s, %s, %s, %s, %s)",
+                page_size=1000)
+            
+            conn.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error saving gap analyses: {e}")
+            conn.rollback()
+            cursor.close()
 
@@ -236,6 +236,19 @@ CREATE INDEX idx_aggregate_forecasts_level ON aggregate_forecasts(aggregation_le
 CREATE INDEX idx_aggregate_forecasts_date ON aggregate_forecasts(forecast_date DESC);
 CREATE INDEX idx_aggregate_forecasts_scheme ON aggregate_forecasts(scheme_code) WHERE scheme_code IS NOT NULL;
 
+-- Fitted time-series model parameters (reused until a series' data changes)
+CREATE TABLE IF NOT EXISTS aggregate_model_params (
+    series_key VARCHAR(500) NOT NULL,  -- LEVEL|state|district|block|scheme_code
+    model_type VARCHAR(50) NOT NULL,  -- ARIMA, PROPHET
+    
+    data_fingerprint VARCHAR(64) NOT NULL,  -- Hash of the series values the model was fitted on
+    model_params JSONB NOT NULL,  -- ARIMA coefficients or serialized Prophet model
+    
+    fitted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (series_key, model_type)
+);
+
 -- Life stage events tracking (for forecast triggers)
 CREATE TABLE IF NOT EXISTS life_stage_events (
     event_id SERIAL PRIMARY KEY,
@@ -338,6 +351,7 @@ COMMENT ON TABLE forecast_scenarios IS 'Forecast scenario configurations';
 COMMENT ON TABLE policy_changes IS 'Policy changes affecting forecasts (rate changes, new schemes, etc.)';
 COMMENT ON TABLE benefit_schedules IS 'Benefit schedules and patterns for schemes';
 COMMENT ON TABLE aggregate_forecasts IS 'Aggregate forecasts for planning/analytics';
+COMMENT ON TABLE aggregate_model_params IS 'Cached fitted parameters for aggregate time-series models';
 COMMENT ON TABLE life_stage_events IS 'Life stage events that trigger forecast updates';
 COMMENT ON TABLE forecast_assumptions IS 'Assumptions used in forecasts';
 COMMENT ON TABLE forecast_audit_logs IS 'Audit logs for forecast operations';
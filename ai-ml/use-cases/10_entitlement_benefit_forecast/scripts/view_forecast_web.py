@@ -11,33 +11,49 @@ from flask import Flask, render_template_string, jsonify, request
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import pandas as pd
-import yaml
 import json
 import random
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
-from db_connector import DBConnector
+from dashboard_data import get_dashboard_source, all_dashboard_sources, conditional_json
 
 app = Flask(__name__)
 
-# Load database config
-def get_db_connection():
-    """Get database connection"""
+# Pooled database access: stats snapshots refreshed in the background,
+# forecast list served one keyset page at a time
+STATS_TTL_SECONDS = 30
+STATS_MAX_AGE_SECONDS = 10
+
+def get_source():
+    """Get pooled data source (connection pool, keyset pages, cached stats)"""
     db_config_path = Path(__file__).parent.parent / "config" / "db_config.yaml"
-    with open(db_config_path, 'r') as f:
-        db_config = yaml.safe_load(f)['database']
-    
-    db = DBConnector(
-        host=db_config['host'],
-        port=db_config['port'],
-        database=db_config['name'],
-        user=db_config['user'],
-        password=db_config['password']
-    )
-    db.connect()
-    return db
+    return get_dashboard_source(db_config_path, stats_ttl_seconds=STATS_TTL_SECONDS)
+
+def get_db_connection():
+    """Get database connection (pooled, already connected)"""
+    return get_source().checkout()
+
+FORECAST_STATS_QUERY = """
+    SELECT 
+        (SELECT COUNT(*) FROM forecast.forecast_records WHERE status = 'COMPLETED') as total_forecasts,
+        (SELECT COUNT(DISTINCT scheme_code) FROM forecast.forecast_projections) as total_schemes,
+        (SELECT COALESCE(SUM(total_annual_value), 0) FROM forecast.forecast_records WHERE status = 'COMPLETED') as total_annual_value,
+        (SELECT COUNT(*) FROM forecast.aggregate_forecasts) as total_aggregate_forecasts
+"""
+
+# Completed forecasts, newest first (keyset-paginated)
+FORECAST_LIST_QUERY = """
+    SELECT 
+        forecast_id, family_id, horizon_months, forecast_date,
+        forecast_type, scenario_name, status,
+        total_annual_value, total_forecast_value, scheme_count,
+        uncertainty_level, generated_at
+    FROM forecast.forecast_records
+    WHERE status = 'COMPLETED'
+"""
+FORECAST_LIST_ORDER = [('generated_at', 'DESC'), ('forecast_id', 'DESC')]
 
 # Enhanced HTML Template with Advanced Features
 HTML_TEMPLATE = """
@@ -1004,24 +1020,40 @@ def index():
 
 @app.route('/api/forecasts')
 def api_forecasts():
-    """API endpoint for forecasts"""
+    """API endpoint for forecasts (?cursor=<next_cursor>&limit=<rows>)"""
+    try:
+        page = get_source().page(
+            FORECAST_LIST_QUERY,
+            FORECAST_LIST_ORDER,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
     db = get_db_connection()
     try:
         cursor = db.connection.cursor()
         
-        cursor.execute("""
-            SELECT 
-                forecast_id, family_id, horizon_months, forecast_date,
-                forecast_type, scenario_name, status,
-                total_annual_value, total_forecast_value, scheme_count,
-                uncertainty_level, generated_at
-            FROM forecast.forecast_records
-            WHERE status = 'COMPLETED'
-            ORDER BY generated_at DESC
-            LIMIT 20
-        """)
+        forecasts_data = [tuple(row.values()) for row in page['items']]
         
-        forecasts_data = cursor.fetchall()
+        # Projections of all forecasts on the page in one query
+        projections_by_forecast = {}
+        if forecasts_data:
+            cursor.execute("""
+                SELECT 
+                    forecast_id, projection_id, scheme_code, scheme_name, projection_type,
+                    period_start, period_end, period_type,
+                    benefit_amount, benefit_frequency, probability, confidence_level,
+                    assumptions, life_stage_event, event_date
+                FROM forecast.forecast_projections
+                WHERE forecast_id = ANY(%s)
+                ORDER BY forecast_id, period_start, scheme_code
+            """, ([row[0] for row in forecasts_data],))
+            for proj_row in cursor.fetchall():
+                projections_by_forecast.setdefault(proj_row[0], []).append(proj_row[1:])
         forecasts = []
         total_annual_value = 0
         total_schemes = set()
@@ -1030,18 +1062,7 @@ def api_forecasts():
         for row in forecasts_data:
             forecast_id, family_id, horizon_months, forecast_date, forecast_type, scenario_name, status, total_annual, total_forecast, scheme_count, uncertainty, generated_at = row
             
-            cursor.execute("""
-                SELECT 
-                    projection_id, scheme_code, scheme_name, projection_type,
-                    period_start, period_end, period_type,
-                    benefit_amount, benefit_frequency, probability, confidence_level,
-                    assumptions, life_stage_event, event_date
-                FROM forecast.forecast_projections
-                WHERE forecast_id = %s
-                ORDER BY period_start, scheme_code
-            """, (forecast_id,))
-            
-            projections_data = cursor.fetchall()
+            projections_data = projections_by_forecast.get(forecast_id, [])
             projections = []
             
             for proj_row in projections_data:
@@ -1103,7 +1124,8 @@ def api_forecasts():
             'total_forecasts': len(forecasts),
             'total_schemes': len(total_schemes),
             'total_annual_value': total_annual_value,
-            'avg_uncertainty': avg_uncertainty
+            'avg_uncertainty': avg_uncertainty,
+            'next_cursor': page['next_cursor']
         })
     
     except Exception as e:
@@ -1111,6 +1133,15 @@ def api_forecasts():
     finally:
         db.disconnect()
 
+@app.route('/api/stats')
+def api_stats():
+    """API endpoint for forecast statistics (cached snapshot, supports If-None-Match)"""
+    try:
+        snapshot = get_source().get_stats('forecast', FORECAST_STATS_QUERY)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    return conditional_json(snapshot.data, snapshot.etag, snapshot.changed_at, max_age=STATS_MAX_AGE_SECONDS)
+
 @app.route('/api/ml-probability')
 def api_ml_probability():
     """API endpoint for ML probability estimation"""
@@ -1638,5 +1669,9 @@ if __name__ == '__main__':
     print("   - Time-Series Models")
     print("\nPress Ctrl+C to stop the server\n")
     
+    # Keep stats snapshots warm so requests never wait on COUNT(*) queries
+    for source in all_dashboard_sources():
+        source.start_stats_refresher()
+    
     app.run(host='0.0.0.0', port=5001, debug=False)
 
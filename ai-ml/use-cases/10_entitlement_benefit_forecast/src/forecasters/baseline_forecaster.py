@@ -7,10 +7,13 @@ and assumptions about eligibility continuation.
 """
 
 import sys
+import uuid
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
+import numpy as np
+import pandas as pd
 import yaml
 import json
 
@@ -48,6 +51,10 @@ class BaselineForecaster:
         self.default_horizon = forecast_config.get('default_horizon_months', 12)
         self.granularity = forecast_config.get('forecast_granularity', 'MONTHLY')
         
+        # Batch forecasting (cohort refresh)
+        batch_config = baseline_config.get('batch', {})
+        self.batch_chunk_size = batch_config.get('chunk_size', 20000)
+        
         # Database configuration
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
         with open(db_config_path, 'r') as f:
@@ -155,6 +162,298 @@ class BaselineForecaster:
             'uncertainty_level': self._calculate_uncertainty_level(projections)
         }
     
+    def iter_family_chunks(
+        self,
+        district: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """
+        Stream active family IDs in chunks (server-side cursor)
+        
+        Args:
+            district: Optional district filter (None for all families)
+            chunk_size: Families per chunk (default: baseline_forecast.batch.chunk_size)
+        
+        Yields:
+            Lists of family IDs
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        conn = self.external_dbs['golden_records'].connection
+        cursor = conn.cursor(name=f"baseline_families_{uuid.uuid4().hex[:8]}")
+        cursor.itersize = chunk_size
+        
+        query = """
+            SELECT DISTINCT family_id::text
+            FROM golden_records.beneficiaries
+            WHERE is_active = TRUE
+              AND family_id IS NOT NULL
+              {district_filter}
+            ORDER BY 1
+        """
+        try:
+            if district:
+                cursor.execute(query.format(district_filter="AND address_district = %s"), (district,))
+            else:
+                cursor.execute(query.format(district_filter=""))
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [row[0] for row in rows]
+        
+        finally:
+            cursor.close()
+            conn.commit()
+    
+    def generate_baseline_forecasts_batch(
+        self,
+        family_ids: List[str],
+        horizon_months: int = 12,
+        start_date: Optional[datetime] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Generate baseline forecasts for many households at once
+        
+        Enrolled schemes, historical average benefits and benefit schedules are
+        loaded with set-based queries; benefit periods are computed once per
+        scheme and the family x scheme x period projections are built with
+        array broadcasting instead of per-family loops.
+        
+        Args:
+            family_ids: Family IDs (e.g. a chunk from iter_family_chunks)
+            horizon_months: Forecast horizon in months
+            start_date: Start date for forecast (default: now)
+        
+        Returns:
+            Dict with 'forecasts' (one row per family, same summary fields as
+            generate_baseline_forecast) and 'projections' (one row per family,
+            scheme and period, ordered as in generate_baseline_forecast)
+        """
+        if start_date is None:
+            start_date = datetime.now()
+        
+        families = pd.Index(pd.unique(pd.Series(family_ids, dtype=str)))
+        n = len(families)
+        
+        # Enrolled family x scheme pairs with 24-month average benefit
+        pairs = self._load_enrolment_pairs(list(families))
+        pairs['family_idx'] = families.get_indexer(pairs['family_id'])
+        pairs = pairs[pairs['family_idx'] >= 0].sort_values(['family_idx', 'scheme_code'], kind='stable')
+        pairs = pairs.reset_index(drop=True)
+        schedules = self._get_benefit_schedules(pairs['scheme_code'].unique().tolist())
+        
+        # Schedule (or monthly historical average fallback) per pair
+        scheduled = pairs['scheme_code'].isin(list(schedules)).to_numpy()
+        fixed_amount = pairs['scheme_code'].map(
+            {code: schedule['fixed_amount'] for code, schedule in schedules.items()}
+        ).to_numpy(dtype=float, na_value=0.0)
+        avg_benefit = pairs['avg_benefit'].to_numpy(dtype=float, na_value=0.0)
+        amount = np.round(np.where(scheduled, fixed_amount, avg_benefit), 2)
+        template_key = np.where(scheduled, pairs['scheme_code'].to_numpy(dtype=object), None)
+        projected = scheduled | (avg_benefit > 0)
+        
+        # Period templates: one per scheduled scheme plus the monthly fallback
+        templates = {None: self._schedule_periods('MONTHLY', [], start_date, horizon_months)}
+        for code, schedule in schedules.items():
+            templates[code] = self._schedule_periods(
+                schedule['frequency'], schedule['seasonal_months'], start_date, horizon_months
+            )
+        
+        pair_idx_parts, period_idx_parts, template_parts = [], [], []
+        period_count = np.zeros(len(pairs), dtype=np.int64)
+        annual_count = np.zeros(len(pairs), dtype=np.int64)
+        seasonal_count = np.zeros(len(pairs), dtype=np.int64)
+        
+        keys = pd.Series(template_key, dtype=object).fillna('')
+        for key, group in pd.Series(np.arange(len(pairs)))[projected].groupby(keys[projected].to_numpy()):
+            template = templates[key or None]
+            periods = len(template)
+            if periods == 0:
+                continue
+            rows = group.to_numpy()
+            period_count[rows] = periods
+            annual_count[rows] = sum(1 for p in template if p[2] == 'ANNUAL')
+            seasonal_count[rows] = sum(1 for p in template if p[2] == 'SEASONAL')
+            
+            # (pairs x periods) grid flattened row-major
+            pair_idx_parts.append(np.repeat(rows, periods))
+            period_idx_parts.append(np.tile(np.arange(periods), len(rows)))
+            template_parts.append(np.full(len(rows) * periods, key or '', dtype=object))
+        
+        # Family totals from (pair amount x period count)
+        family_idx = pairs['family_idx'].to_numpy()
+        scheme_count = np.bincount(family_idx, minlength=n)
+        projection_count = np.bincount(family_idx, weights=period_count, minlength=n)
+        total_forecast_value = np.bincount(family_idx, weights=amount * period_count, minlength=n)
+        total_annual_value = np.bincount(family_idx, weights=amount * annual_count, minlength=n)
+        has_seasonal = np.bincount(family_idx, weights=seasonal_count, minlength=n) > 0
+        
+        uncertainty_level = np.select(
+            [scheme_count == 0, projection_count == 0, has_seasonal],
+            ['MEDIUM', 'HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+        
+        forecasts = pd.DataFrame({
+            'family_id': families,
+            'forecast_type': 'BASELINE',
+            'horizon_months': horizon_months,
+            'start_date': start_date.isoformat(),
+            'scheme_count': scheme_count,
+            'total_annual_value': np.round(total_annual_value, 2),
+            'total_forecast_value': np.round(total_forecast_value, 2),
+            'uncertainty_level': uncertainty_level
+        })
+        
+        projections = self._projection_frame(
+            pairs, schedules, templates, amount, pair_idx_parts, period_idx_parts, template_parts
+        )
+        
+        return {'forecasts': forecasts, 'projections': projections}
+    
+    @staticmethod
+    def _projection_frame(
+        pairs: pd.DataFrame,
+        schedules: Dict[str, Dict[str, Any]],
+        templates: Dict[Optional[str], List[tuple]],
+        amount: np.ndarray,
+        pair_idx_parts: List[np.ndarray],
+        period_idx_parts: List[np.ndarray],
+        template_parts: List[np.ndarray]
+    ) -> pd.DataFrame:
+        """Long projection table from (pair, period) index arrays"""
+        columns = [
+            'family_id', 'scheme_code', 'scheme_name', 'projection_type', 'period_start',
+            'period_end', 'period_type', 'benefit_amount', 'benefit_frequency',
+            'probability', 'confidence_level', 'assumptions'
+        ]
+        if not pair_idx_parts:
+            return pd.DataFrame(columns=columns)
+        
+        pair_idx = np.concatenate(pair_idx_parts)
+        period_idx = np.concatenate(period_idx_parts)
+        template_key = np.concatenate(template_parts)
+        order = np.lexsort((period_idx, pair_idx))
+        pair_idx, period_idx, template_key = pair_idx[order], period_idx[order], template_key[order]
+        
+        # Period attributes via (template, period) lookup tables
+        lookup = pd.DataFrame(
+            [(key or '', i) + period for key, template in templates.items() for i, period in enumerate(template)],
+            columns=['template', 'period_idx', 'period_start', 'period_end', 'period_type', 'confidence_level']
+        ).set_index(['template', 'period_idx'])
+        periods = lookup.reindex(pd.MultiIndex.from_arrays([template_key, period_idx]))
+        
+        # Scheme attributes per distinct scheme, then indexed per row
+        scheme_idx, codes = pd.factorize(pairs['scheme_code'])
+        row_scheme_idx = scheme_idx[pair_idx]
+        names = np.array([schedules[code].get('scheme_name', code) if code in schedules else code
+                          for code in codes], dtype=object)
+        assumptions = [f"Eligibility continues for {code}" for code in codes]
+        
+        return pd.DataFrame({
+            'family_id': pairs['family_id'].to_numpy(dtype=object)[pair_idx],
+            'scheme_code': codes.to_numpy(dtype=object)[row_scheme_idx],
+            'scheme_name': pd.Series(names[row_scheme_idx], dtype=object),
+            'projection_type': 'CURRENT_ENROLMENT',
+            'period_start': periods['period_start'].to_numpy(),
+            'period_end': periods['period_end'].to_numpy(),
+            'period_type': periods['period_type'].to_numpy(),
+            'benefit_amount': amount[pair_idx],
+            'benefit_frequency': periods['period_type'].to_numpy(),
+            'probability': 1.0,
+            'confidence_level': periods['confidence_level'].to_numpy(),
+            'assumptions': [[assumptions[i]] for i in row_scheme_idx.tolist()]
+        }, columns=columns)
+    
+    def _load_enrolment_pairs(self, family_ids: List[str]) -> pd.DataFrame:
+        """
+        Load enrolled (family_id, scheme_code) pairs with average benefit for many families
+        
+        Enrolment and average benefit follow _get_enrolled_schemes and
+        _get_average_benefit: schemes with an active/paid benefit of an active
+        member in the last 12 months, averaged over positive amounts in 24 months.
+        """
+        rows = []
+        
+        try:
+            conn = self.external_dbs['profile_360'].connection
+            cursor = conn.cursor()
+            
+            for start in range(0, len(family_ids), self.batch_chunk_size):
+                cursor.execute("""
+                    SELECT b.family_id::text, bh.scheme_code,
+                           AVG(bh.benefit_amount) FILTER (WHERE bh.benefit_amount > 0) AS avg_benefit
+                    FROM profile_360.benefit_history bh
+                    INNER JOIN golden_records.beneficiaries b ON b.beneficiary_id = bh.beneficiary_id
+                    WHERE b.family_id = ANY(%s::uuid[])
+                      AND bh.benefit_date >= CURRENT_DATE - INTERVAL '24 months'
+                    GROUP BY b.family_id, bh.scheme_code
+                    HAVING bool_or(
+                        b.is_active = TRUE
+                        AND bh.status IN ('ACTIVE', 'PAID', 'ENROLLED')
+                        AND bh.benefit_date >= CURRENT_DATE - INTERVAL '12 months'
+                    )
+                """, (family_ids[start:start + self.batch_chunk_size],))
+                rows.extend(cursor.fetchall())
+            
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error fetching enrolled schemes: {e}")
+            self.external_dbs['profile_360'].connection.rollback()
+        
+        pairs = pd.DataFrame(rows, columns=['family_id', 'scheme_code', 'avg_benefit'])
+        pairs['avg_benefit'] = pd.to_numeric(pairs['avg_benefit'], errors='coerce').astype(float)
+        return pairs
+    
+    def _get_benefit_schedules(self, scheme_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get current benefit schedules for many schemes in one query"""
+        schedules = {}
+        if not scheme_codes:
+            return schedules
+        
+        try:
+            conn = self.db.connection
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT DISTINCT ON (scheme_code)
+                    scheme_code, scheme_name, schedule_type, frequency,
+                    fixed_amount, formula_expression, slab_config,
+                    conditional_on, seasonal_months, crop_season,
+                    effective_from, effective_to
+                FROM forecast.benefit_schedules
+                WHERE scheme_code = ANY(%s)
+                  AND is_active = TRUE
+                  AND (effective_from IS NULL OR effective_from <= CURRENT_DATE)
+                  AND (effective_to IS NULL OR effective_to >= CURRENT_DATE)
+                ORDER BY scheme_code, effective_from DESC
+            """, (list(scheme_codes),))
+            
+            for row in cursor.fetchall():
+                schedules[row[0]] = {
+                    'scheme_code': row[0],
+                    'scheme_name': row[1],
+                    'schedule_type': row[2],
+                    'frequency': row[3],
+                    'fixed_amount': float(row[4]) if row[4] else 0.0,
+                    'formula_expression': row[5],
+                    'slab_config': json.loads(row[6]) if isinstance(row[6], str) else row[6],
+                    'conditional_on': row[7],
+                    'seasonal_months': row[8] or [],
+                    'crop_season': row[9],
+                    'effective_from': row[10],
+                    'effective_to': row[11]
+                }
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error fetching benefit schedules: {e}")
+            self.db.connection.rollback()
+        
+        return schedules
+    
     def _get_enrolled_schemes(self, family_id: str) -> List[str]:
         """Get currently enrolled schemes from benefit history"""
         schemes = []
@@ -214,32 +513,53 @@ class BaselineForecaster:
         fixed_amount = schedule.get('fixed_amount', 0.0)
         formula = schedule.get('formula_expression')
         
+        amount = fixed_amount
+        if formula:
+            # TODO: Evaluate formula
+            amount = fixed_amount  # Placeholder
+        
+        periods = self._schedule_periods(frequency, schedule.get('seasonal_months', []), start_date, horizon_months)
+        for period_start, period_end, period_type, confidence_level in periods:
+            projections.append({
+                'scheme_code': scheme_code,
+                'scheme_name': schedule.get('scheme_name', scheme_code),
+                'projection_type': 'CURRENT_ENROLMENT',
+                'period_start': period_start.isoformat(),
+                'period_end': period_end.isoformat(),
+                'period_type': period_type,
+                'benefit_amount': round(amount, 2),
+                'benefit_frequency': period_type,
+                'probability': 1.0,
+                'confidence_level': confidence_level,
+                'assumptions': [f"Eligibility continues for {scheme_code}"]
+            })
+        
+        return projections
+    
+    @staticmethod
+    def _schedule_periods(
+        frequency: str,
+        seasonal_months: List[int],
+        start_date: datetime,
+        horizon_months: int
+    ) -> List[tuple]:
+        """
+        Benefit periods of a schedule within the horizon
+        
+        Periods depend only on the schedule and the forecast window, so batch
+        forecasting computes them once per scheme and reuses them for every family.
+        
+        Returns:
+            List of (period_start, period_end, period_type, confidence_level) with dates
+        """
+        periods = []
         current_date = start_date
         end_date = start_date + relativedelta(months=horizon_months)
         
         if frequency == 'MONTHLY':
             while current_date < end_date:
                 period_end = min(current_date + relativedelta(months=1) - timedelta(days=1), end_date)
-                
-                amount = fixed_amount
-                if formula:
-                    # TODO: Evaluate formula
-                    amount = fixed_amount  # Placeholder
-                
-                projections.append({
-                    'scheme_code': scheme_code,
-                    'scheme_name': schedule.get('scheme_name', scheme_code),
-                    'projection_type': 'CURRENT_ENROLMENT',
-                    'period_start': current_date.date().isoformat(),
-                    'period_end': period_end.date().isoformat(),
-                    'period_type': 'MONTHLY',
-                    'benefit_amount': round(amount, 2),
-                    'benefit_frequency': 'MONTHLY',
-                    'probability': 1.0,
-                    'confidence_level': 'HIGH',
-                    'assumptions': [f"Eligibility continues for {scheme_code}"]
-                })
-                
+                periods.append((current_date.date(), period_end.date(), 'MONTHLY', 'HIGH'))
                 current_date += relativedelta(months=1)
         
         elif frequency == 'ANNUAL':
@@ -250,26 +570,11 @@ class BaselineForecaster:
             
             while annual_date < end_date:
                 period_end = annual_date + relativedelta(years=1) - timedelta(days=1)
-                
-                projections.append({
-                    'scheme_code': scheme_code,
-                    'scheme_name': schedule.get('scheme_name', scheme_code),
-                    'projection_type': 'CURRENT_ENROLMENT',
-                    'period_start': annual_date.date().isoformat(),
-                    'period_end': min(period_end.date(), end_date.date()).isoformat(),
-                    'period_type': 'ANNUAL',
-                    'benefit_amount': round(fixed_amount, 2),
-                    'benefit_frequency': 'ANNUAL',
-                    'probability': 1.0,
-                    'confidence_level': 'HIGH',
-                    'assumptions': [f"Eligibility continues for {scheme_code}"]
-                })
-                
+                periods.append((annual_date.date(), min(period_end.date(), end_date.date()), 'ANNUAL', 'HIGH'))
                 annual_date += relativedelta(years=1)
         
         elif frequency == 'SEASONAL':
             # Seasonal benefits (e.g., crop support)
-            seasonal_months = schedule.get('seasonal_months', [])
             year = start_date.year
             
             for _ in range((horizon_months // 12) + 1):
@@ -278,23 +583,12 @@ class BaselineForecaster:
                         period_start = datetime(year, month, 1)
                         if period_start >= start_date and period_start < end_date:
                             period_end = period_start + relativedelta(months=1) - timedelta(days=1)
-                            
-                            projections.append({
-                                'scheme_code': scheme_code,
-                                'scheme_name': schedule.get('scheme_name', scheme_code),
-                                'projection_type': 'CURRENT_ENROLMENT',
-                                'period_start': period_start.date().isoformat(),
-                                'period_end': min(period_end.date(), end_date.date()).isoformat(),
-                                'period_type': 'SEASONAL',
-                                'benefit_amount': round(fixed_amount, 2),
-                                'benefit_frequency': 'SEASONAL',
-                                'probability': 1.0,
-                                'confidence_level': 'MEDIUM',
-                                'assumptions': [f"Eligibility continues for {scheme_code}"]
-                            })
+                            periods.append((
+                                period_start.date(), min(period_end.date(), end_date.date()), 'SEASONAL', 'MEDIUM'
+                            ))
                 year += 1
         
-        return projections
+        return periods
     
     def _get_benefit_schedule(self, scheme_code: str) -> Optional[Dict[str, Any]]:
         """Get benefit schedule for a scheme"""
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
+import pandas as pd
 import yaml
 import json
 
@@ -260,6 +261,7 @@ class ScenarioForecaster:
             # Assume recommendations are acted upon within recommendation_horizon
             enrolment_date = start_date + relativedelta(months=recommendation_horizon)
             
+            scheduled = []
             for scheme_code, eligibility_status, eligibility_score, rec_rank in recommendations:
                 # Get benefit schedule
                 schedule = self.baseline_forecaster._get_benefit_schedule(scheme_code)
@@ -270,17 +272,23 @@ class ScenarioForecaster:
                     else:
                         continue  # Skip if no schedule or history
                 
-                # Use ML-based probability estimation if available
-                ml_probability = self.probability_estimator.estimate_probability(
-                    family_id=family_id,
-                    scheme_code=scheme_code,
-                    eligibility_status=eligibility_status,
-                    recommendation_rank=rec_rank or 5,
-                    days_since_recommendation=days_since
-                )
-                
+                scheduled.append((scheme_code, eligibility_status, rec_rank or 5, schedule))
+            
+            if not scheduled:
+                return projections
+            
+            # Use ML-based probability estimation (one call for all recommendations)
+            ml_probabilities = self.probability_estimator.estimate_probabilities(pd.DataFrame({
+                'family_id': family_id,
+                'scheme_code': [item[0] for item in scheduled],
+                'eligibility_status': [item[1] for item in scheduled],
+                'recommendation_rank': [item[2] for item in scheduled],
+                'days_since_recommendation': days_since
+            }))
+            
+            for (scheme_code, eligibility_status, _, schedule), ml_probability in zip(scheduled, ml_probabilities):
                 # Use ML probability if better, otherwise use configured probability
-                final_probability = max(probability, ml_probability)
+                final_probability = max(probability, float(ml_probability))
                 
                 # Generate projections from enrolment_date forward
                 if enrolment_date < start_date + relativedelta(months=horizon_months):
@@ -7,6 +7,7 @@ user behavior, and recommendation effectiveness.
 """
 
 import sys
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -31,6 +32,17 @@ except ImportError:
     print("⚠️  scikit-learn not available. ML-based probability estimation will use heuristics.")
 
 
+# Model input columns (same order as _features_to_vector and train_model)
+FEATURE_COLUMNS = [
+    'historical_application_rate', 'scheme_popularity', 'eligibility_score',
+    'user_engagement', 'rank_score', 'time_decay', 'scheme_type_match',
+    'normalized_rank', 'normalized_days'
+]
+
+# (application_rate, engagement, scheme_type_match) when a family's features are unavailable
+DEFAULT_FAMILY_FEATURES = (0.5, 0.5, 0.7)
+
+
 class ProbabilityEstimator:
     """
     ML-based Probability Estimator
@@ -87,6 +99,17 @@ class ProbabilityEstimator:
             'user_engagement': 0.1,
             'time_since_recommendation': 0.1
         }
+        
+        # Feature cache: scheme-level features are shared by every family and
+        # refreshed together; family-level features are loaded in bulk
+        cache_config = self.config.get('probability_estimation', {}).get('feature_cache', {})
+        self.scheme_feature_ttl = cache_config.get('scheme_ttl_seconds', 3600)
+        self.family_feature_ttl = cache_config.get('family_ttl_seconds', 900)
+        self.feature_query_chunk_size = cache_config.get('query_chunk_size', 10000)
+        self._scheme_features: Dict[str, float] = {}
+        self._scheme_features_loaded_at: Optional[float] = None
+        # family_id -> ((application_rate, engagement, scheme_type_match), cached_at)
+        self._family_features: Dict[str, Tuple[Tuple[float, float, float], float]] = {}
     
     def connect(self):
         """Connect to databases"""
@@ -121,24 +144,254 @@ class ProbabilityEstimator:
         Returns:
             Probability score (0.0 to 1.0)
         """
-        # Extract features
-        features = self._extract_features(
-            family_id, scheme_code, eligibility_status, 
-            recommendation_rank, days_since_recommendation
-        )
+        probabilities = self.estimate_probabilities(pd.DataFrame([{
+            'family_id': family_id,
+            'scheme_code': scheme_code,
+            'eligibility_status': eligibility_status,
+            'recommendation_rank': recommendation_rank,
+            'days_since_recommendation': days_since_recommendation
+        }]))
+        return float(probabilities[0])
+    
+    def estimate_probabilities(self, recommendations: pd.DataFrame) -> np.ndarray:
+        """
+        Estimate probabilities for many (family, scheme) recommendations at once
+        
+        Features come from the feature cache (scheme features refreshed once
+        per TTL, family features loaded in bulk for missing families) and the
+        model is applied once to the whole feature matrix.
+        
+        Args:
+            recommendations: DataFrame with family_id, scheme_code, eligibility_status,
+                recommendation_rank and optional days_since_recommendation
+        
+        Returns:
+            Probability per row (0.0 to 1.0)
+        """
+        if recommendations.empty:
+            return np.zeros(0)
+        
+        matrix = self.build_feature_matrix(recommendations)
         
         # Use ML model if available and trained
         if self.is_model_trained and self.probability_model:
             try:
-                # Convert features to model input format
-                feature_vector = self._features_to_vector(features)
-                probability = self.probability_model.predict_proba([feature_vector])[0][1]
-                return float(probability)
+                return np.asarray(self.probability_model.predict_proba(matrix)[:, 1], dtype=float)
             except Exception as e:
                 print(f"⚠️  ML model prediction failed, using heuristic: {e}")
         
         # Fallback to heuristic-based estimation
-        return self._heuristic_probability(features)
+        return self._heuristic_probabilities(matrix)
+    
+    def build_feature_matrix(self, recommendations: pd.DataFrame) -> np.ndarray:
+        """Family x scheme feature matrix with FEATURE_COLUMNS as columns"""
+        family_ids = recommendations['family_id'].astype(str).to_numpy()
+        scheme_codes = recommendations['scheme_code'].to_numpy()
+        ranks = recommendations['recommendation_rank'].to_numpy(dtype=float)
+        days = (
+            recommendations['days_since_recommendation'].to_numpy(dtype=float)
+            if 'days_since_recommendation' in recommendations else np.zeros(len(recommendations))
+        )
+        
+        scheme_features = self.get_scheme_features(pd.unique(scheme_codes).tolist())
+        family_features = self.get_family_features(pd.unique(family_ids).tolist())
+        # Families whose features could not be loaded get the heuristic defaults
+        family_values = np.array(
+            [family_features.get(family_id, DEFAULT_FAMILY_FEATURES) for family_id in family_ids], dtype=float
+        )
+        
+        matrix = np.empty((len(recommendations), len(FEATURE_COLUMNS)))
+        matrix[:, 0] = family_values[:, 0]
+        matrix[:, 1] = [scheme_features[scheme_code] for scheme_code in scheme_codes]
+        matrix[:, 2] = np.where(recommendations['eligibility_status'].to_numpy() == 'ELIGIBLE', 1.0, 0.7)
+        matrix[:, 3] = family_values[:, 1]
+        matrix[:, 4] = np.maximum(0.5, 1.0 - (ranks - 1) * 0.1)
+        matrix[:, 5] = np.maximum(0.3, 1.0 - days / 90.0)
+        matrix[:, 6] = family_values[:, 2]
+        matrix[:, 7] = ranks / 10.0
+        matrix[:, 8] = days / 90.0
+        
+        return matrix
+    
+    def get_scheme_features(self, scheme_codes: List[str]) -> Dict[str, float]:
+        """Scheme popularity for the given schemes (cache refreshed once per TTL)"""
+        if (self._scheme_features_loaded_at is None
+                or time.monotonic() - self._scheme_features_loaded_at >= self.scheme_feature_ttl):
+            self.refresh_scheme_features()
+        
+        # Schemes with too little recommendation history get the default popularity
+        return {code: self._scheme_features.get(code, 0.5) for code in scheme_codes}
+    
+    def refresh_scheme_features(self):
+        """Load popularity for all schemes with two grouped queries"""
+        conn = self.external_dbs.get('eligibility_checker')
+        if not conn:
+            self._scheme_features = {}
+            self._scheme_features_loaded_at = time.monotonic()
+            return
+        
+        try:
+            cursor = conn.connection.cursor()
+            
+            cursor.execute("""
+                SELECT scheme_code, COUNT(*)
+                FROM eligibility_checker.scheme_eligibility_results
+                WHERE eligibility_status IN ('ELIGIBLE', 'POSSIBLE_ELIGIBLE')
+                  AND recommendation_rank IS NOT NULL
+                  AND recommendation_rank <= 5
+                GROUP BY scheme_code
+            """)
+            recommendation_counts = dict(cursor.fetchall())
+            
+            cursor.execute("""
+                SELECT scheme_code, COUNT(DISTINCT beneficiary_id)
+                FROM profile_360.benefit_history
+                WHERE status IN ('ACTIVE', 'PAID')
+                GROUP BY scheme_code
+            """)
+            enrolled_counts = dict(cursor.fetchall())
+            
+            cursor.close()
+            
+            # Normalize (assume ~30% of recommendations lead to enrollment)
+            self._scheme_features = {
+                scheme_code: min(1.0, (enrolled_counts.get(scheme_code) or 0) / (total * 0.3))
+                for scheme_code, total in recommendation_counts.items()
+                if (total or 0) > 10
+            }
+            self._scheme_features_loaded_at = time.monotonic()
+        
+        except Exception as e:
+            # Not stamped, so the next call retries; previous features stay in use
+            print(f"⚠️  Error refreshing scheme features: {e}")
+            conn.connection.rollback()
+    
+    def get_family_features(self, family_ids: List[str]) -> Dict[str, Tuple[float, float, float]]:
+        """
+        (application_rate, engagement, scheme_type_match) per family
+        
+        Families missing from the cache or older than the TTL are loaded in
+        bulk, query_chunk_size families per query.
+        """
+        now = time.monotonic()
+        features = {}
+        missing = []
+        for family_id in family_ids:
+            cached = self._family_features.get(family_id)
+            if cached and now - cached[1] < self.family_feature_ttl:
+                features[family_id] = cached[0]
+            else:
+                missing.append(family_id)
+        
+        for start in range(0, len(missing), self.feature_query_chunk_size):
+            chunk = missing[start:start + self.feature_query_chunk_size]
+            loaded_at = time.monotonic()
+            for family_id, values in self._load_family_features(chunk).items():
+                self._family_features[family_id] = (values, loaded_at)
+                features[family_id] = values
+        
+        return features
+    
+    def invalidate_features(self, family_ids: Optional[List[str]] = None):
+        """Drop cached features (all features when family_ids is None)"""
+        if family_ids is None:
+            self._family_features.clear()
+            self._scheme_features = {}
+            self._scheme_features_loaded_at = None
+            return
+        
+        for family_id in family_ids:
+            self._family_features.pop(str(family_id), None)
+    
+    def _load_family_features(self, family_ids: List[str]) -> Dict[str, Tuple[float, float, float]]:
+        """Family-level features for a chunk of families (same rules as the per-family getters)"""
+        recommendations = {}
+        applications = {}
+        checks = {}
+        enrolled = {}
+        
+        eligibility_conn = self.external_dbs.get('eligibility_checker')
+        profile_conn = self.external_dbs.get('profile_360')
+        
+        try:
+            if eligibility_conn:
+                cursor = eligibility_conn.connection.cursor()
+                
+                cursor.execute("""
+                    SELECT ec.family_id::text, COUNT(*)
+                    FROM eligibility_checker.scheme_eligibility_results ser
+                    INNER JOIN eligibility_checker.eligibility_checks ec ON ser.check_id = ec.check_id
+                    WHERE ec.family_id = ANY(%s::uuid[])
+                      AND ser.eligibility_status IN ('ELIGIBLE', 'POSSIBLE_ELIGIBLE')
+                      AND ser.recommendation_rank IS NOT NULL
+                      AND ec.check_timestamp >= CURRENT_TIMESTAMP - INTERVAL '180 days'
+                    GROUP BY ec.family_id
+                """, (family_ids,))
+                recommendations = dict(cursor.fetchall())
+                
+                cursor.execute("""
+                    SELECT grb.family_id::text, COUNT(DISTINCT scheme_code)
+                    FROM profile_360.benefit_history bh
+                    JOIN golden_records.beneficiaries grb ON bh.beneficiary_id = grb.beneficiary_id
+                    WHERE grb.family_id = ANY(%s::uuid[])
+                      AND bh.status IN ('ACTIVE', 'PAID')
+                      AND bh.benefit_date >= CURRENT_DATE - INTERVAL '180 days'
+                    GROUP BY grb.family_id
+                """, (family_ids,))
+                applications = dict(cursor.fetchall())
+                
+                cursor.execute("""
+                    SELECT family_id::text, COUNT(*)
+                    FROM eligibility_checker.eligibility_checks
+                    WHERE family_id = ANY(%s::uuid[])
+                      AND check_timestamp >= CURRENT_TIMESTAMP - INTERVAL '90 days'
+                    GROUP BY family_id
+                """, (family_ids,))
+                checks = dict(cursor.fetchall())
+                
+                cursor.close()
+            
+            if profile_conn:
+                cursor = profile_conn.connection.cursor()
+                
+                cursor.execute("""
+                    SELECT grb.family_id::text, COUNT(DISTINCT scheme_code)
+                    FROM profile_360.benefit_history bh
+                    JOIN golden_records.beneficiaries grb ON bh.beneficiary_id = grb.beneficiary_id
+                    WHERE grb.family_id = ANY(%s::uuid[])
+                      AND bh.status IN ('ACTIVE', 'PAID')
+                    GROUP BY grb.family_id
+                """, (family_ids,))
+                enrolled = dict(cursor.fetchall())
+                
+                cursor.close()
+        
+        except Exception as e:
+            # Not cached, so the next call retries these families
+            print(f"⚠️  Error loading family features: {e}")
+            for db in (eligibility_conn, profile_conn):
+                if db and db.connection:
+                    db.connection.rollback()
+            return {}
+        
+        features = {}
+        for family_id in family_ids:
+            total_recommendations = recommendations.get(family_id) or 0
+            if not eligibility_conn:
+                application_rate, engagement = 0.5, 0.5
+            else:
+                application_rate = (
+                    min(1.0, (applications.get(family_id) or 0) / total_recommendations)
+                    if total_recommendations > 0 else 0.5
+                )
+                # More checks = higher engagement (5+ checks = full engagement)
+                engagement = min(1.0, (checks.get(family_id) or 0) / 5.0)
+            # If they have enrolled schemes, more likely to accept new ones
+            scheme_type_match = min(1.0, 0.5 + (enrolled.get(family_id) or 0) * 0.1) if profile_conn else 0.7
+            
+            features[family_id] = (application_rate, engagement, scheme_type_match)
+        
+        return features
     
     def _extract_features(
         self,
@@ -358,6 +611,22 @@ class ProbabilityEstimator:
         # Ensure probability is in valid range
         return max(0.1, min(1.0, probability))
     
+    def _heuristic_probabilities(self, matrix: np.ndarray) -> np.ndarray:
+        """Vectorized _heuristic_probability over a FEATURE_COLUMNS matrix"""
+        weights = np.array([
+            self.feature_weights['historical_rate'],
+            self.feature_weights['scheme_popularity'],
+            self.feature_weights['eligibility_score'],
+            self.feature_weights['user_engagement'],
+            0.1,  # rank_score
+            0.1,  # time_decay
+            0.1,  # scheme_type_match
+            0.0,
+            0.0
+        ])
+        
+        return np.clip(matrix @ weights, 0.1, 1.0)
+    
     def _features_to_vector(self, features: Dict[str, Any]) -> List[float]:
         """Convert features dict to numerical vector for ML model"""
         # This would be used when ML model is trained
@@ -402,13 +671,7 @@ class ProbabilityEstimator:
         
         try:
             # Prepare features and labels
-            feature_columns = [
-                'historical_application_rate', 'scheme_popularity', 'eligibility_score',
-                'user_engagement', 'rank_score', 'time_decay', 'scheme_type_match',
-                'normalized_rank', 'normalized_days'
-            ]
-            
-            X = training_data[feature_columns].fillna(0.5)
+            X = training_data[FEATURE_COLUMNS].fillna(0.5)
             y = training_data['converted'].fillna(0)  # 1 if recommendation led to application, 0 otherwise
             
             # Split data
@@ -7,13 +7,18 @@ block/district/state level for planning use cases.
 """
 
 import sys
+import json
+import time
+import hashlib
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 import numpy as np
 import yaml
+from psycopg2.extras import execute_values
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
@@ -30,12 +35,169 @@ except ImportError:
 
 try:
     from prophet import Prophet
+    from prophet.serialize import model_to_json, model_from_json
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
     print("⚠️  Prophet not available. Install it for Prophet forecasting: pip install prophet")
 
 
+ARIMA_ORDER = (1, 1, 1)
+
+# Key columns identifying one monthly series in the aggregation hierarchy
+SERIES_KEYS = ['aggregation_level', 'state', 'district', 'block_id', 'scheme_code']
+
+# GROUPING(f.address_district, f.address_block) value for each aggregation level
+LEVEL_GROUPING = {'BLOCK': 0, 'DISTRICT': 1, 'STATE': 3}
+
+MODEL_CONFIDENCE = {'ARIMA': 'MEDIUM', 'PROPHET': 'HIGH', 'SIMPLE_TREND': 'LOW'}
+MODEL_PARAMS = {'ARIMA': '(1,1,1)', 'PROPHET': 'yearly_seasonality=True', 'SIMPLE_TREND': 'linear_trend'}
+
+
+def _build_projections(
+    start_date: datetime,
+    forecast: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    confidence_level: str
+) -> List[Dict[str, Any]]:
+    """Monthly projection records starting at start_date"""
+    projections = []
+    for i in range(len(forecast)):
+        period_start = start_date + relativedelta(months=i)
+        period_end = period_start + relativedelta(months=1) - timedelta(days=1)
+        
+        projections.append({
+            'period_start': period_start.strftime('%Y-%m-%d'),
+            'period_end': period_end.strftime('%Y-%m-%d'),
+            'forecasted_value': float(forecast[i]),
+            'lower_bound': float(lower[i]),
+            'upper_bound': float(upper[i]),
+            'confidence_level': confidence_level
+        })
+    
+    return projections
+
+
+def _fit_arima(
+    ts: pd.Series,
+    horizon_months: int,
+    params: Optional[List[float]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[float]]:
+    """
+    ARIMA(1,1,1) forecast with 95% interval.
+    
+    When params are given (persisted from an earlier fit on the same data)
+    the model is only filtered with them instead of being re-estimated.
+    """
+    model = ARIMA(ts, order=ARIMA_ORDER)
+    if params is not None:
+        fitted_model = model.filter(np.asarray(params, dtype=float))
+    else:
+        fitted_model = model.fit()
+    
+    prediction = fitted_model.get_forecast(steps=horizon_months)
+    forecast_ci = np.asarray(prediction.conf_int(), dtype=float)
+    
+    return (
+        np.asarray(prediction.predicted_mean, dtype=float),
+        forecast_ci[:, 0],
+        forecast_ci[:, 1],
+        [float(p) for p in np.asarray(fitted_model.params, dtype=float)]
+    )
+
+
+def _fit_prophet(
+    ts: pd.Series,
+    horizon_months: int,
+    model_json: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+    """Prophet forecast; a serialized model (model_json) is reused instead of refitting"""
+    if model_json is not None:
+        model = model_from_json(model_json)
+    else:
+        # Prepare data for Prophet (needs 'ds' and 'y' columns)
+        prophet_data = pd.DataFrame({
+            'ds': ts.index,
+            'y': ts.values
+        })
+        
+        model = Prophet(
+            yearly_seasonality=True,
+            weekly_seasonality=False,
+            daily_seasonality=False,
+            seasonality_mode='multiplicative'
+        )
+        model.fit(prophet_data)
+    
+    future = model.make_future_dataframe(periods=horizon_months, freq='MS')
+    future_forecast = model.predict(future).tail(horizon_months)
+    
+    return (
+        future_forecast['yhat'].to_numpy(dtype=float),
+        future_forecast['yhat_lower'].to_numpy(dtype=float),
+        future_forecast['yhat_upper'].to_numpy(dtype=float),
+        model_json if model_json is not None else model_to_json(model)
+    )
+
+
+def _simple_trend(values: np.ndarray, horizon_months: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Last value plus average growth, with ±20% bounds"""
+    if len(values) < 2:
+        avg_value = float(values.mean()) if len(values) > 0 else 0.0
+    else:
+        growth_rate = (values[-1] - values[0]) / len(values)
+        avg_value = max(0.0, float(values[-1]) + growth_rate)
+    
+    forecast = np.full(horizon_months, avg_value)
+    return forecast, forecast * 0.8, forecast * 1.2
+
+
+def _fit_series_task(task: Tuple) -> Dict[str, Any]:
+    """
+    Forecast one monthly series (runs in a worker process).
+    
+    task: (series_key, values, first_month, horizon_months, model_type,
+           min_history_months, cached_params)
+    """
+    series_key, values, first_month, horizon_months, model_type, min_history_months, cached_params = task
+    values = np.asarray(values, dtype=float)
+    ts = pd.Series(values, index=pd.date_range(first_month, periods=len(values), freq='MS'))
+    
+    if len(values) >= min_history_months:
+        try:
+            if model_type == 'ARIMA' and ARIMA_AVAILABLE:
+                forecast, lower, upper, fitted_params = _fit_arima(ts, horizon_months, cached_params)
+            elif model_type == 'PROPHET' and PROPHET_AVAILABLE:
+                forecast, lower, upper, fitted_params = _fit_prophet(ts, horizon_months, cached_params)
+            else:
+                fitted_params = None
+            
+            if fitted_params is not None:
+                return {
+                    'series_key': series_key,
+                    'model_type': model_type,
+                    'forecast': forecast,
+                    'lower_bound': lower,
+                    'upper_bound': upper,
+                    'fitted_params': fitted_params,
+                    'reused_params': cached_params is not None
+                }
+        except Exception as e:
+            print(f"⚠️  {model_type} forecasting failed for {series_key}: {e}")
+    
+    forecast, lower, upper = _simple_trend(values, horizon_months)
+    return {
+        'series_key': series_key,
+        'model_type': 'SIMPLE_TREND',
+        'forecast': forecast,
+        'lower_bound': lower,
+        'upper_bound': upper,
+        'fitted_params': None,
+        'reused_params': False
+    }
+
+
 class TimeSeriesForecaster:
     """
     Time-Series Forecaster for Aggregate Predictions
@@ -82,8 +244,16 @@ class TimeSeriesForecaster:
                 password=ext_config['password']
             )
         
-        # Trained models cache
+        # Trained models cache: (model_type, series_key) -> {'fingerprint', 'params'}
         self.trained_models = {}
+        
+        # Batch / hierarchical forecasting
+        batch_config = ts_config.get('batch', {})
+        self.history_months = batch_config.get('history_months', 24)
+        self.min_history_months = batch_config.get('min_history_months', 12)
+        self.max_workers = batch_config.get('max_workers', 4)
+        self.cache_fitted_params = batch_config.get('cache_fitted_params', True)
+        self.reconciliation = batch_config.get('reconciliation', 'ols')
     
     def connect(self):
         """Connect to databases"""
@@ -156,6 +326,556 @@ class TimeSeriesForecaster:
         
         return forecast_result
     
+    def generate_aggregate_forecasts_batch(
+        self,
+        scheme_codes: Optional[List[str]],
+        aggregation_level: str,
+        block_id: Optional[str] = None,
+        district: Optional[str] = None,
+        state: Optional[str] = None,
+        horizon_months: int = 12,
+        model_type: str = 'ARIMA',
+        max_workers: Optional[int] = None,
+        save_to_db: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate aggregate forecasts for many schemes of one region at once
+        
+        Same per-scheme results as generate_aggregate_forecast, but all series
+        come from one aggregation query, models are fitted in parallel (reusing
+        persisted parameters for unchanged series) and records are saved in bulk.
+        
+        Block and district names are only unique within their district and
+        state, so the parent filters given narrow lower levels too and saved
+        rows carry their full (state, district, block) location. A scheme whose
+        filters still match several regions is not forecast.
+        
+        Returns:
+            Dictionary of forecast results keyed by scheme code
+        """
+        if scheme_codes is not None and len(scheme_codes) == 0:
+            return {}
+        
+        series = self.load_aggregate_series(
+            scheme_codes=scheme_codes,
+            state=state,
+            district=district if aggregation_level in ('BLOCK', 'DISTRICT') else None,
+            block_id=block_id if aggregation_level == 'BLOCK' else None,
+            levels=[aggregation_level]
+        )
+        
+        results = {}
+        if not series.empty:
+            # Match legacy behaviour: short series are not forecast at a single level
+            history = (series.to_numpy() != 0).sum(axis=1)
+            series = series[history >= self.min_history_months]
+        
+        if not series.empty:
+            scheme_index = series.index.get_level_values('scheme_code')
+            ambiguous = scheme_index[scheme_index.duplicated()].unique()
+            for scheme_code in ambiguous:
+                results[scheme_code] = {
+                    'success': False,
+                    'message': f'{aggregation_level.title()} matches several regions; pass district/state to narrow it'
+                }
+            series = series[~scheme_index.isin(ambiguous)]
+        
+        if not series.empty:
+            forecasts = self.forecast_series_batch(series, horizon_months, model_type, max_workers)
+            
+            forecast_ids = (
+                self._save_aggregate_forecasts_bulk(forecasts, horizon_months)
+                if save_to_db else [None] * len(forecasts)
+            )
+            for row, forecast_id in zip(forecasts.itertuples(index=False), forecast_ids):
+                result = self._forecast_result(row)
+                result['forecast_id'] = forecast_id
+                results[row.scheme_code] = result
+        
+        for scheme_code in scheme_codes or []:
+            if scheme_code not in results:
+                results[scheme_code] = {
+                    'success': False,
+                    'message': 'Insufficient historical data for time-series forecasting'
+                }
+        
+        return results
+    
+    def generate_hierarchical_forecasts(
+        self,
+        scheme_codes: Optional[List[str]] = None,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        horizon_months: int = 12,
+        model_type: str = 'ARIMA',
+        max_workers: Optional[int] = None,
+        save_to_db: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Forecast every block, district and state series in one pass
+        
+        Block, district and state forecasts are reconciled so blocks sum to
+        their district and districts to their state. Levels above the requested
+        scope are skipped: with a district, only its blocks and the district
+        itself are forecast (a state total built from one district would be wrong).
+        
+        Args:
+            scheme_codes: Schemes to forecast (None = all schemes with history)
+            state: Restrict to one state
+            district: Restrict to one district (no STATE level)
+            horizon_months: Forecast horizon
+            model_type: ARIMA or PROPHET
+            max_workers: Worker processes for model fitting (0 or 1 runs in-process)
+            save_to_db: Save reconciled forecasts to forecast.aggregate_forecasts
+        
+        Returns:
+            Run summary with the reconciled forecasts DataFrame
+        """
+        started = time.time()
+        
+        levels = ['BLOCK', 'DISTRICT'] if district else ['BLOCK', 'DISTRICT', 'STATE']
+        series = (
+            self.load_aggregate_series(scheme_codes=scheme_codes, state=state, district=district, levels=levels)
+            if scheme_codes is None or len(scheme_codes) > 0 else pd.DataFrame()
+        )
+        if series.empty:
+            return {
+                'success': False,
+                'message': 'No historical benefit data for the requested region'
+            }
+        
+        load_seconds = time.time() - started
+        print(f"📊 Loaded {len(series)} monthly series in {load_seconds:.1f}s")
+        
+        forecasts = self.forecast_series_batch(series, horizon_months, model_type, max_workers)
+        forecasts = self.reconcile_forecasts(forecasts)
+        
+        if save_to_db:
+            forecasts['forecast_id'] = self._save_aggregate_forecasts_bulk(forecasts, horizon_months)
+        
+        elapsed = time.time() - started
+        level_totals = forecasts.groupby('aggregation_level')['total_forecast_value'].sum()
+        summary = {
+            'success': True,
+            'horizon_months': horizon_months,
+            'model_type': model_type,
+            'reconciliation': self.reconciliation,
+            'series_count': len(forecasts),
+            'scheme_count': int(forecasts['scheme_code'].nunique()),
+            'models_used': forecasts['model_type'].value_counts().to_dict(),
+            'reused_params': int(forecasts['reused_params'].sum()),
+            'level_totals': {level: float(total) for level, total in level_totals.items()},
+            'elapsed_seconds': round(elapsed, 2),
+            'forecasts': forecasts
+        }
+        
+        print(f"✅ Forecast {summary['series_count']} series in {elapsed:.1f}s "
+              f"({summary['reused_params']} reused cached parameters)")
+        
+        return summary
+    
+    def load_aggregate_series(
+        self,
+        scheme_codes: Optional[List[str]] = None,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        block_id: Optional[str] = None,
+        levels: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Build monthly benefit series for all requested levels in one query
+        
+        Returns:
+            DataFrame indexed by SERIES_KEYS with one column per month
+            (missing months filled with 0)
+        """
+        conn = self.external_dbs.get('profile_360')
+        if not conn:
+            return pd.DataFrame()
+        
+        levels = levels or ['BLOCK', 'DISTRICT', 'STATE']
+        month_expr = "DATE_TRUNC('month', bh.benefit_date)"
+        grouping_columns = {
+            'BLOCK': "f.address_state, f.address_district, f.address_block",
+            'DISTRICT': "f.address_state, f.address_district",
+            'STATE': "f.address_state"
+        }
+        grouping_sets = ",\n                ".join(
+            f"(bh.scheme_code, {grouping_columns[level]}, {month_expr})" for level in levels
+        )
+        # Columns outside every grouping set cannot be selected or passed to GROUPING()
+        if 'BLOCK' in levels:
+            grouping_expr = "GROUPING(f.address_district, f.address_block)"
+        elif 'DISTRICT' in levels:
+            grouping_expr = "GROUPING(f.address_district) * 2 + 1"
+        else:
+            grouping_expr = "3"
+        district_expr = "f.address_district" if {'BLOCK', 'DISTRICT'} & set(levels) else "NULL"
+        block_expr = "f.address_block" if 'BLOCK' in levels else "NULL"
+        
+        where_clauses = [
+            "bh.status IN ('ACTIVE', 'PAID')",
+            "bh.benefit_date >= CURRENT_DATE - %s * INTERVAL '1 month'"
+        ]
+        params: List[Any] = [self.history_months]
+        if scheme_codes:
+            where_clauses.append("bh.scheme_code = ANY(%s)")
+            params.append(list(scheme_codes))
+        for column, value in (('address_state', state), ('address_district', district), ('address_block', block_id)):
+            if value:
+                where_clauses.append(f"f.{column} = %s")
+                params.append(value)
+        
+        where_sql = "\n              AND ".join(where_clauses)
+        query = f"""
+            SELECT
+                {grouping_expr} as grouping_id,
+                bh.scheme_code,
+                f.address_state as state,
+                {district_expr} as district,
+                {block_expr} as block_id,
+                {month_expr} as month,
+                SUM(bh.benefit_amount) as total_amount
+            FROM profile_360.benefit_history bh
+            JOIN golden_records.beneficiaries b ON bh.beneficiary_id = b.beneficiary_id
+            JOIN golden_records.families f ON b.family_id = f.family_id
+            WHERE {where_sql}
+            GROUP BY GROUPING SETS (
+                {grouping_sets}
+            )
+        """
+        
+        try:
+            cursor = conn.connection.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as e:
+            print(f"⚠️  Error loading aggregate series: {e}")
+            conn.connection.rollback()
+            return pd.DataFrame()
+        
+        if not rows:
+            return pd.DataFrame()
+        
+        data = pd.DataFrame(rows, columns=['grouping_id', 'scheme_code', 'state', 'district', 'block_id', 'month', 'total_amount'])
+        level_names = {grouping: level for level, grouping in LEVEL_GROUPING.items()}
+        data['aggregation_level'] = data['grouping_id'].map(level_names)
+        # Higher levels leave the grouped-away columns NULL; blocks without an address_block
+        # stay as their own ('' block) node so children still add up to the district
+        data[['state', 'district', 'block_id']] = data[['state', 'district', 'block_id']].fillna('')
+        data['month'] = pd.to_datetime(data['month']).dt.tz_localize(None)
+        data['total_amount'] = data['total_amount'].astype(float)
+        
+        series = data.pivot_table(
+            index=SERIES_KEYS, columns='month', values='total_amount', aggfunc='sum', fill_value=0.0
+        )
+        full_range = pd.date_range(start=series.columns.min(), end=series.columns.max(), freq='MS')
+        
+        return series.reindex(columns=full_range, fill_value=0.0)
+    
+    def forecast_series_batch(
+        self,
+        series: pd.DataFrame,
+        horizon_months: int = 12,
+        model_type: str = 'ARIMA',
+        max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Fit and forecast many monthly series in parallel
+        
+        Each series starts at its first month with benefits. Parameters
+        persisted from an earlier fit are reused while the series data is
+        unchanged; refitted parameters are written back to the cache.
+        
+        Args:
+            series: Output of load_aggregate_series
+            horizon_months: Forecast horizon
+            model_type: ARIMA or PROPHET
+            max_workers: Worker processes (0 or 1 runs in-process)
+        
+        Returns:
+            One row per series with forecast / lower_bound / upper_bound arrays
+        """
+        if series.empty:
+            return pd.DataFrame()
+        
+        max_workers = self.max_workers if max_workers is None else max_workers
+        months = series.columns
+        matrix = series.to_numpy(dtype=float)
+        first_months = (matrix != 0).argmax(axis=1)
+        series_keys = ['|'.join(str(part) for part in key) for key in series.index]
+        
+        cached = self._load_cached_params(series_keys, model_type) if self.cache_fitted_params else {}
+        
+        tasks = []
+        fingerprints = []
+        for i, series_key in enumerate(series_keys):
+            values = matrix[i, first_months[i]:]
+            fingerprint = self._series_fingerprint(values, months[-1])
+            entry = cached.get(series_key)
+            params = entry['params'] if entry and entry['fingerprint'] == fingerprint else None
+            
+            fingerprints.append(fingerprint)
+            tasks.append((
+                series_key, values, months[first_months[i]].strftime('%Y-%m-%d'),
+                horizon_months, model_type, self.min_history_months, params
+            ))
+        
+        if max_workers <= 1 or len(tasks) < 2:
+            results = [_fit_series_task(task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_fit_series_task, tasks, chunksize=chunksize))
+        
+        if self.cache_fitted_params:
+            self._save_cached_params([
+                (result['series_key'], model_type, fingerprint, result['fitted_params'])
+                for result, fingerprint in zip(results, fingerprints)
+                if result['fitted_params'] is not None and not result['reused_params']
+            ])
+        
+        forecasts = series.index.to_frame(index=False)
+        forecasts['model_type'] = [result['model_type'] for result in results]
+        forecasts['forecast'] = [result['forecast'] for result in results]
+        forecasts['lower_bound'] = [result['lower_bound'] for result in results]
+        forecasts['upper_bound'] = [result['upper_bound'] for result in results]
+        forecasts['reused_params'] = [result['reused_params'] for result in results]
+        forecasts['history_months'] = len(months) - first_months
+        forecasts['period_start'] = months[-1] + relativedelta(months=1)
+        forecasts['reconciled'] = False
+        forecasts['total_forecast_value'] = [float(result['forecast'].sum()) for result in results]
+        
+        return forecasts
+    
+    def reconcile_forecasts(self, forecasts: pd.DataFrame, method: Optional[str] = None) -> pd.DataFrame:
+        """
+        Make block/district/state forecasts coherent for each scheme
+        
+        Methods:
+            ols: Least-squares projection onto the hierarchy (every level's
+                 forecast contributes; S (S'S)^-1 S' y)
+            bottom_up: Districts and states are the sums of their blocks
+            none: Leave forecasts unchanged
+        
+        Interval bounds are shifted by the same adjustment as the forecast.
+        """
+        method = method or self.reconciliation
+        if method == 'none' or forecasts.empty:
+            return forecasts
+        
+        forecasts = forecasts.copy()
+        forecast = np.vstack(forecasts['forecast'].to_numpy())
+        adjusted = forecast.copy()
+        reconciled = np.zeros(len(forecasts), dtype=bool)
+        levels = forecasts['aggregation_level'].to_numpy()
+        states = forecasts['state'].to_numpy()
+        districts = forecasts['district'].to_numpy()
+        
+        for scheme_code, positions in forecasts.groupby('scheme_code', sort=False).indices.items():
+            bottom = positions[levels[positions] == 'BLOCK']
+            if len(bottom) == 0:
+                continue
+            
+            # Summing matrix: row per node, column per block
+            summing = np.zeros((len(positions), len(bottom)))
+            for row, position in enumerate(positions):
+                if levels[position] == 'BLOCK':
+                    summing[row] = bottom == position
+                elif levels[position] == 'DISTRICT':
+                    summing[row] = (states[bottom] == states[position]) & (districts[bottom] == districts[position])
+                else:
+                    summing[row] = states[bottom] == states[position]
+            
+            if not summing.any(axis=1).all():
+                print(f"⚠️  Incomplete hierarchy for {scheme_code}; skipping reconciliation")
+                continue
+            
+            if method == 'bottom_up':
+                adjusted[positions] = summing @ forecast[bottom]
+            else:
+                projection = np.linalg.solve(summing.T @ summing, summing.T @ forecast[positions])
+                adjusted[positions] = summing @ projection
+            reconciled[positions] = True
+        
+        adjustment = adjusted - forecast
+        forecasts['forecast'] = list(adjusted)
+        forecasts['lower_bound'] = list(np.vstack(forecasts['lower_bound'].to_numpy()) + adjustment)
+        forecasts['upper_bound'] = list(np.vstack(forecasts['upper_bound'].to_numpy()) + adjustment)
+        forecasts['total_forecast_value'] = adjusted.sum(axis=1)
+        forecasts['reconciled'] = reconciled
+        
+        return forecasts
+    
+    @staticmethod
+    def _series_fingerprint(values: np.ndarray, last_month: pd.Timestamp) -> str:
+        """Identifies a series' data; cached model parameters are reused only while it matches"""
+        digest = hashlib.sha1(np.round(values, 2).tobytes())
+        digest.update(last_month.strftime('%Y-%m').encode())
+        return digest.hexdigest()[:20]
+    
+    def _load_cached_params(self, series_keys: List[str], model_type: str) -> Dict[str, Dict[str, Any]]:
+        """Persisted fitted parameters for the given series (in-memory cache first)"""
+        cached = {}
+        missing = []
+        for series_key in series_keys:
+            entry = self.trained_models.get((model_type, series_key))
+            if entry is not None:
+                cached[series_key] = entry
+            else:
+                missing.append(series_key)
+        
+        if not missing or self.db.connection is None:
+            return cached
+        
+        try:
+            cursor = self.db.connection.cursor()
+            cursor.execute("""
+                SELECT series_key, data_fingerprint, model_params
+                FROM forecast.aggregate_model_params
+                WHERE model_type = %s
+                  AND series_key = ANY(%s)
+            """, (model_type, missing))
+            
+            for series_key, fingerprint, params in cursor.fetchall():
+                entry = {'fingerprint': fingerprint, 'params': params}
+                self.trained_models[(model_type, series_key)] = entry
+                cached[series_key] = entry
+            
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error loading cached model parameters: {e}")
+            self.db.connection.rollback()
+        
+        return cached
+    
+    def _save_cached_params(self, entries: List[Tuple[str, str, str, Any]]):
+        """Upsert refitted parameters as (series_key, model_type, fingerprint, params)"""
+        for series_key, model_type, fingerprint, params in entries:
+            self.trained_models[(model_type, series_key)] = {'fingerprint': fingerprint, 'params': params}
+        
+        if not entries or self.db.connection is None:
+            return
+        
+        try:
+            conn = self.db.connection
+            cursor = conn.cursor()
+            fitted_at = datetime.now()
+            
+            execute_values(cursor, """
+                INSERT INTO forecast.aggregate_model_params (
+                    series_key, model_type, data_fingerprint, model_params, fitted_at
+                ) VALUES %s
+                ON CONFLICT (series_key, model_type) DO UPDATE SET
+                    data_fingerprint = EXCLUDED.data_fingerprint,
+                    model_params = EXCLUDED.model_params,
+                    fitted_at = EXCLUDED.fitted_at
+            """, [
+                (series_key, model_type, fingerprint, json.dumps(params), fitted_at)
+                for series_key, model_type, fingerprint, params in entries
+            ], template="(%s, %s, %s, %s::jsonb, %s)", page_size=1000)
+            
+            conn.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error saving cached model parameters: {e}")
+            if 'conn' in locals():
+                conn.rollback()
+    
+    def _forecast_result(self, row) -> Dict[str, Any]:
+        """Per-series forecast in the generate_aggregate_forecast result format"""
+        return {
+            'model_type': row.model_type,
+            'model_params': MODEL_PARAMS[row.model_type],
+            'projections': _build_projections(
+                row.period_start, row.forecast, row.lower_bound, row.upper_bound,
+                MODEL_CONFIDENCE[row.model_type]
+            ),
+            'total_forecast_value': float(row.total_forecast_value),
+            'mean_absolute_error': None,
+            'forecast_date': datetime.now().isoformat(),
+            'success': True
+        }
+    
+    def _save_aggregate_forecasts_bulk(self, forecasts: pd.DataFrame, horizon_months: int) -> List[int]:
+        """
+        Save many aggregate forecasts in one statement
+        
+        Monthly projections and model details go into the metadata column.
+        
+        Returns:
+            aggregate_id per forecasts row (0 when saving failed)
+        """
+        if forecasts.empty:
+            return []
+        
+        try:
+            conn = self.db.connection
+            cursor = conn.cursor()
+            generated_at = datetime.now()
+            
+            records = []
+            for row in forecasts.itertuples(index=False):
+                period_start = row.period_start
+                period_end = period_start + relativedelta(months=horizon_months) - timedelta(days=1)
+                metadata = {
+                    'model_type': row.model_type,
+                    'model_params': MODEL_PARAMS[row.model_type],
+                    'reconciled': bool(row.reconciled),
+                    'reused_params': bool(row.reused_params),
+                    'history_months': int(row.history_months),
+                    'projections': [
+                        {'forecasted_value': round(float(value), 2),
+                         'lower_bound': round(float(lower), 2),
+                         'upper_bound': round(float(upper), 2)}
+                        for value, lower, upper in zip(row.forecast, row.lower_bound, row.upper_bound)
+                    ]
+                }
+                records.append((
+                    row.aggregation_level,
+                    row.block_id or None,
+                    row.district or None,
+                    row.state or None,
+                    generated_at.date(),
+                    horizon_months,
+                    row.scheme_code,
+                    row.scheme_code,  # scheme_name (would fetch from master)
+                    row.total_forecast_value / (horizon_months / 12),  # annual
+                    row.total_forecast_value,
+                    period_start.date(),
+                    period_end.date(),
+                    'MONTHLY',
+                    generated_at,
+                    json.dumps(metadata)
+                ))
+            
+            inserted = execute_values(cursor, """
+                INSERT INTO forecast.aggregate_forecasts (
+                    aggregation_level, block_id, district, state,
+                    forecast_date, horizon_months,
+                    scheme_code, scheme_name,
+                    total_annual_value, total_forecast_value,
+                    period_start, period_end, period_type,
+                    generated_at, generated_by, metadata
+                ) VALUES %s
+                RETURNING aggregate_id
+            """, records, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'SYSTEM', %s::jsonb)",
+                page_size=1000, fetch=True)
+            
+            conn.commit()
+            cursor.close()
+            
+            return [row[0] for row in inserted]
+        
+        except Exception as e:
+            print(f"⚠️  Error saving aggregate forecasts: {e}")
+            if 'conn' in locals():
+                conn.rollback()
+            return [0] * len(forecasts)
+    
     def _load_aggregate_historical_data(
         self,
         scheme_code: str,
@@ -260,38 +980,15 @@ class TimeSeriesForecaster:
         try:
             # Auto ARIMA would be better, but for now use simple ARIMA(1,1,1)
             # In production, would use auto_arima to find best parameters
+            forecast, lower, upper, _ = _fit_arima(ts, horizon_months)
             
-            model = ARIMA(ts, order=(1, 1, 1))
-            fitted_model = model.fit()
-            
-            # Generate forecast
-            forecast = fitted_model.forecast(steps=horizon_months)
-            forecast_ci = fitted_model.get_forecast(steps=horizon_months).conf_int()
-            
-            # Prepare projections
-            projections = []
             start_date = ts.index[-1] + relativedelta(months=1)
             
-            for i in range(horizon_months):
-                period_start = start_date + relativedelta(months=i)
-                period_end = period_start + relativedelta(months=1) - timedelta(days=1)
-                
-                projections.append({
-                    'period_start': period_start.strftime('%Y-%m-%d'),
-                    'period_end': period_end.strftime('%Y-%m-%d'),
-                    'forecasted_value': float(forecast.iloc[i]),
-                    'lower_bound': float(forecast_ci.iloc[i, 0]),
-                    'upper_bound': float(forecast_ci.iloc[i, 1]),
-                    'confidence_level': 'MEDIUM'
-                })
-            
-            total_forecast = float(forecast.sum())
-            
             return {
                 'model_type': 'ARIMA',
-                'model_params': '(1,1,1)',
-                'projections': projections,
-                'total_forecast_value': total_forecast,
+                'model_params': MODEL_PARAMS['ARIMA'],
+                'projections': _build_projections(start_date, forecast, lower, upper, MODEL_CONFIDENCE['ARIMA']),
+                'total_forecast_value': float(forecast.sum()),
                 'mean_absolute_error': None,  # Would calculate from validation
                 'forecast_date': datetime.now().isoformat()
             }
@@ -303,50 +1000,15 @@ class TimeSeriesForecaster:
     def _forecast_prophet(self, ts: pd.Series, horizon_months: int) -> Dict[str, Any]:
         """Forecast using Prophet model"""
         try:
-            # Prepare data for Prophet (needs 'ds' and 'y' columns)
-            prophet_data = pd.DataFrame({
-                'ds': ts.index,
-                'y': ts.values
-            })
-            
-            # Initialize and fit Prophet model
-            model = Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=False,
-                daily_seasonality=False,
-                seasonality_mode='multiplicative'
-            )
-            
-            model.fit(prophet_data)
-            
-            # Create future dataframe
-            future = model.make_future_dataframe(periods=horizon_months, freq='MS')
-            
-            # Generate forecast
-            forecast_df = model.predict(future)
-            
-            # Extract future predictions only
-            future_forecast = forecast_df.tail(horizon_months)
+            forecast, lower, upper, _ = _fit_prophet(ts, horizon_months)
             
-            # Prepare projections
-            projections = []
-            for _, row in future_forecast.iterrows():
-                projections.append({
-                    'period_start': row['ds'].strftime('%Y-%m-%d'),
-                    'period_end': (row['ds'] + relativedelta(months=1) - timedelta(days=1)).strftime('%Y-%m-%d'),
-                    'forecasted_value': float(row['yhat']),
-                    'lower_bound': float(row['yhat_lower']),
-                    'upper_bound': float(row['yhat_upper']),
-                    'confidence_level': 'HIGH'  # Prophet provides confidence intervals
-                })
-            
-            total_forecast = float(future_forecast['yhat'].sum())
+            start_date = ts.index[-1] + relativedelta(months=1)
             
             return {
                 'model_type': 'PROPHET',
-                'model_params': 'yearly_seasonality=True',
-                'projections': projections,
-                'total_forecast_value': total_forecast,
+                'model_params': MODEL_PARAMS['PROPHET'],
+                'projections': _build_projections(start_date, forecast, lower, upper, MODEL_CONFIDENCE['PROPHET']),
+                'total_forecast_value': float(forecast.sum()),
                 'mean_absolute_error': None,
                 'forecast_date': datetime.now().isoformat()
             }
@@ -357,40 +1019,15 @@ class TimeSeriesForecaster:
     
     def _forecast_simple_trend(self, ts: pd.Series, horizon_months: int) -> Dict[str, Any]:
         """Simple trend-based forecast (fallback)"""
-        # Calculate average growth rate
-        if len(ts) < 2:
-            avg_value = float(ts.mean()) if len(ts) > 0 else 0.0
-        else:
-            # Simple linear trend
-            values = ts.values
-            growth_rate = (values[-1] - values[0]) / len(values) if len(values) > 1 else 0
-            
-            # Use last value as base
-            last_value = float(values[-1]) if len(values) > 0 else 0.0
-            avg_value = max(0, last_value + growth_rate)
+        forecast, lower, upper = _simple_trend(ts.to_numpy(dtype=float), horizon_months)
         
-        # Generate projections
-        projections = []
         start_date = ts.index[-1] + relativedelta(months=1) if len(ts) > 0 else datetime.now()
         
-        for i in range(horizon_months):
-            period_start = start_date + relativedelta(months=i)
-            period_end = period_start + relativedelta(months=1) - timedelta(days=1)
-            
-            projections.append({
-                'period_start': period_start.strftime('%Y-%m-%d'),
-                'period_end': period_end.strftime('%Y-%m-%d'),
-                'forecasted_value': avg_value,
-                'lower_bound': avg_value * 0.8,
-                'upper_bound': avg_value * 1.2,
-                'confidence_level': 'LOW'
-            })
-        
         return {
             'model_type': 'SIMPLE_TREND',
-            'model_params': 'linear_trend',
-            'projections': projections,
-            'total_forecast_value': avg_value * horizon_months,
+            'model_params': MODEL_PARAMS['SIMPLE_TREND'],
+            'projections': _build_projections(start_date, forecast, lower, upper, MODEL_CONFIDENCE['SIMPLE_TREND']),
+            'total_forecast_value': float(forecast.sum()),
             'mean_absolute_error': None,
             'forecast_date': datetime.now().isoformat()
         }
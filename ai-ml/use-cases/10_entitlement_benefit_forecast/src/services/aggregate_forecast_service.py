@@ -89,31 +89,29 @@ class AggregateForecastService:
         if scheme_codes is None:
             scheme_codes = self._get_active_scheme_codes()
         
-        forecasts = {}
-        total_value = 0.0
+        # One aggregation query and parallel model fitting for all schemes
+        try:
+            results = self.ts_forecaster.generate_aggregate_forecasts_batch(
+                scheme_codes=scheme_codes,
+                aggregation_level=aggregation_level,
+                block_id=block_id,
+                district=district,
+                state=state,
+                horizon_months=horizon_months,
+                model_type=model_type
+            )
+            forecasts = {code: result for code, result in results.items() if result.get('success')}
         
-        for scheme_code in scheme_codes:
-            try:
-                forecast_result = self.ts_forecaster.generate_aggregate_forecast(
-                    scheme_code=scheme_code,
-                    aggregation_level=aggregation_level,
-                    block_id=block_id,
-                    district=district,
-                    state=state,
-                    horizon_months=horizon_months,
-                    model_type=model_type
-                )
-                
-                if forecast_result.get('success'):
-                    forecasts[scheme_code] = forecast_result
-                    total_value += forecast_result.get('total_forecast_value', 0)
-            
-            except Exception as e:
-                print(f"⚠️  Error forecasting {scheme_code}: {e}")
-                forecasts[scheme_code] = {
-                    'success': False,
-                    'error': str(e)
-                }
+        except Exception as e:
+            print(f"⚠️  Error forecasting schemes: {e}")
+            forecasts = {
+                scheme_code: {'success': False, 'error': str(e)}
+                for scheme_code in scheme_codes
+            }
+        
+        total_value = sum(
+            f.get('total_forecast_value', 0) for f in forecasts.values() if f.get('success')
+        )
         
         return {
             'success': True,
@@ -128,6 +126,44 @@ class AggregateForecastService:
             'scheme_count': len([f for f in forecasts.values() if f.get('success')])
         }
     
+    def generate_hierarchical_forecasts(
+        self,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        scheme_codes: Optional[List[str]] = None,
+        horizon_months: int = 12,
+        model_type: str = 'ARIMA',
+        max_workers: Optional[int] = None,
+        save_to_db: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Forecast all blocks, districts and the state in one reconciled pass
+        
+        Args:
+            state: Restrict to one state
+            district: Restrict to one district (its blocks and itself; no STATE level)
+            scheme_codes: List of scheme codes to forecast (None = all active schemes)
+            horizon_months: Forecast horizon
+            model_type: ARIMA or PROPHET
+            max_workers: Worker processes for model fitting
+            save_to_db: Save forecasts to forecast.aggregate_forecasts
+        
+        Returns:
+            Run summary with per-level totals and the forecasts DataFrame
+        """
+        if scheme_codes is None:
+            scheme_codes = self._get_active_scheme_codes()
+        
+        return self.ts_forecaster.generate_hierarchical_forecasts(
+            scheme_codes=scheme_codes,
+            state=state,
+            district=district,
+            horizon_months=horizon_months,
+            model_type=model_type,
+            max_workers=max_workers,
+            save_to_db=save_to_db
+        )
+    
     def _get_active_scheme_codes(self) -> List[str]:
         """Get list of active scheme codes"""
         try:
@@ -7,17 +7,22 @@ Handles automatic forecast refresh when relevant events occur
 """
 
 import sys
+import time
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from collections import defaultdict
 import yaml
 import json
+from psycopg2.extras import execute_values
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
 
 from .forecast_orchestrator import ForecastOrchestrator
+from .forecast_refresh_queue import ForecastRefreshQueue
 
 
 class EventDrivenForecastRefresh:
@@ -44,6 +49,18 @@ class EventDrivenForecastRefresh:
         self.refresh_triggers = event_config.get('refresh_triggers', [])
         self.auto_refresh_threshold = event_config.get('auto_refresh_threshold', 0.1)
         
+        # Coalescing queue: bursts of events per family become one batched refresh
+        coalescing_config = event_config.get('coalescing', {})
+        self.coalesce_events = coalescing_config.get('enabled', False)
+        self.refresh_batch_size = coalescing_config.get('batch_size', 5000)
+        self.poll_interval_seconds = coalescing_config.get('poll_interval_seconds', 5.0)
+        self.refresh_queue = ForecastRefreshQueue(
+            debounce_seconds=coalescing_config.get('debounce_seconds', 30.0),
+            max_delay_seconds=coalescing_config.get('max_delay_seconds', 300.0),
+            retry_delay_seconds=coalescing_config.get('retry_delay_seconds', 30.0),
+            max_attempts=coalescing_config.get('max_attempts', 5)
+        )
+        
         # Initialize orchestrator
         self.orchestrator = ForecastOrchestrator(config_path)
         
@@ -104,6 +121,16 @@ class EventDrivenForecastRefresh:
                 'message': 'family_id required for forecast refresh'
             }
         
+        # Family already queued: fold this event into the pending refresh
+        if self.coalesce_events and self.refresh_queue.is_pending(family_id):
+            self.refresh_queue.enqueue(family_id, event_type, event_data)
+            return {
+                'success': True,
+                'refreshed': False,
+                'queued': True,
+                'message': f'{event_type} coalesced into pending forecast refresh'
+            }
+        
         # Check if refresh is needed
         if not self._should_refresh(family_id, event_type, event_data):
             return {
@@ -112,6 +139,15 @@ class EventDrivenForecastRefresh:
                 'message': 'No refresh needed (change below threshold)'
             }
         
+        if self.coalesce_events:
+            self.refresh_queue.enqueue(family_id, event_type, event_data)
+            return {
+                'success': True,
+                'refreshed': False,
+                'queued': True,
+                'message': f'Forecast refresh queued due to {event_type}'
+            }
+        
         # Get existing forecast
         existing_forecast = self.orchestrator.get_forecast(family_id=family_id, forecast_id=None)
         
@@ -230,6 +266,244 @@ class EventDrivenForecastRefresh:
         except Exception as e:
             print(f"⚠️  Error logging refresh event: {e}")
     
+    def process_refresh_queue(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Refresh all families whose debounce window has passed
+        
+        Ready families are drained in batches of batch_size and refreshed
+        with refresh_families_batch. Failed families are requeued with
+        backoff and dropped after max_attempts.
+        
+        Args:
+            force: Refresh every pending family now (e.g. on shutdown)
+        
+        Returns:
+            Summary with batch, family, event, failure and drop counts
+        """
+        summary = {'batches': 0, 'families': 0, 'events': 0, 'refreshed': 0, 'failed': 0, 'dropped': 0}
+        
+        while True:
+            entries = self.refresh_queue.drain_ready(max_families=self.refresh_batch_size, force=force)
+            if not entries:
+                break
+            
+            result = self.refresh_families_batch(list(entries), events=entries)
+            
+            summary['batches'] += 1
+            summary['families'] += len(entries)
+            summary['events'] += sum(entry['event_count'] for entry in entries.values())
+            summary['refreshed'] += result['refreshed']
+            summary['failed'] += len(result['failed_family_ids'])
+            
+            if result['failed_family_ids']:
+                # Retry after a backoff rather than spinning on the same families
+                dropped = self.refresh_queue.requeue({
+                    family_id: entries[family_id] for family_id in result['failed_family_ids']
+                })
+                if dropped:
+                    summary['dropped'] += len(dropped)
+                    print(f"⚠️  Dropped {len(dropped)} families after "
+                          f"{self.refresh_queue.max_attempts} failed refresh attempts")
+                break
+        
+        return summary
+    
+    def run_refresh_worker(self, stop_event: Optional[threading.Event] = None):
+        """
+        Process the refresh queue every poll_interval_seconds until stop_event is set
+        
+        Pending families are flushed before returning.
+        """
+        stop_event = stop_event or threading.Event()
+        print(f"🔁 Forecast refresh worker started (debounce {self.refresh_queue.debounce_seconds}s, "
+              f"batches of {self.refresh_batch_size})")
+        
+        while not stop_event.wait(self.poll_interval_seconds):
+            summary = self.process_refresh_queue()
+            if summary['families']:
+                print(f"   Refreshed {summary['refreshed']} families from {summary['events']} events "
+                      f"({summary['failed']} failed)")
+        
+        self.process_refresh_queue(force=True)
+    
+    def refresh_families_batch(
+        self,
+        family_ids: List[str],
+        events: Optional[Dict[str, Dict[str, Any]]] = None,
+        horizon_months: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate forecasts for many families at once
+        
+        Each family keeps the horizon and scenario of its latest forecast.
+        Baseline forecasts are computed with the vectorized batch forecaster
+        and replaced in bulk (one UPDATE, DELETE and COPY per batch); scenario
+        forecasts are regenerated per family.
+        
+        Args:
+            family_ids: Families to refresh
+            events: Coalesced events per family (from the refresh queue) for audit logging
+            horizon_months: Override the horizon of every family
+        
+        Returns:
+            Counts and the family IDs that failed
+        """
+        started = time.monotonic()
+        family_ids = [str(family_id) for family_id in family_ids]
+        latest = self._load_latest_forecasts(family_ids)
+        
+        groups: Dict[Tuple[int, Optional[str]], List[str]] = defaultdict(list)
+        for family_id in family_ids:
+            existing = latest.get(family_id, {})
+            groups[(horizon_months or existing.get('horizon_months') or 12, existing.get('scenario_name'))].append(family_id)
+        
+        refreshed: Dict[str, Dict[str, Any]] = {}
+        failed: List[str] = []
+        
+        for (horizon, scenario_name), members in groups.items():
+            if scenario_name is None:
+                try:
+                    result = self.orchestrator.baseline_forecaster.generate_baseline_forecasts_batch(members, horizon)
+                    forecast_ids = self.orchestrator.replace_forecasts_bulk(
+                        result['forecasts'], result['projections'], 'BASELINE',
+                        assumptions=self.orchestrator.baseline_forecaster.assumptions
+                    )
+                except Exception as e:
+                    print(f"⚠️  Error refreshing baseline batch: {e}")
+                    forecast_ids = {}
+                
+                if not forecast_ids:
+                    failed.extend(members)
+                    continue
+                
+                annual_values = dict(zip(
+                    result['forecasts']['family_id'].astype(str),
+                    result['forecasts']['total_annual_value'].astype(float)
+                ))
+                for family_id, forecast_id in forecast_ids.items():
+                    refreshed[family_id] = {
+                        'forecast_id': forecast_id,
+                        'total_annual_value': annual_values.get(family_id, 0.0)
+                    }
+            else:
+                # No batch scenario forecaster yet
+                for family_id in members:
+                    try:
+                        new_forecast = self.orchestrator.generate_forecast(
+                            family_id=family_id,
+                            horizon_months=horizon,
+                            scenario_name=scenario_name,
+                            save_to_db=True
+                        )
+                        refreshed[family_id] = {
+                            'forecast_id': new_forecast.get('forecast_id'),
+                            'total_annual_value': new_forecast.get('total_annual_value', 0)
+                        }
+                    except Exception as e:
+                        print(f"⚠️  Error refreshing forecast for {family_id}: {e}")
+                        failed.append(family_id)
+        
+        self._log_refresh_events_bulk(refreshed, latest, events or {})
+        
+        return {
+            'success': True,
+            'refreshed': len(refreshed),
+            'failed_family_ids': failed,
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
+    
+    def _load_latest_forecasts(self, family_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest forecast (id, horizon, scenario, annual value) per family in one query"""
+        try:
+            conn = self.db.connection
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT DISTINCT ON (family_id)
+                    family_id::text, forecast_id, horizon_months, scenario_name, total_annual_value
+                FROM forecast.forecast_records
+                WHERE family_id = ANY(%s::uuid[])
+                ORDER BY family_id, generated_at DESC
+            """, (family_ids,))
+            
+            latest = {
+                row[0]: {
+                    'forecast_id': row[1],
+                    'horizon_months': row[2],
+                    'scenario_name': row[3],
+                    'total_annual_value': float(row[4]) if row[4] is not None else 0.0
+                }
+                for row in cursor.fetchall()
+            }
+            cursor.close()
+            return latest
+        
+        except Exception as e:
+            print(f"⚠️  Error loading latest forecasts: {e}")
+            self.db.connection.rollback()
+            return {}
+    
+    def _log_refresh_events_bulk(
+        self,
+        refreshed: Dict[str, Dict[str, Any]],
+        latest: Dict[str, Dict[str, Any]],
+        events: Dict[str, Dict[str, Any]]
+    ):
+        """Log refreshes of families that had a previous forecast with one INSERT"""
+        records = []
+        now = datetime.now()
+        
+        for family_id, new_forecast in refreshed.items():
+            existing_forecast = latest.get(family_id)
+            if not existing_forecast:
+                continue
+            
+            change = self._calculate_change(existing_forecast, new_forecast)
+            entry = events.get(family_id, {})
+            event_types = entry.get('event_types') or ['STALE_FORECAST']
+            event_count = entry.get('event_count', 0)
+            
+            records.append((
+                'FORECAST_REFRESH',
+                now,
+                'SYSTEM',
+                None,
+                family_id,
+                new_forecast.get('forecast_id'),
+                f"Auto-refreshed due to {', '.join(event_types)}"
+                f"{f' ({event_count} events coalesced)' if event_count > 1 else ''}. Change: {change:.2%}",
+                json.dumps({
+                    'event_types': event_types,
+                    'event_count': event_count,
+                    'existing_forecast_id': existing_forecast.get('forecast_id'),
+                    'new_forecast_id': new_forecast.get('forecast_id'),
+                    'change_percentage': change,
+                    'events': entry.get('events', [])
+                }, default=str)
+            ))
+        
+        if not records:
+            return
+        
+        try:
+            conn = self.db.connection
+            cursor = conn.cursor()
+            
+            execute_values(cursor, """
+                INSERT INTO forecast.forecast_audit_logs (
+                    event_type, event_timestamp, actor_type, actor_id,
+                    family_id, forecast_id, event_description, event_data
+                ) VALUES %s
+            """, records, template="(%s, %s, %s, %s, %s::uuid, %s, %s, %s::jsonb)", page_size=1000)
+            
+            conn.commit()
+            cursor.close()
+        
+        except Exception as e:
+            print(f"⚠️  Error logging refresh events: {e}")
+            if 'conn' in locals():
+                conn.rollback()
+    
     def refresh_stale_forecasts(
         self,
         days_stale: int = 30,
@@ -249,53 +523,33 @@ class EventDrivenForecastRefresh:
             conn = self.db.connection
             cursor = conn.cursor()
             
-            # Find stale forecasts
+            # Find families whose latest completed forecast is stale
             cursor.execute("""
-                SELECT DISTINCT family_id, MAX(forecast_id) as latest_forecast_id
+                SELECT family_id::text
                 FROM forecast.forecast_records
-                WHERE generated_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
-                  AND status = 'COMPLETED'
+                WHERE status = 'COMPLETED'
                 GROUP BY family_id
+                HAVING MAX(generated_at) < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
                 ORDER BY MAX(generated_at) ASC
                 LIMIT %s
             """, (days_stale, limit))
             
-            stale_forecasts = cursor.fetchall()
+            stale_family_ids = [row[0] for row in cursor.fetchall()]
             cursor.close()
             
             refreshed = 0
             failed = 0
             
-            for family_id, forecast_id in stale_forecasts:
-                try:
-                    # Get forecast details
-                    forecast = self.orchestrator.get_forecast(
-                        family_id=str(family_id),
-                        forecast_id=forecast_id
-                    )
-                    
-                    if forecast:
-                        horizon_months = forecast.get('horizon_months', 12)
-                        scenario_name = forecast.get('scenario_name')
-                        
-                        # Generate new forecast
-                        new_forecast = self.orchestrator.generate_forecast(
-                            family_id=str(family_id),
-                            horizon_months=horizon_months,
-                            scenario_name=scenario_name,
-                            save_to_db=True
-                        )
-                        
-                        refreshed += 1
-                except Exception as e:
-                    print(f"⚠️  Error refreshing forecast for {family_id}: {e}")
-                    failed += 1
+            for start in range(0, len(stale_family_ids), self.refresh_batch_size):
+                result = self.refresh_families_batch(stale_family_ids[start:start + self.refresh_batch_size])
+                refreshed += result['refreshed']
+                failed += len(result['failed_family_ids'])
             
             return {
                 'success': True,
                 'refreshed': refreshed,
                 'failed': failed,
-                'total': len(stale_forecasts)
+                'total': len(stale_family_ids)
             }
         
         except Exception as e:
@@ -6,11 +6,14 @@ Main orchestrator service that coordinates baseline and scenario forecasting.
 """
 
 import sys
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import pandas as pd
 import yaml
 import json
+from psycopg2.extras import execute_values
 
 # Import forecasters
 try:
@@ -21,8 +24,6 @@ try:
     from .event_driven_forecast_refresh import EventDrivenForecastRefresh
 except ImportError:
     # Fallback for script execution
-    import sys
-    from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from forecasters.baseline_forecaster import BaselineForecaster
     from forecasters.scenario_forecaster import ScenarioForecaster
@@ -30,6 +31,11 @@ except ImportError:
     from models.probability_estimator import ProbabilityEstimator
     from services.event_driven_forecast_refresh import EventDrivenForecastRefresh
 
+# Add shared utils to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
+from instrumentation import traced
+from db_connector import copy_rows
+
 
 class ForecastOrchestrator:
     """
@@ -90,6 +96,7 @@ class ForecastOrchestrator:
         self.event_refresh.disconnect()
         self.db.disconnect()
     
+    @traced('forecast.generate')
     def generate_forecast(
         self,
         family_id: str,
@@ -134,6 +141,62 @@ class ForecastOrchestrator:
         
         return forecast_result
     
+    @traced('forecast.baseline_bulk')
+    def generate_baseline_forecasts_bulk(
+        self,
+        district: Optional[str] = None,
+        family_ids: Optional[List[str]] = None,
+        horizon_months: int = 12,
+        chunk_size: Optional[int] = None,
+        save_to_db: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Refresh baseline forecasts for a whole cohort
+        
+        Families are processed in chunks with the batch baseline forecaster;
+        each chunk's forecasts, projections and assumptions are written with
+        bulk statements (multi-row INSERT / COPY) in one transaction.
+        
+        Args:
+            district: Optional district filter (ignored when family_ids is given)
+            family_ids: Explicit cohort (None = all active families)
+            horizon_months: Forecast horizon in months
+            chunk_size: Families per chunk (default: baseline_forecast.batch.chunk_size)
+            save_to_db: Whether to save to database
+        
+        Returns:
+            Refresh summary with family, forecast and projection counts
+        """
+        started = time.monotonic()
+        summary = {'chunks': 0, 'families': 0, 'forecasts_saved': 0, 'projections': 0}
+        
+        if family_ids is not None:
+            size = chunk_size or self.baseline_forecaster.batch_chunk_size
+            chunks = (family_ids[i:i + size] for i in range(0, len(family_ids), size))
+        else:
+            chunks = self.baseline_forecaster.iter_family_chunks(district=district, chunk_size=chunk_size)
+        
+        for chunk in chunks:
+            result = self.baseline_forecaster.generate_baseline_forecasts_batch(chunk, horizon_months)
+            
+            summary['chunks'] += 1
+            summary['families'] += len(result['forecasts'])
+            summary['projections'] += len(result['projections'])
+            
+            if save_to_db:
+                forecast_ids = self._save_forecasts_bulk(
+                    result['forecasts'], result['projections'], 'BASELINE',
+                    assumptions=self.baseline_forecaster.assumptions
+                )
+                summary['forecasts_saved'] += len(forecast_ids)
+            
+            elapsed = time.monotonic() - started
+            print(f"   Chunk {summary['chunks']}: {summary['families']} families, "
+                  f"{summary['projections']} projections ({summary['families'] / max(elapsed, 1e-9):.0f} families/s)")
+        
+        summary['elapsed_seconds'] = round(time.monotonic() - started, 3)
+        return summary
+    
     def get_forecast(
         self,
         family_id: str,
@@ -297,15 +360,16 @@ class ForecastOrchestrator:
         cursor = conn.cursor()
         
         try:
-            for proj in projections:
-                cursor.execute("""
-                    INSERT INTO forecast.forecast_projections (
-                        forecast_id, scheme_code, scheme_name, projection_type,
-                        period_start, period_end, period_type,
-                        benefit_amount, benefit_frequency, probability, confidence_level,
-                        assumptions, life_stage_event, event_date
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
+            # One multi-row INSERT instead of a statement per projection
+            execute_values(cursor, """
+                INSERT INTO forecast.forecast_projections (
+                    forecast_id, scheme_code, scheme_name, projection_type,
+                    period_start, period_end, period_type,
+                    benefit_amount, benefit_frequency, probability, confidence_level,
+                    assumptions, life_stage_event, event_date
+                ) VALUES %s
+            """, [
+                (
                     forecast_id,
                     proj.get('scheme_code'),
                     proj.get('scheme_name'),
@@ -320,7 +384,9 @@ class ForecastOrchestrator:
                     proj.get('assumptions', []),
                     proj.get('life_stage_event'),
                     proj.get('event_date')
-                ))
+                )
+                for proj in projections
+            ], page_size=1000)
             
             conn.commit()
         
@@ -338,19 +404,15 @@ class ForecastOrchestrator:
         cursor = conn.cursor()
         
         try:
-            for assumption in assumptions:
-                cursor.execute("""
-                    INSERT INTO forecast.forecast_assumptions (
-                        forecast_id, assumption_category, assumption_text,
-                        assumption_source, confidence_level
-                    ) VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    forecast_id,
-                    'GENERAL',
-                    assumption,
-                    'SYSTEM',
-                    'MEDIUM'
-                ))
+            execute_values(cursor, """
+                INSERT INTO forecast.forecast_assumptions (
+                    forecast_id, assumption_category, assumption_text,
+                    assumption_source, confidence_level
+                ) VALUES %s
+            """, [
+                (forecast_id, 'GENERAL', assumption, 'SYSTEM', 'MEDIUM')
+                for assumption in assumptions
+            ], page_size=1000)
             
             conn.commit()
         
@@ -358,6 +420,244 @@ class ForecastOrchestrator:
             print(f"⚠️  Error saving assumptions: {e}")
             conn.rollback()
     
+    def _save_forecasts_bulk(
+        self,
+        forecasts: pd.DataFrame,
+        projections: pd.DataFrame,
+        forecast_type: str,
+        scenario_name: Optional[str] = None,
+        assumptions: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Save many forecasts with their projections and assumptions in one transaction
+        
+        Forecast records are inserted with one multi-row INSERT ... RETURNING,
+        projections and assumptions are streamed with COPY.
+        
+        Args:
+            forecasts: One row per family (generate_baseline_forecasts_batch 'forecasts')
+            projections: Projection rows with family_id
+            forecast_type: BASELINE or SCENARIO
+            scenario_name: Scenario name (None for baseline)
+            assumptions: Assumption texts recorded for every forecast
+        
+        Returns:
+            family_id -> forecast_id
+        """
+        if forecasts.empty:
+            return {}
+        
+        assumptions = assumptions or []
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            forecast_date = datetime.now().date()
+            assumptions_json = json.dumps(assumptions)
+            records = [
+                (
+                    row.family_id, int(row.horizon_months), forecast_date, forecast_type, scenario_name,
+                    'COMPLETED', float(row.total_annual_value), float(row.total_forecast_value),
+                    int(row.scheme_count), row.uncertainty_level, assumptions_json
+                )
+                for row in forecasts.itertuples(index=False)
+            ]
+            inserted = execute_values(cursor, """
+                INSERT INTO forecast.forecast_records (
+                    family_id, horizon_months, forecast_date, forecast_type, scenario_name,
+                    status, total_annual_value, total_forecast_value, scheme_count,
+                    uncertainty_level, assumptions
+                ) VALUES %s
+                RETURNING family_id::text, forecast_id
+            """, records, template="(%s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)",
+                page_size=1000, fetch=True)
+            forecast_ids = {row[0]: row[1] for row in inserted}
+            
+            self._copy_projections(cursor, projections, forecast_ids)
+            self._copy_assumptions(cursor, list(forecast_ids.values()), assumptions)
+            
+            conn.commit()
+            cursor.close()
+            return forecast_ids
+        
+        except Exception as e:
+            print(f"⚠️  Error saving forecasts: {e}")
+            conn.rollback()
+            cursor.close()
+            return {}
+    
+    @traced('forecast.replace_bulk')
+    def replace_forecasts_bulk(
+        self,
+        forecasts: pd.DataFrame,
+        projections: pd.DataFrame,
+        forecast_type: str,
+        scenario_name: Optional[str] = None,
+        assumptions: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Replace the latest forecast of each family in one transaction
+        
+        Families that already have a COMPLETED forecast of this type/scenario
+        get that record updated in place; their projections and assumptions are
+        removed with one DELETE and the new ones streamed with COPY. Families
+        without one get a new record (as in _save_forecasts_bulk).
+        
+        Args:
+            forecasts: One row per family (generate_baseline_forecasts_batch 'forecasts')
+            projections: Projection rows with family_id
+            forecast_type: BASELINE or SCENARIO
+            scenario_name: Scenario name (None for baseline)
+            assumptions: Assumption texts recorded for every forecast
+        
+        Returns:
+            family_id -> forecast_id
+        """
+        if forecasts.empty:
+            return {}
+        
+        assumptions = assumptions or []
+        conn = self.db.connection
+        cursor = conn.cursor()
+        
+        try:
+            family_ids = forecasts['family_id'].astype(str).tolist()
+            # FOR UPDATE is not allowed with DISTINCT ON, so pick the latest
+            # forecast per family in a subquery and lock the outer rows
+            cursor.execute("""
+                SELECT family_id::text, forecast_id
+                FROM forecast.forecast_records
+                WHERE forecast_id IN (
+                    SELECT DISTINCT ON (family_id) forecast_id
+                    FROM forecast.forecast_records
+                    WHERE family_id = ANY(%s::uuid[])
+                      AND forecast_type = %s
+                      AND scenario_name IS NOT DISTINCT FROM %s
+                      AND status = 'COMPLETED'
+                    ORDER BY family_id, generated_at DESC, forecast_id DESC
+                )
+                FOR UPDATE
+            """, (family_ids, forecast_type, scenario_name))
+            existing = dict(cursor.fetchall())
+            
+            forecast_date = datetime.now().date()
+            generated_at = datetime.now()
+            assumptions_json = json.dumps(assumptions)
+            is_existing = forecasts['family_id'].astype(str).isin(list(existing)).to_numpy()
+            
+            if is_existing.any():
+                execute_values(cursor, """
+                    UPDATE forecast.forecast_records r SET
+                        horizon_months = v.horizon_months,
+                        forecast_date = v.forecast_date,
+                        generated_at = v.generated_at,
+                        total_annual_value = v.total_annual_value,
+                        total_forecast_value = v.total_forecast_value,
+                        scheme_count = v.scheme_count,
+                        uncertainty_level = v.uncertainty_level,
+                        assumptions = v.assumptions
+                    FROM (VALUES %s) AS v(
+                        forecast_id, horizon_months, forecast_date, generated_at, total_annual_value,
+                        total_forecast_value, scheme_count, uncertainty_level, assumptions
+                    )
+                    WHERE r.forecast_id = v.forecast_id
+                """, [
+                    (
+                        existing[str(row.family_id)], int(row.horizon_months), forecast_date, generated_at,
+                        float(row.total_annual_value), float(row.total_forecast_value),
+                        int(row.scheme_count), row.uncertainty_level, assumptions_json
+                    )
+                    for row in forecasts[is_existing].itertuples(index=False)
+                ], template="(%s, %s, %s::date, %s::timestamp, %s::numeric, %s::numeric, %s, %s, %s::jsonb)",
+                    page_size=1000)
+                
+                replaced_ids = list(existing.values())
+                cursor.execute(
+                    "DELETE FROM forecast.forecast_projections WHERE forecast_id = ANY(%s)", (replaced_ids,)
+                )
+                cursor.execute(
+                    "DELETE FROM forecast.forecast_assumptions WHERE forecast_id = ANY(%s)", (replaced_ids,)
+                )
+            
+            forecast_ids = dict(existing)
+            
+            if not is_existing.all():
+                inserted = execute_values(cursor, """
+                    INSERT INTO forecast.forecast_records (
+                        family_id, horizon_months, forecast_date, forecast_type, scenario_name,
+                        status, total_annual_value, total_forecast_value, scheme_count,
+                        uncertainty_level, assumptions
+                    ) VALUES %s
+                    RETURNING family_id::text, forecast_id
+                """, [
+                    (
+                        row.family_id, int(row.horizon_months), forecast_date, forecast_type, scenario_name,
+                        'COMPLETED', float(row.total_annual_value), float(row.total_forecast_value),
+                        int(row.scheme_count), row.uncertainty_level, assumptions_json
+                    )
+                    for row in forecasts[~is_existing].itertuples(index=False)
+                ], template="(%s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)",
+                    page_size=1000, fetch=True)
+                forecast_ids.update({row[0]: row[1] for row in inserted})
+            
+            self._copy_projections(cursor, projections, forecast_ids)
+            self._copy_assumptions(cursor, list(forecast_ids.values()), assumptions)
+            
+            conn.commit()
+            cursor.close()
+            
+            return forecast_ids
+        
+        except Exception as e:
+            print(f"⚠️  Error replacing forecasts: {e}")
+            conn.rollback()
+            cursor.close()
+            return {}
+    
+    def _copy_projections(self, cursor, projections: pd.DataFrame, forecast_ids: Dict[str, int]):
+        """COPY projection rows (with family_id) into forecast_projections"""
+        if projections.empty:
+            return
+        
+        array_literals: Dict[tuple, str] = {}
+        
+        def array_literal(values) -> str:
+            key = tuple(values or [])
+            if key not in array_literals:
+                array_literals[key] = '{' + ','.join(
+                    '"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"' for v in key
+                ) + '}'
+            return array_literals[key]
+        
+        rows = pd.DataFrame({
+            'forecast_id': projections['family_id'].map(forecast_ids),
+            'scheme_code': projections['scheme_code'],
+            'scheme_name': projections['scheme_name'],
+            'projection_type': projections['projection_type'],
+            'period_start': projections['period_start'],
+            'period_end': projections['period_end'],
+            'period_type': projections['period_type'],
+            'benefit_amount': projections['benefit_amount'],
+            'benefit_frequency': projections['benefit_frequency'],
+            'probability': projections['probability'],
+            'confidence_level': projections['confidence_level'],
+            'assumptions': [array_literal(values) for values in projections['assumptions']]
+        })
+        copy_rows(cursor, 'forecast.forecast_projections', rows)
+    
+    def _copy_assumptions(self, cursor, forecast_ids: List[int], assumptions: List[str]):
+        """COPY the same assumption texts for every forecast"""
+        if not assumptions or not forecast_ids:
+            return
+        
+        rows = pd.DataFrame(
+            [(forecast_id, 'GENERAL', text, 'SYSTEM', 'MEDIUM')
+             for forecast_id in forecast_ids for text in assumptions],
+            columns=['forecast_id', 'assumption_category', 'assumption_text',
+                     'assumption_source', 'confidence_level']
+        )
+        copy_rows(cursor, 'forecast.forecast_assumptions', rows)
+    
     def get_aggregate_forecast(
         self,
         aggregation_level: str,
@@ -424,6 +724,7 @@ class ForecastOrchestrator:
             days_since_recommendation=days_since_recommendation
         )
     
+    @traced('forecast.handle_event')
     def handle_event(
         self,
         event_type: str,
@@ -441,6 +742,7 @@ class ForecastOrchestrator:
         """
         return self.event_refresh.handle_event(event_type, event_data)
     
+    @traced('forecast.refresh_stale')
     def refresh_stale_forecasts(
         self,
         days_stale: int = 30,
@@ -0,0 +1,179 @@
+"""
+Forecast Refresh Queue
+Use Case ID: AI-PLATFORM-10
+
+Coalesces refresh events per family so a burst of events (e.g. several
+life-stage or eligibility updates for one household) results in a single
+forecast recomputation once the burst has settled.
+"""
+
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+
+class ForecastRefreshQueue:
+    """
+    Debouncing refresh queue
+    
+    A family becomes ready when no new event has arrived for
+    debounce_seconds, or when its first pending event is older than
+    max_delay_seconds (so a continuous stream of events cannot postpone
+    the refresh forever). Requeued families back off exponentially from
+    retry_delay_seconds and are dropped after max_attempts failed refreshes.
+    """
+    
+    def __init__(
+        self,
+        debounce_seconds: float = 30.0,
+        max_delay_seconds: float = 300.0,
+        max_events_per_family: int = 20,
+        retry_delay_seconds: float = 30.0,
+        max_attempts: int = 5
+    ):
+        """
+        Initialize refresh queue
+        
+        Args:
+            debounce_seconds: Quiet period after the last event before refreshing
+            max_delay_seconds: Longest a family can wait after its first event
+            max_events_per_family: Events kept per family for audit logging
+            retry_delay_seconds: Wait before the first retry of a failed family (doubles per attempt)
+            max_attempts: Failed refreshes after which a family is dropped
+        """
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_events_per_family = max_events_per_family
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_attempts = max_attempts
+        
+        # family_id -> {'first_seen', 'last_seen', 'event_count', 'event_types', 'events'}
+        # plus 'attempts' and 'retry_at' once requeued
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        
+        self.events_received = 0
+        self.events_coalesced = 0
+        self.families_dropped = 0
+    
+    def enqueue(self, family_id: str, event_type: str, event_data: Dict[str, Any]) -> bool:
+        """
+        Add an event for a family
+        
+        Returns:
+            True if the family was not pending yet (False = coalesced)
+        """
+        now = time.monotonic()
+        family_id = str(family_id)
+        
+        with self._lock:
+            self.events_received += 1
+            entry = self._pending.get(family_id)
+            
+            if entry is None:
+                self._pending[family_id] = {
+                    'first_seen': now,
+                    'last_seen': now,
+                    'event_count': 1,
+                    'event_types': [event_type],
+                    'events': [{'event_type': event_type, 'event_data': event_data}]
+                }
+                return True
+            
+            self.events_coalesced += 1
+            entry['last_seen'] = now
+            entry['event_count'] += 1
+            if event_type not in entry['event_types']:
+                entry['event_types'].append(event_type)
+            if len(entry['events']) < self.max_events_per_family:
+                entry['events'].append({'event_type': event_type, 'event_data': event_data})
+            return False
+    
+    def is_pending(self, family_id: str) -> bool:
+        """Whether a refresh is already queued for the family"""
+        with self._lock:
+            return str(family_id) in self._pending
+    
+    def drain_ready(self, max_families: Optional[int] = None, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Remove and return families that are ready to refresh
+        
+        Args:
+            max_families: Upper bound on families returned (oldest first)
+            force: Return all pending families regardless of debounce and retry backoff
+        
+        Returns:
+            family_id -> pending entry (event_count, event_types, events)
+        """
+        now = time.monotonic()
+        
+        with self._lock:
+            ready = [
+                (entry['first_seen'], family_id)
+                for family_id, entry in self._pending.items()
+                if force
+                or (entry.get('retry_at', 0.0) <= now and (
+                    now - entry['last_seen'] >= self.debounce_seconds
+                    or now - entry['first_seen'] >= self.max_delay_seconds
+                ))
+            ]
+            ready.sort()
+            if max_families is not None:
+                ready = ready[:max_families]
+            
+            return {family_id: self._pending.pop(family_id) for _, family_id in ready}
+    
+    def requeue(self, entries: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Put drained families back after a failed refresh, merging newer events
+        
+        Each family waits retry_delay_seconds * 2^(attempts - 1) before it is
+        ready again; families that reach max_attempts are dropped.
+        
+        Returns:
+            IDs of the dropped families
+        """
+        now = time.monotonic()
+        dropped = []
+        
+        with self._lock:
+            for family_id, entry in entries.items():
+                attempts = entry.get('attempts', 0) + 1
+                if attempts >= self.max_attempts:
+                    # Events that arrived since the drain stay queued as new work
+                    self.families_dropped += 1
+                    dropped.append(family_id)
+                    continue
+                
+                retry_at = now + self.retry_delay_seconds * 2 ** (attempts - 1)
+                current = self._pending.get(family_id)
+                if current is None:
+                    self._pending[family_id] = dict(entry, attempts=attempts, retry_at=retry_at)
+                    continue
+                
+                current['attempts'] = max(current.get('attempts', 0), attempts)
+                current['retry_at'] = retry_at
+                current['first_seen'] = min(current['first_seen'], entry['first_seen'])
+                current['event_count'] += entry['event_count']
+                for event_type in entry['event_types']:
+                    if event_type not in current['event_types']:
+                        current['event_types'].append(event_type)
+                room = self.max_events_per_family - len(current['events'])
+                current['events'] = entry['events'][:max(0, room)] + current['events']
+        
+        return dropped
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue counters"""
+        with self._lock:
+            return {
+                'pending_families': len(self._pending),
+                'events_received': self.events_received,
+                'events_coalesced': self.events_coalesced,
+                'families_dropped': self.families_dropped
+            }
+
@@ -288,6 +288,22 @@ def setup_database():
     """)
     print("✅ Created table 'nudge_audit_logs'")
     
+    # 11. Bandit State (checkpointed template bandit counts)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS nudging.bandit_state (
+            template_id UUID NOT NULL,
+            action_type VARCHAR(50) NOT NULL,
+            channel_code VARCHAR(50) NOT NULL,
+            total_trials DOUBLE PRECISION DEFAULT 0,
+            total_successes DOUBLE PRECISION DEFAULT 0, -- Weighted rewards (clicked/responded/completed)
+            last_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (template_id, action_type, channel_code),
+            FOREIGN KEY (template_id) REFERENCES nudging.nudge_templates(template_id),
+            FOREIGN KEY (channel_code) REFERENCES nudging.nudge_channels(channel_code)
+        );
+    """)
+    print("✅ Created table 'bandit_state'")
+    
     # Create indexes
     indexes = [
         ("CREATE INDEX IF NOT EXISTS idx_nudges_family_id ON nudging.nudges(family_id);", "nudges.family_id"),
@@ -298,6 +314,7 @@ def setup_database():
         ("CREATE INDEX IF NOT EXISTS idx_fatigue_tracking_family_id ON nudging.fatigue_tracking(family_id);", "fatigue_tracking.family_id"),
         ("CREATE INDEX IF NOT EXISTS idx_channel_preferences_family_id ON nudging.channel_preferences(family_id);", "channel_preferences.family_id"),
         ("CREATE INDEX IF NOT EXISTS idx_family_consent_family_id ON nudging.family_consent(family_id);", "family_consent.family_id"),
+        ("CREATE UNIQUE INDEX IF NOT EXISTS idx_content_effectiveness_overall ON nudging.content_effectiveness(template_id, action_type, channel_code) WHERE demographic_segment IS NULL;", "content_effectiveness.overall"),
     ]
     
     for index_sql, index_name in indexes:
@@ -307,8 +324,8 @@ def setup_database():
     conn.close()
     print("\n✅ Database setup completed successfully!")
     print("📊 Schema: nudging")
-    print("📋 Tables created: 10")
-    print("📇 Indexes created: 8")
+    print("📋 Tables created: 11")
+    print("📇 Indexes created: 9")
 
 if __name__ == "__main__":
     try:
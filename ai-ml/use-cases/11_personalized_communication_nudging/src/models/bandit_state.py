@@ -0,0 +1,234 @@
+"""
+Bandit State Store - In-memory Beta-Bernoulli posteriors for template selection.
+Holds one arm per (template_id, action_type, channel_code), applies feedback in
+micro-batches and checkpoints observed counts to PostgreSQL.
+"""
+
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+
+ArmKey = Tuple[str, str, str]
+
+
+class BanditStateStore:
+    def __init__(self, prior_strength: float = 10.0, reward_weights: Optional[Dict[str, float]] = None,
+                 trial_event: str = 'DELIVERED', update_batch_size: int = 500,
+                 update_interval_seconds: float = 5.0, checkpoint_interval_seconds: float = 300.0,
+                 random_seed: Optional[int] = None):
+        self.prior_strength = float(prior_strength)
+        self.reward_weights = reward_weights or {'CLICKED': 0.2, 'RESPONDED': 0.3, 'COMPLETED': 0.5}
+        self.trial_event = trial_event
+        self.update_batch_size = update_batch_size
+        self.update_interval_seconds = update_interval_seconds
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.rng = np.random.default_rng(random_seed)
+        
+        # Arm arrays (grown on demand): prior mean from content_effectiveness,
+        # observed trials/successes from feedback
+        self._index: Dict[ArmKey, int] = {}
+        self._keys: List[ArmKey] = []
+        self._size = 0
+        self.prior_mean = np.zeros(0)
+        self.trials = np.zeros(0)
+        self.successes = np.zeros(0)
+        # Counts not yet written to nudging.bandit_state
+        self._unsaved_trials = np.zeros(0)
+        self._unsaved_successes = np.zeros(0)
+        
+        self._pending: List[Tuple[ArmKey, float, float]] = []
+        self._lock = threading.Lock()
+        self._last_apply = time.monotonic()
+        self._last_checkpoint = time.monotonic()
+        self.loaded = False
+    
+    def load(self, connection):
+        """Loads prior means (content_effectiveness) and observed counts (bandit_state) once."""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT DISTINCT ON (template_id, action_type, channel_code)
+                    template_id::text, action_type, channel_code, effectiveness_score
+                FROM nudging.content_effectiveness
+                WHERE effectiveness_score IS NOT NULL
+                ORDER BY template_id, action_type, channel_code, last_updated_at DESC;
+            """)
+            priors = cursor.fetchall()
+            
+            cursor.execute("""
+                SELECT template_id::text, action_type, channel_code, total_trials, total_successes
+                FROM nudging.bandit_state;
+            """)
+            observed = cursor.fetchall()
+            connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error loading bandit state: {e}")
+            connection.rollback()
+            priors, observed = [], []
+        
+        with self._lock:
+            for template_id, action_type, channel_code, score in priors:
+                idx = self._arm(template_id, action_type, channel_code)
+                self.prior_mean[idx] = min(max(float(score) / 100.0, 0.0), 1.0)
+            for template_id, action_type, channel_code, trials, successes in observed:
+                idx = self._arm(template_id, action_type, channel_code)
+                self.trials[idx] = float(trials or 0)
+                self.successes[idx] = float(successes or 0)
+            self.loaded = True
+        
+        print(f"✅ Loaded bandit state: {self._size} arms ({len(observed)} with observations)")
+    
+    def _arm(self, template_id, action_type: str, channel_code: str) -> int:
+        """Returns the arm index for a key, adding the arm if needed (caller holds the lock)."""
+        key = (str(template_id), action_type, channel_code)
+        idx = self._index.get(key)
+        if idx is not None:
+            return idx
+        
+        if self._size == len(self.trials):
+            capacity = max(64, 2 * self._size)
+            for name in ('trials', 'successes', '_unsaved_trials', '_unsaved_successes'):
+                grown = np.zeros(capacity)
+                grown[:self._size] = getattr(self, name)[:self._size]
+                setattr(self, name, grown)
+            grown = np.full(capacity, 0.5)
+            grown[:self._size] = self.prior_mean[:self._size]
+            self.prior_mean = grown
+        
+        idx = self._size
+        self._index[key] = idx
+        self._keys.append(key)
+        self._size += 1
+        return idx
+    
+    def arm_indices(self, template_ids: List[Any], action_type: str, channel_code: str) -> np.ndarray:
+        """Arm indices for candidate templates of one (action_type, channel_code)."""
+        with self._lock:
+            return np.array([self._arm(t, action_type, channel_code) for t in template_ids], dtype=np.int64)
+    
+    def posterior(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Beta(alpha, beta) parameters for the given arms."""
+        with self._lock:
+            prior_mean = self.prior_mean[indices]
+            trials = self.trials[indices]
+            successes = np.minimum(self.successes[indices], trials)
+        alpha = 1.0 + self.prior_strength * prior_mean + successes
+        beta = 1.0 + self.prior_strength * (1.0 - prior_mean) + (trials - successes)
+        return alpha, beta
+    
+    def sample(self, indices: np.ndarray, n: int) -> np.ndarray:
+        """Draws an (n, len(indices)) matrix of Thompson samples."""
+        alpha, beta = self.posterior(indices)
+        return self.rng.beta(alpha, beta, size=(n, len(indices)))
+    
+    def trial_counts(self, indices: np.ndarray) -> np.ndarray:
+        """Observed trials plus prior pseudo-trials (used by UCB)."""
+        with self._lock:
+            return self.trials[indices] + self.prior_strength
+    
+    def record(self, template_id, action_type: str, channel_code: str, event_type: str) -> bool:
+        """
+        Queues a feedback event. Returns True if the event affects the bandit.
+        Pending events are applied once the micro-batch is full or the interval has passed.
+        """
+        trial = 1.0 if event_type == self.trial_event else 0.0
+        reward = float(self.reward_weights.get(event_type, 0.0))
+        if not template_id or (trial == 0.0 and reward == 0.0):
+            return False
+        
+        with self._lock:
+            self._pending.append(((str(template_id), action_type, channel_code), trial, reward))
+            due = (len(self._pending) >= self.update_batch_size or
+                   time.monotonic() - self._last_apply >= self.update_interval_seconds)
+        
+        if due:
+            self.apply_pending()
+        return True
+    
+    def apply_pending(self) -> int:
+        """Applies queued feedback to the arm arrays in one vectorized update."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_apply = time.monotonic()
+            if not pending:
+                return 0
+            
+            indices = np.array([self._arm(*key) for key, _, _ in pending], dtype=np.int64)
+            trials = np.array([t for _, t, _ in pending])
+            rewards = np.array([r for _, _, r in pending])
+            
+            np.add.at(self.trials, indices, trials)
+            np.add.at(self.successes, indices, rewards)
+            np.add.at(self._unsaved_trials, indices, trials)
+            np.add.at(self._unsaved_successes, indices, rewards)
+        
+        return len(pending)
+    
+    def checkpoint_due(self) -> bool:
+        return time.monotonic() - self._last_checkpoint >= self.checkpoint_interval_seconds
+    
+    def checkpoint(self, connection) -> int:
+        """
+        Writes unsaved counts to nudging.bandit_state as increments, so several
+        processes sharing the table do not overwrite each other's feedback.
+        """
+        self.apply_pending()
+        
+        with self._lock:
+            n = self._size
+            dirty = np.nonzero((self._unsaved_trials[:n] != 0) | (self._unsaved_successes[:n] != 0))[0]
+            rows = [
+                (*self._keys[i], float(self._unsaved_trials[i]), float(self._unsaved_successes[i]))
+                for i in dirty
+            ]
+            self._last_checkpoint = time.monotonic()
+        
+        if not rows:
+            return 0
+        
+        try:
+            cursor = connection.cursor()
+            execute_values(
+                cursor,
+                """
+                INSERT INTO nudging.bandit_state (
+                    template_id, action_type, channel_code, total_trials, total_successes
+                ) VALUES %s
+                ON CONFLICT (template_id, action_type, channel_code) DO UPDATE SET
+                    total_trials = nudging.bandit_state.total_trials + EXCLUDED.total_trials,
+                    total_successes = nudging.bandit_state.total_successes + EXCLUDED.total_successes,
+                    last_updated_at = CURRENT_TIMESTAMP;
+                """,
+                rows,
+                template="(%s::uuid, %s, %s, %s, %s)",
+                page_size=1000
+            )
+            connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error checkpointing bandit state: {e}")
+            connection.rollback()
+            return 0
+        
+        with self._lock:
+            # Only subtract what was written; feedback applied meanwhile stays unsaved
+            for i, (_, _, _, trials, successes) in zip(dirty, rows):
+                self._unsaved_trials[i] -= trials
+                self._unsaved_successes[i] -= successes
+        
+        return len(rows)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            n = self._size
+            return {
+                'arms': n,
+                'pending_events': len(self._pending),
+                'total_trials': float(self.trials[:n].sum()),
+                'total_successes': float(self.successes[:n].sum()),
+                'unsaved_arms': int(np.count_nonzero(self._unsaved_trials[:n] + self._unsaved_successes[:n]))
+            }
+
@@ -7,6 +7,7 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import pandas as pd
+import numpy as np
 import yaml
 from datetime import datetime
 import random
@@ -15,6 +16,42 @@ import random
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
 
+# High urgency benefits from faster channels
+CHANNEL_SPEED = {
+    'SMS': 1.0,
+    'APP_PUSH': 0.9,
+    'WHATSAPP': 0.9,
+    'WEB_INBOX': 0.5,
+    'IVR': 0.3,
+    'ASSISTED_VISIT': 0.1
+}
+
+URGENCY_MULTIPLIERS = {
+    'CRITICAL': 1.5,
+    'HIGH': 1.2,
+    'MEDIUM': 1.0,
+    'LOW': 0.8
+}
+
+# Some actions work better on certain channels
+ACTION_CHANNEL_ADJUSTMENTS = {
+    'renewal': {
+        'SMS': 5, 'APP_PUSH': 10, 'WEB_INBOX': 15, 'WHATSAPP': 8, 'IVR': 0, 'ASSISTED_VISIT': 5
+    },
+    'missing_doc': {
+        'SMS': 0, 'APP_PUSH': 5, 'WEB_INBOX': 20, 'WHATSAPP': 10, 'IVR': -5, 'ASSISTED_VISIT': 15
+    },
+    'consent': {
+        'SMS': 10, 'APP_PUSH': 15, 'WEB_INBOX': 20, 'WHATSAPP': 15, 'IVR': 5, 'ASSISTED_VISIT': 10
+    },
+    'deadline': {
+        'SMS': 15, 'APP_PUSH': 20, 'WEB_INBOX': 10, 'WHATSAPP': 15, 'IVR': 10, 'ASSISTED_VISIT': 5
+    },
+    'informational': {
+        'SMS': 5, 'APP_PUSH': 10, 'WEB_INBOX': 15, 'WHATSAPP': 8, 'IVR': -5, 'ASSISTED_VISIT': 0
+    }
+}
+
 
 class ChannelOptimizer:
     def __init__(self, config_path=None):
@@ -166,50 +203,14 @@ class ChannelOptimizer:
 
     def _get_urgency_adjustment(self, channel_code: str, urgency: str) -> float:
         """Adjusts score based on urgency and channel speed."""
-        # High urgency benefits from faster channels
-        channel_speed = {
-            'SMS': 1.0,
-            'APP_PUSH': 0.9,
-            'WHATSAPP': 0.9,
-            'WEB_INBOX': 0.5,
-            'IVR': 0.3,
-            'ASSISTED_VISIT': 0.1
-        }
-        
-        urgency_multipliers = {
-            'CRITICAL': 1.5,
-            'HIGH': 1.2,
-            'MEDIUM': 1.0,
-            'LOW': 0.8
-        }
-        
-        speed = channel_speed.get(channel_code, 0.5)
-        multiplier = urgency_multipliers.get(urgency, 1.0)
+        speed = CHANNEL_SPEED.get(channel_code, 0.5)
+        multiplier = URGENCY_MULTIPLIERS.get(urgency, 1.0)
         
         return (speed * multiplier - 1.0) * 10  # Scale adjustment
 
     def _get_action_type_adjustment(self, channel_code: str, action_type: str) -> float:
         """Adjusts score based on action type and channel suitability."""
-        # Some actions work better on certain channels
-        adjustments = {
-            'renewal': {
-                'SMS': 5, 'APP_PUSH': 10, 'WEB_INBOX': 15, 'WHATSAPP': 8, 'IVR': 0, 'ASSISTED_VISIT': 5
-            },
-            'missing_doc': {
-                'SMS': 0, 'APP_PUSH': 5, 'WEB_INBOX': 20, 'WHATSAPP': 10, 'IVR': -5, 'ASSISTED_VISIT': 15
-            },
-            'consent': {
-                'SMS': 10, 'APP_PUSH': 15, 'WEB_INBOX': 20, 'WHATSAPP': 15, 'IVR': 5, 'ASSISTED_VISIT': 10
-            },
-            'deadline': {
-                'SMS': 15, 'APP_PUSH': 20, 'WEB_INBOX': 10, 'WHATSAPP': 15, 'IVR': 10, 'ASSISTED_VISIT': 5
-            },
-            'informational': {
-                'SMS': 5, 'APP_PUSH': 10, 'WEB_INBOX': 15, 'WHATSAPP': 8, 'IVR': -5, 'ASSISTED_VISIT': 0
-            }
-        }
-        
-        action_adjustments = adjustments.get(action_type, {})
+        action_adjustments = ACTION_CHANNEL_ADJUSTMENTS.get(action_type, {})
         return action_adjustments.get(channel_code, 0)
 
     def _get_context_adjustment(self, family_id: str, channel_code: str, context: Dict[str, Any]) -> float:
@@ -265,6 +266,178 @@ class ChannelOptimizer:
         except Exception as e:
             print(f"⚠️  Error getting available channels: {e}")
             return list(self.channel_capabilities.keys())
+    
+    def load_family_consent_bulk(self, family_ids: List[str], chunk_size: int = 50000) -> pd.DataFrame:
+        """Loads consent, opt-outs, language, vulnerability and digital footprint for many families."""
+        columns = ['family_id', 'consent_given', 'consent_channels', 'opt_out_channels', 'preferred_language',
+                   'preferred_time_windows', 'vulnerability_category', 'digital_footprint_score']
+        family_ids = list(dict.fromkeys(str(f) for f in family_ids))
+        rows = []
+        try:
+            cursor = self.db.connection.cursor()
+            for start in range(0, len(family_ids), chunk_size):
+                cursor.execute("""
+                    SELECT family_id, consent_given, consent_channels, opt_out_channels, preferred_language,
+                           preferred_time_windows, vulnerability_category, digital_footprint_score
+                    FROM nudging.family_consent
+                    WHERE family_id = ANY(%s);
+                """, (family_ids[start:start + chunk_size],))
+                rows.extend(cursor.fetchall())
+        except Exception as e:
+            print(f"⚠️  Error loading family consent: {e}")
+            self.db.connection.rollback()
+        
+        consent = pd.DataFrame(rows, columns=columns, dtype=object)
+        return consent.drop_duplicates('family_id', keep='last').set_index('family_id')
+    
+    def _load_preferences_bulk(self, family_ids: List[str], chunk_size: int = 50000) -> pd.DataFrame:
+        """Loads all channel preference rows (action-specific and general) for many families."""
+        rows = []
+        try:
+            cursor = self.db.connection.cursor()
+            for start in range(0, len(family_ids), chunk_size):
+                cursor.execute("""
+                    SELECT family_id, channel_code, action_type, preference_score
+                    FROM nudging.channel_preferences
+                    WHERE family_id = ANY(%s);
+                """, (family_ids[start:start + chunk_size],))
+                rows.extend(cursor.fetchall())
+        except Exception as e:
+            print(f"⚠️  Error loading channel preferences: {e}")
+            self.db.connection.rollback()
+        
+        prefs = pd.DataFrame(rows, columns=['family_id', 'channel_code', 'action_type', 'preference_score'], dtype=object)
+        prefs['preference_score'] = pd.to_numeric(prefs['preference_score'], errors='coerce')
+        return prefs
+    
+    def select_best_channels_bulk(self, nudges: pd.DataFrame, family_consent: Optional[pd.DataFrame] = None,
+                                  chunk_size: int = 50000) -> pd.DataFrame:
+        """
+        Vectorized select_best_channel for many nudges.
+        
+        Args:
+            nudges: DataFrame with family_id, action_type, urgency
+            family_consent: Output of load_family_consent_bulk (loaded here if not given)
+            chunk_size: Families per lookup query
+        
+        Returns:
+            DataFrame (same index) with channel_code, confidence, reason
+        """
+        n = len(nudges)
+        urgency = nudges['urgency'].to_numpy(dtype=object)
+        
+        if not self.enabled:
+            channel = np.where(np.isin(urgency, ['CRITICAL', 'HIGH']), 'SMS',
+                               np.where(urgency == 'MEDIUM', 'APP_PUSH', 'WEB_INBOX'))
+            return pd.DataFrame({
+                'channel_code': channel.astype(object),
+                'confidence': 0.5,
+                'reason': 'Fallback heuristic (optimization disabled)'
+            }, index=nudges.index)
+        
+        family_codes, families = pd.factorize(nudges['family_id'].astype(str))
+        family_list = list(families)
+        if family_consent is None:
+            family_consent = self.load_family_consent_bulk(family_list, chunk_size)
+        
+        channels = list(self.channel_capabilities.keys())
+        channel_pos = {c: i for i, c in enumerate(channels)}
+        n_families, n_channels = len(family_list), len(channels)
+        
+        # 1. Available channels per family (consent list if given, minus opt-outs)
+        consent = family_consent.reindex(family_list)
+        consent.index = np.arange(n_families)
+        
+        def channel_matrix(column: str):
+            exploded = consent[column].dropna().explode().dropna()
+            matrix = np.zeros((n_families, n_channels), dtype=bool)
+            listed = np.zeros(n_families, dtype=bool)
+            listed[exploded.index.to_numpy(dtype=np.int64)] = True
+            known = exploded.map(channel_pos).dropna()
+            matrix[known.index.to_numpy(dtype=np.int64), known.to_numpy(dtype=np.int64)] = True
+            return matrix, listed
+        
+        available = np.ones((n_families, n_channels), dtype=bool)
+        consented, has_consent_list = channel_matrix('consent_channels')
+        available[has_consent_list] = consented[has_consent_list]
+        opted_out, _ = channel_matrix('opt_out_channels')
+        available &= ~opted_out
+        available = available[family_codes]
+        
+        # 2. Historical preference (action-specific row wins over the general row)
+        positions = pd.DataFrame({
+            'pos': np.arange(n),
+            'family_id': np.asarray(family_list, dtype=object)[family_codes] if n else [],
+            'action_type': nudges['action_type'].to_numpy(dtype=object)
+        })
+        prefs = self._load_preferences_bulk(family_list, chunk_size)
+        prefs = prefs[prefs['channel_code'].isin(channels)]
+        prefs = prefs.assign(channel_idx=prefs['channel_code'].map(channel_pos))
+        
+        specific = np.full((n, n_channels), np.nan)
+        matched = positions.merge(prefs[prefs['action_type'].notna()], on=['family_id', 'action_type'])
+        specific[matched['pos'].to_numpy(dtype=np.int64), matched['channel_idx'].to_numpy(dtype=np.int64)] = matched['preference_score']
+        general = np.full((n, n_channels), np.nan)
+        matched = positions.merge(prefs[prefs['action_type'].isna()].drop(columns='action_type'), on='family_id')
+        general[matched['pos'].to_numpy(dtype=np.int64), matched['channel_idx'].to_numpy(dtype=np.int64)] = matched['preference_score']
+        
+        preference = np.where(np.isnan(specific), general, specific)
+        scores = np.where(np.isnan(preference) | (preference == 0), 50.0, preference)
+        
+        # 3. Urgency and action-type adjustments
+        speed = np.array([CHANNEL_SPEED.get(c, 0.5) for c in channels])
+        multiplier = np.array([URGENCY_MULTIPLIERS.get(u, 1.0) for u in urgency]).reshape(-1, 1)
+        scores += (speed * multiplier - 1.0) * 10
+        
+        action_codes, actions = pd.factorize(positions['action_type'])
+        action_table = np.array([
+            [ACTION_CHANNEL_ADJUSTMENTS.get(a, {}).get(c, 0) for c in channels] for a in actions
+        ]).reshape(len(actions), n_channels)
+        scores += action_table[action_codes]
+        
+        # 4. Context adjustments (same placeholder signals as _get_context_adjustment)
+        if 'APP_PUSH' in channel_pos:
+            scores[:, channel_pos['APP_PUSH']] -= np.where(np.random.random(n) > 0.5, 0, 20)
+        for channel_code in ['WEB_INBOX', 'WHATSAPP']:
+            if channel_code in channel_pos:
+                scores[:, channel_pos[channel_code]] -= np.where(np.random.random(n) > 0.3, 0, 15)
+        
+        scores = np.clip(scores, 0.0, 100.0)
+        masked = np.where(available, scores, -np.inf)
+        best = masked.argmax(axis=1) if n_channels else np.zeros(n, dtype=np.int64)
+        best_score = masked[np.arange(n), best] if n_channels else np.full(n, -np.inf)
+        
+        channel_code = np.asarray(channels, dtype=object)[best] if n_channels else np.full(n, None, dtype=object)
+        confidence = best_score.copy()
+        reason = np.array([f'Best engagement score: {score:.2f}' for score in best_score], dtype=object)
+        
+        # 5. No channel left, then fallback rules in configured order
+        decided = ~available.any(axis=1)
+        channel_code[decided] = 'ASSISTED_VISIT'
+        confidence[decided] = 1.0
+        reason[decided] = 'No digital channels available, defaulting to assisted visit'
+        
+        footprint = pd.to_numeric(consent['digital_footprint_score'], errors='coerce').to_numpy()[family_codes]
+        no_footprint = ~np.isnan(footprint) & (footprint != 0) & (footprint < 0.3)
+        high_vulnerability = (consent['vulnerability_category'].to_numpy(dtype=object) == 'HIGH')[family_codes]
+        
+        for rule in self.fallback_rules:
+            for key, condition, rule_reason in [
+                ('if_no_digital_footprint', no_footprint, 'No digital footprint detected'),
+                ('if_high_vulnerability', high_vulnerability, 'High vulnerability category')
+            ]:
+                if rule.get(key):
+                    hit = condition & ~decided
+                    channel_code[hit] = rule[key]
+                    confidence[hit] = 1.0
+                    reason[hit] = rule_reason
+                    decided |= hit
+        
+        return pd.DataFrame({
+            'channel_code': channel_code,
+            'confidence': confidence,
+            'reason': reason
+        }, index=nudges.index)
 
     def _fallback_selection(self, family_id: str, action_type: str, urgency: str,
                            context: Dict[str, Any]) -> Dict[str, Any]:
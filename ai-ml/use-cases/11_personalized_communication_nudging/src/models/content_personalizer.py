@@ -7,15 +7,25 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import pandas as pd
+import numpy as np
 import yaml
 from datetime import datetime
 import random
+import time
 import uuid
 
 # Add shared utils to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
 
+try:
+    from .bandit_state import BanditStateStore
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from bandit_state import BanditStateStore
+
+TEMPLATE_COLUMNS = ['template_id', 'template_name', 'template_content', 'tone', 'length_category']
+
 
 class ContentPersonalizer:
     def __init__(self, config_path=None):
@@ -46,6 +56,27 @@ class ContentPersonalizer:
         # Fix missing bandit_algorithm key
         if not hasattr(self, 'bandit_algorithm') or not self.bandit_algorithm:
             self.bandit_algorithm = 'UCB'
+        
+        # Approved templates are loaded once and resolved in memory
+        bandit_config = self.config.get('bandit_state', {})
+        self.template_cache_ttl = bandit_config.get('template_cache_ttl_seconds', 3600)
+        self.epsilon = bandit_config.get('epsilon', 0.1)
+        self._template_catalog = None
+        self._template_catalog_loaded_at = 0.0
+        self._candidate_cache = {}
+        
+        # In-memory bandit posteriors (replaces per-template effectiveness queries)
+        self.bandit_state = None
+        if bandit_config.get('enabled', True):
+            self.bandit_state = BanditStateStore(
+                prior_strength=bandit_config.get('prior_strength', 10),
+                reward_weights=bandit_config.get('reward_weights'),
+                trial_event=bandit_config.get('trial_event', 'DELIVERED'),
+                update_batch_size=bandit_config.get('update_batch_size', 500),
+                update_interval_seconds=bandit_config.get('update_interval_seconds', 5),
+                checkpoint_interval_seconds=bandit_config.get('checkpoint_interval_seconds', 300),
+                random_seed=bandit_config.get('random_seed')
+            )
 
     def select_template(self, family_id: str, action_type: str, channel_code: str,
                        urgency: str, language: str = 'en', action_context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -98,6 +129,9 @@ class ContentPersonalizer:
 
     def _get_available_templates(self, action_type: str, channel_code: str, language: str) -> List[Dict[str, Any]]:
         """Gets available templates for action type, channel, and language with fallback logic."""
+        if self.template_cache_ttl:
+            return self._get_cached_templates(action_type, channel_code, language)
+        
         try:
             cursor = self.db.connection.cursor()
             
@@ -206,8 +240,98 @@ class ContentPersonalizer:
             traceback.print_exc()
             return []
 
+    def _load_template_catalog(self):
+        """Loads all approved templates in one query (newest first, as the fallback queries order them)."""
+        try:
+            cursor = self.db.connection.cursor()
+            cursor.execute("""
+                SELECT template_id, template_name, template_content, tone, length_category,
+                       action_type, channel_code, language_code
+                FROM nudging.nudge_templates
+                WHERE approval_status = 'APPROVED'
+                ORDER BY created_at DESC;
+            """)
+            rows = cursor.fetchall()
+        except Exception as e:
+            print(f"⚠️  Error loading template catalog: {e}")
+            self.db.connection.rollback()
+            rows = []
+        
+        self._template_catalog = [
+            {**dict(zip(TEMPLATE_COLUMNS, row[:5])), '_action_type': row[5], '_channel_code': row[6], '_language': row[7]}
+            for row in rows
+        ]
+        self._template_catalog_loaded_at = time.monotonic()
+        self._candidate_cache = {}
+    
+    def _get_cached_templates(self, action_type: str, channel_code: str, language: str) -> List[Dict[str, Any]]:
+        """Same fallback order and limits as the SQL path, resolved against the cached catalog."""
+        if (self._template_catalog is None or
+                time.monotonic() - self._template_catalog_loaded_at >= self.template_cache_ttl):
+            self._load_template_catalog()
+        
+        key = (action_type, channel_code, language)
+        if key in self._candidate_cache:
+            return self._candidate_cache[key]
+        
+        catalog = self._template_catalog
+        fallbacks = [
+            ([t for t in catalog if t['_action_type'] == action_type and t['_channel_code'] == channel_code
+              and t['_language'] == language], None),
+            ([t for t in catalog if t['_action_type'] == action_type and t['_channel_code'] == channel_code], 5),
+            ([t for t in catalog if t['_action_type'] == action_type], 5),
+            ([t for t in catalog if t['_channel_code'] == channel_code], 3),
+        ]
+        
+        templates = []
+        for matches, limit in fallbacks:
+            if matches:
+                templates = [{c: t[c] for c in TEMPLATE_COLUMNS} for t in matches[:limit]]
+                break
+        
+        self._candidate_cache[key] = templates
+        return templates
+    
+    def _ensure_bandit_state(self):
+        if not self.bandit_state.loaded:
+            self.bandit_state.load(self.db.connection)
+    
+    def _bandit_state_choices(self, arm_indices: np.ndarray, n: int):
+        """
+        Chooses one of the candidate arms for n nudges at once.
+        Returns (choice index per nudge, posterior mean per candidate).
+        """
+        alpha, beta = self.bandit_state.posterior(arm_indices)
+        means = alpha / (alpha + beta)
+        rng = self.bandit_state.rng
+        
+        if self.bandit_algorithm == 'THOMPSON_SAMPLING':
+            choices = self.bandit_state.sample(arm_indices, n).argmax(axis=1)
+        elif self.bandit_algorithm == 'EPSILON_GREEDY':
+            choices = np.full(n, int(means.argmax()))
+            explore = rng.random(n) < self.epsilon
+            choices[explore] = rng.integers(0, len(arm_indices), size=int(explore.sum()))
+        else:
+            # UCB on the posterior mean
+            trials = self.bandit_state.trial_counts(arm_indices)
+            bonus = np.sqrt(2 * np.log(max(trials.sum(), 1.0)) / np.maximum(trials, 1.0))
+            choices = np.full(n, int((means + bonus).argmax()))
+        
+        return choices, means
+    
     def _bandit_selection(self, templates: List[Dict], family_id: str, action_type: str, channel_code: str) -> Dict[str, Any]:
         """Selects template using bandit algorithm (UCB, Thompson Sampling, or Epsilon-Greedy)."""
+        if self.bandit_state is not None:
+            self._ensure_bandit_state()
+            arm_indices = self.bandit_state.arm_indices([t['template_id'] for t in templates], action_type, channel_code)
+            choices, means = self._bandit_state_choices(arm_indices, 1)
+            choice = int(choices[0])
+            return {
+                **templates[choice],
+                'effectiveness_score': float(means[choice]) * 100.0,
+                'confidence': float(means[choice])
+            }
+        
         # Get effectiveness scores for each template
         template_scores = []
         for template in templates:
@@ -381,6 +505,96 @@ class ContentPersonalizer:
         
         return personalized
 
+    def select_templates_batch(self, nudges: pd.DataFrame, personalize: bool = True) -> pd.DataFrame:
+        """
+        Selects templates for many nudges at once.
+        
+        Args:
+            nudges: DataFrame with family_id, action_type, channel_code, urgency and
+                    optional language / action_context columns
+            personalize: Fill personalized_content (skip when only template ids are needed)
+        
+        Returns:
+            DataFrame (same index) with template_id, template_content, personalized_content,
+            selection_strategy, confidence
+        """
+        n = len(nudges)
+        template_ids = np.empty(n, dtype=object)
+        contents = np.full(n, 'Default message', dtype=object)
+        confidence = np.zeros(n)
+        
+        languages = nudges['language'].fillna('en') if 'language' in nudges.columns else pd.Series('en', index=nudges.index)
+        use_bandit = self.strategy == 'BANDIT' and self.enabled and self.bandit_state is not None
+        if use_bandit:
+            self._ensure_bandit_state()
+        
+        groups = pd.DataFrame({
+            'action_type': nudges['action_type'].to_numpy(),
+            'channel_code': nudges['channel_code'].to_numpy(),
+            'language': languages.to_numpy()
+        }).groupby(['action_type', 'channel_code', 'language'], sort=False).indices
+        
+        for (action_type, channel_code, language), positions in groups.items():
+            templates = self._get_available_templates(action_type, channel_code, language)
+            if not templates:
+                continue
+            
+            if use_bandit:
+                arm_indices = self.bandit_state.arm_indices([t['template_id'] for t in templates], action_type, channel_code)
+                choices, means = self._bandit_state_choices(arm_indices, len(positions))
+                template_ids[positions] = np.array([t['template_id'] for t in templates], dtype=object)[choices]
+                contents[positions] = np.array([t['template_content'] for t in templates], dtype=object)[choices]
+                confidence[positions] = means[choices]
+                continue
+            
+            for pos in positions:
+                row = nudges.iloc[pos]
+                if self.strategy == 'AB_TEST' and self.enabled:
+                    selected = self._ab_test_selection(templates, str(row['family_id']))
+                elif self.strategy == 'BANDIT' and self.enabled:
+                    selected = self._bandit_selection(templates, row['family_id'], action_type, channel_code)
+                else:
+                    selected = self._heuristic_selection(templates, row['urgency'])
+                template_ids[pos] = selected['template_id']
+                contents[pos] = selected['template_content']
+                confidence[pos] = selected.get('confidence', 0.7)
+        
+        result = pd.DataFrame({
+            'template_id': template_ids,
+            'template_content': contents,
+            'selection_strategy': np.where(pd.isna(template_ids), 'DEFAULT', self.strategy if self.enabled else 'HEURISTIC'),
+            'confidence': confidence
+        }, index=nudges.index)
+        
+        if personalize:
+            contexts = nudges['action_context'] if 'action_context' in nudges.columns else pd.Series(None, index=nudges.index, dtype=object)
+            result['personalized_content'] = [
+                self._personalize_content(content, family_id, action_type, context if isinstance(context, dict) else None)
+                for content, family_id, action_type, context in zip(
+                    contents, nudges['family_id'].tolist(), nudges['action_type'].tolist(), contexts.tolist()
+                )
+            ]
+        
+        return result
+    
+    def record_feedback(self, template_id, action_type: str, channel_code: str, event_type: str) -> bool:
+        """Queues a feedback event for the bandit; checkpoints when the interval has passed."""
+        if self.bandit_state is None:
+            return False
+        
+        recorded = self.bandit_state.record(template_id, action_type, channel_code, event_type)
+        if recorded and self.bandit_state.checkpoint_due():
+            self.checkpoint_bandit_state()
+        return recorded
+    
+    def checkpoint_bandit_state(self) -> int:
+        """Applies pending feedback and writes unsaved bandit counts to PostgreSQL."""
+        if self.bandit_state is None:
+            return 0
+        return self.bandit_state.checkpoint(self.db.connection)
+    
     def disconnect(self):
+        if self.bandit_state is not None:
+            self.checkpoint_bandit_state()
         self.db.disconnect()
 
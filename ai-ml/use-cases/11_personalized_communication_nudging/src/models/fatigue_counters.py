@@ -0,0 +1,381 @@
+"""
+Fatigue Counter Store - In-process day/week/month nudge counters per family.
+Counters live in compact NumPy arrays, increments are applied under a lock and
+written behind to nudging.fatigue_tracking in batched upserts.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, date
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+
+PERIODS = ('DAY', 'WEEK', 'MONTH')
+CHECK_NAMES = ('daily', 'weekly', 'monthly')
+
+
+def period_bounds(today: date) -> Dict[str, tuple]:
+    """(period_start, period_end) for the day, week and month containing today."""
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    if month_start.month == 12:
+        month_end = month_start.replace(year=month_start.year + 1, month=1) - timedelta(days=1)
+    else:
+        month_end = month_start.replace(month=month_start.month + 1) - timedelta(days=1)
+    return {
+        'DAY': (today, today),
+        'WEEK': (week_start, week_start + timedelta(days=6)),
+        'MONTH': (month_start, month_end)
+    }
+
+
+class FatigueCounterStore:
+    def __init__(self, limits_for: Callable[[str], Dict[str, int]], flush_batch_size: int = 5000,
+                 flush_interval_seconds: float = 10.0, reload_interval_seconds: float = 300.0,
+                 query_chunk_size: int = 50000, default_vulnerability: str = 'MEDIUM'):
+        """
+        Args:
+            limits_for: Returns max_per_day/week/month for a vulnerability category
+            flush_batch_size: Pending families that trigger a write-behind flush
+            flush_interval_seconds: Flush pending increments at least this often
+            reload_interval_seconds: Re-read counters/cooldowns written by other processes
+            query_chunk_size: Families per vulnerability lookup query
+        """
+        self.limits_for = limits_for
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.reload_interval_seconds = reload_interval_seconds
+        self.query_chunk_size = query_chunk_size
+        self.default_vulnerability = default_vulnerability
+        
+        self._index: Dict[str, int] = {}
+        self._family_ids: List[str] = []
+        self._size = 0
+        self.counts = np.zeros((0, 3), dtype=np.int32)       # DAY, WEEK, MONTH
+        self.vulnerability = np.zeros(0, dtype=np.int16)     # category code, -1 = not loaded
+        self.cooldown_until = np.zeros(0)                    # epoch seconds, 0 = none
+        self._cooldowns: Dict[int, tuple] = {}               # index -> (cooldown_until, reason)
+        
+        # Vulnerability category codes and their limit rows
+        self._categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._limits = np.zeros((0, 3), dtype=np.int32)
+        
+        # Write-behind buffer: (family index, day) -> increments since the last flush,
+        # each carrying the period bounds it was recorded in
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._bounds = None
+        self._loaded_at = 0.0
+        self._last_flush = time.monotonic()
+    
+    def _family_index(self, family_id: str) -> int:
+        """Index for a family, growing the arrays if needed (caller holds the lock)."""
+        idx = self._index.get(family_id)
+        if idx is not None:
+            return idx
+        
+        if self._size == len(self.vulnerability):
+            capacity = max(1024, 2 * self._size)
+            counts = np.zeros((capacity, 3), dtype=np.int32)
+            counts[:self._size] = self.counts[:self._size]
+            vulnerability = np.full(capacity, -1, dtype=np.int16)
+            vulnerability[:self._size] = self.vulnerability[:self._size]
+            cooldown_until = np.zeros(capacity)
+            cooldown_until[:self._size] = self.cooldown_until[:self._size]
+            self.counts, self.vulnerability, self.cooldown_until = counts, vulnerability, cooldown_until
+        
+        idx = self._size
+        self._index[family_id] = idx
+        self._family_ids.append(family_id)
+        self._size += 1
+        return idx
+    
+    def _category_code(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            limits = self.limits_for(category)
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_codes[category] = code
+            self._limits = np.vstack([
+                self._limits,
+                [[limits['max_per_day'], limits['max_per_week'], limits['max_per_month']]]
+            ]).astype(np.int32)
+        return code
+    
+    def ensure_current(self, connection, today: Optional[date] = None):
+        """Loads counters on first use, on period rollover and after the reload interval."""
+        today = today or date.today()
+        bounds = period_bounds(today)
+        stale = time.monotonic() - self._loaded_at >= self.reload_interval_seconds
+        if self._bounds == bounds and not stale:
+            return
+        
+        # Write pending increments before re-reading the counters they add to
+        self.flush(connection)
+        self.load(connection, bounds)
+    
+    def load(self, connection, bounds: Dict[str, tuple]):
+        """Reads current-period counts and active cooldowns for all families."""
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT family_id, period_type, COALESCE(nudge_count, 0)
+                FROM nudging.fatigue_tracking
+                WHERE (period_type = 'DAY' AND period_start = %s)
+                   OR (period_type = 'WEEK' AND period_start = %s)
+                   OR (period_type = 'MONTH' AND period_start = %s);
+            """, (bounds['DAY'][0], bounds['WEEK'][0], bounds['MONTH'][0]))
+            count_rows = cursor.fetchall()
+            
+            cursor.execute("""
+                SELECT DISTINCT ON (family_id) family_id, cooldown_until, cooldown_reason
+                FROM nudging.fatigue_tracking
+                WHERE cooldown_until IS NOT NULL AND cooldown_until > %s
+                ORDER BY family_id, cooldown_until DESC;
+            """, (datetime.now(),))
+            cooldown_rows = cursor.fetchall()
+            connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error loading fatigue counters: {e}")
+            connection.rollback()
+            return
+        
+        period_col = {p: i for i, p in enumerate(PERIODS)}
+        with self._lock:
+            self.counts[:self._size] = 0
+            self.cooldown_until[:self._size] = 0.0
+            self._cooldowns = {}
+            # Vulnerability is re-read lazily after each reload
+            self.vulnerability[:self._size] = -1
+            
+            for family_id, period_type, nudge_count in count_rows:
+                idx = self._family_index(str(family_id))
+                self.counts[idx, period_col[period_type]] = int(nudge_count)
+            
+            for family_id, cooldown_until, reason in cooldown_rows:
+                idx = self._family_index(str(family_id))
+                self.cooldown_until[idx] = cooldown_until.timestamp()
+                self._cooldowns[idx] = (cooldown_until, reason)
+            
+            # Increments recorded since the flush are not in the database yet
+            for (idx, _), entry in self._pending.items():
+                for col, period_type in enumerate(PERIODS):
+                    if entry['bounds'][period_type] == bounds[period_type]:
+                        self.counts[idx, col] += entry['count']
+            
+            self._bounds = bounds
+            self._loaded_at = time.monotonic()
+        
+        print(f"✅ Loaded fatigue counters: {len(count_rows)} period rows, {len(cooldown_rows)} active cooldowns")
+    
+    def _load_vulnerability(self, connection, indices: np.ndarray):
+        """Fills vulnerability codes for families not loaded yet (chunked ANY queries)."""
+        missing = indices[self.vulnerability[indices] < 0]
+        if len(missing) == 0:
+            return
+        
+        missing = np.unique(missing)
+        family_ids = [self._family_ids[i] for i in missing]
+        found = {}
+        try:
+            cursor = connection.cursor()
+            for start in range(0, len(family_ids), self.query_chunk_size):
+                cursor.execute("""
+                    SELECT family_id, vulnerability_category
+                    FROM nudging.family_consent
+                    WHERE family_id = ANY(%s);
+                """, (family_ids[start:start + self.query_chunk_size],))
+                found.update({str(f): v for f, v in cursor.fetchall() if v})
+            connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error loading vulnerability categories: {e}")
+            connection.rollback()
+        
+        with self._lock:
+            for idx, family_id in zip(missing, family_ids):
+                self.vulnerability[idx] = self._category_code(found.get(family_id, self.default_vulnerability))
+    
+    def check_many(self, connection, family_ids: Iterable[str], now: Optional[datetime] = None) -> pd.DataFrame:
+        """Vectorized fatigue check; one row per family in input order."""
+        now = now or datetime.now()
+        self.ensure_current(connection, now.date())
+        
+        family_ids = [str(f) for f in family_ids]
+        with self._lock:
+            indices = np.fromiter((self._family_index(f) for f in family_ids), dtype=np.int64, count=len(family_ids))
+        self._load_vulnerability(connection, indices)
+        
+        with self._lock:
+            counts = self.counts[indices].copy()
+            codes = self.vulnerability[indices].copy()
+            cooldown_until = self.cooldown_until[indices].copy()
+            limits = self._limits[codes] if len(codes) else np.zeros((0, 3), dtype=np.int32)
+            in_cooldown = cooldown_until > now.timestamp()
+            cooldowns = {int(pos): self._cooldowns.get(int(indices[pos]), (None, None))
+                         for pos in np.nonzero(in_cooldown)[0]}
+        
+        within = counts < limits
+        allowed = ~in_cooldown & within.all(axis=1)
+        
+        # Bitmask of failed checks -> the same reason text as check_fatigue
+        failed_mask = (~within).astype(np.int64) @ np.array([1, 2, 4])
+        failed_text = np.array([
+            ', '.join(name for bit, name in enumerate(CHECK_NAMES) if mask & (1 << bit))
+            for mask in range(8)
+        ], dtype=object)
+        reason = np.where(failed_mask == 0, 'Within fatigue limits',
+                          'Fatigue limit exceeded: ' + failed_text[failed_mask]).astype(object)
+        cooldown_column = np.full(len(family_ids), None, dtype=object)
+        for pos, (until, cooldown_reason) in cooldowns.items():
+            reason[pos] = f'Cooldown period active: {cooldown_reason}'
+            cooldown_column[pos] = until
+        
+        return pd.DataFrame({
+            'family_id': family_ids,
+            'allowed': allowed,
+            'reason': reason,
+            'in_cooldown': in_cooldown,
+            'cooldown_until': cooldown_column,
+            'vulnerability_category': np.array(self._categories, dtype=object)[codes] if len(codes) else [],
+            'day_count': counts[:, 0],
+            'week_count': counts[:, 1],
+            'month_count': counts[:, 2],
+            'max_per_day': limits[:, 0],
+            'max_per_week': limits[:, 1],
+            'max_per_month': limits[:, 2]
+        })
+    
+    def increment(self, connection, family_id: str, channel_code: str, action_type: str,
+                  now: Optional[datetime] = None):
+        """Atomically bumps the day/week/month counters; the database write happens on flush."""
+        now = now or datetime.now()
+        self.ensure_current(connection, now.date())
+        
+        with self._lock:
+            idx = self._family_index(str(family_id))
+            self.counts[idx] += 1
+            key = (idx, now.date())
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = {
+                    'count': 0, 'channels': Counter(), 'actions': Counter(), 'last_at': now,
+                    'bounds': period_bounds(now.date())
+                }
+            entry['count'] += 1
+            entry['channels'][channel_code] += 1
+            entry['actions'][action_type] += 1
+            entry['last_at'] = max(entry['last_at'], now)
+            due = (len(self._pending) >= self.flush_batch_size or
+                   time.monotonic() - self._last_flush >= self.flush_interval_seconds)
+        
+        if due:
+            self.flush(connection)
+    
+    def set_cooldown(self, family_id: str, cooldown_until: datetime, reason: str):
+        with self._lock:
+            idx = self._family_index(str(family_id))
+            if cooldown_until.timestamp() >= self.cooldown_until[idx]:
+                self.cooldown_until[idx] = cooldown_until.timestamp()
+                self._cooldowns[idx] = (cooldown_until, reason)
+    
+    def flush(self, connection) -> int:
+        """Writes pending increments as one batched upsert (three period rows per family)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            family_ids = {idx: self._family_ids[idx] for idx, _ in pending}
+        
+        if not pending:
+            return 0
+        
+        # Increments go to the periods they were recorded in; days of one week/month merge
+        # into a single row since an upsert cannot touch the same row twice
+        merged = {}
+        for (idx, _), entry in pending.items():
+            for period_type in PERIODS:
+                period_start, period_end = entry['bounds'][period_type]
+                row = merged.get((idx, period_type, period_start))
+                if row is None:
+                    merged[(idx, period_type, period_start)] = row = {
+                        'period_end': period_end, 'count': 0,
+                        'channels': Counter(), 'actions': Counter(), 'last_at': entry['last_at']
+                    }
+                row['count'] += entry['count']
+                row['channels'].update(entry['channels'])
+                row['actions'].update(entry['actions'])
+                row['last_at'] = max(row['last_at'], entry['last_at'])
+        
+        rows = [
+            (family_ids[idx], period_type, period_start, row['period_end'], row['count'],
+             json.dumps(dict(row['channels'])), json.dumps(dict(row['actions'])), row['last_at'])
+            for (idx, period_type, period_start), row in merged.items()
+        ]
+        
+        merge_counts = """(
+                    SELECT COALESCE(jsonb_object_agg(key, total), '{{}}'::jsonb)
+                    FROM (
+                        SELECT key, SUM(value::int) AS total
+                        FROM (
+                            SELECT * FROM jsonb_each_text(COALESCE(ft.{col}, '{{}}'::jsonb))
+                            UNION ALL
+                            SELECT * FROM jsonb_each_text(EXCLUDED.{col})
+                        ) merged
+                        GROUP BY key
+                    ) totals
+                )"""
+        
+        try:
+            cursor = connection.cursor()
+            execute_values(
+                cursor,
+                f"""
+                INSERT INTO nudging.fatigue_tracking AS ft (
+                    family_id, period_type, period_start, period_end,
+                    nudge_count, channel_counts, action_type_counts, last_nudge_at
+                ) VALUES %s
+                ON CONFLICT (family_id, period_type, period_start) DO UPDATE SET
+                    nudge_count = COALESCE(ft.nudge_count, 0) + EXCLUDED.nudge_count,
+                    channel_counts = {merge_counts.format(col='channel_counts')},
+                    action_type_counts = {merge_counts.format(col='action_type_counts')},
+                    last_nudge_at = GREATEST(ft.last_nudge_at, EXCLUDED.last_nudge_at),
+                    updated_at = CURRENT_TIMESTAMP;
+                """,
+                rows,
+                template="(%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb, %s)",
+                page_size=1000
+            )
+            connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error flushing fatigue counters: {e}")
+            connection.rollback()
+            # Keep the increments (and their periods) for the next flush
+            with self._lock:
+                for key, entry in pending.items():
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = entry
+                        continue
+                    current['count'] += entry['count']
+                    current['channels'].update(entry['channels'])
+                    current['actions'].update(entry['actions'])
+                    current['last_at'] = max(current['last_at'], entry['last_at'])
+            return 0
+        
+        return len(family_ids)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'families': self._size,
+                'pending_families': len({idx for idx, _ in self._pending}),
+                'active_cooldowns': len(self._cooldowns)
+            }
+
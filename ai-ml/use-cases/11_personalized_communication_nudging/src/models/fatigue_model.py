@@ -15,6 +15,12 @@ from dateutil.relativedelta import relativedelta
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utils"))
 from db_connector import DBConnector
 
+try:
+    from .fatigue_counters import FatigueCounterStore
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from fatigue_counters import FatigueCounterStore
+
 
 class FatigueModel:
     def __init__(self, config_path=None):
@@ -41,6 +47,18 @@ class FatigueModel:
         self.vulnerability_adjustments = self.config.get('vulnerability_adjustments', {})
         self.cooldown_periods = self.config.get('cooldown_periods', {})
 
+        # In-process counters with write-behind to nudging.fatigue_tracking
+        counter_config = self.config.get('counter_service', {})
+        self.counters = None
+        if counter_config.get('enabled', True):
+            self.counters = FatigueCounterStore(
+                self._get_limits_for_vulnerability,
+                flush_batch_size=counter_config.get('flush_batch_size', 5000),
+                flush_interval_seconds=counter_config.get('flush_interval_seconds', 10),
+                reload_interval_seconds=counter_config.get('reload_interval_seconds', 300),
+                query_chunk_size=counter_config.get('query_chunk_size', 50000)
+            )
+    
     def check_fatigue(self, family_id: str, proposed_channel: str = None) -> Dict[str, Any]:
         """
         Checks if a family can receive a nudge based on fatigue limits.
@@ -55,6 +73,9 @@ class FatigueModel:
         """
         if not self.enabled:
             return {'allowed': True, 'reason': 'Fatigue tracking disabled'}
+        
+        if self.counters is not None:
+            return self._fatigue_result(self.counters.check_many(self.db.connection, [family_id]).iloc[0])
 
         today = date.today()
         now = datetime.now()
@@ -102,10 +123,67 @@ class FatigueModel:
                 'failed_checks': failed_checks
             }
 
+    def check_fatigue_many(self, family_ids: List[str]) -> pd.DataFrame:
+        """
+        Checks fatigue limits for many families at once.
+        Returns one row per family: family_id, allowed, reason, in_cooldown, cooldown_until,
+        vulnerability_category, day/week/month_count and max_per_day/week/month.
+        """
+        if not self.enabled:
+            return pd.DataFrame({
+                'family_id': [str(f) for f in family_ids],
+                'allowed': True,
+                'reason': 'Fatigue tracking disabled'
+            })
+        
+        if self.counters is not None:
+            return self.counters.check_many(self.db.connection, family_ids)
+        
+        return pd.DataFrame([{'family_id': f, **self.check_fatigue(f)} for f in family_ids])
+    
+    def _fatigue_result(self, row: pd.Series) -> Dict[str, Any]:
+        """Converts a check_fatigue_many row to the check_fatigue result format."""
+        if row['in_cooldown']:
+            cooldown_reason = row['reason'].replace('Cooldown period active: ', '', 1)
+            return {
+                'allowed': False,
+                'reason': row['reason'],
+                'cooldown_until': row['cooldown_until'],
+                'cooldown_reason': cooldown_reason
+            }
+        
+        current_counts = {'day': int(row['day_count']), 'week': int(row['week_count']), 'month': int(row['month_count'])}
+        limits = {
+            'max_per_day': int(row['max_per_day']),
+            'max_per_week': int(row['max_per_week']),
+            'max_per_month': int(row['max_per_month'])
+        }
+        result = {
+            'allowed': bool(row['allowed']),
+            'reason': row['reason'],
+            'vulnerability_category': row['vulnerability_category'],
+            'current_counts': current_counts,
+            'limits': limits
+        }
+        
+        if row['allowed']:
+            result['remaining'] = {
+                'day': max(0, limits['max_per_day'] - current_counts['day']),
+                'week': max(0, limits['max_per_week'] - current_counts['week']),
+                'month': max(0, limits['max_per_month'] - current_counts['month'])
+            }
+        else:
+            result['failed_checks'] = row['reason'].split(': ', 1)[1].split(', ')
+        return result
+    
     def record_nudge(self, family_id: str, channel_code: str, action_type: str):
         """Records a nudge send to update fatigue counters."""
         if not self.enabled:
             return
+        
+        if self.counters is not None:
+            self.counters.increment(self.db.connection, family_id, channel_code, action_type)
+            return
 
         today = date.today()
         now = datetime.now()
@@ -152,6 +230,8 @@ class FatigueModel:
                 cursor.execute(insert_query, (family_id, today, today, cooldown_until, reason))
             
             self.db.connection.commit()
+            if self.counters is not None:
+                self.counters.set_cooldown(family_id, cooldown_until, reason)
             print(f"✅ Set cooldown for family {family_id}: {reason} until {cooldown_until}")
         except Exception as e:
             print(f"⚠️  Error setting cooldown: {e}")
@@ -311,6 +391,13 @@ class FatigueModel:
             print(f"⚠️  Error incrementing counter: {e}")
             self.db.connection.rollback()
 
+    def flush_counters(self) -> int:
+        """Writes pending counter increments to PostgreSQL."""
+        if self.counters is None:
+            return 0
+        return self.counters.flush(self.db.connection)
+    
     def disconnect(self):
+        self.flush_counters()
         self.db.disconnect()
 
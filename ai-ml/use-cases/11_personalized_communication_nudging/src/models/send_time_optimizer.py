@@ -7,6 +7,7 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import pandas as pd
+import numpy as np
 import yaml
 from datetime import datetime, timedelta, time
 
@@ -212,6 +213,153 @@ class SendTimeOptimizer:
         
         return scheduled_time
 
+    def _load_preferred_windows_bulk(self, family_ids: List[str], chunk_size: int) -> pd.DataFrame:
+        """Top time window per (family, channel, action_type) incl. general (NULL action) rows."""
+        rows = []
+        try:
+            cursor = self.db.connection.cursor()
+            for start in range(0, len(family_ids), chunk_size):
+                cursor.execute("""
+                    SELECT DISTINCT ON (family_id, channel_code, action_type)
+                        family_id, channel_code, action_type, time_window
+                    FROM nudging.send_time_preferences
+                    WHERE family_id = ANY(%s)
+                    ORDER BY family_id, channel_code, action_type, preference_score DESC;
+                """, (family_ids[start:start + chunk_size],))
+                rows.extend(cursor.fetchall())
+        except Exception as e:
+            print(f"⚠️  Error loading preferred time windows: {e}")
+            self.db.connection.rollback()
+        return pd.DataFrame(rows, columns=['family_id', 'channel_code', 'action_type', 'time_window'], dtype=object)
+    
+    def _load_preferred_days_bulk(self, family_ids: List[str], chunk_size: int) -> pd.DataFrame:
+        """Best responding day of week per (family, channel, action_type) above the 0.3 threshold."""
+        rows = []
+        try:
+            cursor = self.db.connection.cursor()
+            for start in range(0, len(family_ids), chunk_size):
+                cursor.execute("""
+                    SELECT DISTINCT ON (family_id, channel_code, action_type)
+                        family_id, channel_code, action_type, day_of_week, response_rate
+                    FROM (
+                        SELECT family_id, channel_code, action_type, day_of_week,
+                               AVG(CASE WHEN responded THEN 1.0 ELSE 0.0 END) AS response_rate
+                        FROM nudging.nudge_history
+                        WHERE family_id = ANY(%s)
+                        GROUP BY family_id, channel_code, action_type, day_of_week
+                    ) rates
+                    ORDER BY family_id, channel_code, action_type, response_rate DESC;
+                """, (family_ids[start:start + chunk_size],))
+                rows.extend(cursor.fetchall())
+        except Exception as e:
+            print(f"⚠️  Error loading preferred days: {e}")
+            self.db.connection.rollback()
+        
+        days = pd.DataFrame(rows, columns=['family_id', 'channel_code', 'action_type', 'day_of_week', 'response_rate'], dtype=object)
+        days = days[pd.to_numeric(days['response_rate'], errors='coerce') > 0.3]
+        return days.drop(columns='response_rate')
+    
+    def select_best_times_bulk(self, nudges: pd.DataFrame, now: Optional[datetime] = None,
+                               chunk_size: int = 50000) -> pd.DataFrame:
+        """
+        Vectorized select_best_time for many nudges.
+        
+        Args:
+            nudges: DataFrame with family_id, channel_code, action_type, urgency
+            now: Reference time (default: current time)
+            chunk_size: Families per lookup query
+        
+        Returns:
+            DataFrame (same index) with scheduled_time, time_window, day_of_week, is_weekend,
+            confidence, reason
+        """
+        now = now or datetime.now()
+        urgent = nudges['urgency'].isin(['CRITICAL', 'HIGH']).to_numpy()
+        
+        if not self.enabled:
+            next_morning = (now + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+            scheduled = pd.Series(np.where(urgent, now + timedelta(hours=1), next_morning), index=nudges.index)
+            scheduled = pd.to_datetime(scheduled)
+            return pd.DataFrame({
+                'scheduled_time': scheduled,
+                'time_window': 'MORNING',
+                'day_of_week': scheduled.dt.weekday,
+                'is_weekend': scheduled.dt.weekday >= 5,
+                'confidence': 0.5,
+                'reason': 'Fallback heuristic (optimization disabled)'
+            }, index=nudges.index)
+        
+        keys = pd.DataFrame({
+            'family_id': nudges['family_id'].astype(str).to_numpy(dtype=object),
+            'channel_code': nudges['channel_code'].to_numpy(dtype=object),
+            'action_type': nudges['action_type'].to_numpy(dtype=object)
+        })
+        family_ids = list(pd.unique(keys['family_id']))
+        
+        # Preferred window: action-specific row, else the general row
+        windows = self._load_preferred_windows_bulk(family_ids, chunk_size)
+        specific = keys.merge(windows[windows['action_type'].notna()], on=['family_id', 'channel_code', 'action_type'], how='left')['time_window']
+        general = keys.merge(
+            windows[windows['action_type'].isna()].drop(columns='action_type'),
+            on=['family_id', 'channel_code'], how='left'
+        )['time_window']
+        preferred_window = specific.where(specific.notna(), general).to_numpy(dtype=object)
+        
+        days = self._load_preferred_days_bulk(family_ids, chunk_size)
+        preferred_day = pd.to_numeric(
+            keys.merge(days, on=['family_id', 'channel_code', 'action_type'], how='left')['day_of_week'], errors='coerce'
+        ).to_numpy()
+        
+        # Target day (same rules as _calculate_scheduled_time)
+        today = now.date()
+        late = now.hour >= 20
+        has_day = ~np.isnan(preferred_day)
+        days_ahead = np.where(has_day, (np.nan_to_num(preferred_day) - today.weekday()) % 7, 1 if late else 0)
+        days_ahead = np.where(has_day & (days_ahead == 0) & late, 7, days_ahead)
+        
+        window_hours = {w['name']: (w['start_hour'] + w['end_hour']) // 2 for w in self.time_windows}
+        target_hour = np.array([window_hours.get(w, 10) for w in preferred_window], dtype=np.int64).reshape(-1)
+        
+        if not late:
+            target_hour = np.where(urgent, min(20, now.hour + 1), target_hour)
+            days_ahead = np.where(urgent, 0, days_ahead)
+        
+        midnight = pd.Timestamp(datetime.combine(today, time(0, 0)))
+        scheduled = (midnight
+                     + pd.to_timedelta(days_ahead.astype(np.int64), unit='D')
+                     + pd.to_timedelta(target_hour, unit='h'))
+        scheduled = pd.Series(scheduled, index=nudges.index)
+        scheduled = scheduled.where(scheduled >= pd.Timestamp(now), scheduled + pd.Timedelta(hours=1))
+        
+        # SMS restrictions (same rules as _apply_restrictions)
+        sms = (nudges['channel_code'] == 'SMS').to_numpy()
+        if sms.any():
+            no_after = self.restrictions.get('no_sms_after_hour', 20)
+            no_before = self.restrictions.get('no_sms_before_hour', 8)
+            hour = scheduled.dt.hour.to_numpy()
+            day_start = scheduled.dt.normalize()
+            too_late = sms & (hour >= no_after)
+            too_early = sms & (hour < no_before)
+            scheduled = scheduled.mask(too_late, day_start + pd.Timedelta(days=1, hours=no_before))
+            scheduled = scheduled.mask(too_early, day_start + pd.Timedelta(hours=no_before))
+            
+            if self.restrictions.get('no_weekend_sms', False):
+                weekday = scheduled.dt.weekday.to_numpy()
+                weekend = sms & (weekday >= 5)
+                shift = (7 - weekday) % 7
+                shift = np.where(shift == 0, 7, shift)
+                scheduled = scheduled.mask(weekend, scheduled + pd.to_timedelta(shift, unit='D'))
+        
+        time_window = np.where(pd.isna(preferred_window), 'MORNING', preferred_window).astype(object)
+        return pd.DataFrame({
+            'scheduled_time': scheduled,
+            'time_window': time_window,
+            'day_of_week': scheduled.dt.weekday,
+            'is_weekend': scheduled.dt.weekday >= 5,
+            'confidence': 0.75,
+            'reason': 'Optimized based on historical engagement for ' + pd.Series(time_window, index=nudges.index)
+        }, index=nudges.index)
+    
     def _fallback_time_selection(self, urgency: str) -> Dict[str, Any]:
         """Fallback time selection when optimization is disabled."""
         now = datetime.now()
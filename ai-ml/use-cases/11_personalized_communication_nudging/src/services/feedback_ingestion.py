@@ -0,0 +1,455 @@
+"""
+Feedback Ingestion - Buffered, windowed processing of nudge feedback events.
+Events are accepted into an in-memory ring buffer, aggregated per
+(family, channel, action, template) over short windows and applied in bulk.
+Events of a failed window are put back into the buffer up to max_retries times.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+# Add shared utils to path
+shared_utils_path = Path(__file__).parent.parent.parent.parent.parent / "shared" / "utils"
+if str(shared_utils_path) not in sys.path:
+    sys.path.insert(0, str(shared_utils_path))
+from db_connector import copy_rows
+
+
+# Event type -> nudge status / timestamp column (same mapping as NudgeOrchestrator.record_feedback)
+EVENT_STATUS = {
+    'DELIVERED': 'DELIVERED',
+    'OPENED': 'OPENED',
+    'CLICKED': 'CLICKED',
+    'RESPONDED': 'RESPONDED',
+    'COMPLETED': 'COMPLETED',
+    'FAILED': 'FAILED'
+}
+EVENT_TIME_COLUMNS = {
+    'DELIVERED': 'delivered_at',
+    'OPENED': 'opened_at',
+    'CLICKED': 'clicked_at',
+    'RESPONDED': 'responded_at',
+    'COMPLETED': 'completed_at'
+}
+COUNTER_EVENTS = {
+    'DELIVERED': 'total_sends',
+    'OPENED': 'total_opens',
+    'CLICKED': 'total_clicks',
+    'RESPONDED': 'total_responses',
+    'COMPLETED': 'total_completions'
+}
+COUNTER_COLUMNS = list(COUNTER_EVENTS.values())
+EVENT_FIELDS = ['nudge_id', 'event_type', 'event_time', 'metadata', 'attempts']
+
+
+class FeedbackRingBuffer:
+    """Fixed-capacity FIFO of feedback events; new events are rejected (and counted) when full."""
+    
+    def __init__(self, capacity: int = 100000):
+        self.capacity = capacity
+        self._slots: List[Optional[Tuple]] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.dropped = 0
+    
+    def put(self, event: Tuple) -> bool:
+        with self._lock:
+            if self._size == self.capacity:
+                self.dropped += 1
+                return False
+            self._slots[(self._head + self._size) % self.capacity] = event
+            self._size += 1
+            self.accepted += 1
+            return True
+    
+    def drain(self, max_events: Optional[int] = None) -> List[Tuple]:
+        """Removes and returns up to max_events events in arrival order."""
+        with self._lock:
+            count = self._size if max_events is None else min(max_events, self._size)
+            end = self._head + count
+            if end <= self.capacity:
+                events = self._slots[self._head:end]
+                self._slots[self._head:end] = [None] * count
+            else:
+                wrap = end - self.capacity
+                events = self._slots[self._head:] + self._slots[:wrap]
+                self._slots[self._head:] = [None] * (self.capacity - self._head)
+                self._slots[:wrap] = [None] * wrap
+            self._head = end % self.capacity
+            self._size -= count
+            return events
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+
+class FeedbackIngestionService:
+    def __init__(self, db, fatigue_model, content_personalizer, config: Optional[Dict[str, Any]] = None,
+                 learning_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            db: Dedicated DBConnector for the ingestion worker
+            fatigue_model: FatigueModel (COMPLETED events count towards fatigue)
+            content_personalizer: ContentPersonalizer (bandit feedback)
+            config: nudging.feedback_ingestion settings
+            learning_config: nudging.learning settings (engagement weights, smoothing)
+        """
+        config = config or {}
+        learning_config = learning_config or {}
+        self.db = db
+        self.fatigue_model = fatigue_model
+        self.content_personalizer = content_personalizer
+        
+        self.buffer = FeedbackRingBuffer(config.get('buffer_capacity', 100000))
+        self.window_seconds = config.get('window_seconds', 1.0)
+        self.max_events_per_window = config.get('max_events_per_window', 50000)
+        self.nudge_cache_size = config.get('nudge_cache_size', 200000)
+        self.write_history = config.get('write_history', True)
+        self.max_retries = config.get('max_retries', 3)
+        
+        self.enable_feedback_loop = learning_config.get('enable_feedback_loop', True)
+        self.smoothing_samples = learning_config.get('min_samples_for_learning', 10)
+        self.engagement_weights = learning_config.get('engagement_weights', {
+            'OPENED': 0.1, 'CLICKED': 0.2, 'RESPONDED': 0.3, 'COMPLETED': 0.4
+        })
+        
+        # nudge_id -> (family_id, action_type, channel_code, template_id)
+        self._nudge_cache: Dict[str, Tuple] = {}
+        self._process_lock = threading.Lock()
+        
+        self.events_processed = 0
+        self.events_rejected = 0
+        self.events_unknown_nudge = 0
+        self.events_failed = 0
+        self.events_retried = 0
+        self.windows_processed = 0
+        self.last_window_ms = 0.0
+    
+    def ingest(self, nudge_id: str, event_type: str, metadata: Optional[Dict[str, Any]] = None,
+               event_time: Optional[datetime] = None) -> bool:
+        """Accepts a feedback event into the ring buffer. Returns False if rejected."""
+        if event_type not in EVENT_STATUS:
+            self.events_rejected += 1
+            return False
+        try:
+            nudge_id = str(uuid.UUID(str(nudge_id)))
+        except ValueError:
+            self.events_rejected += 1
+            return False
+        return self.buffer.put((nudge_id, event_type, event_time or datetime.now(), metadata, 0))
+    
+    def run_worker(self, stop_event: Optional[threading.Event] = None):
+        """Processes one window every window_seconds until stop_event is set, then drains the buffer."""
+        stop_event = stop_event or threading.Event()
+        print(f"🔁 Feedback ingestion worker started (window {self.window_seconds}s, "
+              f"buffer {self.buffer.capacity} events)")
+        
+        while not stop_event.wait(self.window_seconds):
+            self.process_window()
+        
+        while len(self.buffer):
+            self.process_window()
+    
+    def process_window(self) -> Dict[str, Any]:
+        """Drains one window of events and applies it in bulk."""
+        with self._process_lock:
+            started = time.monotonic()
+            raw = self.buffer.drain(self.max_events_per_window)
+            if not raw:
+                return {'events': 0}
+            
+            events = pd.DataFrame(raw, columns=EVENT_FIELDS, dtype=object)
+            events['event_time'] = pd.to_datetime(events['event_time'])
+            events, unresolved = self._attach_nudges(events)
+            retried = self._requeue(unresolved)
+            if events.empty:
+                return {'events': len(raw), 'applied': 0, 'retried': retried}
+            
+            try:
+                cursor = self.db.connection.cursor()
+                self._apply_nudge_updates(cursor, events)
+                if self.write_history:
+                    self._copy_history(cursor, events)
+                if self.enable_feedback_loop:
+                    deltas = self._aggregate(events)
+                    self._apply_channel_preferences(cursor, deltas)
+                    self._apply_content_effectiveness(cursor, deltas)
+                self.db.connection.commit()
+            except Exception as e:
+                print(f"⚠️  Error applying feedback window ({len(events)} events): {e}")
+                self.db.connection.rollback()
+                retried += self._requeue(events)
+                return {'events': len(raw), 'applied': 0, 'retried': retried, 'error': str(e)}
+            
+            # In-memory learners (micro-batched / write-behind on their own)
+            for row in events.itertuples(index=False):
+                if row.event_type == 'COMPLETED':
+                    self.fatigue_model.record_nudge(row.family_id, row.channel_code, row.action_type)
+                if self.enable_feedback_loop and row.template_id:
+                    self.content_personalizer.record_feedback(row.template_id, row.action_type,
+                                                              row.channel_code, row.event_type)
+            
+            self.events_processed += len(events)
+            self.windows_processed += 1
+            self.last_window_ms = (time.monotonic() - started) * 1000
+            return {'events': len(raw), 'applied': len(events), 'retried': retried,
+                    'duration_ms': round(self.last_window_ms, 1)}
+    
+    def _requeue(self, events: pd.DataFrame) -> int:
+        """
+        Puts events back into the buffer for the next window. Events that already
+        had max_retries attempts (or find the buffer full) are counted as failed.
+        """
+        requeued = 0
+        for event in events[EVENT_FIELDS].itertuples(index=False, name=None):
+            attempts = event[-1] + 1
+            if attempts <= self.max_retries and self.buffer.put(event[:-1] + (attempts,)):
+                requeued += 1
+            else:
+                self.events_failed += 1
+        
+        if requeued < len(events):
+            print(f"⚠️  Dropped {len(events) - requeued} feedback events (retries exhausted or buffer full)")
+        self.events_retried += requeued
+        return requeued
+    
+    def _attach_nudges(self, events: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Adds family/action/channel/template per event. Unknown nudges are dropped;
+        if the lookup itself fails the unresolved events are returned for a retry.
+        
+        Returns:
+            (events with nudge details, unresolved events)
+        """
+        nudge_ids = list(pd.unique(events['nudge_id']))
+        missing = [n for n in nudge_ids if n not in self._nudge_cache]
+        lookup_failed = False
+        if missing:
+            try:
+                cursor = self.db.connection.cursor()
+                cursor.execute("""
+                    SELECT nudge_id::text, family_id, action_type, scheduled_channel, template_id::text
+                    FROM nudging.nudges
+                    WHERE nudge_id = ANY(%s::uuid[]);
+                """, (missing,))
+                rows = cursor.fetchall()
+                self.db.connection.commit()
+            except Exception as e:
+                print(f"⚠️  Error looking up nudges for feedback: {e}")
+                self.db.connection.rollback()
+                rows = []
+                lookup_failed = True
+            
+            if len(self._nudge_cache) + len(rows) > self.nudge_cache_size:
+                self._nudge_cache = {}
+            for nudge_id, family_id, action_type, channel_code, template_id in rows:
+                self._nudge_cache[nudge_id] = (family_id, action_type, channel_code, template_id)
+        
+        info = [self._nudge_cache.get(n) for n in events['nudge_id']]
+        known = np.array([i is not None for i in info], dtype=bool)
+        if lookup_failed:
+            unresolved = events[~known]
+        else:
+            unresolved = events.iloc[:0]
+            self.events_unknown_nudge += int((~known).sum())
+        
+        events = events[known].reset_index(drop=True)
+        info = pd.DataFrame([i for i in info if i is not None],
+                            columns=['family_id', 'action_type', 'channel_code', 'template_id'], dtype=object)
+        return pd.concat([events, info], axis=1), unresolved
+    
+    def _apply_nudge_updates(self, cursor, events: pd.DataFrame):
+        """One UPDATE for all nudges in the window (latest timestamp per event, latest status)."""
+        nudges = events.drop_duplicates('nudge_id', keep='last').set_index('nudge_id')[['event_type']]
+        times = events[events['event_type'].isin(list(EVENT_TIME_COLUMNS))].pivot_table(
+            index='nudge_id', columns='event_type', values='event_time', aggfunc='max'
+        ).reindex(index=nudges.index, columns=list(EVENT_TIME_COLUMNS))
+        failed = events[events['event_type'] == 'FAILED'].drop_duplicates('nudge_id', keep='last').set_index('nudge_id')
+        
+        update = pd.DataFrame({'nudge_id': nudges.index}, index=nudges.index)
+        for event_type, column in EVENT_TIME_COLUMNS.items():
+            update[column] = times[event_type].astype(object).where(times[event_type].notna(), None)
+        update['status'] = nudges['event_type'].map(EVENT_STATUS)
+        reasons = failed['metadata'].map(lambda m: m.get('reason', 'Unknown') if isinstance(m, dict) else 'Unknown')
+        update['failed_reason'] = reasons.reindex(nudges.index).astype(object).where(lambda r: r.notna(), None)
+        rows = list(update.itertuples(index=False, name=None))
+        
+        execute_values(
+            cursor,
+            """
+            UPDATE nudging.nudges AS n SET
+                delivery_status = CASE WHEN v.delivered_at IS NOT NULL THEN 'DELIVERED' ELSE n.delivery_status END,
+                delivered_at = COALESCE(v.delivered_at, n.delivered_at),
+                opened_at = COALESCE(v.opened_at, n.opened_at),
+                clicked_at = COALESCE(v.clicked_at, n.clicked_at),
+                responded_at = COALESCE(v.responded_at, n.responded_at),
+                completed_at = COALESCE(v.completed_at, n.completed_at),
+                status = CASE WHEN v.status = 'DELIVERED' AND n.status <> 'SENT' THEN n.status ELSE v.status END,
+                failed_reason = COALESCE(v.failed_reason, n.failed_reason),
+                updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(nudge_id, delivered_at, opened_at, clicked_at, responded_at,
+                                  completed_at, status, failed_reason)
+            WHERE n.nudge_id = v.nudge_id;
+            """,
+            rows,
+            template="(%s::uuid, %s::timestamp, %s::timestamp, %s::timestamp, %s::timestamp, %s::timestamp, %s, %s)",
+            page_size=1000
+        )
+    
+    def _copy_history(self, cursor, events: pd.DataFrame):
+        """COPY one nudge_history row per event (same flags as NudgeOrchestrator._add_to_history)."""
+        hour = events['event_time'].dt.hour
+        weekday = events['event_time'].dt.weekday
+        history = pd.DataFrame({
+            'nudge_id': events['nudge_id'],
+            'family_id': events['family_id'],
+            'channel_code': events['channel_code'],
+            'action_type': events['action_type'],
+            'template_id': events['template_id'],
+            'sent_time': events['event_time'],
+            'time_window': np.select(
+                [(hour >= 9) & (hour < 12), (hour >= 12) & (hour < 17), (hour >= 17) & (hour < 20)],
+                ['MORNING', 'AFTERNOON', 'EVENING'], default='NIGHT'
+            ),
+            'day_of_week': weekday,
+            'is_weekend': weekday >= 5
+        })
+        for event_type, flag in [('DELIVERED', 'delivered'), ('OPENED', 'opened'), ('CLICKED', 'clicked'),
+                                 ('RESPONDED', 'responded'), ('COMPLETED', 'completed'), ('IGNORED', 'ignored')]:
+            history[flag] = events['event_type'] == event_type
+        
+        copy_rows(cursor, 'nudging.nudge_history', history)
+    
+    def _aggregate(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Event counts per (family, channel, action, template) for the window."""
+        counted = events[events['event_type'].isin(list(COUNTER_EVENTS))]
+        counts = pd.crosstab(
+            [counted['family_id'], counted['channel_code'], counted['action_type'],
+             counted['template_id'].fillna('')],
+            counted['event_type']
+        )
+        counts = counts.reindex(columns=list(COUNTER_EVENTS), fill_value=0).rename(columns=COUNTER_EVENTS)
+        counts.index.names = ['family_id', 'channel_code', 'action_type', 'template_id']
+        return counts.reset_index()
+    
+    def _engagement_sql(self, total: Dict[str, str]) -> Tuple[str, str]:
+        """
+        SQL for (engagement_rate, smoothed score) from running totals (column -> SQL expression).
+        Engagement is a weighted rate per send; the score shrinks it towards 50
+        until min_samples_for_learning sends have been seen.
+        """
+        weighted = ' + '.join(
+            f"{float(self.engagement_weights.get(event, 0.0))} * {total[column]}"
+            for event, column in COUNTER_EVENTS.items() if event != 'DELIVERED'
+        )
+        denominator = f"GREATEST({', '.join(total[c] for c in COUNTER_COLUMNS)}, 1)"
+        rate = f"LEAST(100.0, 100.0 * ({weighted}) / {denominator})"
+        k = float(self.smoothing_samples)
+        score = f"((50.0 * {k} + {rate} * {denominator}) / ({k} + {denominator}))"
+        return rate, score
+    
+    @staticmethod
+    def _rate_sql(total: Dict[str, str]) -> List[Tuple[str, str]]:
+        """(column, SQL) for the per-event rates of content_effectiveness."""
+        denominator = f"GREATEST({', '.join(total[c] for c in COUNTER_COLUMNS)}, 1)"
+        return [
+            (name, f"LEAST(100.0, 100.0 * {total[column]} / {denominator})")
+            for name, column in [('open_rate', 'total_opens'), ('click_rate', 'total_clicks'),
+                                 ('response_rate', 'total_responses'), ('completion_rate', 'total_completions')]
+        ]
+    
+    def _apply_channel_preferences(self, cursor, deltas: pd.DataFrame):
+        """Adds window counts to channel_preferences (action-specific rows) and recomputes scores."""
+        per_channel = deltas.groupby(['family_id', 'channel_code', 'action_type'], as_index=False)[COUNTER_COLUMNS].sum()
+        if per_channel.empty:
+            return
+        
+        new_rate, new_score = self._engagement_sql({c: f"v.{c}" for c in COUNTER_COLUMNS})
+        summed = {c: f"(cp.{c} + EXCLUDED.{c})" for c in COUNTER_COLUMNS}
+        rate, score = self._engagement_sql(summed)
+        columns = ', '.join(COUNTER_COLUMNS)
+        
+        execute_values(
+            cursor,
+            f"""
+            INSERT INTO nudging.channel_preferences AS cp (
+                family_id, channel_code, action_type, preference_score, engagement_rate,
+                {columns}, last_updated_at
+            )
+            SELECT v.family_id, v.channel_code, v.action_type, {new_score}, {new_rate},
+                   {', '.join(f'v.{c}' for c in COUNTER_COLUMNS)}, CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(family_id, channel_code, action_type, {columns})
+            ON CONFLICT (family_id, channel_code, action_type) DO UPDATE SET
+                {', '.join(f'{c} = {summed[c]}' for c in COUNTER_COLUMNS)},
+                engagement_rate = {rate},
+                preference_score = {score},
+                last_updated_at = CURRENT_TIMESTAMP;
+            """,
+            list(per_channel.itertuples(index=False, name=None)),
+            template="(%s, %s, %s, %s::int, %s::int, %s::int, %s::int, %s::int)",
+            page_size=1000
+        )
+    
+    def _apply_content_effectiveness(self, cursor, deltas: pd.DataFrame):
+        """Adds window counts to content_effectiveness (overall segment) and recomputes rates."""
+        per_template = deltas[deltas['template_id'] != ''].groupby(
+            ['template_id', 'action_type', 'channel_code'], as_index=False
+        )[COUNTER_COLUMNS].sum()
+        if per_template.empty:
+            return
+        
+        plain = {c: f"v.{c}" for c in COUNTER_COLUMNS}
+        summed = {c: f"(ce.{c} + EXCLUDED.{c})" for c in COUNTER_COLUMNS}
+        _, new_score = self._engagement_sql(plain)
+        _, score = self._engagement_sql(summed)
+        new_rates = self._rate_sql(plain)
+        rates = self._rate_sql(summed)
+        columns = ', '.join(COUNTER_COLUMNS)
+        
+        execute_values(
+            cursor,
+            f"""
+            INSERT INTO nudging.content_effectiveness AS ce (
+                template_id, action_type, channel_code, {columns},
+                {', '.join(name for name, _ in new_rates)}, effectiveness_score, last_updated_at
+            )
+            SELECT v.template_id, v.action_type, v.channel_code, {', '.join(f'v.{c}' for c in COUNTER_COLUMNS)},
+                   {', '.join(sql for _, sql in new_rates)}, {new_score}, CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(template_id, action_type, channel_code, {columns})
+            ON CONFLICT (template_id, action_type, channel_code) WHERE demographic_segment IS NULL DO UPDATE SET
+                {', '.join(f'{c} = {summed[c]}' for c in COUNTER_COLUMNS)},
+                {', '.join(f'{name} = {sql}' for name, sql in rates)},
+                effectiveness_score = {score},
+                last_updated_at = CURRENT_TIMESTAMP;
+            """,
+            list(per_template.itertuples(index=False, name=None)),
+            template="(%s::uuid, %s, %s, %s::int, %s::int, %s::int, %s::int, %s::int)",
+            page_size=1000
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'buffered': len(self.buffer),
+            'accepted': self.buffer.accepted,
+            'dropped': self.buffer.dropped,
+            'rejected': self.events_rejected,
+            'processed': self.events_processed,
+            'unknown_nudge': self.events_unknown_nudge,
+            'failed': self.events_failed,
+            'retried': self.events_retried,
+            'windows': self.windows_processed,
+            'last_window_ms': round(self.last_window_ms, 1)
+        }
+
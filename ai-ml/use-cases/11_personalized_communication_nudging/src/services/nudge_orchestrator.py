@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import yaml
 import uuid
 import json
@@ -16,7 +17,8 @@ import json
 shared_utils_path = Path(__file__).parent.parent.parent.parent.parent / "shared" / "utils"
 if str(shared_utils_path) not in sys.path:
     sys.path.insert(0, str(shared_utils_path))
-from db_connector import DBConnector
+from db_connector import DBConnector, copy_rows
+from instrumentation import traced
 
 # Import models
 try:
@@ -24,6 +26,7 @@ try:
     from ..models.channel_optimizer import ChannelOptimizer
     from ..models.send_time_optimizer import SendTimeOptimizer
     from ..models.content_personalizer import ContentPersonalizer
+    from .feedback_ingestion import FeedbackIngestionService
 except ImportError:
     # Fallback for script execution
     sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -31,6 +34,7 @@ except ImportError:
     from models.channel_optimizer import ChannelOptimizer
     from models.send_time_optimizer import SendTimeOptimizer
     from models.content_personalizer import ContentPersonalizer
+    from services.feedback_ingestion import FeedbackIngestionService
 
 
 class NudgeOrchestrator:
@@ -43,6 +47,7 @@ class NudgeOrchestrator:
         db_config_path = Path(__file__).parent.parent.parent / "config" / "db_config.yaml"
         with open(db_config_path, 'r') as f:
             db_configs = yaml.safe_load(f)
+        self.db_configs = db_configs
 
         self.db = DBConnector(
             host=db_configs['database']['host'],
@@ -58,6 +63,14 @@ class NudgeOrchestrator:
         self.channel_optimizer = ChannelOptimizer(config_path)
         self.send_time_optimizer = SendTimeOptimizer(config_path)
         self.content_personalizer = ContentPersonalizer(config_path)
+        
+        bulk_config = self.config.get('nudging', {}).get('bulk_scheduling', {})
+        self.bulk_chunk_size = bulk_config.get('chunk_size', 50000)
+        self.bulk_query_chunk_size = bulk_config.get('query_chunk_size', 50000)
+        self.bulk_log_audit = bulk_config.get('log_audit', True)
+        
+        # Buffered feedback ingestion (created on first use, own connection)
+        self.feedback_ingestion = None
 
     def connect(self):
         """Connects all models to the database."""
@@ -65,6 +78,7 @@ class NudgeOrchestrator:
         if not self.db.connection:
             self.db.connect()
 
+    @traced('nudge.schedule')
     def schedule_nudge(self, action_type: str, family_id: str, urgency: str,
                       expiry_date: Optional[datetime] = None,
                       action_context: Optional[Dict[str, Any]] = None,
@@ -167,7 +181,165 @@ class NudgeOrchestrator:
             'content_strategy': content_result.get('selection_strategy', 'HEURISTIC'),
             'fatigue_status': fatigue_check
         }
-
+    
+    @traced('nudge.schedule_bulk')
+    def schedule_nudges_bulk(self, nudges, scheduled_by: str = 'SYSTEM') -> pd.DataFrame:
+        """
+        Schedules many nudges with the same steps as schedule_nudge, set-based per chunk.
+        
+        Args:
+            nudges: DataFrame (or list of dicts) with action_type, family_id, urgency and
+                    optional expiry_date, action_context
+            scheduled_by: Who scheduled the nudges (USER, SYSTEM, ADMIN)
+        
+        Returns:
+            DataFrame (one row per input nudge) with success, reason, nudge_id,
+            scheduled_channel, scheduled_time, time_window, template_id, etc.
+        """
+        nudges = pd.DataFrame(nudges).reset_index(drop=True)
+        print(f"📅 Bulk scheduling {len(nudges)} nudges (chunks of {self.bulk_chunk_size})")
+        
+        results = []
+        for start in range(0, len(nudges), self.bulk_chunk_size):
+            chunk = nudges.iloc[start:start + self.bulk_chunk_size]
+            results.append(self._schedule_nudges_chunk(chunk, scheduled_by))
+            print(f"   ✅ {min(start + self.bulk_chunk_size, len(nudges))}/{len(nudges)} processed")
+        
+        if not results:
+            return pd.DataFrame(columns=['family_id', 'action_type', 'urgency', 'success', 'reason', 'nudge_id'])
+        
+        result = pd.concat(results)
+        scheduled = int(result['success'].sum())
+        print(f"✅ Scheduled {scheduled} nudges, skipped {len(result) - scheduled}")
+        if scheduled < len(result):
+            for reason, count in result.loc[~result['success'], 'reason'].value_counts().items():
+                print(f"   - {reason}: {count}")
+        return result
+    
+    def _schedule_nudges_chunk(self, chunk: pd.DataFrame, scheduled_by: str) -> pd.DataFrame:
+        """Fatigue, consent, channel, time and content for one chunk, then COPY nudge and audit rows."""
+        family_ids = chunk['family_id'].astype(str)
+        unique_families = list(pd.unique(family_ids))
+        
+        result = pd.DataFrame({
+            'family_id': family_ids,
+            'action_type': chunk['action_type'],
+            'urgency': chunk['urgency'],
+            'success': False,
+            'reason': None,
+            'nudge_id': None,
+            'scheduled_channel': None,
+            'scheduled_time': None,
+            'time_window': None,
+            'template_id': None,
+            'personalized_content': None,
+            'channel_confidence': np.nan,
+            'time_confidence': np.nan,
+            'content_strategy': None
+        }, index=chunk.index)
+        result = result.astype({'reason': object, 'nudge_id': object, 'scheduled_channel': object,
+                                'scheduled_time': object, 'time_window': object, 'template_id': object,
+                                'personalized_content': object, 'content_strategy': object})
+        
+        # 1. Fatigue limits
+        fatigue = self.fatigue_model.check_fatigue_many(unique_families).set_index('family_id')
+        allowed = family_ids.map(fatigue['allowed']).fillna(True).astype(bool)
+        result.loc[~allowed, 'reason'] = family_ids[~allowed].map(fatigue['reason']).fillna('Fatigue limit exceeded')
+        
+        # 2. Consent, opt-outs, language and vulnerability (shared with the channel optimizer)
+        consent = self.channel_optimizer.load_family_consent_bulk(unique_families, self.bulk_query_chunk_size)
+        has_consent_row = family_ids.isin(consent.index)
+        consent_given = family_ids.map(consent['consent_given']).fillna(False).astype(bool)
+        refused = allowed & has_consent_row & ~consent_given
+        result.loc[refused, 'reason'] = 'Consent not given for communications'
+        
+        work = chunk[allowed & ~refused]
+        if work.empty:
+            return result
+        work_families = family_ids[work.index]
+        
+        # 3. Channel, 4. send time, 5. template (all vectorized)
+        channels = self.channel_optimizer.select_best_channels_bulk(work, family_consent=consent,
+                                                                   chunk_size=self.bulk_query_chunk_size)
+        work = work.assign(channel_code=channels['channel_code'])
+        times = self.send_time_optimizer.select_best_times_bulk(work, chunk_size=self.bulk_query_chunk_size)
+        language = work_families.map(consent['preferred_language']).fillna('en')
+        content = self.content_personalizer.select_templates_batch(work.assign(language=language))
+        
+        no_template = content['template_id'].isna()
+        result.loc[no_template[no_template].index, 'reason'] = 'No suitable template found'
+        
+        ok = no_template[~no_template].index
+        if len(ok) == 0:
+            return result
+        
+        nudge_ids = [str(uuid.uuid4()) for _ in range(len(ok))]
+        scheduled_time = times.loc[ok, 'scheduled_time']
+        scheduled_iso = [t.isoformat() for t in scheduled_time.tolist()]
+        
+        expiry = chunk.loc[ok, 'expiry_date'] if 'expiry_date' in chunk.columns else pd.Series(None, index=ok, dtype=object)
+        contexts = chunk.loc[ok, 'action_context'] if 'action_context' in chunk.columns else pd.Series(None, index=ok, dtype=object)
+        
+        nudge_rows = pd.DataFrame({
+            'nudge_id': nudge_ids,
+            'family_id': family_ids[ok].to_numpy(),
+            'action_type': chunk.loc[ok, 'action_type'].to_numpy(),
+            'action_context': [json.dumps(c) if isinstance(c, dict) and c else None for c in contexts],
+            'urgency': chunk.loc[ok, 'urgency'].to_numpy(),
+            'expiry_date': expiry.to_numpy(),
+            'scheduled_channel': channels.loc[ok, 'channel_code'].to_numpy(),
+            'scheduled_time': scheduled_time.to_numpy(),
+            'template_id': content.loc[ok, 'template_id'].astype(str).to_numpy(),
+            'personalized_content': content.loc[ok, 'personalized_content'].to_numpy(),
+            'status': 'SCHEDULED'
+        })
+        
+        try:
+            cursor = self.db.connection.cursor()
+            copy_rows(cursor, 'nudging.nudges', nudge_rows)
+            
+            if self.bulk_log_audit:
+                audit_rows = pd.DataFrame({
+                    'action_type': 'NUDGE_SCHEDULED',
+                    'entity_type': 'NUDGE',
+                    'entity_id': nudge_ids,
+                    'performed_by': scheduled_by,
+                    'details': [
+                        json.dumps({
+                            'family_id': family_id,
+                            'action_type': action_type,
+                            'urgency': urgency,
+                            'channel': channel,
+                            'scheduled_time': when
+                        })
+                        for family_id, action_type, urgency, channel, when in zip(
+                            nudge_rows['family_id'].tolist(), nudge_rows['action_type'].tolist(),
+                            nudge_rows['urgency'].tolist(), nudge_rows['scheduled_channel'].tolist(), scheduled_iso
+                        )
+                    ]
+                })
+                copy_rows(cursor, 'nudging.nudge_audit_logs', audit_rows)
+            
+            self.db.connection.commit()
+        except Exception as e:
+            print(f"⚠️  Error inserting scheduled nudges: {e}")
+            self.db.connection.rollback()
+            result.loc[ok, 'reason'] = f'Error creating nudge records: {e}'
+            return result
+        
+        result.loc[ok, 'success'] = True
+        result.loc[ok, 'reason'] = None
+        result.loc[ok, 'nudge_id'] = nudge_ids
+        result.loc[ok, 'scheduled_channel'] = channels.loc[ok, 'channel_code']
+        result.loc[ok, 'scheduled_time'] = scheduled_iso
+        result.loc[ok, 'time_window'] = times.loc[ok, 'time_window']
+        result.loc[ok, 'template_id'] = nudge_rows['template_id'].to_numpy()
+        result.loc[ok, 'personalized_content'] = nudge_rows['personalized_content'].to_numpy()
+        result.loc[ok, 'channel_confidence'] = channels.loc[ok, 'confidence']
+        result.loc[ok, 'time_confidence'] = times.loc[ok, 'confidence']
+        result.loc[ok, 'content_strategy'] = content.loc[ok, 'selection_strategy']
+        return result
+    
     def get_nudge_history(self, family_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Gets nudge history for a family."""
         try:
@@ -214,6 +386,7 @@ class NudgeOrchestrator:
             print(f"⚠️  Error getting nudge history: {e}")
             return []
 
+    @traced('nudge.record_feedback')
     def record_feedback(self, nudge_id: str, event_type: str, metadata: Optional[Dict[str, Any]] = None):
         """
         Records feedback event for a nudge (delivered, opened, clicked, responded, etc.).
@@ -308,6 +481,43 @@ class NudgeOrchestrator:
             self.db.connection.rollback()
             return {'success': False, 'error': str(e)}
 
+    def ingest_feedback(self, nudge_id: str, event_type: str, metadata: Optional[Dict[str, Any]] = None,
+                        event_time: Optional[datetime] = None) -> bool:
+        """
+        Buffers a feedback event for windowed bulk processing (high-volume path).
+        Returns False if the event was rejected (invalid or buffer full).
+        """
+        return self._get_feedback_ingestion().ingest(nudge_id, event_type, metadata, event_time)
+
+    @traced('nudge.process_feedback_window')
+    def process_feedback_window(self) -> Dict[str, Any]:
+        """Applies one window of buffered feedback events."""
+        return self._get_feedback_ingestion().process_window()
+
+    def run_feedback_worker(self, stop_event=None):
+        """Runs the feedback ingestion loop (blocking) until stop_event is set."""
+        self._get_feedback_ingestion().run_worker(stop_event)
+
+    def _get_feedback_ingestion(self) -> FeedbackIngestionService:
+        if self.feedback_ingestion is None:
+            ingestion_db = DBConnector(
+                host=self.db_configs['database']['host'],
+                port=self.db_configs['database']['port'],
+                database=self.db_configs['database']['name'],
+                user=self.db_configs['database']['user'],
+                password=self.db_configs['database']['password']
+            )
+            ingestion_db.connect()
+            nudging_config = self.config.get('nudging', {})
+            self.feedback_ingestion = FeedbackIngestionService(
+                ingestion_db,
+                self.fatigue_model,
+                self.content_personalizer,
+                nudging_config.get('feedback_ingestion', {}),
+                nudging_config.get('learning', {})
+            )
+        return self.feedback_ingestion
+
     def _get_family_preferences(self, family_id: str) -> Dict[str, Any]:
         """Gets family consent and preferences."""
         try:
@@ -423,12 +633,13 @@ class NudgeOrchestrator:
     def _update_learning_models(self, family_id: str, channel_code: str, action_type: str,
                                template_id: uuid.UUID, event_type: str):
         """Updates learning models based on feedback (simplified for now)."""
-        # In a full implementation, this would update:
+        # Content bandit: queued in memory, applied in micro-batches and checkpointed periodically
+        if template_id:
+            self.content_personalizer.record_feedback(template_id, action_type, channel_code, event_type)
+        
+        # In a full implementation, this would also update:
         # - Channel preferences scores
         # - Send time preferences
-        # - Content effectiveness metrics
-        # For now, just a placeholder
-        pass
 
     def _log_audit(self, action_type: str, entity_type: str, entity_id: str,
                   performed_by: str, details: Dict[str, Any]):
@@ -449,6 +660,10 @@ class NudgeOrchestrator:
             self.db.connection.rollback()
 
     def disconnect(self):
+        if self.feedback_ingestion is not None:
+            while len(self.feedback_ingestion.buffer):
+                self.feedback_ingestion.process_window()
+            self.feedback_ingestion.db.disconnect()
         self.db.disconnect()
         self.fatigue_model.disconnect()
         self.channel_optimizer.disconnect()